@@ -0,0 +1,171 @@
+"""
+IntentParser mikrobenchmarki — kompilyatsiya qilingan Aho-Corasick va chiziqli qidiruv.
+
+Ishlatish:
+    python benchmarks/intent_parser_bench.py [--number 20000]
+
+"linear" ustuni avvalgi algoritmni takrorlaydi (har bir kalit so'z uchun ``in``,
+har chaqiruvda ``slash_map`` qayta quriladi, har bir kun nomi va sarlavha
+kalit so'zi uchun alohida ``re.sub``) — ikkala yo'l bir xil pattern va
+kirishlarda o'lchanadi. "cold" — ``analyze`` keshi tozalangan holda,
+"cached" — bir xil matn qayta kelganda.
+
+Ikkinchi jadval bitta xabar uchun to'liq yo'lni o'lchaydi: intent + rejim +
+til (avval uchta alohida skanerlash, endi bitta umumiy tahlil).
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import timeit
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.intent_parser import (  # noqa: E402
+    _DAY_MAP,
+    _INTENT_PATTERNS,
+    _SLASH_MAP,
+    _TIME_RE,
+    IntentParser,
+)
+from core.auto_mode import AutoModeSwitcher  # noqa: E402
+from core.language import _RU_CHARS, _UZ_CHARS, _UZ_WORDS, LanguageDetector  # noqa: E402
+from core.text_features import analyze  # noqa: E402
+
+SAMPLES: list[tuple[str, str]] = [
+    ("chat_uz", "salom, menga python dasturlash tili haqida batafsil gapirib ber"),
+    ("chat_en", "explain how binary search trees are balanced in practice"),
+    ("add_task", "ertaga 14:00 da doktor bilan uchrashuv qo'sh"),
+    ("schedule", "dushanba kungi darslar jadvali qanday"),
+    ("slash", "/focus 25 daqiqa"),
+    ("homework", "matematikadan uy vazifalari bormi"),
+]
+
+
+def _linear_extract(text: str, intent: str) -> dict[str, Any]:
+    params: dict[str, Any] = {}
+    lower = text.lower()
+    for key, canonical in _DAY_MAP.items():
+        if key in lower:
+            params["day"] = canonical
+            break
+    time_match = _TIME_RE.search(text)
+    if time_match:
+        params["time"] = time_match.group(1)
+    if intent in ("add_task", "add_class", "add_homework"):
+        title = text
+        for key in _DAY_MAP:
+            title = re.sub(rf"\b{re.escape(key)}\b", "", title, flags=re.IGNORECASE)
+        title = _TIME_RE.sub("", title)
+        title = re.sub(r"^/\w+\s*", "", title).strip()
+        for kw in ["dars qo'sh", "yangi dars", "qo'sh", "add", "vazifa", "uchrashuv", "reja"]:
+            title = re.sub(rf"\b{re.escape(kw)}\b", "", title, flags=re.IGNORECASE)
+        title = title.strip(" ,.")
+        if title:
+            params["title"] = title
+    return params
+
+
+def linear_parse(text: str) -> dict[str, Any]:
+    """Avvalgi chiziqli parserning etalon nusxasi."""
+    lower = text.lower().strip()
+    slash_map = dict(_SLASH_MAP)
+    first = lower.split()[0] if lower.split() else ""
+    if first in slash_map:
+        return {"intent": slash_map[first], "params": _linear_extract(text, slash_map[first])}
+    for intent, keywords in _INTENT_PATTERNS:
+        for kw in keywords:
+            if kw in lower:
+                return {"intent": intent, "params": _linear_extract(text, intent)}
+    return {"intent": "chat", "params": {}}
+
+
+def linear_mode(text: str) -> str:
+    """Avvalgi AutoModeSwitcher.detect_mode ning etalon nusxasi."""
+    lower = text.lower()
+    for mode, keywords in (
+        ("code", AutoModeSwitcher._CODE_KEYWORDS),
+        ("study", AutoModeSwitcher._STUDY_KEYWORDS),
+        ("pro", AutoModeSwitcher._PRO_KEYWORDS),
+    ):
+        for kw in keywords:
+            if kw in lower:
+                return mode
+    return "fast"
+
+
+def linear_language(text: str) -> str:
+    """Avvalgi LanguageDetector.detect ning etalon nusxasi."""
+    words = re.findall(r"\b\w+\b", text.lower())
+    if sum(1 for ch in text if ch in _RU_CHARS) > len(text) * 0.3:
+        return "ru"
+    uz_words = sum(1 for w in words if w in _UZ_WORDS)
+    if sum(1 for ch in text if ch in _UZ_CHARS) >= 1 or uz_words >= 1:
+        return "uz"
+    if sum(1 for ch in text if ch.isalpha() and ch.isascii()) > len(text) * 0.5:
+        return "en"
+    return "uz"
+
+
+def _bench(func, number: int) -> float:
+    return timeit.timeit(func, number=number) / number
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--number", type=int, default=20000, help="har bir namuna uchun takrorlar soni")
+    args = ap.parse_args()
+
+    parser = IntentParser()
+    modes = AutoModeSwitcher()
+    detector = LanguageDetector()
+
+    def cold_parse(text: str) -> None:
+        analyze.cache_clear()
+        parser.parse(text)
+
+    def linear_all(text: str) -> None:
+        linear_parse(text)
+        linear_mode(text)
+        linear_language(text)
+
+    def cold_all(text: str) -> None:
+        analyze.cache_clear()
+        parser.parse(text)
+        modes.detect_mode(text)
+        detector.detect(text)
+
+    n = args.number
+    print("IntentParser.parse")
+    print(f"{'sample':<10} {'linear µs':>10} {'cold µs':>9} {'cached µs':>10} {'speedup':>8}")
+    total_old = total_new = 0.0
+    for name, text in SAMPLES:
+        assert parser.parse(text)["intent"] == linear_parse(text)["intent"], name
+        old = _bench(lambda: linear_parse(text), n)
+        new = _bench(lambda: cold_parse(text), n)
+        hot = _bench(lambda: parser.parse(text), n)
+        total_old += old
+        total_new += new
+        print(
+            f"{name:<10} {old * 1e6:>10.2f} {new * 1e6:>9.2f} {hot * 1e6:>10.2f} "
+            f"{old / new:>7.1f}x"
+        )
+    print(f"{'total':<10} {total_old * 1e6:>10.2f} {total_new * 1e6:>9.2f} {'':>10} "
+          f"{total_old / total_new:>7.1f}x")
+
+    print()
+    print("intent + rejim + til (bitta xabar)")
+    print(f"{'sample':<10} {'linear µs':>10} {'shared µs':>10} {'speedup':>8}")
+    for name, text in SAMPLES:
+        assert modes.detect_mode(text) == linear_mode(text), name
+        old = _bench(lambda: linear_all(text), n)
+        new = _bench(lambda: cold_all(text), n)
+        print(f"{name:<10} {old * 1e6:>10.2f} {new * 1e6:>10.2f} {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
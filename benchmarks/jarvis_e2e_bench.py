@@ -0,0 +1,275 @@
+"""
+Jarvis.process uchun oxirigacha (end-to-end) kechikish benchmarki — soxta provayder bilan.
+
+Ishlatish:
+    python benchmarks/jarvis_e2e_bench.py [--turns 40] [--concurrency 4]
+                                          [--latency-ms 400 --p95-ms 1200]
+                                          [--tokens-per-s 60] [--error-rate 0.05]
+                                          [--stream] [--time-scale 0] [--http]
+                                          [--rag-docs data/documents] [--json natija.json]
+
+Haqiqiy API ga so'rov yuborilmaydi: ``core.mock_provider`` (``config/models.json``
+dagi ``mock`` provayderi) ishlatiladi. ``--http`` bilan esa localhost
+``MockProviderServer`` va haqiqiy ``openai`` client (tarmoq qatlami ham
+o'lchanadi). ``--time-scale 0`` provayder kechikishini o'chiradi — faqat
+Jarvis ning o'z xarajati qoladi.
+
+Har bir tur uchun bosqichlar vaqti ``core.tracing`` spanlaridan olinadi:
+intent (avto rejim + lokal klassifikator), language, rag, memory (uzoq
+muddatli xotiradan qidiruv), rerank, prompt_build, provider, memory_write;
+qolgani — other. Oxirida o'tkazuvchanlik (tur/s), xatolar, tracing
+xarajati va ``--stream`` da birinchi tokengacha vaqt (TTFT) chiqariladi.
+Ma'lumotlar vaqtinchalik katalogda saqlanadi.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_ROOT))
+
+from core.mock_provider import MOCK_ENV, MockProviderServer  # noqa: E402
+
+_STAGES = [
+    "intent",
+    "language",
+    "rag",
+    "memory",
+    "rerank",
+    "prompt_build",
+    "provider",
+    "memory_write",
+    "other",
+]
+_PROMPTS = [
+    "Python da dekoratorlar qanday ishlaydi, misol bilan tushuntir",
+    "Explain the difference between TCP and UDP with examples",
+    "Как улучшить концентрацию во время учёбы?",
+    "Kvant kompyuterlari oddiy kompyuterlardan nimasi bilan farq qiladi?",
+    "Write a short plan for learning linear algebra in a month",
+    "Почему небо голубое? Объясни простыми словами",
+    "Rekursiya va iteratsiya o'rtasidagi farq nima?",
+    "What are good habits for writing maintainable code?",
+    "Bugun kayfiyatim yaxshi emas, nima maslahat berasan?",
+    "Summarize the main causes of the First World War",
+    "Объясни, что такое градиентный спуск",
+    "SQL da JOIN turlarini solishtirib ber",
+]
+
+
+# Trace spanlari → hisobot bosqichlari (core.tracing)
+_SPAN_STAGES = {
+    "auto_mode": "intent",
+    "local_intent": "intent",
+    "language": "language",
+    "rag": "rag",
+    "memory": "memory",
+    "rerank": "rerank",
+    "prompt_build": "prompt_build",
+    "provider": "provider",
+    "memory_write": "memory_write",
+}
+_OVERHEAD_SPANS = 20_000
+
+
+def _turn_stages(trace: Any) -> dict:
+    stages: dict[str, float] = {}
+    for span in trace.spans:
+        stage = _SPAN_STAGES.get(span.name)
+        if stage:
+            stages[stage] = stages.get(stage, 0.0) + span.duration_ms / 1000
+    stages["other"] = max(0.0, trace.duration_ms / 1000 - sum(stages.values()))
+    return stages
+
+
+def _span_cost(tracer: Any) -> float:
+    """Bitta span ning o'rtacha narxi (sekund) — tracing xarajatini baholash uchun."""
+    with tracer.trace("overhead") as trace:
+        started = time.perf_counter()
+        for _ in range(_OVERHEAD_SPANS):
+            with tracer.span("x") as span:
+                span.set(n=1)
+        cost = (time.perf_counter() - started) / _OVERHEAD_SPANS
+        trace.spans.clear()
+    tracer.clear()
+    return cost
+
+
+def _summary(values: list[float]) -> dict:
+    ordered = sorted(values)
+    if not ordered:
+        return {"mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0}
+    return {
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": round(statistics.median(ordered) * 1000, 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3),
+    }
+
+
+def _mock_settings(args: argparse.Namespace) -> dict:
+    return {
+        "latency_ms": {"distribution": "lognormal", "median": args.latency_ms, "p95": args.p95_ms},
+        "tokens_per_s": args.tokens_per_s,
+        "reply_tokens": [args.reply_tokens // 2, args.reply_tokens * 3 // 2],
+        "error_rate": args.error_rate,
+        "stream_error_rate": args.error_rate if args.stream else 0.0,
+        "time_scale": args.time_scale,
+        "seed": args.seed,
+    }
+
+
+def run(args: argparse.Namespace) -> dict:
+    os.environ[MOCK_ENV] = "1"
+    from core.jarvis import Jarvis
+
+    jarvis = Jarvis()
+    provider_cfg = jarvis.router._config["providers"]["mock"]
+    provider_cfg["mock"] = {**provider_cfg.get("mock", {}), **_mock_settings(args)}
+    server = None
+    if args.http:
+        server = MockProviderServer(provider_cfg["mock"]).start()
+        provider_cfg["base_url"] = server.base_url
+    jarvis.router.set_provider("mock")
+    if args.rag_docs:
+        jarvis.rag.ingest_directory(str(args.rag_docs))
+
+    tracer = jarvis.tracer
+    session_ids = [f"bench-{i}" for i in range(max(1, args.concurrency))]
+    lock = threading.Lock()
+    records: list[dict] = []
+
+    def one_turn(index: int, sid: str, record: bool = True) -> None:
+        prompt = _PROMPTS[index % len(_PROMPTS)]
+        first_token: list[float] = []
+        on_token = (lambda delta: first_token or first_token.append(time.perf_counter())) if args.stream else None
+        started = time.perf_counter()
+        response = jarvis.process(prompt, session_id=sid, on_token=on_token)
+        if not record:
+            return
+        trace = tracer.recent(1, session_id=sid)[-1]
+        with lock:
+            records.append({
+                "total": trace.duration_ms / 1000,
+                "stages": _turn_stages(trace),
+                "spans": len(trace.spans) + 1,
+                "ttft": first_token[0] - started if first_token else None,
+                "error": response.startswith("❌"),
+            })
+
+    def worker(slot: int) -> None:
+        # Har bir worker o'z sessiyasida ketma-ket — sessiya qulfida kutish o'lchanmaydi
+        for index in range(slot, args.turns, len(session_ids)):
+            one_turn(index, session_ids[slot])
+
+    for i in range(args.warmup):
+        one_turn(i, session_ids[0], record=False)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(session_ids)) as pool:
+        list(pool.map(worker, range(len(session_ids))))
+    wall = time.perf_counter() - started
+    if server is not None:
+        server.stop()
+    # Xulosa oqimlari va sessiya buferi vaqtinchalik katalogdan chiqishdan oldin
+    # diskka tushishi kerak — aks holda atexit ularni repo ichidagi ./data ga yozadi
+    for thread in threading.enumerate():
+        if thread.name == "jarvis-memory-summary":
+            thread.join()
+    jarvis.session_store.flush()
+
+    totals = [r["total"] for r in records]
+    result = {
+        "turns": len(records),
+        "concurrency": args.concurrency,
+        "transport": "http" if args.http else "in-process",
+        "stream": args.stream,
+        "throughput_turns_per_s": round(len(records) / wall, 2) if wall else 0.0,
+        "errors": sum(r["error"] for r in records),
+        "total": _summary(totals),
+        "stages": {},
+    }
+    total_sum = sum(totals) or 1.0
+    for stage in _STAGES:
+        values = [r["stages"].get(stage, 0.0) for r in records]
+        result["stages"][stage] = {**_summary(values), "share": round(sum(values) / total_sum, 4)}
+    spans_per_turn = statistics.fmean(r["spans"] for r in records) if records else 0.0
+    overhead = spans_per_turn * _span_cost(tracer)
+    result["tracing"] = {
+        "spans_per_turn": round(spans_per_turn, 1),
+        "overhead_us_per_turn": round(overhead * 1e6, 1),
+        "overhead_share": round(overhead / (statistics.fmean(totals) or 1.0), 5) if totals else 0.0,
+    }
+    ttfts = [r["ttft"] for r in records if r["ttft"] is not None]
+    if ttfts:
+        result["ttft"] = _summary(ttfts)
+    return result
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--turns", type=int, default=40)
+    ap.add_argument("--concurrency", type=int, default=4, help="parallel sessiyalar soni")
+    ap.add_argument("--warmup", type=int, default=3)
+    ap.add_argument("--latency-ms", type=float, default=400.0, help="TTFT medianasi")
+    ap.add_argument("--p95-ms", type=float, default=1200.0, help="TTFT 95-persentili")
+    ap.add_argument("--tokens-per-s", type=float, default=60.0)
+    ap.add_argument("--reply-tokens", type=int, default=100, help="o'rtacha javob uzunligi")
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--time-scale", type=float, default=1.0, help="0 — provayder kutmaydi")
+    ap.add_argument("--stream", action="store_true")
+    ap.add_argument("--http", action="store_true", help="localhost server + openai client")
+    ap.add_argument("--rag-docs", type=Path, help="RAG ga oldindan yuklanadigan hujjatlar")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", type=Path, help="natijalarni JSON faylga yozish")
+    args = ap.parse_args()
+    if args.rag_docs:
+        args.rag_docs = args.rag_docs.resolve()
+    if args.json:
+        args.json = args.json.resolve()
+
+    # Jarvis ./data ga yozadi — haqiqiy ma'lumotlarga tegmaslik uchun vaqtinchalik katalog
+    with tempfile.TemporaryDirectory() as workdir:
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            r = run(args)
+        finally:
+            os.chdir(cwd)
+
+    print(
+        f"{r['turns']} tur, {r['concurrency']} parallel, {r['transport']}"
+        f"{', stream' if r['stream'] else ''}: {r['throughput_turns_per_s']:.2f} tur/s, "
+        f"xatolar: {r['errors']}"
+    )
+    print(f"{'bosqich':>14} {'mean':>10} {'p50':>10} {'p95':>10} {'ulush':>7}")
+    for stage, s in r["stages"].items():
+        print(
+            f"{stage:>14} {s['mean_ms']:>8.2f}ms {s['p50_ms']:>8.2f}ms "
+            f"{s['p95_ms']:>8.2f}ms {s['share'] * 100:>6.1f}%"
+        )
+    t = r["total"]
+    print(f"{'jami':>14} {t['mean_ms']:>8.2f}ms {t['p50_ms']:>8.2f}ms {t['p95_ms']:>8.2f}ms")
+    tr = r["tracing"]
+    print(
+        f"tracing: {tr['spans_per_turn']:.0f} span/tur, ~{tr['overhead_us_per_turn']:.0f} µs/tur "
+        f"({tr['overhead_share'] * 100:.2f}%)"
+    )
+    if "ttft" in r:
+        f = r["ttft"]
+        print(f"{'TTFT':>14} {f['mean_ms']:>8.2f}ms {f['p50_ms']:>8.2f}ms {f['p95_ms']:>8.2f}ms")
+    if args.json:
+        args.json.write_text(json.dumps(r, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Til aniqlash benchmarki — trigramma modeli va avvalgi evristika.
+
+Ishlatish:
+    python benchmarks/langid_bench.py [--number 2000]
+
+Aniqlik ``benchmarks/langid_accuracy.tsv`` to'plamida o'lchanadi (yorliqlar:
+uz_latn, uz_cyrl, en, ru). "heuristic" ustuni avvalgi LanguageDetector
+algoritmini takrorlaydi (so'zlar to'plami va harf ulushlari). Shuningdek
+jadvalni mmap orqali yuklash vaqti va bitta xabarni baholash vaqti chiqariladi.
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import time
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.lang_model import _MODEL_PATH, TrigramLanguageModel  # noqa: E402
+from core.language import _RU_CHARS, _UZ_CHARS, _UZ_WORDS  # noqa: E402
+
+_ACCURACY_SET = Path(__file__).resolve().parent / "langid_accuracy.tsv"
+
+
+def heuristic_language(text: str) -> str:
+    """Avvalgi LanguageDetector.detect ning etalon nusxasi (standart til — uz)."""
+    words = re.findall(r"\b\w+\b", text.lower())
+    if sum(1 for ch in text if ch in _RU_CHARS) > len(text) * 0.3:
+        return "ru"
+    uz_words = sum(1 for w in words if w in _UZ_WORDS)
+    if sum(1 for ch in text if ch in _UZ_CHARS) >= 1 or uz_words >= 1:
+        return "uz"
+    if sum(1 for ch in text if ch.isalpha() and ch.isascii()) > len(text) * 0.5:
+        return "en"
+    return "uz"
+
+
+def load_samples() -> list[tuple[str, str]]:
+    samples = []
+    for line in _ACCURACY_SET.read_text(encoding="utf-8").splitlines():
+        if not line.strip() or line.startswith("#"):
+            continue
+        label, text = line.split("\t", 1)
+        samples.append((label, text))
+    return samples
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--number", type=int, default=2000, help="tezlik uchun takrorlar soni")
+    args = ap.parse_args()
+
+    start = time.perf_counter()
+    model = TrigramLanguageModel.load(_MODEL_PATH)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    samples = load_samples()
+    labels = sorted({label for label, _ in samples})
+    print(f"{'label':<8} {'n':>4} {'heuristic':>10} {'model':>8} {'script':>8}")
+    total_h = total_m = total_s = 0
+    for label in labels:
+        subset = [text for lab, text in samples if lab == label]
+        lang = label.split("_")[0]
+        h = sum(heuristic_language(t) == lang for t in subset)
+        predicted = [model.predict(t)[0] or "" for t in subset]
+        m = sum(p.split("_")[0] == lang for p in predicted)
+        s = sum(p == label for p in predicted)
+        total_h, total_m, total_s = total_h + h, total_m + m, total_s + s
+        n = len(subset)
+        print(f"{label:<8} {n:>4} {h / n:>10.1%} {m / n:>8.1%} {s / n:>8.1%}")
+    n = len(samples)
+    print(f"{'total':<8} {n:>4} {total_h / n:>10.1%} {total_m / n:>8.1%} {total_s / n:>8.1%}")
+
+    texts = [text for _, text in samples]
+    avg_len = sum(map(len, texts)) / len(texts)
+    per_msg_h = timeit.timeit(
+        lambda: [heuristic_language(t) for t in texts], number=max(1, args.number // len(texts))
+    ) / (max(1, args.number // len(texts)) * len(texts))
+    per_msg_m = timeit.timeit(
+        lambda: [model.predict(t) for t in texts], number=max(1, args.number // len(texts))
+    ) / (max(1, args.number // len(texts)) * len(texts))
+    print()
+    print(f"jadval: {_MODEL_PATH.stat().st_size} bayt, mmap yuklash {load_ms:.2f} ms")
+    print(f"o'rtacha xabar uzunligi: {avg_len:.0f} belgi")
+    print(f"heuristic: {per_msg_h * 1e6:.1f} µs/xabar, model: {per_msg_m * 1e6:.1f} µs/xabar")
+
+
+if __name__ == "__main__":
+    main()
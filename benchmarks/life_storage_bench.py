@@ -0,0 +1,110 @@
+"""
+Life ma'lumotlarini yuklash/saqlash benchmarki — pydantic validatsiyasi va tezkor yo'l.
+
+Ishlatish:
+    python benchmarks/life_storage_bench.py [--sizes 10000 100000] [--repeat 3]
+
+"validate" ustuni avvalgi yo'lni takrorlaydi (``Homework(**item)`` va
+``model_dump()``), "fast" — ``from_storage`` (``model_validate``) /
+``to_storage``. Har bir o'lcham uchun uy vazifalari ro'yxati vaqtinchalik papkada ``LifeStorage`` orqali
+yoziladi va o'qiladi; "json" ustunlari faqat fayl I/O va JSON vaqtini
+ko'rsatadi, model qurish/serializatsiya ulardan tashqarida.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from life.models import Homework  # noqa: E402
+from life.storage import LifeStorage  # noqa: E402
+
+_SUBJECTS = ["Matematika", "Fizika", "Kimyo", "Tarix", "Ingliz tili", "Biologiya"]
+_PRIORITIES = ["low", "medium", "high", "urgent"]
+_STATUSES = ["pending", "in_progress", "completed", "overdue"]
+
+
+def make_records(n: int, seed: int = 0) -> list[dict]:
+    """Tasodifiy, lekin takrorlanuvchi uy vazifasi yozuvlari."""
+    rng = random.Random(seed)
+    records = []
+    for i in range(n):
+        day = 1 + rng.randrange(28)
+        deadline = f"2026-{1 + rng.randrange(12):02d}-{day:02d}"
+        if rng.random() < 0.3:
+            deadline += f" {rng.randrange(24):02d}:{rng.randrange(60):02d}"
+        records.append(
+            Homework(
+                subject=rng.choice(_SUBJECTS),
+                description=f"{i}-mashq, {rng.randrange(1, 200)}-bet",
+                assigned_date=f"2026-01-{day:02d}",
+                deadline=deadline,
+                priority=rng.choice(_PRIORITIES),
+                status=rng.choice(_STATUSES),
+            ).model_dump(mode="json")
+        )
+    return records
+
+
+def best_of(repeat: int, func: Callable[[], object]) -> float:
+    """Eng yaxshi vaqt (ms)."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(n: int, repeat: int) -> None:
+    records = make_records(n)
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = LifeStorage(data_dir=tmp)
+        storage.save_homework(records)
+
+        json_load = best_of(repeat, storage.load_homework)
+        raw = storage.load_homework()
+        build_validate = best_of(repeat, lambda: [Homework(**item) for item in raw])
+        build_fast = best_of(repeat, lambda: [Homework.from_storage(item) for item in raw])
+
+        models = [Homework.from_storage(item) for item in raw]
+        dump_validate = best_of(repeat, lambda: [m.model_dump() for m in models])
+        dump_fast = best_of(repeat, lambda: [m.to_storage() for m in models])
+        dumped = [m.to_storage() for m in models]
+        json_save = best_of(repeat, lambda: storage.save_homework(dumped))
+
+        assert [m.model_dump() for m in models] == [Homework(**r).model_dump() for r in raw]
+        size_kb = storage.homework_file.stat().st_size / 1024
+
+    print(f"\n{n:,} ta yozuv ({size_kb:,.0f} KB JSON)")
+    print(f"{'':<10} {'json':>9} {'validate':>10} {'fast':>9} {'tezlanish':>10} {'jami (old→new)':>20}")
+    print(
+        f"{'yuklash':<10} {json_load:>7.1f}ms {build_validate:>8.1f}ms {build_fast:>7.1f}ms "
+        f"{build_validate / build_fast:>9.1f}x "
+        f"{json_load + build_validate:>9.1f}→{json_load + build_fast:.1f}ms"
+    )
+    print(
+        f"{'saqlash':<10} {json_save:>7.1f}ms {dump_validate:>8.1f}ms {dump_fast:>7.1f}ms "
+        f"{dump_validate / dump_fast:>9.1f}x "
+        f"{json_save + dump_validate:>9.1f}→{json_save + dump_fast:.1f}ms"
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    ap.add_argument("--repeat", type=int, default=3, help="takrorlar (eng yaxshisi olinadi)")
+    args = ap.parse_args()
+    for n in args.sizes:
+        run(n, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Kundalik reja yechuvchisi benchmarki — qayta rejalash vaqti va sifati.
+
+Ishlatish:
+    python benchmarks/plan_solver_bench.py [--sizes 20 100 300 500] [--days 20]
+
+Har bir o'lcham uchun ``--days`` ta tasodifiy kun (darslar, joylar, muddatli
+va muddatsiz vazifalar, energiya darajasi) yechiladi. "greedy" ustuni —
+qiymat zichligi bo'yicha birinchi sig'adigan oynaga joylash; "solver" —
+``solve_plan``. Maqsad: yuzlab elementda qayta rejalash < 50 ms.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from life.plan_solver import PlanItem, Window, _fits, free_windows, solve_plan  # noqa: E402
+
+_LOCATIONS = ["A-101", "A-204", "B-12", "Sport zali", ""]
+_MINUTES = [15, 20, 30, 45, 60, 90, 120]
+
+
+def make_day(n: int, seed: int) -> tuple[list[PlanItem], list[Window], int]:
+    """Tasodifiy, lekin takrorlanuvchi kun: elementlar, bo'sh oynalar, energiya."""
+    rng = random.Random(seed)
+    classes = []
+    t = 8 * 60 + rng.choice([0, 30])
+    for _ in range(rng.randrange(2, 6)):
+        length = rng.choice([45, 80, 90])
+        classes.append((t, t + length, rng.choice(_LOCATIONS)))
+        t += length + rng.choice([10, 20, 40, 70, 100])
+    windows = free_windows(classes, day_start=7 * 60, day_end=22 * 60)
+    items = []
+    for i in range(n):
+        deadline = None
+        if rng.random() < 0.15:
+            deadline = rng.randrange(10 * 60, 22 * 60, 5)
+        items.append(
+            PlanItem(
+                key=str(i),
+                kind=rng.choice(["homework", "task"]),
+                label=f"#{i}",
+                minutes=rng.choice(_MINUTES),
+                value=rng.randint(1, 4) * rng.choice([10, 15, 20, 25, 30]),
+                effort=rng.randint(1, 3),
+                deadline=deadline,
+            )
+        )
+    return items, windows, rng.randint(1, 5)
+
+
+def greedy(items: list[PlanItem], windows: list[Window], energy_level: int) -> int:
+    """Taqqoslash uchun: zichlik bo'yicha birinchi sig'adigan oyna."""
+    energy = energy_level * 120
+    used = [0] * len(windows)
+    total = 0
+    for item in sorted(items, key=lambda it: -it.value / it.minutes):
+        if item.energy > energy:
+            continue
+        for w, window in enumerate(windows):
+            after = used[w] + item.minutes
+            if after <= window.capacity and _fits(window, after, item.deadline):
+                used[w] = after
+                energy -= item.energy
+                total += item.value
+                break
+    return total
+
+
+def run(n: int, days: int) -> None:
+    times, gains, optimal = [], [], 0
+    for seed in range(days):
+        items, windows, energy = make_day(n, seed)
+        baseline = greedy(items, windows, energy)
+        solved = solve_plan(items, windows, energy)
+        times.append(solved.elapsed_ms)
+        gains.append(solved.value / baseline if baseline else 1.0)
+        optimal += solved.optimal
+    print(
+        f"{n:>6} {statistics.median(times):>9.1f}ms {max(times):>9.1f}ms "
+        f"{statistics.mean(gains):>12.3f}x {optimal:>6}/{days}"
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[20, 100, 300, 500])
+    ap.add_argument("--days", type=int, default=20, help="har bir o'lcham uchun kunlar soni")
+    args = ap.parse_args()
+    print(f"{'n':>6} {'median':>11} {'max':>11} {'solver/greedy':>13} {'optimal':>8}")
+    for n in args.sizes:
+        run(n, args.days)
+
+
+if __name__ == "__main__":
+    main()
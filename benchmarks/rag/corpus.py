@@ -0,0 +1,169 @@
+"""
+RAG benchmarki uchun korpus va belgilangan savollar.
+
+Sintetik korpus: soxta so'zlardan iborat to'ldiruvchi matn orasiga
+"fakt" gaplari joylanadi (``<obyekt> <xususiyat> <qiymat> ga teng.`` va
+boshqa shablonlar). Savol — ``<obyekt> <xususiyat> qancha?`` kabi; bo'lak savolga mos deb
+hisoblanadi, agar u to'g'ri fayldan bo'lsa va ``<obyekt> <xususiyat>``
+kalit iborasini to'liq o'z ichiga olsa. Shuning uchun ``_chunk_text``
+o'zgarsa ham belgilar yaroqli qoladi (faktni bo'lib yuboradigan bo'laklash
+recall ni pasaytiradi — aynan shu o'lchanadi).
+
+``data/documents`` dagi haqiqiy hujjatlar uchun savollar gaplardan
+olinadi: gapning eng kam uchraydigan so'zlari — so'rov, gap o'rtasidagi
+qism — kalit.
+"""
+
+from __future__ import annotations
+
+import random
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Callable
+
+_ONSETS = ["", "b", "ch", "d", "f", "g", "h", "j", "k", "l", "m", "n", "p", "q", "r", "s", "sh", "t", "v", "x", "y", "z"]
+_VOWELS = ["a", "e", "i", "o", "u", "o'"]
+_CODAS = ["", "", "", "n", "r", "l", "m", "sh", "t", "k"]
+_ATTRIBUTES = ["balandligi", "narxi", "aholisi", "yoshi", "massasi", "tezligi", "harorati", "maydoni"]
+# Fakt va savol shablonlari turlicha — so'rov shablon so'zlari bo'yicha emas,
+# obyekt va xususiyat bo'yicha topilishi kerak
+_FACT_TEMPLATES = [
+    "{key} {value} ga teng.",
+    "Ma'lumotlarga ko'ra {key} taxminan {value}.",
+    "O'lchovlar {key} {value} ekanini ko'rsatdi.",
+    "Hisobotda {key} {value} deb qayd etilgan.",
+]
+_QUESTION_TEMPLATES = ["{key} qancha?", "{key} nimaga teng?", "{key} haqida nima ma'lum?", "{key}"]
+_FILLER_WORDS = 4000
+_DOC_SENTENCES = (12, 30)
+_FACTS_PER_DOC = (1, 4)
+_SENTENCE_RE = re.compile(r"[^.!?\n]+[.!?]")
+_WORD_RE = re.compile(r"\w{3,}", re.UNICODE)
+_QUERY_WORDS = 5
+_KEY_CHARS = 40
+_DOCUMENT_SUFFIXES = {".txt", ".md"}
+
+
+class Question:
+    """Savol, javob turgan fayl va mos bo'lakda bo'lishi shart bo'lgan ibora."""
+
+    __slots__ = ("text", "source", "key")
+
+    def __init__(self, text: str, source: str, key: str) -> None:
+        self.text = text
+        self.source = source
+        self.key = key
+
+
+class Corpus:
+    """Hujjatlar (fayl nomi → matn), savollar va kelib chiqishi."""
+
+    __slots__ = ("documents", "questions", "origin")
+
+    def __init__(self, documents: dict[str, str], questions: list[Question], origin: str) -> None:
+        self.documents = documents
+        self.questions = questions
+        self.origin = origin  # "synthetic" yoki "documents+synthetic"
+
+
+def _pseudo_word(rng: random.Random) -> str:
+    """Bo'g'inlardan (undosh + unli + ixtiyoriy undosh) soxta so'z."""
+    return "".join(
+        rng.choice(_ONSETS) + rng.choice(_VOWELS) + rng.choice(_CODAS)
+        for _ in range(rng.randint(2, 4))
+    )
+
+
+def _synthetic_document(
+    rng: random.Random,
+    vocabulary: list[str],
+    weights: list[float],
+    name: str,
+) -> tuple[str, list[Question]]:
+    sentences = []
+    for _ in range(rng.randint(*_DOC_SENTENCES)):
+        words = rng.choices(vocabulary, weights, k=rng.randint(6, 14))
+        sentences.append(" ".join(words).capitalize() + ".")
+    questions = []
+    for _ in range(rng.randint(*_FACTS_PER_DOC)):
+        entity = f"{_pseudo_word(rng).capitalize()}-{rng.randint(100, 999)}"
+        attribute = rng.choice(_ATTRIBUTES)
+        key = f"{entity} {attribute}"
+        fact = rng.choice(_FACT_TEMPLATES).format(key=key, value=rng.randint(1, 9999))
+        sentences.insert(rng.randrange(len(sentences) + 1), fact)
+        questions.append(Question(rng.choice(_QUESTION_TEMPLATES).format(key=key), name, key))
+    return " ".join(sentences), questions
+
+
+def _questions_from_text(rng: random.Random, name: str, text: str, doc_freq: Counter) -> list[Question]:
+    questions = []
+    for sentence in _SENTENCE_RE.findall(text):
+        words = _WORD_RE.findall(sentence.lower())
+        if len(words) < 8 or rng.random() > 0.2:
+            continue
+        rare = sorted(set(words), key=lambda w: (doc_freq[w], w))[:_QUERY_WORDS]
+        middle = sentence.strip()
+        start = max(0, (len(middle) - _KEY_CHARS) // 2)
+        questions.append(Question(" ".join(rare), name, middle[start:start + _KEY_CHARS]))
+    return questions
+
+
+def load_documents(directory: Path) -> dict[str, str]:
+    """``data/documents`` dagi matnli hujjatlar (bo'lmasa bo'sh)."""
+    if not directory.is_dir():
+        return {}
+    return {
+        path.name: path.read_text(encoding="utf-8", errors="ignore")
+        for path in sorted(directory.rglob("*"))
+        if path.suffix.lower() in _DOCUMENT_SUFFIXES and path.is_file()
+    }
+
+
+def build_corpus(
+    target_chunks: int,
+    count_chunks: Callable[[str], int],
+    questions: int,
+    seed: int = 0,
+    documents_dir: Path | None = None,
+) -> Corpus:
+    """Kamida ``target_chunks`` bo'lakli korpus va ``questions`` ta savol.
+
+    Args:
+        target_chunks: Kerakli bo'laklar soni (1k / 10k / 100k)
+        count_chunks: Matn nechta bo'lakka bo'linishini hisoblash (``_chunk_text``)
+        questions: Savollar soni
+        seed: Takrorlanuvchanlik uchun
+        documents_dir: Haqiqiy hujjatlar katalogi (yetmasa sintetik bilan to'ldiriladi)
+    """
+    rng = random.Random(seed)
+    documents: dict[str, str] = {}
+    labeled: list[Question] = []
+    chunks = 0
+    origin = "synthetic"
+
+    real = load_documents(documents_dir) if documents_dir else {}
+    if real:
+        origin = "documents+synthetic"
+        doc_freq = Counter(w for text in real.values() for w in set(_WORD_RE.findall(text.lower())))
+        for name, text in real.items():
+            if chunks >= target_chunks:
+                break
+            documents[name] = text
+            chunks += count_chunks(text)
+            labeled.extend(_questions_from_text(rng, name, text, doc_freq))
+
+    vocabulary = [_pseudo_word(rng) for _ in range(_FILLER_WORDS)]
+    # Zipf taqsimoti — tabiiy tildagidek bir nechta so'z juda tez-tez uchraydi
+    weights = [1.0 / (rank + 1) for rank in range(len(vocabulary))]
+    index = 0
+    while chunks < target_chunks:
+        name = f"doc_{index:06d}.txt"
+        text, facts = _synthetic_document(rng, vocabulary, weights, name)
+        documents[name] = text
+        labeled.extend(facts)
+        chunks += count_chunks(text)
+        index += 1
+
+    rng.shuffle(labeled)
+    return Corpus(documents, labeled[:questions], origin)
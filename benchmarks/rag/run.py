@@ -0,0 +1,147 @@
+"""
+RAG benchmarki — retrieval sifati, indekslash tezligi va qidiruv kechikishi.
+
+Ishlatish:
+    python benchmarks/rag/run.py [--sizes 1000 10000 100000] [--backend numpy]
+                                 [--questions 300] [--chunk-size 500 --overlap 50]
+                                 [--json natija.json]
+
+Har bir o'lcham uchun vaqtinchalik katalogda korpus (``data/documents`` +
+sintetik to'ldirish) fayllarga yoziladi, ``RAGEngine.ingest_directory``
+bilan indekslanadi va belgilangan savollar ``RAGEngine.query`` orqali
+beriladi. Hisobot: recall@1/5/10, MRR@10, indekslash tezligi (bo'lak/s),
+diskdagi indeks hajmi, p50/p95/p99 kechikish.
+
+Embedding — oflayn ``HashingEmbedder`` (model yuklanmaydi, tarmoq kerak
+emas), shuning uchun CI da ham ishlaydi. ``--backend``: ``numpy`` (o'rnatilgan
+IVF), ``chroma`` yoki ``none`` (kalit so'z bo'yicha fallback).
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(_ROOT))
+
+import core.rag as rag_module  # noqa: E402
+from core.embeddings import HashingEmbedder  # noqa: E402
+from core.rag import RAGEngine  # noqa: E402
+from core.vector_store import get_vector_store_manager  # noqa: E402
+
+from corpus import Question, build_corpus  # noqa: E402
+
+_RECALL_AT = (1, 5, 10)
+_BACKENDS = {"numpy": "numpy", "chroma": "chroma", "none": "none"}
+
+
+def _percentile(ordered: list[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def _dir_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def _first_relevant(results: list[dict], question: Question) -> int:
+    """Birinchi mos bo'lakning o'rni (1 dan), topilmasa 0."""
+    for rank, item in enumerate(results, 1):
+        if Path(item["source"]).name == question.source and question.key in item["content"]:
+            return rank
+    return 0
+
+
+def run(size: int, args: argparse.Namespace) -> dict:
+    chunker = functools.partial(rag_module._chunk_text, chunk_size=args.chunk_size, overlap=args.overlap)
+    corpus = build_corpus(
+        size,
+        lambda text: len(chunker(text)),
+        args.questions,
+        seed=args.seed,
+        documents_dir=None if args.synthetic_only else _ROOT / "data" / "documents",
+    )
+    with tempfile.TemporaryDirectory() as workdir:
+        docs_dir = Path(workdir) / "docs"
+        docs_dir.mkdir()
+        for name, text in corpus.documents.items():
+            (docs_dir / name).write_text(text, encoding="utf-8")
+
+        persist_dir = Path(workdir) / "index"
+        get_vector_store_manager(str(persist_dir), backend=args.backend, embedding_function=HashingEmbedder())
+        os.environ["JARVIS_VECTOR_BACKEND"] = args.backend
+        original_chunker = rag_module._chunk_text
+        rag_module._chunk_text = chunker
+        try:
+            engine = RAGEngine(persist_dir=str(persist_dir))
+            started = time.perf_counter()
+            chunks = engine.ingest_directory(str(docs_dir))
+            ingest_s = time.perf_counter() - started
+        finally:
+            rag_module._chunk_text = original_chunker
+
+        latencies, ranks = [], []
+        for question in corpus.questions:
+            started = time.perf_counter()
+            results = engine.query(question.text, k=max(_RECALL_AT))
+            latencies.append((time.perf_counter() - started) * 1000)
+            ranks.append(_first_relevant(results, question))
+        disk = _dir_size(persist_dir) if persist_dir.exists() else 0
+        backend = engine.get_stats()["backend"]
+
+    latencies.sort()
+    n = len(ranks) or 1
+    return {
+        "size": size,
+        "chunks": chunks,
+        "backend": backend,
+        "corpus": corpus.origin,
+        "questions": len(ranks),
+        **{f"recall@{k}": round(sum(0 < r <= k for r in ranks) / n, 4) for k in _RECALL_AT},
+        "mrr@10": round(sum(1 / r for r in ranks if r) / n, 4),
+        "ingest_chunks_per_s": round(chunks / ingest_s, 1) if ingest_s else 0.0,
+        "disk_mb": round(disk / 2**20, 2),
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p95_ms": round(_percentile(latencies, 0.95), 3),
+        "p99_ms": round(_percentile(latencies, 0.99), 3),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 10_000, 100_000])
+    ap.add_argument("--backend", choices=sorted(_BACKENDS), default="numpy")
+    ap.add_argument("--questions", type=int, default=300)
+    ap.add_argument("--chunk-size", type=int, default=rag_module._CHUNK_SIZE)
+    ap.add_argument("--overlap", type=int, default=rag_module._CHUNK_OVERLAP)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--synthetic-only", action="store_true", help="data/documents ni ishlatmaslik")
+    ap.add_argument("--json", type=Path, help="natijalarni JSON faylga yozish")
+    args = ap.parse_args()
+
+    print(
+        f"{'chunks':>8} {'backend':>9} {'R@1':>6} {'R@5':>6} {'R@10':>6} {'MRR':>6} "
+        f"{'ingest/s':>9} {'disk':>8} {'p50':>8} {'p95':>8} {'p99':>8}"
+    )
+    results = []
+    for size in args.sizes:
+        r = run(size, args)
+        results.append(r)
+        print(
+            f"{r['chunks']:>8} {r['backend']:>9} {r['recall@1']:>6.3f} {r['recall@5']:>6.3f} "
+            f"{r['recall@10']:>6.3f} {r['mrr@10']:>6.3f} {r['ingest_chunks_per_s']:>9.0f} "
+            f"{r['disk_mb']:>6.1f}MB {r['p50_ms']:>6.2f}ms {r['p95_ms']:>6.2f}ms {r['p99_ms']:>6.2f}ms"
+        )
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Jarvis ishga tushish vaqti benchmarki — ``python -X importtime`` asosida.
+
+Ishlatish:
+    python benchmarks/startup_bench.py [--runs 5] [--top 15] [--budget-ms 150]
+
+Har bir o'lchov yangi jarayonda: ``core.jarvis`` import qilinadi va
+``Jarvis()`` yaratiladi. ``-X importtime`` chiqishidan eng qimmat modullar
+(kumulyativ vaqt bo'yicha) ko'rsatiladi. Maqsad: import + yaratish
+``--budget-ms`` dan oshmasligi; oshsa chiqish kodi 1.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parent.parent
+
+_SCRIPT = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+t0 = time.perf_counter()
+from core.jarvis import Jarvis
+t1 = time.perf_counter()
+Jarvis()
+t2 = time.perf_counter()
+heavy = [m for m in ("chromadb", "pydantic", "whisper", "asyncio", "core.rag", "core.intent_parser")
+         if m in sys.modules]
+print(json.dumps({{"import_ms": (t1 - t0) * 1000, "init_ms": (t2 - t1) * 1000, "loaded": heavy}}))
+"""
+
+
+def measure_once() -> tuple[dict, list[tuple[str, int]]]:
+    """Bitta yangi jarayonda o'lchash: (vaqtlar, [(modul, kumulyativ_us)])."""
+    with tempfile.TemporaryDirectory() as workdir:
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", _SCRIPT.format(root=str(_ROOT))],
+            capture_output=True,
+            text=True,
+            cwd=workdir,
+            env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+            check=True,
+        )
+    stats = json.loads(proc.stdout.strip().splitlines()[-1])
+    modules = []
+    for line in proc.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        modules.append((name.strip(), int(cumulative)))
+    return stats, modules
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--top", type=int, default=15, help="ko'rsatiladigan modullar soni")
+    ap.add_argument("--budget-ms", type=float, default=150.0, help="import + Jarvis() uchun maqsad")
+    args = ap.parse_args()
+
+    imports, inits, last_modules, loaded = [], [], [], []
+    for _ in range(args.runs):
+        stats, last_modules = measure_once()
+        imports.append(stats["import_ms"])
+        inits.append(stats["init_ms"])
+        loaded = stats["loaded"]
+
+    total = statistics.median(imports) + statistics.median(inits)
+    print(f"import core.jarvis: {statistics.median(imports):7.1f}ms (median, {args.runs} run)")
+    print(f"Jarvis():           {statistics.median(inits):7.1f}ms")
+    print(f"jami:               {total:7.1f}ms  (maqsad {args.budget_ms:.0f}ms)")
+    print(f"yuklangan og'ir modullar: {', '.join(loaded) or 'yo`q'}")
+    print(f"\n{'cumulative':>12}  modul")
+    for name, cumulative in sorted(last_modules, key=lambda m: -m[1])[: args.top]:
+        print(f"{cumulative / 1000:>10.1f}ms  {name}")
+
+    if total > args.budget_ms:
+        print(f"\nMaqsaddan {total - args.budget_ms:.1f}ms oshdi")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
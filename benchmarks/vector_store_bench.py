@@ -0,0 +1,90 @@
+"""
+O'rnatilgan NumPy vektor ombori benchmarki — top-k kechikishi va recall.
+
+Ishlatish:
+    python benchmarks/vector_store_bench.py [--sizes 10000 100000] [--dim 384] [--queries 200]
+
+Sintetik klasterlangan vektorlar (embedding modellariga o'xshash taqsimot)
+``NumpyVectorStore`` ga partiyalab qo'shiladi, so'ng tasodifiy so'rovlar
+uchun IVF natijasi aniq (brute-force) top-k bilan solishtiriladi.
+Maqsad: 100k+ vektorda top-k qidiruv < 10 ms.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np  # noqa: E402
+
+from core.vector_index import NumpyVectorStore  # noqa: E402
+
+_BATCH = 2000
+_TOPICS = 500
+
+
+def make_vectors(n: int, topics: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Mavzular atrofida to'plangan, normallangan vektorlar."""
+    dim = topics.shape[1]
+    labels = rng.integers(0, _TOPICS, n)
+    vectors = topics[labels] + 0.6 * rng.standard_normal((n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def run(n: int, dim: int, queries: int, k: int) -> None:
+    rng = np.random.default_rng(n)
+    topics = rng.standard_normal((_TOPICS, dim)).astype(np.float32)
+    vectors = make_vectors(n, topics, rng)
+    with tempfile.TemporaryDirectory() as workdir:
+        store = NumpyVectorStore(Path(workdir) / "bench")
+        started = time.perf_counter()
+        for start in range(0, n, _BATCH):
+            block = vectors[start:start + _BATCH]
+            ids = [str(i) for i in range(start, start + len(block))]
+            metas = [{"lang": "uz" if i % 2 else "en"} for i in range(start, start + len(block))]
+            store.add([""] * len(block), metas, ids, embeddings=block)
+        add_s = time.perf_counter() - started
+
+        # So'rovlar ham shu mavzulardan (hujjatlarga o'xshash savollar)
+        probes = make_vectors(queries, topics, rng)
+        times, filtered_times, recalls = [], [], []
+        for q in probes:
+            started = time.perf_counter()
+            hits = store.query(["q"], k=k, query_embeddings=[q])[0]
+            times.append((time.perf_counter() - started) * 1000)
+            started = time.perf_counter()
+            store.query(["q"], k=k, query_embeddings=[q], where={"lang": "uz"})
+            filtered_times.append((time.perf_counter() - started) * 1000)
+            exact = set(np.argpartition(-(vectors @ q), k)[:k].astype(str))
+            recalls.append(len(exact & {h["id"] for h in hits}) / k)
+        stats = store.stats()
+        store.close()
+
+    times.sort()
+    print(
+        f"{n:>8} {add_s:>8.1f}s {stats['nlist']:>6} {statistics.median(times):>8.2f}ms "
+        f"{times[int(len(times) * 0.95)]:>8.2f}ms {statistics.median(filtered_times):>9.2f}ms "
+        f"{statistics.mean(recalls):>8.3f}"
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    ap.add_argument("--dim", type=int, default=384)
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("-k", type=int, default=5)
+    args = ap.parse_args()
+    print(f"{'n':>8} {'add':>9} {'nlist':>6} {'median':>10} {'p95':>10} {'filtered':>11} {'recall':>8}")
+    for n in args.sizes:
+        run(n, args.dim, args.queries, args.k)
+
+
+if __name__ == "__main__":
+    main()
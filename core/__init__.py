@@ -1,61 +1,61 @@
-from .ai_router import AIRouter
-from .education import SmartEducation
-from .modes import ModeManager
-from .language import LanguageDetector
-from .memory import MemoryManager
-from .tools import ToolRegistry
-from .rag import RAGEngine
-from .jarvis import Jarvis
+# Submodullar birinchi murojaatda import qilinadi (PEP 562): ``import core``
+# yoki ``from core.jarvis import Jarvis`` paketning boshqa modullarini
+# (pydantic, asyncio, ChromaDB ...) yuklamaydi.
+from importlib import import_module
 
-try:
-    from .auto_mode import AutoModeSwitcher
-except Exception:
-    AutoModeSwitcher = None  # type: ignore[assignment,misc]
+_EXPORTS = {
+    "AIRouter": ".ai_router",
+    "SmartEducation": ".education",
+    "ModeManager": ".modes",
+    "LanguageDetector": ".language",
+    "MemoryManager": ".memory",
+    "ToolRegistry": ".tools",
+    "RAGEngine": ".rag",
+    "Jarvis": ".jarvis",
+    "AutoModeSwitcher": ".auto_mode",
+    "CalendarSystem": ".calendar_system",
+    "ClassAutomation": ".class_automation",
+    "EnergyTracker": ".energy_tracker",
+    "ExpenseTracker": ".expense_tracker",
+    "IntentParser": ".intent_parser",
+    "SmartFeatures": ".smart_features",
+    "UIRenderer": ".ui_renderer",
+    "VoiceEngine": ".voice",
+    "TelegramBot": ".telegram_bot",
+}
 
-try:
-    from .calendar_system import CalendarSystem
-except Exception:
-    CalendarSystem = None  # type: ignore[assignment,misc]
-
-try:
-    from .class_automation import ClassAutomation
-except Exception:
-    ClassAutomation = None  # type: ignore[assignment,misc]
-
-try:
-    from .energy_tracker import EnergyTracker
-except Exception:
-    EnergyTracker = None  # type: ignore[assignment,misc]
-
-try:
-    from .expense_tracker import ExpenseTracker
-except Exception:
-    ExpenseTracker = None  # type: ignore[assignment,misc]
+# Yuklab bo'lmasa None qaytariladigan (ixtiyoriy) modullar
+_OPTIONAL = {
+    "AutoModeSwitcher",
+    "CalendarSystem",
+    "ClassAutomation",
+    "EnergyTracker",
+    "ExpenseTracker",
+    "IntentParser",
+    "SmartFeatures",
+    "UIRenderer",
+    "VoiceEngine",
+    "TelegramBot",
+}
 
-try:
-    from .intent_parser import IntentParser
-except Exception:
-    IntentParser = None  # type: ignore[assignment,misc]
 
-try:
-    from .smart_features import SmartFeatures
-except Exception:
-    SmartFeatures = None  # type: ignore[assignment,misc]
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        value = getattr(import_module(module_name, __name__), name)
+    except Exception:
+        if name not in _OPTIONAL:
+            raise
+        value = None
+    globals()[name] = value
+    return value
 
-try:
-    from .ui_renderer import UIRenderer
-except Exception:
-    UIRenderer = None  # type: ignore[assignment,misc]
 
-try:
-    from .voice import VoiceEngine
-except Exception:
-    VoiceEngine = None  # type: ignore[assignment,misc]
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
 
-try:
-    from .telegram_bot import TelegramBot
-except Exception:
-    TelegramBot = None  # type: ignore[assignment,misc]
 
 __all__ = [
     "AIRouter",
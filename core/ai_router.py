@@ -7,8 +7,9 @@ from __future__ import annotations
 
 import json
 import os
+import time
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 try:
     from openai import OpenAI  # type: ignore
@@ -17,7 +18,29 @@ try:
 except ImportError:
     _OPENAI_AVAILABLE = False
 
+from .metrics import get_registry
+from .retrieval import estimate_tokens
+from .tracing import get_tracer
+
 _CONFIG_PATH = Path(__file__).parent.parent / "config" / "models.json"
+_MOCK_ENV = "JARVIS_MOCK_PROVIDER"  # core.mock_provider.MOCK_ENV
+
+_METRICS = get_registry()
+_PROVIDER_REQUESTS = _METRICS.counter(
+    "jarvis_provider_requests_total", "AI provayderga urinishlar", ["provider", "outcome"]
+)
+_PROVIDER_ERRORS = _METRICS.counter(
+    "jarvis_provider_errors_total", "Provayder xatolari turi bo'yicha", ["provider", "type"]
+)
+_PROVIDER_FALLBACKS = _METRICS.counter(
+    "jarvis_provider_fallbacks_total", "Xato sababli keyingi provayderga o'tishlar", ["provider"]
+)
+_PROVIDER_TOKENS = _METRICS.counter(
+    "jarvis_provider_tokens_total", "Kiruvchi/chiquvchi tokenlar", ["provider", "direction"]
+)
+_PROVIDER_LATENCY = _METRICS.histogram(
+    "jarvis_provider_latency_seconds", "Provayder javobi vaqti", ["provider"]
+)
 
 _DEFAULT_CONFIG: dict = {
     "providers": {
@@ -92,6 +115,26 @@ _DEFAULT_CONFIG: dict = {
                 ],
             },
         },
+        "mock": {
+            "kind": "mock",
+            "base_url": "mock://local",
+            "models": {
+                "fast": "mock-fast",
+                "code": "mock-code",
+                "pro": "mock-pro",
+                "all": ["mock-fast", "mock-code", "mock-pro"],
+            },
+            "mock": {
+                "latency_ms": {"distribution": "lognormal", "median": 400, "p95": 1200},
+                "tokens_per_s": 60,
+                "reply_tokens": [40, 160],
+                "error_rate": 0.0,
+                "errors": ["rate_limit", "server", "timeout"],
+                "stream_error_rate": 0.0,
+                "time_scale": 1.0,
+                "seed": None,
+            },
+        },
     },
     "default_provider": "gemini",
     "fallback_order": ["gemini", "deepseek", "openrouter", "groq", "huggingface"],
@@ -119,8 +162,16 @@ class AIRouter:
             "groq": os.getenv("GROQ_API_KEY"),
             "huggingface": os.getenv("HUGGINGFACE_API_KEY"),
         }
+        # Soxta provayderlar (core.mock_provider) kalit talab qilmaydi —
+        # JARVIS_MOCK_PROVIDER o'rnatilganda yoqiladi
+        mock_enabled = os.getenv(_MOCK_ENV, "").lower() not in ("", "0", "false")
+        for name, cfg in self._config["providers"].items():
+            if cfg.get("kind") == "mock":
+                self._api_keys[name] = "mock" if mock_enabled else None
         self._forced_provider: Optional[str] = None
         self._forced_model: Optional[str] = None
+        # Provayder bo'yicha client keshi — barcha sessiyalar uchun umumiy
+        self._clients: dict[str, Any] = {}
 
     def set_provider(self, name: str) -> None:
         """Foydalanuvchi tomonidan provayderni tanlash.
@@ -129,10 +180,14 @@ class AIRouter:
         fallback QILINMAYDI. Avtomatik rejimga qaytish uchun reset_auto() ishlating.
         Agar provayder nomi noto'g'ri bo'lsa, ValueError ko'tariladi.
         """
+        self.validate_provider(name)
+        self._forced_provider = name
+
+    def validate_provider(self, name: str) -> None:
+        """Provayder nomini tekshirish. Noto'g'ri bo'lsa ValueError ko'tariladi."""
         if name not in self._config["providers"]:
             available = ", ".join(self._config["providers"].keys())
             raise ValueError(f"Noto'g'ri provayder: '{name}'. Mavjud: {available}")
-        self._forced_provider = name
 
     def set_model(self, model_name: str) -> None:
         """Foydalanuvchi tomonidan aniq modelni tanlash (override sifatida)."""
@@ -188,18 +243,31 @@ class AIRouter:
         return "\n".join(lines)
 
     def _get_client(self, provider: str) -> Any:
-        """Berilgan provayder uchun OpenAI-compatible client yaratish."""
-        if not _OPENAI_AVAILABLE:
-            raise ImportError("openai kutubxonasi o'rnatilmagan: pip install openai")
+        """Berilgan provayder uchun OpenAI-compatible client (keshlangan)."""
+        client = self._clients.get(provider)
+        if client is not None:
+            return client
 
         provider_config = self._config["providers"].get(provider, {})
         base_url = provider_config.get("base_url", "")
+        if provider_config.get("kind") == "mock" and base_url.startswith("mock://"):
+            from .mock_provider import MockOpenAIClient
+
+            client = MockOpenAIClient(provider_config.get("mock"))
+            self._clients[provider] = client
+            return client
+
+        if not _OPENAI_AVAILABLE:
+            raise ImportError("openai kutubxonasi o'rnatilmagan: pip install openai")
+
         api_key = self._api_keys.get(provider, "")
 
         if not api_key:
             raise ValueError(f"{provider.upper()} API kaliti o'rnatilmagan")
 
-        return OpenAI(api_key=api_key, base_url=base_url)
+        client = OpenAI(api_key=api_key, base_url=base_url)
+        self._clients[provider] = client
+        return client
 
     def _select_model(self, provider: str, mode: str, model_override: Optional[str] = None) -> str:
         """Rejim va provayderga qarab modelni tanlash."""
@@ -217,12 +285,15 @@ class AIRouter:
         model: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: int = 2048,
+        provider: Optional[str] = None,
+        on_token: Optional[Callable[[str], None]] = None,
     ) -> str:
         """So'rovni mos provayderga yo'naltirish.
 
-        Agar _forced_provider o'rnatilgan bo'lsa — faqat shu providerni ishlatish
-        (fallback QILMASLIK). Agar _forced_model o'rnatilgan bo'lsa — shu modelni
-        ishlatish. Aks holda — fallback_order bilan ishlash.
+        Agar provider (yoki _forced_provider) o'rnatilgan bo'lsa — faqat shu
+        providerni ishlatish (fallback QILMASLIK). Agar model (yoki _forced_model)
+        o'rnatilgan bo'lsa — shu modelni ishlatish. Aks holda — fallback_order
+        bilan ishlash.
 
         Args:
             messages: OpenAI-format xabarlar ro'yxati
@@ -230,45 +301,53 @@ class AIRouter:
             model: Model override (ixtiyoriy)
             temperature: Temperatura parametri
             max_tokens: Maksimal tokenlar soni
+            provider: Majburiy provayder (ixtiyoriy, sessiya darajasidagi tanlov)
+            on_token: Berilsa javob oqim (stream) rejimida olinadi va har bir
+                bo'lak shu funksiyaga uzatiladi
 
         Returns:
             AI javobi matni
         """
         effective_model = model or self._forced_model
+        forced_provider = provider or self._forced_provider
+        tracer = get_tracer()
 
         # Majburiy provayder tanlangan bo'lsa — faqat shuni ishlatish
-        if self._forced_provider:
-            provider = self._forced_provider
+        if forced_provider:
+            provider = forced_provider
             api_key = self._api_keys.get(provider)
             if not api_key:
                 raise RuntimeError(
                     f"'{provider}' provayderining API kaliti o'rnatilmagan. "
                     f"Avtomatik rejimga qaytish uchun /auto buyrug'ini ishlating."
                 )
-            client = self._get_client(provider)
             selected_model = self._select_model(provider, mode, effective_model)
             if not selected_model:
                 raise RuntimeError(
                     f"'{provider}' provayderida '{mode}' rejimi uchun model topilmadi."
                 )
             try:
-                response = client.chat.completions.create(
-                    model=selected_model,
-                    messages=messages,
-                    temperature=temperature,
-                    max_tokens=max_tokens,
+                response = self._attempt(
+                    provider, selected_model, messages, temperature, max_tokens, on_token
                 )
-                return response.choices[0].message.content or ""
             except Exception as exc:
                 raise RuntimeError(
                     f"'{provider}' provayderida '{selected_model}' modeli bilan xato: {exc}"
                 ) from exc
+            tracer.annotate(provider=provider, model=selected_model, attempts=1)
+            return response
 
         # Avtomatik rejim — fallback_order bo'yicha
         fallback_order: list[str] = self._config.get(
             "fallback_order", ["gemini", "deepseek", "openrouter", "groq", "huggingface"]
         )
         last_error: Optional[Exception] = None
+        streamed = [False]
+        attempts = 0
+
+        def _on_token(delta: str) -> None:
+            streamed[0] = True
+            on_token(delta)  # type: ignore[misc]
 
         for provider in fallback_order:
             api_key = self._api_keys.get(provider)
@@ -276,21 +355,28 @@ class AIRouter:
                 continue
 
             try:
-                client = self._get_client(provider)
                 selected_model = self._select_model(provider, mode, effective_model)
 
                 if not selected_model:
                     continue
 
-                response = client.chat.completions.create(
-                    model=selected_model,
-                    messages=messages,
-                    temperature=temperature,
-                    max_tokens=max_tokens,
+                attempts += 1
+                response = self._attempt(
+                    provider,
+                    selected_model,
+                    messages,
+                    temperature,
+                    max_tokens,
+                    _on_token if on_token else None,
                 )
-                return response.choices[0].message.content or ""
+                tracer.annotate(provider=provider, model=selected_model, attempts=attempts)
+                return response
 
             except Exception as exc:
+                # Mijozga bo'laklar yuborib bo'lingan bo'lsa — fallback mumkin emas
+                if streamed[0]:
+                    raise RuntimeError(f"'{provider}' oqimi uzildi: {exc}") from exc
+                _PROVIDER_FALLBACKS.labels(provider).inc()
                 last_error = exc
                 continue
 
@@ -306,6 +392,90 @@ class AIRouter:
             "yoki HUGGINGFACE_API_KEY."
         )
 
+    def _attempt(
+        self,
+        provider: str,
+        model: str,
+        messages: list[dict],
+        temperature: float,
+        max_tokens: int,
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """Bitta provayder urinishi — trace span va metrikalar bilan."""
+        started = time.perf_counter()
+        with get_tracer().span("provider_attempt", provider=provider, model=model) as span:
+            try:
+                client = self._get_client(provider)
+                text, usage = self._complete(
+                    client, model, messages, temperature, max_tokens, on_token
+                )
+            except Exception as exc:
+                _PROVIDER_REQUESTS.labels(provider, "error").inc()
+                _PROVIDER_ERRORS.labels(provider, type(exc).__name__).inc()
+                raise
+            finally:
+                _PROVIDER_LATENCY.labels(provider).observe(time.perf_counter() - started)
+            if usage is not None:
+                tokens_in, tokens_out = usage
+            else:
+                # Oqim rejimida usage kelmaydi — taxminiy hisob
+                tokens_in = sum(estimate_tokens(m.get("content") or "") for m in messages)
+                tokens_out = estimate_tokens(text)
+            span.set(tokens_in=tokens_in, tokens_out=tokens_out)
+        _PROVIDER_REQUESTS.labels(provider, "ok").inc()
+        _PROVIDER_TOKENS.labels(provider, "in").inc(tokens_in)
+        _PROVIDER_TOKENS.labels(provider, "out").inc(tokens_out)
+        return text
+
+    @staticmethod
+    def _complete(
+        client: Any,
+        model: str,
+        messages: list[dict],
+        temperature: float,
+        max_tokens: int,
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> tuple[str, Optional[tuple[int, int]]]:
+        """Bitta chat completion chaqiruvi (on_token berilsa — oqim rejimida).
+
+        Returns:
+            (javob matni, (kiruvchi, chiquvchi) tokenlar yoki None)
+        """
+        span = get_tracer().current_span()
+        if on_token is None:
+            response = client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+            usage = getattr(response, "usage", None)
+            tokens = (
+                (usage.prompt_tokens or 0, usage.completion_tokens or 0) if usage is not None else None
+            )
+            return response.choices[0].message.content or "", tokens
+
+        parts: list[str] = []
+        started = time.perf_counter()
+        stream = client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+        )
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content or ""
+            if delta:
+                if not parts:
+                    span.set(first_token_ms=round((time.perf_counter() - started) * 1000, 1))
+                parts.append(delta)
+                on_token(delta)
+        span.set(chunks=len(parts))
+        return "".join(parts), None
+
     def get_available_providers(self) -> list[str]:
         """API kaliti mavjud provayderlar ro'yxati."""
         return [p for p, key in self._api_keys.items() if key]
@@ -4,6 +4,8 @@ Foydalanuvchi kiritishiga qarab rejimni avtomatik tanlash.
 """
 from __future__ import annotations
 
+from .text_features import analyze
+
 
 class AutoModeSwitcher:
     """Kiritishga qarab rejimni avtomatik aniqlash."""
@@ -37,25 +39,8 @@ class AutoModeSwitcher:
 
         Default: "fast"
         """
-        text_lower = text.lower()
-
-        # Code mode
-        for kw in self._CODE_KEYWORDS:
-            if kw in text_lower:
-                return "code"
-
-        # Study mode
-        for kw in self._STUDY_KEYWORDS:
-            if kw in text_lower:
-                return "study"
-
-        # Pro mode
-        for kw in self._PRO_KEYWORDS:
-            if kw in text_lower:
-                return "pro"
-
-        # Default
-        return "fast"
+        # Kalit so'zlar ustuvorligi: code > study > pro (umumiy tahlildan)
+        return analyze(text).mode
 
     def should_switch(self, current_mode: str, detected_mode: str) -> bool:
         """Rejim almashtirilishi kerakmi?"""
@@ -0,0 +1,430 @@
+"""
+DateParser — o'zbek, ingliz va rus tillaridagi sana/vaqt iboralarini tahlil qilish.
+
+Nisbiy ("3 kundan keyin", "in 2 hours", "через час"), kun nomlari ("ertaga",
+"next friday", "в пятницу"), mutlaq sanalar ("2026-03-02", "5 mart",
+"october 20") va vaqtlar ("soat 3 da", "5pm", "в 17:00") qo'llab-quvvatlanadi.
+Natija har doim ``Asia/Tashkent`` vaqt zonasidagi datetime. Kiritish vaqtida
+bir marta normallashtiriladi; saqlangan muddat satrlari uchun ``parse_deadline``
+keshlangan.
+
+Aniq bo'lmagan soatlar: "soat 3" kabi 1..7 oralig'idagi soatlar kunduzgi
+(15:00) deb olinadi, agar am/pm yoki "ertalab" ko'rsatilmagan bo'lsa.
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from functools import lru_cache
+from typing import Optional
+
+from .metrics import get_registry, lru_cache_collector
+
+try:
+    from zoneinfo import ZoneInfo
+
+    TASHKENT_TZ: tzinfo = ZoneInfo("Asia/Tashkent")
+except Exception:
+    # tzdata yo'q bo'lsa (Windows) — Toshkentda 1992 yildan beri yozgi vaqt yo'q
+    TASHKENT_TZ = timezone(timedelta(hours=5))
+
+_CACHE_SIZE = 1024
+_DEADLINE_CACHE_SIZE = 4096
+_PM_GUESS_MAX_HOUR = 7  # "soat 3" → 15:00
+
+_APOSTROPHES = str.maketrans({"ʻ": "'", "ʼ": "'", "‘": "'", "’": "'", "`": "'"})
+
+_NUMBER_WORDS: dict[str, float] = {
+    # o'zbek
+    "bir": 1, "ikki": 2, "uch": 3, "to'rt": 4, "besh": 5, "olti": 6,
+    "yetti": 7, "sakkiz": 8, "to'qqiz": 9, "o'n": 10, "yarim": 0.5,
+    # ingliz
+    "a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10, "half an": 0.5,
+    "half a": 0.5,
+    # rus
+    "один": 1, "одну": 1, "два": 2, "две": 2, "три": 3, "четыре": 4,
+    "пять": 5, "шесть": 6, "семь": 7, "восемь": 8, "девять": 9, "десять": 10,
+}
+_NUM = r"(?P<n>\d+|" + "|".join(
+    re.escape(w) for w in sorted(_NUMBER_WORDS, key=len, reverse=True)
+) + ")"
+
+# Birlik → (daqiqalar, kunlar)
+_UNITS: list[tuple[str, tuple[int, int]]] = [
+    (r"daqiqa|minut|minutes?|mins?|минут[уы]?", (1, 0)),
+    (r"soat|hours?|hrs?|час(?:а|ов)?", (60, 0)),
+    (r"kun|days?|день|дня|дней", (0, 1)),
+    (r"hafta|weeks?|недел[юиь]", (0, 7)),
+    (r"oy|months?|месяц(?:а|ев)?", (0, 30)),
+]
+_UNIT_ALT = "|".join(f"(?P<u{i}>{p})" for i, (p, _) in enumerate(_UNITS))
+
+_RELATIVE_RES = [
+    # 3 kundan keyin, yarim soatdan so'ng, soatdan keyin
+    re.compile(rf"\b(?:{_NUM}\s*)?(?:{_UNIT_ALT})(?:dan)?\s+(?:keyin|so'ng)\b"),
+    # in 2 hours, in an hour, in half an hour
+    re.compile(rf"\bin\s+{_NUM}\s+(?:{_UNIT_ALT})\b"),
+    # через час, через 2 дня, через полчаса
+    re.compile(rf"\bчерез\s+(?:(?P<half>пол)|{_NUM}\s+)?(?:{_UNIT_ALT})\b"),
+]
+
+_RELATIVE_DAYS: dict[str, int] = {
+    "bugun": 0, "ertaga": 1, "indinga": 2, "kecha": -1,
+    "бугун": 0, "эртага": 1, "индинга": 2,
+    "today": 0, "tonight": 0, "tomorrow": 1, "day after tomorrow": 2, "yesterday": -1,
+    "сегодня": 0, "завтра": 1, "послезавтра": 2, "вчера": -1,
+}
+# Kun qismini ham bildiruvchi nisbiy kunlar: "tonight" — bugun kechqurun
+_RELATIVE_DAYPARTS: dict[str, str] = {"tonight": "evening"}
+_RELATIVE_DAY_RE = re.compile(
+    r"\b(?P<rel>"
+    + "|".join(re.escape(w) for w in sorted(_RELATIVE_DAYS, key=len, reverse=True))
+    + r")\b"
+)
+
+_WEEKDAY_NAMES: dict[str, int] = {
+    "dushanba": 0, "seshanba": 1, "chorshanba": 2, "payshanba": 3,
+    "juma": 4, "shanba": 5, "yakshanba": 6,
+    "душанба": 0, "сешанба": 1, "чоршанба": 2, "пайшанба": 3,
+    "жума": 4, "шанба": 5, "якшанба": 6,
+    "monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3,
+    "friday": 4, "saturday": 5, "sunday": 6,
+    "понедельник": 0, "вторник": 1, "среду": 2, "среда": 2, "четверг": 3,
+    "пятницу": 4, "пятница": 4, "субботу": 5, "суббота": 5, "воскресенье": 6,
+}
+_WEEKDAY_RE = re.compile(
+    r"\b(?:(?P<next>kelasi|keyingi|next|следующ(?:ий|ую|ее|ей))\s+(?:hafta\s+|week\s+)?)?"
+    r"(?:(?:on|this|в|во)\s+)?(?P<wd>"
+    + "|".join(re.escape(w) for w in sorted(_WEEKDAY_NAMES, key=len, reverse=True))
+    + r")(?:\s+kuni)?\b"
+)
+
+_MONTHS: dict[str, int] = {
+    "yanvar": 1, "fevral": 2, "mart": 3, "aprel": 4, "may": 5, "iyun": 6,
+    "iyul": 7, "avgust": 8, "sentabr": 9, "sentyabr": 9, "oktabr": 10,
+    "oktyabr": 10, "noyabr": 11, "dekabr": 12,
+    "january": 1, "february": 2, "march": 3, "april": 4, "june": 6,
+    "july": 7, "august": 8, "september": 9, "october": 10, "november": 11,
+    "december": 12, "jan": 1, "feb": 2, "mar": 3, "apr": 4, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "sept": 9, "oct": 10, "nov": 11, "dec": 12,
+    "января": 1, "февраля": 2, "марта": 3, "апреля": 4, "мая": 5, "июня": 6,
+    "июля": 7, "августа": 8, "сентября": 9, "октября": 10, "ноября": 11,
+    "декабря": 12,
+}
+_MONTH_ALT = "|".join(re.escape(m) for m in sorted(_MONTHS, key=len, reverse=True))
+# "may" inglizcha modal fe'l ham ("I may 3 times try") — oy nomidan keyin
+# kun kelsa, sana faqat oldida sana so'zi yoki kundan keyin chegara bo'lsa olinadi
+_AMBIGUOUS_MONTHS = frozenset({"may"})
+_MONTH_FIRST_ALT = "|".join(
+    re.escape(m) for m in sorted(_MONTHS, key=len, reverse=True) if m not in _AMBIGUOUS_MONTHS
+)
+_AMBIGUOUS_MONTH_ALT = "|".join(re.escape(m) for m in sorted(_AMBIGUOUS_MONTHS))
+_ABSOLUTE_DATE_RES = [
+    re.compile(r"\b(?P<y>\d{4})-(?P<m>\d{1,2})-(?P<d>\d{1,2})\b"),
+    re.compile(r"\b(?P<d>\d{1,2})[./](?P<m>\d{1,2})[./](?P<y>\d{4}|\d{2})\b"),
+    # Yilsiz qisqa shakl faqat ikki xonali ("25.12") — "3.5" kabi sonlar sana emas
+    re.compile(r"\b(?P<d>\d{2})[./](?P<m>\d{2})\b(?![.:/]\d)"),
+    re.compile(rf"\b(?P<d>\d{{1,2}})(?:-|\s+)(?P<mon>{_MONTH_ALT})\b"),
+    re.compile(rf"\b(?P<mon>{_MONTH_FIRST_ALT})\s+(?P<d>\d{{1,2}})\b(?!:)"),
+    # on may 3, by may 3
+    re.compile(
+        rf"\b(?:on|by|until|till|before|after|from|since)\s+"
+        rf"(?P<mon>{_AMBIGUOUS_MONTH_ALT})\s+(?P<d>\d{{1,2}})\b(?!:)"
+    ),
+    # may 3, may 3 at 5pm, may 3 da
+    re.compile(
+        rf"\b(?P<mon>{_AMBIGUOUS_MONTH_ALT})\s+(?P<d>\d{{1,2}})"
+        r"(?=\s*(?:[,.;!?)]|$)|\s+(?:at|soat|da|ga|kuni|gacha)\b)"
+    ),
+]
+
+_DAYPARTS: dict[str, int] = {
+    "ertalab": 9, "tushda": 13, "tushdan keyin": 15, "kechqurun": 19, "kechasi": 22,
+    "эрталаб": 9, "кечқурун": 19,
+    "morning": 9, "noon": 12, "afternoon": 15, "evening": 19, "night": 22,
+    "midnight": 0,
+    "утром": 9, "утра": 9, "днём": 14, "днем": 14, "дня": 14, "вечером": 19,
+    "вечера": 19, "ночью": 23, "ночи": 23,
+}
+# Tun qismlari: "kechasi soat 2", "в 2 часа ночи" — 02:00, "kechasi soat 11" — 23:00
+_NIGHT_DAYPARTS = frozenset({"kechasi", "night", "ночью", "ночи"})
+_NIGHT_AM_MAX_HOUR = 5
+_DAYPART_RE = re.compile(
+    r"\b(?P<part>"
+    + "|".join(re.escape(w) for w in sorted(_DAYPARTS, key=len, reverse=True))
+    + r")\b"
+)
+
+_TIME_RES = [
+    # 5pm, 5:30 pm
+    re.compile(r"\b(?:(?:at|soat|в)\s+)?(?P<h>\d{1,2})(?::(?P<m>[0-5]\d))?\s*(?P<ampm>am|pm)\b"),
+    # soat 3 da, соат 15:30, at 5, в 17:00, в 5 часов
+    re.compile(
+        r"\b(?:soat|соат|at|в)\s+(?P<h>\d{1,2})(?::(?P<m>[0-5]\d))?"
+        r"(?:\s*(?:da|ga|larda|o'clock|час(?:а|ов)?))?\b"
+    ),
+    # 14:30 (da)
+    re.compile(r"\b(?P<h>[01]?\d|2[0-3]):(?P<m>[0-5]\d)(?:\s*(?:da|ga))?\b"),
+    # 5 o'clock
+    re.compile(r"\b(?P<h>\d{1,2})\s*o'clock\b"),
+]
+
+
+class DateTimeMatch:
+    """Matndan topilgan sana/vaqt."""
+
+    __slots__ = ("value", "has_date", "has_time", "spans")
+
+    def __init__(
+        self,
+        value: datetime,
+        has_date: bool,
+        has_time: bool,
+        spans: tuple[tuple[int, int], ...],
+    ) -> None:
+        self.value = value  # Asia/Tashkent vaqt zonasida
+        self.has_date = has_date
+        self.has_time = has_time
+        self.spans = spans  # matndagi ifoda o'rinlari (sarlavhadan olib tashlash uchun)
+
+    @property
+    def date_str(self) -> str:
+        return self.value.strftime("%Y-%m-%d")
+
+    @property
+    def time_str(self) -> str:
+        return self.value.strftime("%H:%M") if self.has_time else ""
+
+    def deadline_str(self) -> str:
+        """Saqlash formati: "YYYY-MM-DD" yoki "YYYY-MM-DD HH:MM"."""
+        return f"{self.date_str} {self.time_str}" if self.has_time else self.date_str
+
+    def strip_from(self, text: str) -> str:
+        """Topilgan ifodalarni matndan olib tashlash."""
+        for start, end in sorted(self.spans, reverse=True):
+            text = text[:start] + " " + text[end:]
+        return " ".join(text.split())
+
+
+def now_tashkent() -> datetime:
+    """Joriy vaqt (Asia/Tashkent)."""
+    return datetime.now(TASHKENT_TZ)
+
+
+def today_tashkent() -> date:
+    """Bugungi sana (Asia/Tashkent)."""
+    return datetime.now(TASHKENT_TZ).date()
+
+
+def parse_datetime(text: str, now: Optional[datetime] = None) -> Optional[DateTimeMatch]:
+    """Matndan sana/vaqt ifodasini topish va normallashtirish.
+
+    Args:
+        text: Erkin matn ("ertaga soat 3 da matematika", "через 2 часа").
+        now: Hisob nuqtasi (None — hozir, Asia/Tashkent).
+
+    Returns:
+        DateTimeMatch yoki None (ifoda topilmasa).
+    """
+    if not text:
+        return None
+    if now is None:
+        now = now_tashkent()
+    elif now.tzinfo is None:
+        now = now.replace(tzinfo=TASHKENT_TZ)
+    else:
+        now = now.astimezone(TASHKENT_TZ)
+    # Daqiqagacha yaxlitlash — bir daqiqa ichidagi takroriy matnlar keshdan olinadi
+    return _parse(text, now.replace(second=0, microsecond=0))
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _parse(text: str, now: datetime) -> Optional[DateTimeMatch]:
+    lower = text.lower().translate(_APOSTROPHES)
+    if len(lower) != len(text):
+        lower = text.translate(_APOSTROPHES)
+    spans: list[tuple[int, int]] = []
+    taken = bytearray(len(lower))
+
+    def claim(match: re.Match) -> bool:
+        start, end = match.span()
+        if any(taken[start:end]):
+            return False
+        taken[start:end] = b"\x01" * (end - start)
+        spans.append((start, end))
+        return True
+
+    value: Optional[datetime] = None
+    target_date: Optional[date] = None
+    has_time = False
+
+    # 1. Nisbiy davomiylik: "3 kundan keyin", "in 2 hours", "через час"
+    for pattern in _RELATIVE_RES:
+        m = pattern.search(lower)
+        if m and claim(m):
+            amount = _amount(m)
+            minutes, days = next(
+                unit for i, (_, unit) in enumerate(_UNITS) if m.group(f"u{i}")
+            )
+            if minutes:
+                value = now + timedelta(minutes=round(amount * minutes))
+                has_time = True
+            else:
+                target_date = now.date() + timedelta(days=round(amount * days))
+            break
+
+    # 2. Mutlaq sana
+    if value is None and target_date is None:
+        for pattern in _ABSOLUTE_DATE_RES:
+            m = pattern.search(lower)
+            if m is None:
+                continue
+            parsed = _absolute_date(m, now.date())
+            if parsed is not None and claim(m):
+                target_date = parsed
+                break
+
+    # 3. Hafta kuni
+    if value is None and target_date is None:
+        m = _WEEKDAY_RE.search(lower)
+        if m and claim(m):
+            weekday = _WEEKDAY_NAMES[m.group("wd")]
+            today = now.date()
+            if m.group("next"):
+                next_monday = today + timedelta(days=7 - today.weekday())
+                target_date = next_monday + timedelta(days=weekday)
+            else:
+                target_date = today + timedelta(days=(weekday - today.weekday()) % 7)
+
+    # 4. Nisbiy kun: bugun, ertaga, завтра
+    relative_daypart: Optional[str] = None
+    if value is None and target_date is None:
+        m = _RELATIVE_DAY_RE.search(lower)
+        if m and claim(m):
+            target_date = now.date() + timedelta(days=_RELATIVE_DAYS[m.group("rel")])
+            relative_daypart = _RELATIVE_DAYPARTS.get(m.group("rel"))
+
+    if value is not None:
+        return DateTimeMatch(value, True, True, tuple(spans))
+
+    # 5. Vaqt va kun qismi (ertalab, kechqurun)
+    daypart_hour: Optional[int] = None
+    night = False
+    m = _DAYPART_RE.search(lower)
+    if m and claim(m):
+        daypart_hour = _DAYPARTS[m.group("part")]
+        night = m.group("part") in _NIGHT_DAYPARTS
+    elif relative_daypart is not None:
+        daypart_hour = _DAYPARTS[relative_daypart]
+
+    clock: Optional[time] = None
+    for pattern in _TIME_RES:
+        m = pattern.search(lower)
+        if m is None:
+            continue
+        parsed_time = _clock(m, daypart_hour, night)
+        if parsed_time is not None and claim(m):
+            clock = parsed_time
+            break
+    if clock is None and daypart_hour is not None:
+        clock = time(daypart_hour, 0)
+    has_time = clock is not None
+
+    if target_date is None and clock is None:
+        return None
+    has_date = target_date is not None
+    if target_date is None:
+        target_date = now.date()
+    result = datetime.combine(target_date, clock or time(0, 0), tzinfo=TASHKENT_TZ)
+    if not has_date and result <= now:
+        # Faqat vaqt berilgan va u o'tib ketgan — ertangi kun
+        result += timedelta(days=1)
+    return DateTimeMatch(result, has_date, has_time, tuple(spans))
+
+
+def _amount(match: re.Match) -> float:
+    if match.groupdict().get("half"):
+        return 0.5
+    raw = match.group("n")
+    if raw is None:
+        return 1.0
+    if raw.isdigit():
+        return float(raw)
+    return float(_NUMBER_WORDS.get(raw, 1))
+
+
+def _absolute_date(match: re.Match, today: date) -> Optional[date]:
+    groups = match.groupdict()
+    try:
+        day = int(groups["d"])
+        month = _MONTHS[groups["mon"]] if groups.get("mon") else int(groups["m"])
+        year_raw = groups.get("y")
+        if year_raw:
+            year = int(year_raw)
+            if year < 100:
+                year += 2000
+            return date(year, month, day)
+        candidate = date(today.year, month, day)
+        # Yil ko'rsatilmagan va sana o'tib ketgan — keyingi yil
+        if candidate < today - timedelta(days=1):
+            candidate = date(today.year + 1, month, day)
+        return candidate
+    except (ValueError, KeyError):
+        return None
+
+
+def _clock(match: re.Match, daypart_hour: Optional[int], night: bool = False) -> Optional[time]:
+    groups = match.groupdict()
+    hour = int(groups["h"])
+    minute = int(groups.get("m") or 0)
+    ampm = groups.get("ampm")
+    if ampm:
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if ampm == "pm" else 0)
+    elif daypart_hour is not None:
+        if daypart_hour >= 12 and hour < 12 and not (night and hour <= _NIGHT_AM_MAX_HOUR):
+            hour += 12
+    elif 1 <= hour <= _PM_GUESS_MAX_HOUR and ":" not in match.group(0):
+        hour += 12
+    if not 0 <= hour <= 23:
+        return None
+    return time(hour, minute)
+
+
+def parse_deadline(value: str) -> Optional[datetime]:
+    """Saqlangan muddat satrini datetime ga aylantirish.
+
+    Tezkor yo'l — ISO formatlar ("YYYY-MM-DD", "YYYY-MM-DD HH:MM"), natijasi
+    keshlanadi. Aks holda tabiiy til ifodasi sifatida tahlil qilinadi
+    ("ertaga" bugungi sanaga bog'liq — bu yo'l keshlanmaydi).
+
+    Returns:
+        Asia/Tashkent vaqt zonasidagi datetime yoki None.
+    """
+    value = value.strip()
+    if not value:
+        return None
+    parsed = _parse_iso_deadline(value)
+    if parsed is not None:
+        return parsed
+    match = parse_datetime(value)
+    return match.value if match else None
+
+
+@lru_cache(maxsize=_DEADLINE_CACHE_SIZE)
+def _parse_iso_deadline(value: str) -> Optional[datetime]:
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=TASHKENT_TZ)
+    return parsed.astimezone(TASHKENT_TZ)
+
+
+_METRICS = get_registry()
+_METRICS.register_collector(lru_cache_collector("date_parser", _parse))
+_METRICS.register_collector(lru_cache_collector("deadline", _parse_iso_deadline))
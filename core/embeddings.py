@@ -0,0 +1,94 @@
+"""
+Embedding funksiyalari — matnlarni vektorga aylantirish.
+
+Tartib: ChromaDB ning standart modeli (all-MiniLM-L6-v2, ONNX) →
+sentence-transformers → kutubxonasiz ``HashingEmbedder``. Oxirgisi
+semantik emas, lekin so'z va harf n-grammlari bo'yicha leksik o'xshashlikni
+ushlaydi va ChromaDB siz deploylarda ham vektor qidiruvni ishlatishga imkon
+beradi.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import zlib
+from typing import Any, Callable
+
+_HASH_DIM = 384
+_CHAR_NGRAM = 3
+_WORD_CACHE_SIZE = 50_000
+_SENTENCE_MODEL = "all-MiniLM-L6-v2"
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+EmbeddingFunction = Callable[[list[str]], list[list[float]]]
+
+
+class HashingEmbedder:
+    """Feature hashing: so'zlar va harf 3-grammlari, ishorali, L2-normallangan.
+
+    So'z bo'yicha hissalar keshlanadi — matnlarda so'zlar ko'p takrorlanadi.
+    """
+
+    def __init__(self, dim: int = _HASH_DIM) -> None:
+        self.dim = dim
+        self._word_cache: dict[str, tuple[tuple[int, float], ...]] = {}
+
+    def _word_features(self, word: str) -> tuple[tuple[int, float], ...]:
+        features = self._word_cache.get(word)
+        if features is None:
+            padded = f" {word} ".encode("utf-8")
+            keys = [b"w:" + padded] + [
+                b"c:" + padded[i:i + _CHAR_NGRAM] for i in range(len(padded) - _CHAR_NGRAM + 1)
+            ]
+            features = tuple(
+                (h % self.dim, (2.0 if n == 0 else 1.0) * (1 if h & 0x80000000 else -1))
+                for n, h in enumerate(zlib.crc32(key) for key in keys)
+            )
+            if len(self._word_cache) >= _WORD_CACHE_SIZE:
+                self._word_cache.clear()
+            self._word_cache[word] = features
+        return features
+
+    def embed_one(self, text: str) -> list[float]:
+        vector = [0.0] * self.dim
+        for word in _WORD_RE.findall(text.lower()):
+            for index, weight in self._word_features(word):
+                vector[index] += weight
+        norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+        return [x / norm for x in vector]
+
+    def __call__(self, input: list[str]) -> list[list[float]]:  # noqa: A002 — Chroma imzosi
+        return [self.embed_one(text) for text in input]
+
+
+class _SentenceTransformerEmbedder:
+    def __init__(self, model: Any) -> None:
+        self._model = model
+
+    def __call__(self, input: list[str]) -> list[list[float]]:  # noqa: A002
+        return [list(v) for v in self._model.encode(input, normalize_embeddings=True)]
+
+
+def default_embedding_function() -> tuple[str, EmbeddingFunction]:
+    """Mavjud eng yaxshi embedding funksiyasi.
+
+    Returns:
+        (nom, funksiya) — nom ``"chroma-default"``, ``"sentence-transformers"``
+        yoki ``"hashing"``
+    """
+    try:
+        from chromadb.utils import embedding_functions  # type: ignore
+
+        return "chroma-default", embedding_functions.DefaultEmbeddingFunction()
+    except Exception:
+        pass
+    try:
+        from sentence_transformers import SentenceTransformer  # type: ignore
+
+        return "sentence-transformers", _SentenceTransformerEmbedder(
+            SentenceTransformer(_SENTENCE_MODEL)
+        )
+    except Exception:
+        pass
+    return "hashing", HashingEmbedder()
@@ -4,10 +4,13 @@ JARVIS Energy & Mood Tracker.
 from __future__ import annotations
 
 import json
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import Optional
 
+from life.dates import date_to_epoch_day, epoch_day
+
 _ENERGY_FILE = Path("data/energy.json")
 _TASHKENT_TZ = timezone(timedelta(hours=5))
 
@@ -38,11 +41,18 @@ def _now_str() -> str:
     return datetime.now(_TASHKENT_TZ).strftime("%Y-%m-%d %H:%M:%S")
 
 
+def _today_day() -> int:
+    """Bugungi sana epoch kun ko'rinishida."""
+    return date_to_epoch_day(datetime.now(_TASHKENT_TZ).date())
+
+
 class EnergyTracker:
     """Kunlik energiya va kayfiyat kuzatuv."""
 
     def __init__(self) -> None:
         self._records: list[dict] = []
+        # self._records bilan parallel: har bir yozuvning epoch kuni (o'sish tartibida)
+        self._days: list[int] = []
         self._load()
 
     def _load(self) -> None:
@@ -54,6 +64,20 @@ class EnergyTracker:
                     self._records = data if isinstance(data, list) else []
         except Exception:
             self._records = []
+        self._index()
+
+    def _index(self) -> None:
+        """Sanalarni bir marta epoch kunga aylantirish va yozuvlarni sana bo'yicha tartiblash."""
+        keyed = [(epoch_day(str(r.get("date", ""))), r) for r in self._records]
+        keyed = [(-1 if day is None else day, r) for day, r in keyed]
+        keyed.sort(key=lambda pair: pair[0])
+        self._days = [day for day, _ in keyed]
+        self._records = [r for _, r in keyed]
+
+    def _find(self, day: int) -> int:
+        """Berilgan kunning birinchi yozuvi indeksi (yo'q bo'lsa -1)."""
+        i = bisect_left(self._days, day)
+        return i if i < len(self._days) and self._days[i] == day else -1
 
     def _save(self) -> None:
         """Energiya yozuvlarini faylga saqlash."""
@@ -83,31 +107,30 @@ class EnergyTracker:
             "note": note,
         }
         # Bugungi mavjud yozuvni yangilash yoki yangi qo'shish
-        today = _today_str()
-        for i, rec in enumerate(self._records):
-            if rec.get("date") == today:
-                self._records[i] = entry
-                self._save()
-                return entry
-        self._records.append(entry)
+        today = _today_day()
+        i = self._find(today)
+        if i >= 0:
+            self._records[i] = entry
+        else:
+            pos = bisect_right(self._days, today)
+            self._days.insert(pos, today)
+            self._records.insert(pos, entry)
         self._save()
         return entry
 
     def get_today_energy(self) -> Optional[dict]:
         """Bugungi energiya yozuvi."""
-        today = _today_str()
-        for rec in reversed(self._records):
-            if rec.get("date") == today:
-                return rec
+        today = _today_day()
+        hi = bisect_right(self._days, today)
+        if hi and self._days[hi - 1] == today:
+            return self._records[hi - 1]
         return None
 
     def get_weekly_average(self) -> float:
         """Haftalik o'rtacha energiya darajasi (0.0 — yozuv yo'q)."""
-        now = datetime.now(_TASHKENT_TZ)
-        week_start = (now - timedelta(days=6)).strftime("%Y-%m-%d")
-        week_records = [
-            r for r in self._records if r.get("date", "") >= week_start
-        ]
+        today = _today_day()
+        lo = bisect_left(self._days, today - 6)
+        week_records = self._records[lo:bisect_right(self._days, today, lo)]
         if not week_records:
             return 0.0
         return sum(r.get("level", 0) for r in week_records) / len(week_records)
@@ -118,12 +141,11 @@ class EnergyTracker:
         Returns:
             ``True`` — burnout xavfi bor, ``False`` — yo'q.
         """
-        now = datetime.now(_TASHKENT_TZ)
+        today = _today_day()
         low_streak = 0
         for i in range(1, 8):
-            date_str = (now - timedelta(days=i)).strftime("%Y-%m-%d")
-            found = next((r for r in self._records if r.get("date") == date_str), None)
-            if found and found.get("level", 5) <= 2:
+            idx = self._find(today - i)
+            if idx >= 0 and self._records[idx].get("level", 5) <= 2:
                 low_streak += 1
             else:
                 break
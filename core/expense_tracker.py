@@ -6,10 +6,13 @@ from __future__ import annotations
 import json
 import os
 import uuid
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import Optional
 
+from life.dates import date_to_epoch_day, epoch_day
+
 _EXPENSE_FILE = Path("data/expenses.json")
 _TASHKENT_TZ = timezone(timedelta(hours=5))
 
@@ -39,11 +42,18 @@ def _now_str() -> str:
     return datetime.now(_TASHKENT_TZ).strftime("%Y-%m-%d %H:%M:%S")
 
 
+def _today_day() -> int:
+    """Bugungi sana epoch kun ko'rinishida."""
+    return date_to_epoch_day(datetime.now(_TASHKENT_TZ).date())
+
+
 class ExpenseTracker:
     """Oddiy xarajat kuzatuv tizimi."""
 
     def __init__(self) -> None:
         self._expenses: list[dict] = []
+        # self._expenses bilan parallel: har bir yozuvning epoch kuni (o'sish tartibida)
+        self._days: list[int] = []
         self._load()
 
     def _load(self) -> None:
@@ -55,6 +65,21 @@ class ExpenseTracker:
                     self._expenses = data if isinstance(data, list) else []
         except Exception:
             self._expenses = []
+        self._index()
+
+    def _index(self) -> None:
+        """Sanalarni bir marta epoch kunga aylantirish va yozuvlarni sana bo'yicha tartiblash."""
+        keyed = [(epoch_day(str(e.get("date", ""))), e) for e in self._expenses]
+        keyed = [(-1 if day is None else day, e) for day, e in keyed]
+        keyed.sort(key=lambda pair: pair[0])
+        self._days = [day for day, _ in keyed]
+        self._expenses = [e for _, e in keyed]
+
+    def _range(self, start_day: int, end_day: int) -> list[dict]:
+        """[start_day, end_day) oralig'idagi xarajatlar (binar qidiruv)."""
+        lo = bisect_left(self._days, start_day)
+        hi = bisect_left(self._days, end_day, lo)
+        return self._expenses[lo:hi]
 
     def _save(self) -> None:
         """Xarajatlarni faylga saqlash."""
@@ -90,14 +115,17 @@ class ExpenseTracker:
             "date": _today_str(),
             "created_at": _now_str(),
         }
-        self._expenses.append(entry)
+        day = _today_day()
+        pos = bisect_right(self._days, day)
+        self._days.insert(pos, day)
+        self._expenses.insert(pos, entry)
         self._save()
         return entry
 
     def get_today_expenses(self) -> list[dict]:
         """Bugungi xarajatlar ro'yxati."""
-        today = _today_str()
-        return [e for e in self._expenses if e.get("date") == today]
+        today = _today_day()
+        return self._range(today, today + 1)
 
     def get_weekly_summary(self) -> dict:
         """Haftalik xulosa.
@@ -105,11 +133,8 @@ class ExpenseTracker:
         Returns:
             ``{"total": int, "by_category": dict, "daily_average": int}``
         """
-        now = datetime.now(_TASHKENT_TZ)
-        week_start = (now - timedelta(days=6)).strftime("%Y-%m-%d")
-        week_expenses = [
-            e for e in self._expenses if e.get("date", "") >= week_start
-        ]
+        today = _today_day()
+        week_expenses = self._range(today - 6, today + 1)
         total = sum(e.get("amount", 0) for e in week_expenses)
         by_category: dict[str, int] = {}
         for e in week_expenses:
@@ -124,11 +149,12 @@ class ExpenseTracker:
         Returns:
             ``{"total": int, "by_category": dict, "count": int}``
         """
-        now = datetime.now(_TASHKENT_TZ)
-        month_prefix = now.strftime("%Y-%m")
-        month_expenses = [
-            e for e in self._expenses if e.get("date", "").startswith(month_prefix)
-        ]
+        today = datetime.now(_TASHKENT_TZ).date()
+        month_start = today.replace(day=1)
+        next_month = (month_start + timedelta(days=32)).replace(day=1)
+        month_expenses = self._range(
+            date_to_epoch_day(month_start), date_to_epoch_day(next_month)
+        )
         total = sum(e.get("amount", 0) for e in month_expenses)
         by_category: dict[str, int] = {}
         for e in month_expenses:
@@ -0,0 +1,283 @@
+"""
+IntentClassifier — tarmoqsiz (offline) intent klassifikatori.
+
+Kalit so'zlarga tushmagan strukturali so'rovlarni ("ertaga soat 3 da
+matematika bor") aniqlaydi, shunda ular AI provayderga yuborilmasdan lokal
+bajariladi. Model — xeshlangan n-gramma belgilar (so'zlar, so'z juftlari,
+so'z ichidagi belgi trigrammalari) ustidagi chiziqli softmax regressiya.
+Ehtimolliklar ajratilgan validatsiya to'plamida harorat (temperature) bilan
+kalibrlanadi.
+
+Model ``config/intents/train.tsv`` dan quriladi:
+    python -m core.intent_classifier
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import random
+import re
+import threading
+import zlib
+from pathlib import Path
+from typing import Optional
+
+_INTENT_DIR = Path(__file__).resolve().parent.parent / "config" / "intents"
+_TRAIN_PATH = _INTENT_DIR / "train.tsv"
+_MODEL_PATH = _INTENT_DIR / "model.json"
+
+_DEFAULT_BITS = 15
+_DEFAULT_THRESHOLD = 0.8  # bundan past ishonchda "chat" deb hisoblanadi
+_EPOCHS = 60
+_LEARNING_RATE = 0.5
+_L2 = 1e-4
+_HOLDOUT = 0.2
+_TEMPERATURES = [t / 10 for t in range(3, 31)]
+_WEIGHT_EPSILON = 1e-2  # bundan kichik og'irliklar saqlanmaydi
+
+_APOSTROPHES = str.maketrans({"ʻ": "'", "ʼ": "'", "‘": "'", "’": "'", "`": "'"})
+_TOKEN_RE = re.compile(r"[^\W_]+(?:'[^\W_]+)*")
+_DIGIT_RE = re.compile(r"\d")
+
+
+def _features(text: str, bits: int) -> list[int]:
+    """Matnni xeshlangan belgi indekslariga aylantirish (takrorlarsiz)."""
+    normalized = _DIGIT_RE.sub("0", text.lower().translate(_APOSTROPHES))
+    tokens = _TOKEN_RE.findall(normalized)
+    feats = {f"w:{t}" for t in tokens}
+    feats.update(f"b:{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    for t in tokens:
+        padded = f"#{t}#"
+        feats.update(f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2))
+    mask = (1 << bits) - 1
+    return sorted({zlib.crc32(f.encode("utf-8")) & mask for f in feats})
+
+
+def _softmax(scores: list[float]) -> list[float]:
+    best = max(scores)
+    exps = [math.exp(s - best) for s in scores]
+    total = sum(exps)
+    return [e / total for e in exps]
+
+
+class IntentClassifier:
+    """Xeshlangan n-gramma belgilar ustidagi chiziqli klassifikator."""
+
+    def __init__(
+        self,
+        labels: list[str],
+        weights: dict[int, list[float]],
+        bias: list[float],
+        bits: int = _DEFAULT_BITS,
+        temperature: float = 1.0,
+    ) -> None:
+        self.labels = labels
+        self.bits = bits
+        self.temperature = temperature
+        self._weights = weights
+        self._bias = bias
+
+    # === Bashorat ===
+
+    def _scores(self, feats: list[int]) -> list[float]:
+        scores = list(self._bias)
+        if not feats:
+            return scores
+        scale = 1.0 / math.sqrt(len(feats))
+        n = len(scores)
+        for idx in feats:
+            row = self._weights.get(idx)
+            if row is not None:
+                for k in range(n):
+                    scores[k] += row[k] * scale
+        return scores
+
+    def probabilities(self, text: str) -> dict[str, float]:
+        """Har bir intent uchun kalibrlangan ehtimollik."""
+        scores = self._scores(_features(text, self.bits))
+        probs = _softmax([s / self.temperature for s in scores])
+        return dict(zip(self.labels, probs))
+
+    def predict(self, text: str) -> tuple[str, float]:
+        """Eng ehtimolli intent va uning ishonchliligi.
+
+        Returns:
+            (intent, ishonch 0..1)
+        """
+        probs = self.probabilities(text)
+        label = max(probs, key=probs.__getitem__)
+        return label, probs[label]
+
+    # === O'qitish ===
+
+    @classmethod
+    def train(
+        cls,
+        samples: list[tuple[str, str]],
+        bits: int = _DEFAULT_BITS,
+        epochs: int = _EPOCHS,
+        seed: int = 0,
+    ) -> "IntentClassifier":
+        """Softmax regressiyani AdaGrad bilan o'qitish.
+
+        Args:
+            samples: [(intent, matn)] ro'yxati.
+        """
+        labels = sorted({label for label, _ in samples})
+        label_idx = {label: i for i, label in enumerate(labels)}
+        n = len(labels)
+        data = [(label_idx[label], _features(text, bits)) for label, text in samples]
+        weights: dict[int, list[float]] = {}
+        grad_sq: dict[int, list[float]] = {}
+        bias = [0.0] * n
+        bias_sq = [1e-8] * n
+        rng = random.Random(seed)
+        model = cls(labels, weights, bias, bits)
+
+        for _ in range(epochs):
+            rng.shuffle(data)
+            for y, feats in data:
+                probs = _softmax(model._scores(feats))
+                scale = 1.0 / math.sqrt(len(feats)) if feats else 0.0
+                for k in range(n):
+                    g = probs[k] - (1.0 if k == y else 0.0)
+                    bias_sq[k] += g * g
+                    bias[k] -= _LEARNING_RATE * g / math.sqrt(bias_sq[k])
+                    if g == 0.0:
+                        continue
+                    for idx in feats:
+                        row = weights.setdefault(idx, [0.0] * n)
+                        sq = grad_sq.setdefault(idx, [1e-8] * n)
+                        gw = g * scale + _L2 * row[k]
+                        sq[k] += gw * gw
+                        row[k] -= _LEARNING_RATE * gw / math.sqrt(sq[k])
+        return model
+
+    @classmethod
+    def build(cls, samples: list[tuple[str, str]], seed: int = 0) -> "IntentClassifier":
+        """Model qurish: validatsiyada haroratni tanlash, so'ng to'liq to'plamda o'qitish."""
+        rng = random.Random(seed)
+        by_label: dict[str, list[tuple[str, str]]] = {}
+        for sample in samples:
+            by_label.setdefault(sample[0], []).append(sample)
+        train_set: list[tuple[str, str]] = []
+        holdout: list[tuple[str, str]] = []
+        for group in by_label.values():
+            group = list(group)
+            rng.shuffle(group)
+            cut = max(1, int(len(group) * _HOLDOUT))
+            holdout.extend(group[:cut])
+            train_set.extend(group[cut:])
+
+        probe = cls.train(train_set, seed=seed)
+        feats = [(probe.labels.index(label), _features(text, probe.bits)) for label, text in holdout]
+        raw = [probe._scores(f) for _, f in feats]
+
+        def nll(temperature: float) -> float:
+            loss = 0.0
+            for (y, _), scores in zip(feats, raw):
+                probs = _softmax([s / temperature for s in scores])
+                loss -= math.log(max(probs[y], 1e-12))
+            return loss
+
+        temperature = min(_TEMPERATURES, key=nll)
+        model = cls.train(samples, seed=seed)
+        model.temperature = temperature
+        return model
+
+    # === Saqlash ===
+
+    def save(self, path: Path = _MODEL_PATH) -> None:
+        """Modelni JSON ga atomar yozish (kichik og'irliklar tashlanadi)."""
+        weights = {
+            str(idx): [round(w, 3) for w in row]
+            for idx, row in sorted(self._weights.items())
+            if max(abs(w) for w in row) >= _WEIGHT_EPSILON
+        }
+        data = {
+            "labels": self.labels,
+            "bits": self.bits,
+            "temperature": self.temperature,
+            "bias": [round(b, 4) for b in self._bias],
+            "weights": weights,
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path = _MODEL_PATH) -> "IntentClassifier":
+        """Modelni JSON dan yuklash."""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(
+            labels=list(data["labels"]),
+            weights={int(k): v for k, v in data["weights"].items()},
+            bias=list(data["bias"]),
+            bits=int(data["bits"]),
+            temperature=float(data.get("temperature", 1.0)),
+        )
+
+
+def load_samples(path: Path = _TRAIN_PATH) -> list[tuple[str, str]]:
+    """``intent<TAB>matn`` formatidagi o'quv to'plamini o'qish."""
+    samples = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if not line.strip() or line.startswith("#"):
+            continue
+        label, _, text = line.partition("\t")
+        if text:
+            samples.append((label.strip(), text.strip()))
+    return samples
+
+
+_classifier: Optional[IntentClassifier] = None
+_classifier_failed = False
+_classifier_lock = threading.Lock()
+
+
+def get_intent_classifier() -> Optional[IntentClassifier]:
+    """Umumiy klassifikatorni qaytarish (fayl yo'q bo'lsa o'quv to'plamidan quriladi)."""
+    global _classifier, _classifier_failed
+    if _classifier is None and not _classifier_failed:
+        with _classifier_lock:
+            if _classifier is None and not _classifier_failed:
+                try:
+                    _classifier = IntentClassifier.load()
+                except (OSError, ValueError, KeyError):
+                    try:
+                        _classifier = IntentClassifier.build(load_samples())
+                        _classifier.save()
+                    except (OSError, ValueError):
+                        _classifier_failed = _classifier is None
+    return _classifier
+
+
+def classify(text: str, threshold: float = _DEFAULT_THRESHOLD) -> tuple[str, float]:
+    """Matnni klassifikatsiya qilish; ishonch past bo'lsa yoki model bo'lmasa "chat".
+
+    Returns:
+        (intent, ishonch 0..1)
+    """
+    model = get_intent_classifier()
+    if model is None or not text.strip():
+        return "chat", 0.0
+    label, confidence = model.predict(text)
+    if confidence < threshold:
+        return "chat", confidence
+    return label, confidence
+
+
+if __name__ == "__main__":
+    samples = load_samples()
+    model = IntentClassifier.build(samples)
+    model.save()
+    correct = sum(model.predict(text)[0] == label for label, text in samples)
+    print(
+        f"Intent modeli saqlandi: {_MODEL_PATH} ({_MODEL_PATH.stat().st_size} bayt), "
+        f"{len(model.labels)} intent, harorat {model.temperature}, "
+        f"o'quv aniqligi {correct}/{len(samples)}"
+    )
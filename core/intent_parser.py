@@ -6,7 +6,15 @@ O'zbek va ingliz tillarida slash buyruqlar ham qo'llab-quvvatlanadi.
 from __future__ import annotations
 
 import re
-from typing import Any
+from functools import lru_cache
+from typing import Any, Optional
+
+from .date_parser import parse_datetime
+from .intent_classifier import classify as classify_intent
+from .metrics import get_registry, lru_cache_collector
+from .text_features import TextFeatures, analyze
+
+_CLASSIFY_CACHE_SIZE = 512
 
 # Kun nomlari: o'zbek va ingliz
 _DAY_MAP: dict[str, str] = {
@@ -59,6 +67,60 @@ _INTENT_PATTERNS: list[tuple[str, list[str]]] = [
 # Vaqt pattern'i: HH:MM
 _TIME_RE = re.compile(r"\b(\d{1,2}:\d{2})\b")
 
+# Slash buyruqlar → intent
+_SLASH_MAP: dict[str, str] = {
+    "/exit": "exit",
+    "/quit": "exit",
+    "/help": "show_help",
+    "/status": "show_status",
+    "/week": "show_week",
+    "/schedule": "show_schedule",
+    "/add_class": "add_class",
+    "/homework": "show_homework",
+    "/add_hw": "add_homework",
+    "/done_hw": "done_homework",
+    "/tasks": "show_tasks",
+    "/add_task": "add_task",
+    "/done_task": "done_task",
+    "/plan": "show_plan",
+    "/today": "show_today",
+    "/stats": "show_stats",
+    "/reminders": "show_reminders",
+    "/focus": "start_focus",
+    "/cognitive": "show_cognitive",
+    "/reflect": "show_reflect",
+    "/fast": "change_mode",
+    "/code": "change_mode",
+    "/pro": "change_mode",
+}
+
+# Sarlavhani tozalash uchun oldindan kompilyatsiya qilingan pattern'lar
+_TITLE_DAY_RE = re.compile(
+    r"\b(?:" + "|".join(re.escape(day) for day in _DAY_MAP) + r")\b", re.IGNORECASE
+)
+_TITLE_SLASH_RE = re.compile(r"^/\w+\s*")
+_TITLE_KEYWORD_RES: list[re.Pattern[str]] = [
+    re.compile(rf"\b{re.escape(kw)}\b", re.IGNORECASE)
+    for kw in ["dars qo'sh", "yangi dars", "qo'sh", "add", "vazifa", "uchrashuv", "reja"]
+]
+_MINUTES_RE = re.compile(r"\b(\d+)\s*(?:daqiqa|min(?:utes?)?)\b")
+# Sana/vaqt olib tashlangandan keyin qolgan to'ldiruvchi so'zlar
+_TITLE_FILLER_RE = re.compile(r"(?:^|\s)(?:da|ga|kuni|bor|kerak)$", re.IGNORECASE)
+# Sana/vaqt qidiriladigan intent'lar
+_DATETIME_INTENTS = frozenset(
+    {"add_task", "add_class", "add_homework", "show_schedule", "show_plan", "show_today"}
+)
+
+
+@lru_cache(maxsize=_CLASSIFY_CACHE_SIZE)
+def _classify_cached(text: str) -> tuple[str, float]:
+    """Klassifikator qarori matn bo'yicha keshlanadi (parametrlar emas — ular
+    joriy sanaga bog'liq: "ertaga")."""
+    return classify_intent(text)
+
+
+get_registry().register_collector(lru_cache_collector("intent_classify", _classify_cached))
+
 
 class IntentParser:
     """Foydalanuvchi kiritishini tabiiy tilda tahlil qilish."""
@@ -73,21 +135,39 @@ class IntentParser:
             ``{"intent": str, "params": dict}`` ko'rinishidagi lug'at.
             Agar intent aniqlanmasa ``"chat"`` qaytariladi.
         """
-        lower = text.lower().strip()
+        # Matn bir marta tahlil qilinadi (umumiy kesh — rejim va til bilan birga)
+        features = analyze(text)
 
         # Avval slash buyruqlarni tekshirish (backward compatibility)
-        slash_intent = self._check_slash(lower)
+        slash_intent = self._check_slash(features.lower)
         if slash_intent:
-            return {"intent": slash_intent, "params": self._extract_params(text, slash_intent)}
+            return {
+                "intent": slash_intent,
+                "params": self._extract_params(text, slash_intent, features),
+            }
+
+        # Tabiiy til intent'larini tekshirish (_INTENT_PATTERNS tartibidagi birinchisi)
+        if features.intent:
+            return {
+                "intent": features.intent,
+                "params": self._extract_params(text, features.intent, features),
+            }
 
-        # Tabiiy til intent'larini tekshirish
-        for intent, keywords in _INTENT_PATTERNS:
-            for kw in keywords:
-                if kw in lower:
-                    return {"intent": intent, "params": self._extract_params(text, intent)}
+        # Kalit so'z topilmadi — lokal klassifikator (ishonch yuqori bo'lsagina)
+        return self.classify(text)
 
-        # Intent topilmadi — AI ga yuborish
-        return {"intent": "chat", "params": {}}
+    def classify(self, text: str) -> dict[str, Any]:
+        """Matnni faqat lokal klassifikator bilan tahlil qilish.
+
+        Kalit so'zlarga tushmagan strukturali so'rovlar uchun ("ertaga soat 3
+        da matematika bor"). Ishonch chegaradan past bo'lsa ``"chat"``.
+
+        Returns:
+            ``{"intent": str, "params": dict, "confidence": float}``
+        """
+        intent, confidence = _classify_cached(text)
+        params = self._extract_params(text, intent) if intent != "chat" else {}
+        return {"intent": intent, "params": params, "confidence": confidence}
 
     # ------------------------------------------------------------------
     # Ichki yordamchi metodlar
@@ -95,48 +175,43 @@ class IntentParser:
 
     def _check_slash(self, lower: str) -> str | None:
         """Slash buyruqlarni intent'ga moslashtirish."""
-        slash_map: dict[str, str] = {
-            "/exit": "exit",
-            "/quit": "exit",
-            "/help": "show_help",
-            "/status": "show_status",
-            "/week": "show_week",
-            "/schedule": "show_schedule",
-            "/add_class": "add_class",
-            "/homework": "show_homework",
-            "/add_hw": "add_homework",
-            "/done_hw": "done_homework",
-            "/tasks": "show_tasks",
-            "/add_task": "add_task",
-            "/done_task": "done_task",
-            "/plan": "show_plan",
-            "/today": "show_today",
-            "/stats": "show_stats",
-            "/reminders": "show_reminders",
-            "/focus": "start_focus",
-            "/cognitive": "show_cognitive",
-            "/reflect": "show_reflect",
-            "/fast": "change_mode",
-            "/code": "change_mode",
-            "/pro": "change_mode",
-        }
-        first_token = lower.split()[0] if lower.split() else ""
-        return slash_map.get(first_token)
-
-    def _extract_params(self, text: str, intent: str) -> dict[str, Any]:
-        """Parametrlarni (kun, vaqt, sarlavha) ajratib olish."""
-        params: dict[str, Any] = {}
-        lower = text.lower()
+        parts = lower.split(None, 1)
+        return _SLASH_MAP.get(parts[0]) if parts else None
 
-        # Kun
-        for uz_en, canonical in _DAY_MAP.items():
-            if uz_en in lower:
-                params["day"] = canonical
-                break
+    def _extract_params(
+        self, text: str, intent: str, features: Optional[TextFeatures] = None
+    ) -> dict[str, Any]:
+        """Parametrlarni (kun, sana, vaqt, sarlavha) ajratib olish.
 
-        # Vaqt
+        Sana/vaqt ifodalari ("ertaga soat 3 da", "next friday 5pm",
+        "через час") ``date_parser`` bilan bir marta normallashtiriladi:
+        ``date`` — "YYYY-MM-DD", ``time`` — "HH:MM", ``datetime`` — ISO.
+
+        Args:
+            text: Asl matn.
+            intent: Aniqlangan intent.
+            features: ``analyze(text)`` natijasi (None bo'lsa keshdan olinadi).
+        """
+        params: dict[str, Any] = {}
+        lower = text.lower()
+        if features is None:
+            features = analyze(text)
+
+        # Kun (_DAY_MAP tartibidagi birinchisi)
+        if features.day:
+            params["day"] = features.day
+
+        # Sana va vaqt (Asia/Tashkent)
+        moment = parse_datetime(text) if intent in _DATETIME_INTENTS else None
+        if moment is not None:
+            params["datetime"] = moment.value.isoformat()
+            params["date"] = moment.date_str
+            if moment.has_time:
+                params["time"] = moment.time_str
+
+        # Vaqt (HH:MM — sana/vaqt ifodasi topilmagan intent'lar uchun)
         time_match = _TIME_RE.search(text)
-        if time_match:
+        if time_match and "time" not in params:
             params["time"] = time_match.group(1)
 
         # Rejim (change_mode uchun)
@@ -148,7 +223,7 @@ class IntentParser:
 
         # Focus daqiqasi
         if intent == "start_focus":
-            min_match = re.search(r"\b(\d+)\s*(?:daqiqa|min(?:utes?)?)\b", lower)
+            min_match = _MINUTES_RE.search(lower)
             if min_match:
                 params["minutes"] = int(min_match.group(1))
             # "/focus stop" ni stop_focus ga yo'naltirish
@@ -157,18 +232,19 @@ class IntentParser:
 
         # Sarlavha — vaqt va kun so'zlarini olib tashlash
         if intent in ("add_task", "add_class", "add_homework"):
-            title = text
+            # Sana/vaqt ifodalarini o'chirish
+            title = moment.strip_from(text) if moment is not None else text
             # Kun nomlarini o'chirish
-            for uz_en in _DAY_MAP:
-                title = re.sub(rf"\b{re.escape(uz_en)}\b", "", title, flags=re.IGNORECASE)
+            title = _TITLE_DAY_RE.sub("", title) if features.day else title
             # Vaqtni o'chirish
-            title = _TIME_RE.sub("", title)
+            if time_match:
+                title = _TIME_RE.sub("", title)
             # Slash buyruqlarni o'chirish
-            title = re.sub(r"^/\w+\s*", "", title).strip()
+            title = _TITLE_SLASH_RE.sub("", title).strip()
             # Kalit so'zlarni o'chirish
-            for kw in ["dars qo'sh", "yangi dars", "qo'sh", "add", "vazifa", "uchrashuv", "reja"]:
-                title = re.sub(rf"\b{re.escape(kw)}\b", "", title, flags=re.IGNORECASE)
-            title = title.strip(" ,.")
+            for pattern in _TITLE_KEYWORD_RES:
+                title = pattern.sub("", title)
+            title = _TITLE_FILLER_RE.sub("", title.strip(" ,.")).strip(" ,.")
             if title:
                 params["title"] = title
 
@@ -5,26 +5,28 @@ Barcha modullarni birlashtiradi va foydalanuvchi so'rovlarini qayta ishlaydi.
 
 from __future__ import annotations
 
-from datetime import datetime
+import re
+from datetime import date, datetime
 from pathlib import Path
-from typing import Optional
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Callable, Optional
 
 from .ai_router import AIRouter
-from .auto_mode import AutoModeSwitcher
-from .education import SmartEducation
-from .intelligence import (
-    CognitiveLoadBalancer,
-    TimePerceptionEngine,
-    AntiProcrastinationEngine,
-    LifeNarrativeEngine,
-    AITutorMode,
-    PersonalityAdapter,
-)
-from .modes import ModeManager
-from .language import LanguageDetector
+from .lazy import LazyProxy
 from .memory import MemoryManager
+from .metrics import get_registry
+from .retrieval import RetrievalPostProcessor, estimate_tokens
+from .session_manager import SessionManager
+from .session_store import SessionStore
 from .tools import ToolRegistry
-from .rag import RAGEngine
+from .tracing import format_trace, get_tracer, preview
+
+if TYPE_CHECKING:
+    from .education import SmartEducation
+    from .intelligence import TimePerceptionEngine
+    from .language import LanguageDetector
+    from .modes import ModeManager
+    from .session_manager import UserSession
 
 _MODE_COMMANDS = {
     "/fast": "fast",
@@ -43,6 +45,54 @@ _MODEL_CMD = "/model"
 _MODELS_CMD = "/models"
 _AUTO_CMD = "/auto"
 _STATUS_CMD = "/status"
+_SESSION_CMD = "/session"
+_SESSIONS_CMD = "/sessions"
+_TRACE_CMD = "/trace"
+# Server/Telegram foydalanuvchilari faqat o'z ``<id>.<nom>`` sessiyalariga o'ta oladi
+_SUBSESSION_SEP = "."
+_SUBSESSION_NAME_RE = re.compile(r"[A-Za-z0-9_-]{1,32}")
+_TRACE_DEFAULT_COUNT = 5
+_METRICS_CMD = "/metrics"
+
+_METRICS = get_registry()
+_PROCESS_SECONDS = _METRICS.histogram("jarvis_process_seconds", "Jarvis.process to'liq vaqti")
+_SESSIONS_ACTIVE = _METRICS.gauge("jarvis_sessions_active", "Xotiradagi faol sessiyalar")
+
+# Lokal klassifikator ishonchli aniqlaganda AI siz bajariladigan intent'lar
+_LOCAL_INTENTS = {
+    "add_task",
+    "add_homework",
+    "show_schedule",
+    "show_homework",
+    "show_tasks",
+    "show_today",
+    "show_plan",
+    "show_reminders",
+    "start_focus",
+}
+# Ma'lumot yozuvchi intent'lar — savol ko'rinishidagi matnda lokal bajarilmaydi
+_MUTATING_INTENTS = frozenset({"add_task", "add_homework"})
+# Savol belgisi: oxiridagi "?", o'zbekcha "-mi/-mu" yuklamasi yoki uz/en/ru so'roq so'zlari
+# (inglizcha so'roq so'zlari faqat gap boshida — "remind me when ..." buyruq bo'lib qoladi)
+_QUESTION_RE = re.compile(
+    r"\?\s*$"
+    r"|\w(?:mi|mu)\s*$"
+    r"|\b(?:nima|nimaga|nega|qanday|qanaqa|qachon|qayer(?:da|ga|dan)?|kim|qaysi|qancha|nechta|necha)\b"
+    r"|^\s*(?:what|how|why|when|where|which|who|should|can|could|would|is|are|do|does)\b"
+    r"|(?<![а-яё])(?:что|как|какой|какая|какие|когда|где|почему|зачем|кто|сколько|ли)(?![а-яё])",
+    re.IGNORECASE,
+)
+# Lokal intentlarning slash buyruq ko'rinishi (Telegram menyusi, CLI)
+_INTENT_COMMANDS = {
+    "/schedule": "show_schedule",
+    "/homework": "show_homework",
+    "/tasks": "show_tasks",
+    "/plan": "show_plan",
+    "/reminders": "show_reminders",
+}
+_RETRIEVAL_CANDIDATES = 8  # RAG va xotiradan olinadigan nomzodlar (har biridan)
+_BASELINE_CONTEXT_ITEMS = 3  # Tejamni hisoblash uchun: avvalgi usul top-3 + top-3 qo'shardi
+_WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
 
 _SYSTEM_BASE = (
     "You are JARVIS, a professional AI life assistant designed to act as a second brain, "
@@ -81,6 +131,29 @@ def _load_system_prompt() -> str:
     return combined.strip() or _SYSTEM_BASE
 
 
+def _format_context(items: list[dict]) -> tuple[str, str]:
+    """Tanlangan bo'laklarni tizim promptiga qo'shiladigan matnga aylantirish.
+
+    Returns:
+        (hujjatlar konteksti, xotira konteksti)
+    """
+    docs = [f"[{c['source']}]: {c['content']}" for c in items if c["kind"] == "rag"]
+    memories = [c["content"] for c in items if c["kind"] == "memory"]
+    rag_context = "\n\nMavjud hujjatlardan kontekst:\n" + "\n---\n".join(docs) if docs else ""
+    memory_context = "\n\nOldingi suhbatlardan:\n" + "\n".join(memories) if memories else ""
+    return rag_context, memory_context
+
+
+def _owns_session(owner: str, session_id: str) -> bool:
+    """``session_id`` egasining o'zi yoki uning ``<owner>.<nom>`` sessiyasimi."""
+    if session_id == owner:
+        return True
+    prefix = owner + _SUBSESSION_SEP
+    return session_id.startswith(prefix) and bool(
+        _SUBSESSION_NAME_RE.fullmatch(session_id[len(prefix):])
+    )
+
+
 class Jarvis:
     """JARVIS-X — Asosiy AI Agent Orchestrator."""
 
@@ -89,22 +162,47 @@ class Jarvis:
         default_mode: str = "pro",
         voice_enabled: bool = False,
         rag_dir: Optional[str] = None,
+        session_id: str = "default",
+        local_cli: bool = False,
     ) -> None:
+        """
+        Args:
+            default_mode: Yangi sessiyalar uchun boshlang'ich rejim.
+            voice_enabled: Ovozli kiritish/chiqarish.
+            rag_dir: RAG hujjatlari katalogi.
+            session_id: Standart sessiya ID si.
+            local_cli: Lokal terminal (bitta egasi bor) — ``/session`` va
+                ``/sessions`` barcha saqlangan sessiyalarga kira oladi.
+                Server va Telegram uchun False: har kim faqat o'z sessiyalarini ko'radi.
+        """
+        self._local_cli = local_cli
+        # Umumiy (og'ir) resurslar — barcha sessiyalar uchun bitta
         self.router = AIRouter()
-        self.mode_manager = ModeManager(default_mode=default_mode)
-        self.language = LanguageDetector()
-        self.memory = MemoryManager()
+        self.session_store = SessionStore()
+        self._default_session_id = session_id
+        self.sessions = SessionManager(
+            MemoryManager(
+                router=self.router,
+                session_store=self.session_store,
+                session_id=session_id,
+            ),
+            default_mode=default_mode,
+        )
         self.tools = ToolRegistry()
-        self.rag = RAGEngine()
-        self.education = SmartEducation()
+        self.retrieval = RetrievalPostProcessor()
+        self.tracer = get_tracer()
+        _SESSIONS_ACTIVE.set_function(lambda: len(self.sessions.list_active()))
+        # Og'ir yoki har doim kerak bo'lmagan modullar birinchi murojaatda
+        # import qilinadi va yaratiladi (core.lazy.LazyProxy)
+        self.rag = LazyProxy("core.rag:RAGEngine")
         # Intelligence modules
-        self.cognitive = CognitiveLoadBalancer()
-        self.time_engine = TimePerceptionEngine()
-        self.anti_procrastination = AntiProcrastinationEngine()
-        self.narrative = LifeNarrativeEngine()
-        self.tutor = AITutorMode()
-        self.personality = PersonalityAdapter()
-        self.auto_mode = AutoModeSwitcher()
+        self.cognitive = LazyProxy("core.intelligence:CognitiveLoadBalancer")
+        self.anti_procrastination = LazyProxy("core.intelligence:AntiProcrastinationEngine")
+        self.narrative = LazyProxy("core.intelligence:LifeNarrativeEngine")
+        self.tutor = LazyProxy("core.intelligence:AITutorMode")
+        self.personality = LazyProxy("core.intelligence:PersonalityAdapter")
+        self.auto_mode = LazyProxy("core.auto_mode:AutoModeSwitcher")
+        self.intent_parser = LazyProxy("core.intent_parser:IntentParser")
         self._register_builtin_tools()
 
         # RAG hujjatlarini yuklash
@@ -114,6 +212,28 @@ class Jarvis:
             except Exception:
                 pass
 
+    # === Sessiya darajasidagi holat (standart sessiya uchun qulay nomlar) ===
+
+    @property
+    def mode_manager(self) -> ModeManager:
+        return self.sessions.get(self._default_session_id).mode_manager
+
+    @property
+    def language(self) -> LanguageDetector:
+        return self.sessions.get(self._default_session_id).language
+
+    @property
+    def memory(self) -> MemoryManager:
+        return self.sessions.get(self._default_session_id).memory
+
+    @property
+    def education(self) -> SmartEducation:
+        return self.sessions.get(self._default_session_id).education
+
+    @property
+    def time_engine(self) -> TimePerceptionEngine:
+        return self.sessions.get(self._default_session_id).time_engine
+
     def _get_homework_manager(self):
         """Return a HomeworkManager instance, or None on failure."""
         try:
@@ -123,69 +243,98 @@ class Jarvis:
             return None
 
     def _register_builtin_tools(self) -> None:
-        """O'rnatilgan vositalarni ro'yxatga olish."""
-        try:
-            from tools.web_search import WebSearchTool
-
-            ws = WebSearchTool()
-            self.tools.register("web_search", ws.search, "Internet qidiruvchi")
-        except Exception:
-            pass
+        """O'rnatilgan vositalarni ro'yxatga olish.
 
-        try:
-            from tools.file_manager import FileManagerTool
-
-            fm = FileManagerTool()
-            self.tools.register("read_file", fm.read_file, "Faylni o'qish")
-            self.tools.register("write_file", fm.write_file, "Faylga yozish")
-            self.tools.register("list_dir", fm.list_directory, "Katalogni ko'rish")
-        except Exception:
-            pass
-
-        try:
-            from tools.code_executor import CodeExecutorTool
-
-            ce = CodeExecutorTool()
-            self.tools.register("run_code", ce.execute, "Python kodni bajarish")
-        except Exception:
-            pass
-
-        try:
-            from tools.terminal import TerminalTool
-
-            term = TerminalTool()
-            self.tools.register("terminal", term.execute, "Terminal buyrug'ini bajarish")
-        except Exception:
-            pass
+        Vosita modullari va obyektlari birinchi chaqiruvda yuklanadi; bu yerda
+        faqat modul mavjudligi tekshiriladi (import qilinmaydi).
+        """
+        builtin = [
+            ("tools.web_search:WebSearchTool", [
+                ("web_search", "search", "Internet qidiruvchi"),
+            ]),
+            ("tools.file_manager:FileManagerTool", [
+                ("read_file", "read_file", "Faylni o'qish"),
+                ("write_file", "write_file", "Faylga yozish"),
+                ("list_dir", "list_directory", "Katalogni ko'rish"),
+            ]),
+            ("tools.code_executor:CodeExecutorTool", [
+                ("run_code", "execute", "Python kodni bajarish"),
+            ]),
+            ("tools.terminal:TerminalTool", [
+                ("terminal", "execute", "Terminal buyrug'ini bajarish"),
+            ]),
+        ]
+        for target, methods in builtin:
+            try:
+                if find_spec(target.partition(":")[0]) is None:
+                    continue
+            except Exception:
+                continue
+            tool = LazyProxy(target)
+            for name, method, description in methods:
+                self.tools.register(name, tool.method(method), description)
 
-    def process(self, user_input: str) -> str:
+    def process(
+        self,
+        user_input: str,
+        session_id: Optional[str] = None,
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> str:
         """Foydalanuvchi kiritishini qayta ishlash va javob qaytarish.
 
         ReAct tsikli: Reason → Act → Observe → Respond
 
         Args:
             user_input: Foydalanuvchi matni
+            session_id: Foydalanuvchi sessiyasi (None — standart sessiya)
+            on_token: AI javobini oqim (stream) bo'laklari bilan olish uchun
+                callback (ixtiyoriy, faqat AI ga yuborilgan so'rovlar uchun)
 
         Returns:
             JARVIS javobi
         """
+        session = self.sessions.get(session_id or self._default_session_id)
+        tracer = self.tracer
+        with _PROCESS_SECONDS.time(), tracer.trace(
+            "process", session_id=session.session_id, input=preview(user_input)
+        ):
+            with tracer.span("session_lock"):
+                session.lock.acquire()
+            try:
+                session.touch()
+                return self._process(session, user_input, on_token)
+            finally:
+                session.lock.release()
+
+    def _process(
+        self,
+        session: UserSession,
+        user_input: str,
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """Bitta sessiya doirasida kiritishni qayta ishlash."""
         if not user_input.strip():
             return ""
+        tracer = self.tracer
 
         # Auto mode switching (slash buyruqlar uchun emas)
         if not user_input.startswith("/"):
-            detected_mode = self.auto_mode.detect_mode(user_input)
-            current_mode = self.mode_manager.get_current_mode_name()
-            if self.auto_mode.should_switch(current_mode, detected_mode):
-                self.mode_manager.set_mode(detected_mode)
+            with tracer.span("auto_mode") as span:
+                detected_mode = self.auto_mode.detect_mode(user_input)
+                current_mode = session.mode_manager.get_current_mode_name()
+                if self.auto_mode.should_switch(current_mode, detected_mode):
+                    session.mode_manager.set_mode(detected_mode)
+                    span.set(switched_to=detected_mode)
 
         # Rejim almashtirish buyruqlarini tekshirish
         parts = user_input.strip().split()
         cmd = parts[0].lower() if parts else ""
+        if cmd.startswith("/"):
+            tracer.annotate(route="command", command=cmd)
         if cmd in _MODE_COMMANDS:
             mode_name = _MODE_COMMANDS[cmd]
-            self.mode_manager.set_mode(mode_name)
-            mode_info = self.mode_manager.get_mode()
+            session.mode_manager.set_mode(mode_name)
+            mode_info = session.mode_manager.get_mode()
             return f"✅ Rejim o'zgartirildi: **{mode_info['name']}**"
 
         # /provider yoki /providers — provayder holati yoki tanlash
@@ -193,7 +342,8 @@ class Jarvis:
             if len(parts) >= 2:
                 provider_name = parts[1].lower()
                 try:
-                    self.router.set_provider(provider_name)
+                    self.router.validate_provider(provider_name)
+                    session.forced_provider = provider_name
                     return f"✅ Provayder tanlandi: **{provider_name}**\nAutomatik rejimga qaytish uchun /auto ishlating."
                 except ValueError as exc:
                     return f"❌ {exc}"
@@ -204,21 +354,93 @@ class Jarvis:
         if cmd in (_MODEL_CMD, _MODELS_CMD):
             if len(parts) >= 2:
                 model_name = " ".join(parts[1:])
-                self.router.set_model(model_name)
+                session.forced_model = model_name
                 return f"✅ Model tanlandi: **{model_name}**\nAutomatik rejimga qaytish uchun /auto ishlating."
             else:
                 return self.router.list_all_models()
 
         # /auto — avtomatik rejimga qaytish
         if cmd == _AUTO_CMD:
-            self.router.reset_auto()
+            session.forced_provider = None
+            session.forced_model = None
             return "✅ Avtomatik rejimga qaytildi. Provider va model avtomatik tanlanadi."
 
+        # Lokal CLI dan tashqari (server/Telegram) foydalanuvchilar boshqalarning
+        # transkriptini ko'rmasligi kerak — sessiya ID sidan qat'i nazar
+        owner = None if self._local_cli else session.session_id
+
+        # /session [id|new] — joriy sessiya yoki boshqa sessiyaga o'tish
+        if cmd == _SESSION_CMD:
+            if len(parts) < 2:
+                stats = session.memory.get_stats()
+                return (
+                    f"💬 Joriy sessiya: **{stats['session_id']}** "
+                    f"({stats['short_term_messages']} ta xabar)\n"
+                    "O'tish: /session <nom> | Yangi: /session new | Ro'yxat: /sessions"
+                )
+            session_id = parts[1]
+            if session_id.lower() == "new":
+                session_id = datetime.now().strftime("s%Y%m%d-%H%M%S")
+                if owner is not None:
+                    session_id = owner + _SUBSESSION_SEP + session_id
+            elif owner is not None and not _owns_session(owner, session_id):
+                return (
+                    f"❌ Faqat o'z sessiyalaringizga o'tish mumkin: {owner} yoki "
+                    f"{owner}{_SUBSESSION_SEP}<nom>"
+                )
+            writer = self.sessions.writer_of(session_id)
+            if writer is not None and writer is not session:
+                # Ikki MemoryManager bitta JSONL ga yozsa seq va tarix buziladi
+                return f"❌ **{session_id}** sessiyasi hozir boshqa joyda ochiq."
+            session.memory.switch_session(session_id)
+            count = len(session.memory.get_conversation_history())
+            return f"✅ Sessiya: **{session_id}** ({count} ta xabar yuklandi)"
+
+        # /sessions — saqlangan sessiyalar ro'yxati
+        if cmd == _SESSIONS_CMD:
+            sessions = session.memory.list_sessions()
+            if owner is not None:
+                sessions = [s for s in sessions if _owns_session(owner, s["id"])]
+            if not sessions:
+                return "💬 Saqlangan sessiyalar yo'q."
+            current = session.memory.get_session_id()
+            lines = ["💬 Sessiyalar:", ""]
+            for s in sessions[:20]:
+                marker = " ✅" if s["id"] == current else ""
+                size_kb = s["size_bytes"] / 1024
+                lines.append(f"  • {s['id']} — {s['updated_at']} ({size_kb:.1f} KB){marker}")
+            return "\n".join(lines)
+
+        # /trace [N] — oxirgi so'rovlarning bosqichma-bosqich vaqtlari
+        if cmd == _TRACE_CMD:
+            tracer.discard()
+            if not tracer.enabled:
+                return "🔎 Tracing o'chirilgan (JARVIS_TRACE=0)."
+            try:
+                count = int(parts[1]) if len(parts) > 1 else _TRACE_DEFAULT_COUNT
+            except ValueError:
+                count = _TRACE_DEFAULT_COUNT
+            traces = tracer.recent(count, session_id=session.session_id)
+            if not traces:
+                return "🔎 Hali trace yo'q."
+            header = f"🔎 Oxirgi {len(traces)} ta so'rov:"
+            return "\n\n".join([header] + [format_trace(t) for t in traces])
+
+        # /metrics [raw] — hisoblagichlar, kechikishlar va kesh statistikasi
+        if cmd == _METRICS_CMD:
+            tracer.discard()
+            if len(parts) > 1 and parts[1].lower() == "raw":
+                return _METRICS.render_prometheus().rstrip()
+            summary = _METRICS.format_summary()
+            if not summary:
+                return "📈 Hali metrikalar yo'q."
+            return "📈 Metrikalar:\n" + summary
+
         # /status — hozirgi holat
         if cmd == _STATUS_CMD:
-            status = self.get_status()
-            forced_provider = self.router.get_current_provider()
-            forced_model = self.router.get_current_model()
+            status = self.get_status(session.session_id)
+            forced_provider = session.forced_provider
+            forced_model = session.forced_model
             provider_str = forced_provider if forced_provider else "avtomatik (fallback)"
             model_str = forced_model if forced_model else "avtomatik (rejimga qarab)"
             available = ", ".join(status["providers"]) if status["providers"] else "yo'q"
@@ -231,14 +453,15 @@ class Jarvis:
                 f"  • Mavjud provayderlar: {available}",
                 f"  • AI tayyor: {ai_icon}",
                 f"  • Xotira: {status['memory']['storage_backend']}",
+                f"  • Sessiya: {status['memory']['session_id']}",
             ]
-            study_stats = self.education.get_study_stats()
+            study_stats = session.education.get_study_stats()
             if study_stats["total_sessions"] > 0:
                 lines.append(
                     f"  • O'qish: {study_stats['total_hours']} soat "
                     f"({study_stats['total_sessions']} sessiya)"
                 )
-            focus_stats = self.time_engine.get_focus_stats()
+            focus_stats = session.time_engine.get_focus_stats()
             if focus_stats["active"]:
                 lines.append(
                     f"  • Focus: 🔥 {focus_stats['remaining_minutes']} daqiqa qoldi"
@@ -250,27 +473,34 @@ class Jarvis:
                 )
             cog_level = status.get("cognitive_load", "unknown")
             lines.append(f"  • Kognitiv yuk: {cog_level.upper()}")
+            retrieval = status["retrieval"]
+            if retrieval["requests"]:
+                lines.append(
+                    f"  • Kontekst: o'rtacha {retrieval['avg_tokens_after']:.0f} token, "
+                    f"{retrieval['avg_tokens_saved']:.0f} token tejaldi "
+                    f"({retrieval['requests']} so'rov)"
+                )
             return "\n".join(lines)
 
         # /focus [minutes] | /focus stop — Focus/Pomodoro boshlash yoki to'xtatish
         if cmd == "/focus":
             if len(parts) > 1 and parts[1].lower() == "stop":
-                result = self.time_engine.stop_focus()
+                result = session.time_engine.stop_focus()
                 # Also stop education focus tracker for backward compat
-                self.education.end_focus()
+                session.education.end_focus()
                 return result
             try:
                 minutes = int(parts[1]) if len(parts) > 1 else 25
             except (ValueError, IndexError):
                 minutes = 25
-            self.mode_manager.set_mode("focus")
-            self.time_engine.start_focus(minutes)
-            return self.education.start_focus(minutes)
+            session.mode_manager.set_mode("focus")
+            session.time_engine.start_focus(minutes)
+            return session.education.start_focus(minutes)
 
         # /focus_end — Focus ni tugatish (backward compat)
         if cmd == "/focus_end":
-            self.time_engine.stop_focus()
-            return self.education.end_focus()
+            session.time_engine.stop_focus()
+            return session.education.end_focus()
 
         # /cognitive — kognitiv yuk tahlili
         if cmd == "/cognitive":
@@ -285,15 +515,15 @@ class Jarvis:
         # /study_start <subject> — O'qish sessiyasini boshlash
         if cmd == "/study_start":
             subject = " ".join(parts[1:]) if len(parts) > 1 else "Umumiy"
-            return self.education.start_study_session(subject)
+            return session.education.start_study_session(subject)
 
         # /study_end — O'qish sessiyasini tugatish
         if cmd == "/study_end":
-            return self.education.end_study_session()
+            return session.education.end_study_session()
 
         # /study_stats — O'qish statistikasi
         if cmd == "/study_stats":
-            stats = self.education.get_study_stats()
+            stats = session.education.get_study_stats()
             lines = [
                 "📊 O'qish Statistikasi",
                 f"📚 Jami sessiyalar: {stats['total_sessions']}",
@@ -313,23 +543,28 @@ class Jarvis:
                 return "Foydalanish: /hw_help <fan> <tavsif>"
             subject = parts[1]
             description = " ".join(parts[2:])
-            prompt = self.education.homework_help_prompt(subject, description)
+            prompt = session.education.homework_help_prompt(subject, description)
             messages = [
-                {"role": "system", "content": self.mode_manager.get_system_prompt()},
+                {"role": "system", "content": session.mode_manager.get_system_prompt()},
                 {"role": "user", "content": prompt},
             ]
             try:
-                return self.router.route_request(messages=messages, mode="pro")
+                return self.router.route_request(
+                    messages=messages,
+                    mode="pro",
+                    model=session.forced_model,
+                    provider=session.forced_provider,
+                )
             except Exception as exc:
                 return f"❌ Xato: {exc}"
 
         # /modes — barcha rejimlar ro'yxati
         if cmd == "/modes":
-            modes = self.mode_manager.list_modes()
-            current = self.mode_manager.get_current_mode_name()
+            modes = session.mode_manager.list_modes()
+            current = session.mode_manager.get_current_mode_name()
             lines = ["🧭 Mavjud rejimlar:", ""]
             for m in modes:
-                info = self.mode_manager.get_mode(m)
+                info = session.mode_manager.get_mode(m)
                 marker = " ✅" if m == current else ""
                 lines.append(f"  /{m} — {info['name']}{marker}")
             lines.append("")
@@ -339,10 +574,10 @@ class Jarvis:
         # /mode <name> — rejim almashtirish
         if cmd == "/mode":
             if len(parts) < 2:
-                return self.process("/modes")
+                return self._process(session, "/modes")
             mode_name = parts[1].lower()
-            if self.mode_manager.set_mode(mode_name):
-                info = self.mode_manager.get_mode()
+            if session.mode_manager.set_mode(mode_name):
+                info = session.mode_manager.get_mode()
                 return f"✅ Rejim o'zgartirildi: **{info['name']}**"
             return f"❌ Noma'lum rejim: {mode_name}. /modes ni ko'ring."
 
@@ -350,7 +585,7 @@ class Jarvis:
         if cmd == "/overload":
             hw = self._get_homework_manager()
             if hw is not None:
-                result = self.education.check_overload(hw)
+                result = session.education.check_overload(hw)
                 return result or "✅ Hozircha ish yuki normal. Davom eting!"
             return "✅ Ish yuki tekshirildi — normal."
 
@@ -394,105 +629,281 @@ class Jarvis:
                 lines.append(f"💡 {cog['suggestion']}")
             else:
                 lines.append("📝 Vazifalar mavjud emas")
-            stats = self.education.get_study_stats()
+            stats = session.education.get_study_stats()
             if stats["total_sessions"] > 0:
                 lines.append("")
                 lines.append(f"📊 Bugungi o'qish: {stats['total_minutes']} daqiqa")
             return "\n".join(lines)
 
+        # /schedule [kun], /homework, /tasks, /plan, /reminders
+        intent = _INTENT_COMMANDS.get(cmd)
+        if intent is not None:
+            params = {"day": parts[1].lower()} if intent == "show_schedule" and len(parts) > 1 else {}
+            response = self._run_local_intent(session, intent, params, user_input)
+            return response if response is not None else "❌ Ma'lumotlarni yuklab bo'lmadi."
+
+        # Strukturali so'rovlar (vazifa qo'shish, jadval...) — AI siz lokal bajarish
+        if not user_input.startswith("/"):
+            with tracer.span("local_intent") as span:
+                local_response = self._handle_local_intent(session, user_input)
+                span.set(handled=local_response is not None)
+            if local_response is not None:
+                tracer.annotate(route="local")
+                session.memory.add_to_short_term("user", user_input)
+                session.memory.add_to_short_term("assistant", local_response)
+                return local_response
+
         # Tilni aniqlash
-        detected_lang = self.language.detect(user_input)
+        with tracer.span("language") as span:
+            detected_lang = session.language.detect(user_input)
+            span.set(lang=detected_lang)
+        mode = session.mode_manager.get_current_mode_name()
+        tracer.annotate(route="ai", mode=mode, lang=detected_lang)
 
         # Xotiraga qo'shish
-        self.memory.add_to_short_term("user", user_input)
+        session.memory.add_to_short_term("user", user_input)
 
-        # RAG qidiruvini amalga oshirish
-        rag_context = ""
-        try:
-            rag_results = self.rag.query(user_input, k=3)
-            if rag_results:
-                rag_context = "\n\nMavjud hujjatlardan kontekst:\n" + "\n---\n".join(
-                    f"[{r['source']}]: {r['content']}" for r in rag_results
-                )
-        except Exception:
-            pass
+        # RAG va uzoq muddatli xotiradan kontekst (xotira — shu til va rejimdagi suhbatlar)
+        with tracer.span("retrieve"):
+            rag_context, memory_context = self._retrieve_context(session, user_input, detected_lang, mode)
 
-        # Uzoq muddatli xotiradan qidirish
-        memory_context = ""
-        try:
-            memory_results = self.memory.search_long_term(user_input, k=3)
-            if memory_results:
-                memory_context = "\n\nOldingi suhbatlardan:\n" + "\n".join(
-                    r["content"] for r in memory_results
+        # Tizim promptini yaratish
+        with tracer.span("prompt_build") as span:
+            system_prompt = f"{_load_system_prompt()}\n\n{session.mode_manager.get_system_prompt()}"
+            personality_instruction = self.personality.get_instruction()
+            if personality_instruction:
+                system_prompt = f"{system_prompt}\n\n{personality_instruction}"
+            lang_instruction = session.language.get_language_instruction()
+            if lang_instruction:
+                system_prompt = f"{system_prompt}\n\n{lang_instruction}"
+            if rag_context:
+                system_prompt += rag_context
+            if memory_context:
+                system_prompt += memory_context
+            conversation_summary = session.memory.get_summary()
+            if conversation_summary:
+                system_prompt += f"\n\nOldingi suhbat xulosasi:\n{conversation_summary}"
+
+            # Xabarlar ro'yxatini tayyorlash
+            messages: list[dict] = [{"role": "system", "content": system_prompt}]
+            messages.extend(session.memory.get_conversation_history())
+            span.set(messages=len(messages), prompt_tokens=sum(estimate_tokens(m["content"]) for m in messages))
+
+        # AI ga so'rov yuborish (har bir provayder urinishi — ichki span)
+        with tracer.span("provider") as span:
+            try:
+                response = self.router.route_request(
+                    messages=messages,
+                    mode=mode,
+                    model=session.forced_model,
+                    provider=session.forced_provider,
+                    on_token=on_token,
                 )
-        except Exception:
-            pass
+            except Exception as exc:
+                span.record_error(exc)
+                response = f"❌ AI provayderi bilan bog'lanishda xato: {exc}"
 
-        # Tizim promptini yaratish
-        system_prompt = f"{_load_system_prompt()}\n\n{self.mode_manager.get_system_prompt()}"
-        personality_instruction = self.personality.get_instruction()
-        if personality_instruction:
-            system_prompt = f"{system_prompt}\n\n{personality_instruction}"
-        lang_instruction = self.language.get_language_instruction()
-        if lang_instruction:
-            system_prompt = f"{system_prompt}\n\n{lang_instruction}"
-        if rag_context:
-            system_prompt += rag_context
-        if memory_context:
-            system_prompt += memory_context
-
-        # Xabarlar ro'yxatini tayyorlash
-        messages: list[dict] = [{"role": "system", "content": system_prompt}]
-        messages.extend(self.memory.get_conversation_history())
-
-        # AI ga so'rov yuborish
-        mode = self.mode_manager.get_current_mode_name()
-        try:
-            response = self.router.route_request(
-                messages=messages,
-                mode=mode,
+        with tracer.span("memory_write") as span:
+            # Javobni xotiraga saqlash
+            session.memory.add_to_short_term("assistant", response)
+
+            # Uzoq muddatli xotiraga saqlash (muhim suhbatlar)
+            try:
+                combined = f"Savol: {user_input}\nJavob: {response}"
+                session.memory.add_to_long_term(combined, {"mode": mode, "lang": detected_lang})
+            except Exception as exc:
+                span.record_error(exc)
+
+        return response
+
+    def _retrieve_context(
+        self,
+        session: UserSession,
+        user_input: str,
+        lang: str,
+        mode: str,
+    ) -> tuple[str, str]:
+        """RAG va xotira nomzodlarini olish va promptga kerakligini tanlash.
+
+        Returns:
+            (hujjatlar konteksti, xotira konteksti) — bo'sh satr bo'lishi mumkin
+        """
+        tracer = self.tracer
+        candidates: list[dict] = []
+        with tracer.span("rag") as span:
+            try:
+                for r in self.rag.query(user_input, k=_RETRIEVAL_CANDIDATES):
+                    candidates.append(
+                        {"kind": "rag", "source": r["source"], "content": r["content"], "score": r["score"]}
+                    )
+            except Exception as exc:
+                span.record_error(exc)
+            span.set(hits=len(candidates))
+        with tracer.span("memory") as span:
+            try:
+                memory_results = session.memory.search_long_term(
+                    user_input, k=_RETRIEVAL_CANDIDATES, where={"lang": lang, "mode": mode}
+                )
+                for r in memory_results:
+                    candidates.append({"kind": "memory", "content": r["content"], "score": 1 - r["distance"]})
+                span.set(hits=len(memory_results))
+            except Exception as exc:
+                span.record_error(exc)
+        if not candidates:
+            return "", ""
+
+        baseline = (
+            [c for c in candidates if c["kind"] == "rag"][:_BASELINE_CONTEXT_ITEMS]
+            + [c for c in candidates if c["kind"] == "memory"][:_BASELINE_CONTEXT_ITEMS]
+        )
+        with tracer.span("rerank") as span:
+            selected = self.retrieval.select(
+                user_input,
+                candidates,
+                baseline_tokens=sum(estimate_tokens(c["content"]) for c in baseline),
             )
-        except Exception as exc:
-            response = f"❌ AI provayderi bilan bog'lanishda xato: {exc}"
+            span.set(selected=len(selected), tokens=self.retrieval.last.get("tokens_after", 0))
+        return _format_context(selected)
 
-        # Javobni xotiraga saqlash
-        self.memory.add_to_short_term("assistant", response)
+    def _handle_local_intent(self, session: UserSession, user_input: str) -> Optional[str]:
+        """Lokal klassifikator ishonchli aniqlagan so'rovni bajarish.
 
-        # Uzoq muddatli xotiraga saqlash (muhim suhbatlar)
-        try:
-            combined = f"Savol: {user_input}\nJavob: {response}"
-            self.memory.add_to_long_term(combined, {"mode": mode, "lang": detected_lang})
-        except Exception:
-            pass
+        Returns:
+            Javob matni yoki None (AI ga yuborish kerak bo'lsa).
+        """
+        result = self.intent_parser.classify(user_input)
+        intent = result["intent"]
+        if intent not in _LOCAL_INTENTS:
+            return None
+        # "juma kuni soat 10 da uchrashuvim bor, nima kiyishim kerak?" — savol, vazifa emas
+        if intent in _MUTATING_INTENTS and _QUESTION_RE.search(user_input):
+            return None
+        return self._run_local_intent(session, intent, result["params"], user_input)
 
-        return response
+    def _run_local_intent(
+        self, session: UserSession, intent: str, params: dict, user_input: str
+    ) -> Optional[str]:
+        """Lokal intentni bajarish (klassifikator yoki slash buyruq orqali).
+
+        Returns:
+            Javob matni yoki None (bajarib bo'lmasa).
+        """
+        try:
+            if intent == "show_today":
+                return self._process(session, "/today")
+            if intent == "start_focus":
+                return self._process(session, f"/focus {params.get('minutes', 25)}")
+            if intent == "show_schedule":
+                return self._local_schedule(params)
+            if intent == "show_plan":
+                from life import DailyPlanner
+
+                return DailyPlanner().get_morning_briefing()
+            if intent == "show_reminders":
+                from life import ReminderEngine
+
+                engine = ReminderEngine()
+                reminders = engine.check_all()
+                if not reminders:
+                    return "🔔 Hozircha eslatmalar yo'q ✅"
+                return engine.format_notifications(reminders)
 
-    def process_intent(self, intent: str, params: dict) -> str:
+            hw = self._get_homework_manager()
+            if hw is None:
+                return None
+            if intent == "show_homework":
+                pending = hw.get_pending_homework()
+                if not pending:
+                    return "📝 Uy vazifalari yo'q ✅"
+                lines = [f"📝 Uy vazifalari ({len(pending)} ta):"]
+                for h in pending:
+                    deadline = f" — {h.deadline}" if h.deadline else ""
+                    lines.append(f"  • {h.subject}: {h.description}{deadline}")
+                return "\n".join(lines)
+            if intent == "show_tasks":
+                pending = hw.get_all_pending()
+                if not pending:
+                    return "📋 Bajarilmagan vazifalar yo'q ✅"
+                lines = [f"📋 Vazifalar ({len(pending)} ta):"]
+                for entry in pending:
+                    item = entry["item"]
+                    title = item.title if entry["type"] == "task" else f"{item.subject}: {item.description}"
+                    deadline = f" — {item.deadline}" if item.deadline else ""
+                    lines.append(f"  • {title}{deadline}")
+                return "\n".join(lines)
+
+            deadline = self._local_deadline(params)
+            if intent == "add_task":
+                title = params.get("title") or user_input.strip()
+                task = hw.add_task(title, deadline=deadline)
+                suffix = f" — {deadline}" if deadline else ""
+                return f"✅ Vazifa qo'shildi: **{task.title}**{suffix}"
+            if intent == "add_homework":
+                text = params.get("title") or user_input.strip()
+                subject, _, description = text.partition(" ")
+                subject = subject.rstrip(":,")
+                if subject.lower().endswith("dan") and len(subject) > 5:
+                    subject = subject[:-3]
+                item = hw.add_homework(subject.capitalize(), description or text, deadline)
+                suffix = f" — {deadline}" if deadline else ""
+                return f"✅ Uy vazifasi qo'shildi: **{item.subject}**: {item.description}{suffix}"
+        except Exception:
+            return None
+        return None
+
+    def _local_schedule(self, params: dict) -> str:
+        """Kun bo'yicha dars jadvali matni."""
+        from life import SmartScheduler
+
+        target = date.fromisoformat(params["date"]) if params.get("date") else None
+        day_name = _WEEKDAYS[target.weekday()] if target else None
+        label = target.strftime("%Y-%m-%d %A") if target else "Bugun"
+        if params.get("day") in _WEEKDAYS:
+            day_name = label = params["day"]
+        classes = SmartScheduler().get_schedule(day_name)
+        if not classes:
+            return f"🏫 {label}: dars yo'q"
+        lines = [f"🏫 {label} — darslar ({len(classes)} ta):"]
+        for c in classes:
+            lines.append(f"  {c.start_time}-{c.end_time}: {c.name} ({c.location or '-'})")
+        return "\n".join(lines)
+
+    @staticmethod
+    def _local_deadline(params: dict) -> str:
+        """IntentParser normallashtirgan sana va vaqtdan muddat satri ("YYYY-MM-DD [HH:MM]")."""
+        deadline = params.get("date", "")
+        if deadline and params.get("time"):
+            deadline += f" {params['time']}"
+        return deadline
+
+    def process_intent(
+        self, intent: str, params: dict, session_id: Optional[str] = None
+    ) -> str:
         """Intent parser natijasini qayta ishlash.
 
-        Intent nomini mavjud slash buyruqqa moslab ``process()`` ga yuboradi.
-        Noma'lum intent yoki ``"chat"`` bo'lsa original matn qaytariladi.
+        Intent nomini ``process()`` bajaradigan slash buyruqqa moslab yuboradi.
+        Buyrug'i yo'q intent yoki ``"chat"`` bo'lsa original matn o'zgarishsiz
+        ``process()`` ga beriladi (u lokal klassifikatorni o'zi ishlatadi).
 
         Args:
             intent: IntentParser tomonidan aniqlangan intent nomi.
             params: IntentParser tomonidan ajratilgan parametrlar.
+            session_id: Foydalanuvchi sessiyasi (None — standart sessiya).
 
         Returns:
             JARVIS javobi.
         """
+        # Faqat process() haqiqatan bajaradigan buyruqlar
         _intent_to_command: dict[str, str] = {
             "show_status": "/status",
             "show_schedule": "/schedule",
-            "show_week": "/week",
             "show_homework": "/homework",
             "show_tasks": "/tasks",
             "show_plan": "/plan",
             "show_today": "/today",
-            "show_stats": "/stats",
             "show_reminders": "/reminders",
             "start_focus": "/focus",
             "stop_focus": "/focus stop",
-            "show_help": "/help",
             "show_cognitive": "/cognitive",
             "show_reflect": "/reflect",
             "show_modes": "/modes",
@@ -507,24 +918,44 @@ class Jarvis:
                 cmd = f"/focus {params['minutes']}"
             elif intent == "show_schedule" and params.get("day"):
                 cmd = f"/schedule {params['day']}"
-            return self.process(cmd)
+            return self.process(cmd, session_id)
         # Chat yoki noma'lum intent — original matni qaytarish
-        return self.process(params.get("original", ""))
+        return self.process(params.get("original", ""), session_id)
+
+    def get_brief_status(self, session_id: Optional[str] = None) -> dict:
+        """Header uchun yengil holat: rejim va AI tayyorligi.
 
-    def get_status(self) -> dict:
+        ``get_status`` dan farqli ravishda xotira, RAG va vazifalarni
+        yuklamaydi — har bir REPL qadamida chaqirish uchun.
+        """
+        session = self.sessions.get(session_id or self._default_session_id)
+        return {
+            "session_id": session.session_id,
+            "mode": session.mode_manager.get_current_mode_name(),
+            "ai_available": self.router.is_available(),
+            "providers": self.router.get_available_providers(),
+        }
+
+    def get_status(self, session_id: Optional[str] = None) -> dict:
         """Joriy holat ma'lumotlari."""
+        session = self.sessions.get(session_id or self._default_session_id)
         cog_level = "unknown"
         hw = self._get_homework_manager()
         if hw is not None:
             cog_level = self.cognitive.get_analysis(hw)["level"]
         return {
-            "mode": self.mode_manager.get_current_mode_name(),
-            "language": self.language.get_response_language(),
+            "session_id": session.session_id,
+            "mode": session.mode_manager.get_current_mode_name(),
+            "language": session.language.get_response_language(),
             "ai_available": self.router.is_available(),
             "providers": self.router.get_available_providers(),
-            "memory": self.memory.get_stats(),
+            "memory": session.memory.get_stats(),
             "rag": self.rag.get_stats(),
             "tools": self.tools.get_tool_names(),
+            "retrieval": self.retrieval.stats(),
+            "tracing": self.tracer.stats(),
             "cognitive_load": cog_level,
-            "focus_state": self.time_engine.get_focus_stats(),
+            "focus_state": session.time_engine.get_focus_stats(),
+            "sessions": self.sessions.get_stats(),
         }
+
@@ -0,0 +1,90 @@
+"""
+KeywordMatcher — Aho-Corasick asosidagi ko'p kalit so'zli qidiruv.
+
+Barcha kalit so'zlar import vaqtida bitta avtomatga kompilyatsiya qilinadi,
+matn esa bitta o'tishda skanerlanadi. Har bir kalit so'zning indeksi uning
+ustuvorligi: kichik indeks — yuqori ustuvorlik. Natija ``kw in text``
+tekshiruvlari bilan bir xil (ustma-ust tushgan mosliklar ham topiladi).
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Iterable, Optional
+
+
+class KeywordMatcher:
+    """Kompilyatsiya qilingan Aho-Corasick avtomati."""
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        """
+        Args:
+            keywords: Kalit so'zlar ustuvorlik tartibida (takrorlanishi mumkin).
+        """
+        self.keywords: list[str] = list(keywords)
+        goto: list[dict[str, int]] = [{}]
+        out: list[tuple[int, ...]] = [()]
+        for index, keyword in enumerate(self.keywords):
+            state = 0
+            for ch in keyword:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto.append({})
+                    out.append(())
+                    goto[state][ch] = nxt
+                state = nxt
+            out[state] += (index,)
+
+        # Failure havolalari (BFS tartibida)
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                target = goto[f].get(ch, 0)
+                fail[nxt] = target if target != nxt else 0
+                out[nxt] += out[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+        # DFA o'tishlari — skanerlash paytida to'ldiriladi (memoizatsiya)
+        self._delta: list[dict[str, int]] = [dict(g) for g in goto]
+
+    def _transition(self, state: int, ch: str) -> int:
+        """Failure havolalari orqali o'tishni hisoblash va keshlash."""
+        s = state
+        while s and ch not in self._goto[s]:
+            s = self._fail[s]
+        nxt = self._goto[s].get(ch, 0)
+        self._delta[state][ch] = nxt
+        return nxt
+
+    def scan(self, text: str) -> list[int]:
+        """Matndagi barcha mos kalit so'z indekslarini topish.
+
+        Returns:
+            Topilgan kalit so'z indekslari (matndagi tartibda, takrorlanishi mumkin).
+        """
+        delta = self._delta
+        out = self._out
+        hits: list[int] = []
+        state = 0
+        for ch in text:
+            nxt = delta[state].get(ch)
+            if nxt is None:
+                nxt = self._transition(state, ch)
+            state = nxt
+            if out[state]:
+                hits.extend(out[state])
+        return hits
+
+    def first(self, text: str) -> Optional[int]:
+        """Eng yuqori ustuvorlikdagi (eng kichik indeksli) mos kalit so'z indeksi."""
+        hits = self.scan(text)
+        return min(hits) if hits else None
@@ -0,0 +1,212 @@
+"""
+TrigramLanguageModel — belgi trigrammalari asosidagi til aniqlash modeli.
+
+Tillar: o'zbek (lotin), o'zbek (kirill), ingliz, rus. Har bir til uchun
+trigramma log-ehtimolliklari xeshlangan jadvalda (int16, til bo'yicha
+ketma-ket) saqlanadi va ``mmap`` orqali yuklanadi — jadval nusxalanmaydi,
+ishga tushish vaqti deyarli nolga teng. Baholash matn uzunligiga chiziqli:
+har bir trigramma uchun bitta xesh va har bir til uchun bitta jadval o'qish.
+
+Jadvalni korpusdan qayta qurish:
+    python -m core.lang_model
+"""
+
+from __future__ import annotations
+
+import math
+import mmap
+import re
+import struct
+import sys
+import threading
+from array import array
+from pathlib import Path
+from typing import Optional
+
+_MODEL_DIR = Path(__file__).resolve().parent.parent / "config" / "langid"
+_MODEL_PATH = _MODEL_DIR / "trigrams.bin"
+_CORPUS_DIR = _MODEL_DIR / "corpus"
+_LANGUAGES = ("uz_latn", "uz_cyrl", "en", "ru")
+
+_MAGIC = b"JLID"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHHHH")  # magic, version, til soni, xesh bitlari, masshtab
+_LABEL_SIZE = 8
+_DEFAULT_BITS = 13  # 8192 ta katak × 4 til × 2 bayt = 64 KB
+_DEFAULT_SCALE = 1000  # log-ehtimollik × masshtab → int16
+_SMOOTHING = 0.5
+
+_HASH_MULT = 2654435761
+_MASK32 = 0xFFFFFFFF
+_APOSTROPHES = str.maketrans({"ʻ": "'", "ʼ": "'", "‘": "'", "’": "'", "`": "'"})
+_NON_LETTER_RE = re.compile(r"[^\w']+|[\d_]+")
+
+
+def _normalize(text: str) -> str:
+    """Kichik harf, yagona apostrof, harf bo'lmagan belgilar → bitta bo'shliq."""
+    cleaned = _NON_LETTER_RE.sub(" ", text.lower().translate(_APOSTROPHES)).strip()
+    return f" {cleaned} " if cleaned else ""
+
+
+def _buckets(text: str, bits: int) -> list[int]:
+    """Normallashtirilgan matndagi har bir trigramma uchun jadval katagi."""
+    codes = list(map(ord, text))
+    shift = 32 - bits
+    return [
+        ((((a << 20) ^ (b << 10) ^ c) * _HASH_MULT) & _MASK32) >> shift
+        for a, b, c in zip(codes, codes[1:], codes[2:])
+    ]
+
+
+class TrigramLanguageModel:
+    """mmap qilingan trigramma jadvali ustidagi til klassifikatori."""
+
+    def __init__(self, table: memoryview, labels: tuple[str, ...], bits: int, scale: int) -> None:
+        """
+        Args:
+            table: int16 log-ehtimolliklar, ``[til][katak]`` tartibida.
+            labels: Til yorliqlari (jadvaldagi tartibda).
+            bits: Xesh bitlari soni (kataklar soni = 2**bits).
+            scale: int16 qiymatlarini log-ehtimollikka qaytarish masshtabi.
+        """
+        size = 1 << bits
+        self.labels = labels
+        self.bits = bits
+        self._scale = float(scale)
+        self._rows = [table[i * size:(i + 1) * size] for i in range(len(labels))]
+
+    @classmethod
+    def load(cls, path: Path = _MODEL_PATH) -> "TrigramLanguageModel":
+        """Jadvalni fayldan mmap orqali yuklash."""
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, n_langs, bits, scale = _HEADER.unpack_from(mm, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"Noto'g'ri til modeli fayli: {path}")
+        offset = _HEADER.size
+        labels = tuple(
+            mm[offset + i * _LABEL_SIZE:offset + (i + 1) * _LABEL_SIZE].rstrip(b"\0").decode()
+            for i in range(n_langs)
+        )
+        offset += n_langs * _LABEL_SIZE
+        expected = n_langs * (1 << bits) * 2
+        if len(mm) - offset < expected:
+            raise ValueError(f"Til modeli fayli to'liq emas: {path}")
+        if sys.byteorder == "little":
+            table = memoryview(mm)[offset:offset + expected].cast("h")
+        else:
+            values = array("h", mm[offset:offset + expected])
+            values.byteswap()
+            table = memoryview(values)
+        return cls(table, labels, bits, scale)
+
+    @classmethod
+    def train(
+        cls,
+        corpora: dict[str, str],
+        bits: int = _DEFAULT_BITS,
+        scale: int = _DEFAULT_SCALE,
+    ) -> "TrigramLanguageModel":
+        """Korpuslardan xotirada model qurish.
+
+        Args:
+            corpora: {til yorlig'i: o'quv matni}.
+        """
+        size = 1 << bits
+        values = array("h")
+        for label in corpora:
+            counts = [0] * size
+            total = 0
+            for line in corpora[label].splitlines():
+                for bucket in _buckets(_normalize(line), bits):
+                    counts[bucket] += 1
+                    total += 1
+            denom = total + _SMOOTHING * size
+            values.extend(
+                max(-32768, round(math.log((c + _SMOOTHING) / denom) * scale)) for c in counts
+            )
+        return cls(memoryview(values), tuple(corpora), bits, scale)
+
+    def save(self, path: Path = _MODEL_PATH) -> None:
+        """Jadvalni fayl formatida (little-endian) saqlash."""
+        values = array("h")
+        for row in self._rows:
+            values.extend(row)
+        if sys.byteorder != "little":
+            values.byteswap()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(
+                _HEADER.pack(_MAGIC, _VERSION, len(self.labels), self.bits, int(self._scale))
+            )
+            for label in self.labels:
+                f.write(label.encode().ljust(_LABEL_SIZE, b"\0"))
+            f.write(values.tobytes())
+        tmp_path.replace(path)
+
+    def probabilities(self, text: str) -> dict[str, float]:
+        """Har bir til uchun posterior ehtimollik (teng prior bilan).
+
+        Returns:
+            {til yorlig'i: ehtimollik}; trigramma bo'lmasa — bo'sh lug'at.
+        """
+        buckets = _buckets(_normalize(text), self.bits)
+        if not buckets:
+            return {}
+        scores = [sum(map(row.__getitem__, buckets)) / self._scale for row in self._rows]
+        best = max(scores)
+        weights = [math.exp(s - best) for s in scores]
+        total = sum(weights)
+        return {label: w / total for label, w in zip(self.labels, weights)}
+
+    def predict(self, text: str) -> tuple[Optional[str], float]:
+        """Eng ehtimolli til va uning ishonchliligi.
+
+        Returns:
+            (til yorlig'i, ishonch 0..1); aniqlab bo'lmasa (None, 0.0).
+        """
+        probs = self.probabilities(text)
+        if not probs:
+            return None, 0.0
+        label = max(probs, key=probs.__getitem__)
+        return label, probs[label]
+
+
+def build_model(
+    corpus_dir: Path = _CORPUS_DIR, bits: int = _DEFAULT_BITS
+) -> TrigramLanguageModel:
+    """``corpus_dir/<til>.txt`` fayllaridan model qurish."""
+    corpora = {
+        label: (corpus_dir / f"{label}.txt").read_text(encoding="utf-8")
+        for label in _LANGUAGES
+    }
+    return TrigramLanguageModel.train(corpora, bits=bits)
+
+
+_model: Optional[TrigramLanguageModel] = None
+_model_failed = False
+_model_lock = threading.Lock()
+
+
+def get_language_model() -> Optional[TrigramLanguageModel]:
+    """Umumiy modelni qaytarish (fayl yo'q bo'lsa korpusdan quriladi, xato bo'lsa None)."""
+    global _model, _model_failed
+    if _model is None and not _model_failed:
+        with _model_lock:
+            if _model is None and not _model_failed:
+                try:
+                    _model = TrigramLanguageModel.load()
+                except (OSError, ValueError, struct.error):
+                    try:
+                        _model = build_model()
+                        _model.save()
+                    except (OSError, ValueError):
+                        _model_failed = _model is None
+    return _model
+
+
+if __name__ == "__main__":
+    model = build_model()
+    model.save()
+    print(f"Til modeli saqlandi: {_MODEL_PATH} ({_MODEL_PATH.stat().st_size} bayt)")
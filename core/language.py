@@ -5,7 +5,7 @@ Auto-detect: O'zbek, Ingliz, Rus.
 
 from __future__ import annotations
 
-import re
+from .text_features import analyze
 
 
 # Uzbek-specific characters (NOT 'o' which is too common in English)
@@ -29,6 +29,8 @@ class LanguageDetector:
 
     def __init__(self) -> None:
         self._current_language: str = "uz"
+        self._current_script: str = "latn"
+        self._confidence: float = 0.0
 
     def detect(self, text: str) -> str:
         """Matn tilini aniqlash.
@@ -38,35 +40,29 @@ class LanguageDetector:
             "en" — Ingliz
             "ru" — Rus
         """
-        if not text or not text.strip():
-            return self._current_language
-
-        text_lower = text.lower()
-        words = re.findall(r"\b\w+\b", text_lower)
+        return self.detect_with_confidence(text)[0]
 
-        # Rus harflari borligini tekshirish
-        ru_char_count = sum(1 for ch in text if ch in _RU_CHARS)
-        if ru_char_count > len(text) * 0.3:
-            self._current_language = "ru"
-            return "ru"
+    def detect_with_confidence(self, text: str) -> tuple[str, float]:
+        """Matn tilini ishonchlilik bilan aniqlash.
 
-        # O'zbek-spetsifik harflar yoki so'zlar
-        uz_word_matches = sum(1 for w in words if w in _UZ_WORDS)
-        uz_char_matches = sum(1 for ch in text if ch in _UZ_CHARS)
+        Ishonch past bo'lsa (qisqa yoki aralash matn) joriy til saqlanadi.
 
-        if uz_char_matches >= 1 or uz_word_matches >= 1:
-            self._current_language = "uz"
-            return "uz"
+        Returns:
+            (til, ishonch 0..1)
+        """
+        if not text or not text.strip():
+            return self._current_language, 0.0
 
-        # Ingliz tili — lotin harflari ko'p bo'lsa
-        latin_count = sum(1 for ch in text if ch.isalpha() and ch.isascii())
-        if latin_count > len(text) * 0.5:
-            # O'zbek lotin alifbosidan farqlash (ko'p umumiy so'zlar)
-            # Agar o'zbek so'zlari yo'q bo'lsa, ingliz
-            self._current_language = "en"
-            return "en"
+        features = analyze(text)
+        self._confidence = features.language_confidence
+        if features.language:
+            self._current_language = features.language
+            self._current_script = features.script
+        return self._current_language, self._confidence
 
-        return self._current_language
+    def get_script(self) -> str:
+        """Joriy yozuv: "latn" yoki "cyrl"."""
+        return self._current_script
 
     def get_response_language(self) -> str:
         """Joriy javob tilini qaytarish."""
@@ -76,6 +72,7 @@ class LanguageDetector:
         """Tilni qo'lda o'rnatish."""
         if lang in ("uz", "en", "ru"):
             self._current_language = lang
+            self._current_script = "cyrl" if lang == "ru" else "latn"
 
     def get_language_instruction(self) -> str:
         """Joriy til uchun tizim ko'rsatmasini qaytarish."""
@@ -84,4 +81,6 @@ class LanguageDetector:
             "en": "The user is writing in English. Respond in English.",
             "ru": "Пользователь пишет на русском. Отвечайте на русском языке.",
         }
+        if self._current_language == "uz" and self._current_script == "cyrl":
+            return "Фойдаланувчи ўзбек тилида кирилл ёзувида ёзмоқда. Кирилл ёзувида жавоб беринг."
         return instructions.get(self._current_language, "")
@@ -0,0 +1,80 @@
+"""
+Dangasa (lazy) yuklash yordamchilari.
+
+Og'ir quyi tizimlar (ChromaDB, web qidiruv, ovoz, kod bajaruvchi) va ular
+turgan modullar faqat birinchi murojaatda import qilinadi va yaratiladi —
+masalan ``/today`` yozgan foydalanuvchi ChromaDB ni umuman yuklamaydi.
+"""
+
+from __future__ import annotations
+
+import threading
+from importlib import import_module
+from typing import Any, Callable, Union
+
+
+def resolve(target: str) -> Any:
+    """``"paket.modul:Nom"`` ko'rinishidagi manzildan obyektni import qilish."""
+    module_name, _, attr = target.partition(":")
+    module = import_module(module_name)
+    return getattr(module, attr) if attr else module
+
+
+class LazyProxy:
+    """Obyektni birinchi atribut murojaatida yaratadigan proksi (thread-safe).
+
+    Misol::
+
+        self.rag = LazyProxy("core.rag:RAGEngine")
+        self.rag.query("...")  # core.rag shu yerda import qilinadi
+    """
+
+    def __init__(self, factory: Union[str, Callable[..., Any]], *args: Any, **kwargs: Any) -> None:
+        """
+        Args:
+            factory: Chaqiriladigan obyekt yoki ``"modul:Nom"`` manzili.
+            *args, **kwargs: Yaratishda uzatiladigan argumentlar.
+        """
+        self._lazy_factory = factory
+        self._lazy_args = args
+        self._lazy_kwargs = kwargs
+        self._lazy_instance: Any = None
+        self._lazy_loaded = False
+        self._lazy_lock = threading.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        """Obyekt allaqachon yaratilganmi."""
+        return self._lazy_loaded
+
+    def get(self) -> Any:
+        """Asl obyekt (kerak bo'lsa shu yerda yaratiladi)."""
+        if not self._lazy_loaded:
+            with self._lazy_lock:
+                if not self._lazy_loaded:
+                    factory = self._lazy_factory
+                    if isinstance(factory, str):
+                        factory = resolve(factory)
+                    self._lazy_instance = factory(*self._lazy_args, **self._lazy_kwargs)
+                    self._lazy_loaded = True
+        return self._lazy_instance
+
+    def method(self, name: str) -> Callable[..., Any]:
+        """Obyektni yaratmasdan uning metodiga havola (chaqirilganda yaratiladi)."""
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            return getattr(self.get(), name)(*args, **kwargs)
+
+        call.__name__ = name
+        return call
+
+    def __getattr__(self, name: str) -> Any:
+        # Faqat proksida yo'q atributlar uchun chaqiriladi
+        if name.startswith("_lazy_"):
+            raise AttributeError(name)
+        return getattr(self.get(), name)
+
+    def __repr__(self) -> str:
+        if self._lazy_loaded:
+            return f"LazyProxy({self._lazy_instance!r})"
+        return f"LazyProxy({self._lazy_factory!r}, yuklanmagan)"
@@ -1,12 +1,50 @@
 """
 Xotira tizimi — qisqa muddatli va uzoq muddatli xotira.
-ChromaDB bo'lmasa, in-memory fallback ishlatiladi.
+Vektor ombori (ChromaDB yoki NumPy) bo'lmasa, in-memory fallback ishlatiladi.
+
+Qisqa muddatli tarix uzaysa, eng eski xabarlar fon oqimida "fast" model
+yordamida yig'ma xulosaga siqiladi (rolling summary) va diskka saqlanadi.
+SessionStore berilsa, suhbat sessiya bo'yicha diskda saqlanadi va qayta
+ishga tushganda faqat oxirgi oyna dangasa (lazy) yuklanadi.
 """
 
 from __future__ import annotations
 
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
 from typing import Any, Optional
 
+from .metrics import get_registry
+from .vector_store import build_where, get_vector_store_manager, match_where
+
+_SUMMARY_THRESHOLD = 30  # Tarix shu sondan oshsa xulosa qilish boshlanadi
+_SUMMARY_BATCH = 20  # Har safar siqiladigan eng eski xabarlar soni
+_SUMMARY_MAX_TOKENS = 400
+_SUMMARY_FILE = "conversation_summary.json"
+_SUMMARY_PROMPT = (
+    "You maintain a rolling summary of a conversation between a user and the "
+    "JARVIS assistant. Merge the previous summary with the new messages into one "
+    "concise summary (max 150 words). Keep facts, decisions, names, dates, open "
+    "tasks and user preferences. Write it in the language of the conversation. "
+    "Return only the summary text."
+)
+
+_METRICS = get_registry()
+_MEMORY_WRITES = _METRICS.counter("jarvis_memory_writes_total", "Xotiraga yozuvlar", ["store"])
+_MEMORY_SEARCH_SECONDS = _METRICS.histogram(
+    "jarvis_memory_search_seconds", "Uzoq muddatli xotiradan qidiruv vaqti"
+)
+_MEMORY_SUMMARIES = _METRICS.counter(
+    "jarvis_memory_summaries_total", "Yig'ma xulosa urinishlari", ["outcome"]
+)
+_VECTOR_FALLBACKS = _METRICS.counter(
+    "jarvis_vector_store_fallbacks_total",
+    "Vektor ombori xatosi sababli in-memory zaxiraga o'tishlar",
+    ["component", "op"],
+)
+
 
 class MemoryManager:
     """Qisqa va uzoq muddatli xotira boshqaruvchisi."""
@@ -16,110 +54,374 @@ class MemoryManager:
         short_term_limit: int = 50,
         collection_name: str = "jarvis_memory",
         persist_dir: str = "./data/memory",
+        router: Any = None,
+        summary_threshold: int = _SUMMARY_THRESHOLD,
+        summary_batch: int = _SUMMARY_BATCH,
+        session_store: Any = None,
+        session_id: str = "default",
+        shared_long_term: Optional["MemoryManager"] = None,
     ) -> None:
         self._short_term: list[dict] = []
+        self._short_term_seq: list[int] = []
         self._short_term_limit = short_term_limit
+        self._session_store = session_store
+        self._session_id = session_id
+        self._loaded = session_store is None
+        self._lock = threading.RLock()
+        self._router = router
+        self._summary_threshold = summary_threshold
+        self._summary_batch = max(1, summary_batch)
+        self._summary = ""
+        self._summarized_messages = 0
+        self._summarized_through = 0
+        self._summary_generation = 0
+        self._summary_path = Path(persist_dir) / _SUMMARY_FILE
+        self._summary_thread: Optional[threading.Thread] = None
+        if session_store is None:
+            self._load_summary()
         self._collection_name = collection_name
         self._persist_dir = persist_dir
-        self._chroma_client: Any = None
-        self._collection: Any = None
+        self._vector_store: Any = None
         self._in_memory_store: list[dict] = []
-        self._use_chroma = False
-        self._init_long_term()
+        self._use_vector_store = False
+        # Vektor ombori birinchi uzoq muddatli murojaatda ishga tushiriladi
+        self._long_term_ready = False
+        self._long_term_owner: MemoryManager = self
+        if shared_long_term is not None:
+            # Og'ir resurslar (vektor ombori/kolleksiya) sessiyalar orasida umumiy
+            self._long_term_owner = shared_long_term._long_term_owner
+            self._in_memory_store = shared_long_term._in_memory_store
+
+    def _ensure_long_term(self) -> None:
+        """Uzoq muddatli saqlashni birinchi murojaatda ishga tushirish."""
+        if self._long_term_ready:
+            return
+        owner = self._long_term_owner
+        if owner is not self:
+            owner._ensure_long_term()
+            self._vector_store = owner._vector_store
+            self._use_vector_store = owner._use_vector_store
+            self._long_term_ready = True
+            return
+        with self._lock:
+            if not self._long_term_ready:
+                self._init_long_term()
+                self._long_term_ready = True
 
     def _init_long_term(self) -> None:
-        """ChromaDB ni ishga tushirish (bo'lmasa in-memory ishlatiladi)."""
+        """Umumiy vektor kolleksiyasini olish (bo'lmasa in-memory ishlatiladi)."""
         try:
-            import chromadb  # type: ignore
+            manager = get_vector_store_manager(self._persist_dir)
+            self._use_vector_store = manager.collection(self._collection_name) is not None
+            self._vector_store = manager
+        except Exception:
+            self._use_vector_store = False
+
+    # === Sessiyalar ===
 
-            self._chroma_client = chromadb.PersistentClient(path=self._persist_dir)
-            self._collection = self._chroma_client.get_or_create_collection(
-                name=self._collection_name,
-                metadata={"hnsw:space": "cosine"},
+    def _ensure_loaded(self) -> None:
+        """Sessiya tarixini (faqat oxirgi oynani) birinchi murojaatda yuklash."""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._summary_path = self._session_store.summary_path(self._session_id)
+            self._load_summary()
+            tail = self._session_store.load_tail(
+                self._session_id,
+                self._short_term_limit,
+                after_seq=self._summarized_through,
             )
-            self._use_chroma = True
-        except ImportError:
-            self._use_chroma = False
-        except Exception:
-            self._use_chroma = False
+            self._short_term_seq = [seq for seq, _ in tail]
+            self._short_term = [msg for _, msg in tail]
+            self._loaded = True
+
+    def for_session(self, session_id: str) -> "MemoryManager":
+        """Boshqa sessiya uchun xotira nusxasi.
+
+        Qisqa muddatli tarix alohida, uzoq muddatli saqlash, router va
+        SessionStore esa shu obyekt bilan umumiy bo'ladi.
+        """
+        return MemoryManager(
+            short_term_limit=self._short_term_limit,
+            collection_name=self._collection_name,
+            persist_dir=self._persist_dir,
+            router=self._router,
+            summary_threshold=self._summary_threshold,
+            summary_batch=self._summary_batch,
+            session_store=self._session_store,
+            session_id=session_id,
+            shared_long_term=self,
+        )
+
+    def flush(self) -> None:
+        """Buferlangan sessiya yozuvlarini diskka yozish."""
+        if self._session_store is not None:
+            self._session_store.flush(self._session_id)
+
+    def get_session_id(self) -> str:
+        """Joriy sessiya ID si."""
+        return self._session_id
+
+    def switch_session(self, session_id: str) -> None:
+        """Boshqa sessiyaga o'tish (yangi bo'lsa bo'sh tarix bilan boshlanadi)."""
+        if self._session_store is None:
+            raise RuntimeError("Sessiyalar yoqilmagan (SessionStore berilmagan)")
+        self._session_store.flush(self._session_id)
+        with self._lock:
+            self._session_id = session_id
+            self._short_term = []
+            self._short_term_seq = []
+            self._summary = ""
+            self._summarized_messages = 0
+            self._summarized_through = 0
+            self._summary_generation += 1
+            self._loaded = False
+
+    def list_sessions(self) -> list[dict]:
+        """Saqlangan sessiyalar ro'yxati."""
+        if self._session_store is None:
+            return []
+        return self._session_store.list_sessions()
 
     # === Qisqa muddatli xotira ===
 
     def add_to_short_term(self, role: str, content: str) -> None:
         """Suhbat tarixiga xabar qo'shish."""
-        self._short_term.append({"role": role, "content": content})
-        if len(self._short_term) > self._short_term_limit:
-            # Eng eskisini o'chirish (system xabardan keyin)
-            self._short_term = self._short_term[-self._short_term_limit :]
+        self._ensure_loaded()
+        seq = 0
+        if self._session_store is not None:
+            seq = self._session_store.append(self._session_id, role, content)
+        with self._lock:
+            self._short_term.append({"role": role, "content": content})
+            self._short_term_seq.append(seq)
+            if len(self._short_term) > self._short_term_limit:
+                # Eng eskisini o'chirish (system xabardan keyin)
+                self._short_term = self._short_term[-self._short_term_limit :]
+                self._short_term_seq = self._short_term_seq[-self._short_term_limit :]
+            needs_summary = len(self._short_term) > self._summary_threshold
+        _MEMORY_WRITES.labels("short_term").inc()
+        if needs_summary:
+            self._schedule_summary()
 
     def get_conversation_history(self) -> list[dict]:
         """Suhbat tarixini qaytarish."""
-        return list(self._short_term)
+        self._ensure_loaded()
+        with self._lock:
+            return list(self._short_term)
 
     def clear_short_term(self) -> None:
-        """Qisqa muddatli xotirani tozalash."""
-        self._short_term = []
+        """Qisqa muddatli xotirani (va yig'ma xulosani) tozalash."""
+        self._ensure_loaded()
+        with self._lock:
+            self._short_term = []
+            self._short_term_seq = []
+            self._summary = ""
+            self._summarized_messages = 0
+            self._summarized_through = 0
+            self._summary_generation += 1
+        if self._session_store is not None:
+            self._session_store.mark_cleared(self._session_id)
+        self._save_summary()
+
+    # === Yig'ma xulosa (rolling summary) ===
+
+    def set_router(self, router: Any) -> None:
+        """Xulosa qilish uchun ishlatiladigan AIRouter ni o'rnatish."""
+        self._router = router
+
+    def get_summary(self) -> str:
+        """Siqilgan eski suhbat xulosasini qaytarish (bo'lmasa bo'sh satr)."""
+        self._ensure_loaded()
+        with self._lock:
+            return self._summary
+
+    def wait_for_summary(self, timeout: Optional[float] = None) -> None:
+        """Fondagi xulosa qilish jarayoni tugashini kutish."""
+        thread = self._summary_thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _schedule_summary(self) -> None:
+        """Eng eski xabarlarni fon oqimida xulosaga siqishni boshlash.
+
+        Bir vaqtning o'zida faqat bitta xulosa oqimi ishlaydi; foydalanuvchi
+        navbati hech qachon kutib qolmaydi.
+        """
+        if self._router is None:
+            return
+        with self._lock:
+            if self._summary_thread is not None and self._summary_thread.is_alive():
+                return
+            batch = self._short_term[: self._summary_batch]
+            if not batch:
+                return
+            last_seq = self._short_term_seq[len(batch) - 1]
+            self._summary_thread = threading.Thread(
+                target=self._summarize,
+                args=(batch, last_seq, self._summary, self._summary_generation),
+                name="jarvis-memory-summary",
+                daemon=True,
+            )
+            self._summary_thread.start()
+
+    def _summarize(
+        self, batch: list[dict], last_seq: int, previous: str, generation: int
+    ) -> None:
+        """Xabarlar to'plamini oldingi xulosa bilan birlashtirish (fon oqimi)."""
+        transcript = "\n".join(f"{m['role']}: {m['content']}" for m in batch)
+        user_content = (
+            f"Previous summary:\n{previous or '(none)'}\n\nNew messages:\n{transcript}"
+        )
+        try:
+            summary = self._router.route_request(
+                messages=[
+                    {"role": "system", "content": _SUMMARY_PROMPT},
+                    {"role": "user", "content": user_content},
+                ],
+                mode="fast",
+                temperature=0.2,
+                max_tokens=_SUMMARY_MAX_TOKENS,
+            )
+        except Exception:
+            _MEMORY_SUMMARIES.labels("error").inc()
+            return
+        summary = (summary or "").strip()
+        if not summary:
+            _MEMORY_SUMMARIES.labels("empty").inc()
+            return
+
+        batch_ids = {id(m) for m in batch}
+        with self._lock:
+            # Oqim ishlayotganda tarix tozalangan bo'lsa — natijani tashlab yuborish
+            if self._summary_generation != generation:
+                _MEMORY_SUMMARIES.labels("stale").inc()
+                return
+            kept = [
+                (m, seq)
+                for m, seq in zip(self._short_term, self._short_term_seq)
+                if id(m) not in batch_ids
+            ]
+            self._short_term = [m for m, _ in kept]
+            self._short_term_seq = [seq for _, seq in kept]
+            self._summary = summary
+            self._summarized_messages += len(batch)
+            self._summarized_through = max(self._summarized_through, last_seq)
+        _MEMORY_SUMMARIES.labels("ok").inc()
+        self._save_summary()
+
+    def _load_summary(self) -> None:
+        """Saqlangan xulosani diskdan yuklash."""
+        try:
+            with open(self._summary_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self._summary = str(data.get("summary", ""))
+                self._summarized_messages = int(data.get("summarized_messages", 0))
+                self._summarized_through = int(data.get("summarized_through", 0))
+        except (OSError, ValueError):
+            pass
+
+    def _save_summary(self) -> None:
+        """Xulosani diskka atomar yozish."""
+        with self._lock:
+            data = {
+                "summary": self._summary,
+                "summarized_messages": self._summarized_messages,
+                "summarized_through": self._summarized_through,
+                "updated_at": datetime.now().isoformat(timespec="seconds"),
+            }
+        try:
+            self._summary_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._summary_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            tmp_path.replace(self._summary_path)
+        except OSError:
+            pass
 
     # === Uzoq muddatli xotira ===
 
     def add_to_long_term(self, content: str, metadata: Optional[dict] = None) -> None:
-        """Uzoq muddatli xotiraga ma'lumot qo'shish."""
+        """Uzoq muddatli xotiraga ma'lumot qo'shish.
+
+        Metadata ga yozilgan vaqt (``ts``, epoch sekund) qo'shiladi — sana
+        oralig'i bo'yicha qidirish uchun.
+        """
         if not content.strip():
             return
 
-        meta = metadata or {}
+        meta = dict(metadata or {})
+        meta.setdefault("ts", int(datetime.now().timestamp()))
 
-        if self._use_chroma and self._collection is not None:
+        self._ensure_long_term()
+        _MEMORY_WRITES.labels("long_term").inc()
+        if self._use_vector_store:
             try:
                 import uuid
 
-                doc_id = str(uuid.uuid4())
-                self._collection.add(
+                self._vector_store.add(
+                    self._collection_name,
                     documents=[content],
                     metadatas=[meta],
-                    ids=[doc_id],
+                    ids=[str(uuid.uuid4())],
                 )
                 return
             except Exception:
-                pass
+                _VECTOR_FALLBACKS.labels("memory", "add").inc()
 
         # Fallback: in-memory
         self._in_memory_store.append({"content": content, "metadata": meta})
         if len(self._in_memory_store) > 1000:
-            self._in_memory_store = self._in_memory_store[-1000:]
+            # Joyida qisqartirish — ro'yxat sessiyalar orasida umumiy
+            del self._in_memory_store[:-1000]
 
-    def search_long_term(self, query: str, k: int = 5) -> list[dict]:
+    def search_long_term(
+        self,
+        query: str,
+        k: int = 5,
+        where: Optional[dict] = None,
+        since: Any = None,
+        until: Any = None,
+    ) -> list[dict]:
         """Uzoq muddatli xotiradan qidiruv.
 
+        Args:
+            query: Qidiruv matni
+            k: Natijalar soni
+            where: Metadata filtri, masalan ``{"lang": "uz", "mode": "pro"}``
+                yoki ``{"mode": {"$in": ["pro", "code"]}}``
+            since: Shu vaqtdan keyin saqlangan yozuvlar (datetime, ISO satr, epoch)
+            until: Shu vaqtgacha saqlangan yozuvlar
+
         Returns:
             [{"content": str, "metadata": dict, "distance": float}]
         """
         if not query.strip():
             return []
 
-        if self._use_chroma and self._collection is not None:
+        with _MEMORY_SEARCH_SECONDS.time():
+            return self._search_long_term(query, k, build_where(where, since, until))
+
+    def _search_long_term(self, query: str, k: int, where: Optional[dict]) -> list[dict]:
+        """Vektor omboridan (bo'lmasa kalit so'z bo'yicha) qidirish."""
+        self._ensure_long_term()
+        if self._use_vector_store:
             try:
-                results = self._collection.query(
-                    query_texts=[query],
-                    n_results=min(k, self._collection.count()),
-                )
-                if not results or not results.get("documents"):
-                    return []
-                docs = results["documents"][0]
-                metas = results.get("metadatas", [[]])[0]
-                distances = results.get("distances", [[]])[0]
+                hits = self._vector_store.query(self._collection_name, [query], k=k, where=where)[0]
                 return [
-                    {"content": d, "metadata": m, "distance": dist}
-                    for d, m, dist in zip(docs, metas, distances)
+                    {"content": h["content"], "metadata": h["metadata"], "distance": h["distance"]}
+                    for h in hits
                 ]
             except Exception:
-                pass
+                _VECTOR_FALLBACKS.labels("memory", "query").inc()
 
         # Fallback: simple keyword search
         query_lower = query.lower()
         results = []
         for item in self._in_memory_store:
-            if query_lower in item["content"].lower():
+            if query_lower in item["content"].lower() and match_where(where, item["metadata"]):
                 results.append(
                     {"content": item["content"], "metadata": item["metadata"], "distance": 0.5}
                 )
@@ -128,17 +430,22 @@ class MemoryManager:
     def get_stats(self) -> dict:
         """Xotira statistikasi."""
         long_term_count = 0
-        if self._use_chroma and self._collection is not None:
+        self._ensure_long_term()
+        if self._use_vector_store:
             try:
-                long_term_count = self._collection.count()
+                long_term_count = self._vector_store.count(self._collection_name)
             except Exception:
                 long_term_count = len(self._in_memory_store)
         else:
             long_term_count = len(self._in_memory_store)
 
+        self._ensure_loaded()
         return {
+            "session_id": self._session_id,
             "short_term_messages": len(self._short_term),
             "short_term_limit": self._short_term_limit,
+            "summarized_messages": self._summarized_messages,
+            "summary_chars": len(self._summary),
             "long_term_entries": long_term_count,
-            "storage_backend": "chromadb" if self._use_chroma else "in-memory",
+            "storage_backend": self._vector_store.backend if self._use_vector_store else "in-memory",
         }
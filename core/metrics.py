@@ -0,0 +1,402 @@
+"""
+Metrikalar reyestri — hisoblagichlar, gauge'lar va qat'iy bucketli histogrammalar.
+
+Modullar metrikalarni import vaqtida e'lon qiladi va ishlash davomida
+yangilaydi::
+
+    _REQUESTS = get_registry().counter(
+        "jarvis_provider_requests_total", "AI provayderga urinishlar", ["provider", "outcome"]
+    )
+    _REQUESTS.labels("gemini", "ok").inc()
+
+Har bir seriya (metrika + label qiymatlari) o'z qulfiga ega va kritik
+bo'lim bir necha amaldan iborat — turli seriyalar bir-birini kutmaydi,
+bitta seriyadagi raqobat esa juda qisqa. Label to'plamlari keshlanadi
+(qayta murojaat — bitta dict qidiruvi).
+
+Natija Prometheus matn formatida (``render_prometheus``, server rejimida
+``GET /metrics``) yoki qisqa jadval sifatida (``format_summary``, CLI
+dagi ``/metrics``) olinadi. Tashqi kutubxona talab qilinmaydi.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Iterable, Optional
+
+# Sekundlarda: kesh/disk (ms) dan AI provayder (o'nlab sekund) gacha
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+Collector = Callable[[], Iterable[tuple]]
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{k}="{_escape_label(str(v))}"' for k, v in labels.items())
+    return "{" + inner + "}"
+
+
+class _CounterValue:
+    __slots__ = ("_lock", "value")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise ValueError("Hisoblagich faqat oshishi mumkin")
+        with self._lock:
+            self.value += amount
+
+
+class _GaugeValue:
+    __slots__ = ("_lock", "value", "_function")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float) -> None:
+        self.value = float(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Qiymatni o'qish vaqtida hisoblash (masalan faol sessiyalar soni)."""
+        self._function = function
+
+    def get(self) -> float:
+        if self._function is not None:
+            try:
+                return float(self._function())
+            except Exception:
+                return math.nan
+        return self.value
+
+
+class _Timer:
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, histogram: "_HistogramValue") -> None:
+        self._histogram = histogram
+        self._start = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._histogram.observe(time.perf_counter() - self._start)
+
+
+class _HistogramValue:
+    __slots__ = ("_lock", "_bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: tuple) -> None:
+        self._lock = threading.Lock()
+        self._bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # oxirgisi — +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self._bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def time(self) -> _Timer:
+        """Blok bajarilish vaqtini kuzatish: ``with histogram.time(): ...``."""
+        return _Timer(self)
+
+    def snapshot(self) -> tuple[list[int], float, int]:
+        with self._lock:
+            return list(self.counts), self.sum, self.count
+
+    def quantile(self, q: float) -> float:
+        """Bucketlar ichida chiziqli interpolyatsiya bilan taxminiy kvantil."""
+        counts, _, total = self.snapshot()
+        if not total:
+            return 0.0
+        rank = q * total
+        seen = 0
+        for i, n in enumerate(counts):
+            if n and seen + n >= rank:
+                lower = self._bounds[i - 1] if i > 0 else 0.0
+                upper = self._bounds[i] if i < len(self._bounds) else lower
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+        return self._bounds[-1]
+
+
+class _Metric:
+    """Metrika oilasi: nom, tavsif, label nomlari va seriyalar."""
+
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()) -> None:  # noqa: A002
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple, Any] = {}
+        self._lock = threading.Lock()
+        self._default = None if self.labelnames else self._child(())
+
+    def _new_value(self) -> Any:
+        raise NotImplementedError
+
+    def _child(self, key: tuple) -> Any:
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self._children[key] = self._new_value()
+        return child
+
+    def labels(self, *values: Any, **kwargs: Any) -> Any:
+        """Label qiymatlari bo'yicha seriya (pozitsion yoki nom bilan)."""
+        if kwargs:
+            values = tuple(kwargs[name] for name in self.labelnames)
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name}: label'lar {self.labelnames} kutilgan")
+        return self._child(tuple(str(v) for v in values))
+
+    def _unlabeled(self) -> Any:
+        if self._default is None:
+            raise ValueError(f"{self.name}: avval labels(...) chaqiring")
+        return self._default
+
+    def series(self) -> list[tuple[dict, Any]]:
+        with self._lock:
+            items = list(self._children.items())
+        return [(dict(zip(self.labelnames, key)), value) for key, value in items]
+
+    def samples(self) -> list[tuple[str, dict, float]]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Faqat oshadigan hisoblagich."""
+
+    kind = "counter"
+
+    def _new_value(self) -> _CounterValue:
+        return _CounterValue()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._unlabeled().inc(amount)
+
+    def samples(self) -> list[tuple[str, dict, float]]:
+        return [(self.name, labels, value.value) for labels, value in self.series()]
+
+
+class Gauge(_Metric):
+    """Oshishi va kamayishi mumkin bo'lgan joriy qiymat."""
+
+    kind = "gauge"
+
+    def _new_value(self) -> _GaugeValue:
+        return _GaugeValue()
+
+    def set(self, value: float) -> None:
+        self._unlabeled().set(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._unlabeled().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._unlabeled().dec(amount)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self._unlabeled().set_function(function)
+
+    def samples(self) -> list[tuple[str, dict, float]]:
+        return [(self.name, labels, value.get()) for labels, value in self.series()]
+
+
+class Histogram(_Metric):
+    """Qat'iy bucketli taqsimot (kechikishlar uchun)."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,  # noqa: A002
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.buckets = tuple(sorted(float(b) for b in buckets if b != math.inf))
+        super().__init__(name, help, labelnames)
+
+    def _new_value(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._unlabeled().observe(value)
+
+    def time(self) -> _Timer:
+        return self._unlabeled().time()
+
+    def samples(self) -> list[tuple[str, dict, float]]:
+        result = []
+        for labels, value in self.series():
+            counts, total_sum, total = value.snapshot()
+            cumulative = 0
+            for bound, n in zip(self.buckets + (math.inf,), counts):
+                cumulative += n
+                result.append((f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+            result.append((f"{self.name}_sum", labels, total_sum))
+            result.append((f"{self.name}_count", labels, total))
+        return result
+
+
+class MetricsRegistry:
+    """Metrikalarni nom bo'yicha saqlash va eksport qilish."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Collector] = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls: type, name: str, help: str, labelnames: Iterable[str], **kwargs: Any) -> Any:  # noqa: A002
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help, labelnames, **kwargs)
+            elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metrika '{name}' boshqa tur yoki label'lar bilan ro'yxatdan o'tgan")
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Counter:  # noqa: A002
+        return self._get_or_create(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Gauge:  # noqa: A002
+        return self._get_or_create(Gauge, name, help, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        help: str,  # noqa: A002
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, help, labelnames, buckets=buckets)
+
+    def register_collector(self, collector: Collector) -> None:
+        """O'qish vaqtida chaqiriladigan funksiya (tashqi hisoblagichlar uchun).
+
+        ``collector()`` ``(nom, tur, tavsif, labels, qiymat)`` kortejlarini
+        qaytaradi, masalan ``functools.lru_cache`` statistikasi.
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def collect(self) -> list[tuple[str, str, str, list[tuple[str, dict, float]]]]:
+        """Barcha metrika oilalari: ``(nom, tur, tavsif, namunalar)``."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        families = {m.name: (m.name, m.kind, m.help, m.samples()) for m in metrics}
+        for collector in collectors:
+            try:
+                for name, kind, help_text, labels, value in collector():
+                    family = families.setdefault(name, (name, kind, help_text, []))
+                    family[3].append((name, labels, value))
+            except Exception:
+                continue
+        return [families[name] for name in sorted(families)]
+
+    def render_prometheus(self) -> str:
+        """Prometheus matn formati (0.0.4)."""
+        lines: list[str] = []
+        for name, kind, help_text, samples in self.collect():
+            help_text = help_text.replace("\\", "\\\\").replace("\n", "\\n")
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample_name, labels, value in samples:
+                lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def format_summary(self, prefix: str = "") -> str:
+        """CLI uchun qisqa ko'rinish: hisoblagichlar va histogramma kvantillari."""
+        lines: list[str] = []
+        with self._lock:
+            metrics = [m for m in self._metrics.values() if m.name.startswith(prefix)]
+        for metric in sorted(metrics, key=lambda m: m.name):
+            for labels, value in metric.series():
+                label_str = ",".join(f"{k}={v}" for k, v in labels.items())
+                title = f"{metric.name}{{{label_str}}}" if label_str else metric.name
+                if isinstance(metric, Histogram):
+                    _, total_sum, total = value.snapshot()
+                    if not total:
+                        continue
+                    lines.append(
+                        f"  {title}: {total} ta, o'rtacha {total_sum / total * 1000:.1f}ms, "
+                        f"p50 ~{value.quantile(0.5) * 1000:.1f}ms, p95 ~{value.quantile(0.95) * 1000:.1f}ms"
+                    )
+                else:
+                    current = value.get() if isinstance(metric, Gauge) else value.value
+                    if current:
+                        lines.append(f"  {title}: {_format_value(current)}")
+        for name, _, _, samples in self.collect():
+            if name in self._metrics or not name.startswith(prefix):
+                continue
+            for _, labels, value in samples:
+                label_str = ",".join(f"{k}={v}" for k, v in labels.items())
+                if value:
+                    lines.append(f"  {name}{{{label_str}}}: {_format_value(value)}")
+        return "\n".join(lines)
+
+
+def lru_cache_collector(name: str, function: Any) -> Collector:
+    """``functools.lru_cache`` bilan o'ralgan funksiya uchun hit/miss collector."""
+
+    def collect() -> Iterable[tuple]:
+        info = function.cache_info()
+        labels = {"cache": name}
+        return [
+            ("jarvis_cache_hits_total", "counter", "Kesh topilgan murojaatlar", labels, info.hits),
+            ("jarvis_cache_misses_total", "counter", "Keshda topilmagan murojaatlar", labels, info.misses),
+        ]
+
+    return collect
+
+
+_registry: Optional[MetricsRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> MetricsRegistry:
+    """Jarayon bo'yicha yagona metrikalar reyestri."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = MetricsRegistry()
+    return _registry
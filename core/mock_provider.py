@@ -0,0 +1,377 @@
+"""
+Soxta (mock) OpenAI-compatible provayder — pulsiz profillash va sinov uchun.
+
+Haqiqiy API ga so'rov yubormasdan ``Jarvis.process`` ni oxirigacha
+ishlatish imkonini beradi. ``config/models.json`` da ``"kind": "mock"``
+bilan ro'yxatga olinadi va ``JARVIS_MOCK_PROVIDER=1`` o'rnatilganda
+mavjud hisoblanadi (boshqa provayderlar kabi ``/provider mock``).
+
+Ikki ko'rinishi bor:
+
+- ``MockOpenAIClient`` — jarayon ichidagi client, ``openai.OpenAI`` ning
+  ``client.chat.completions.create(...)`` interfeysini takrorlaydi
+  (``base_url`` ``mock://`` bilan boshlansa AIRouter shuni ishlatadi)
+- ``MockProviderServer`` — localhost HTTP server (``/v1/chat/completions``,
+  SSE oqimi bilan), haqiqiy ``openai`` client va tarmoq qatlamini ham
+  o'lchash uchun::
+
+      python -m core.mock_provider --port 8765
+
+Sozlamalar (``"mock"`` bo'limi):
+
+    latency_ms      — birinchi tokengacha kechikish: {"distribution":
+                      "fixed" | "uniform" | "lognormal", "median", "p95",
+                      "min", "max"}
+    tokens_per_s    — generatsiya tezligi (0 — darhol)
+    reply_tokens    — javob uzunligi [min, max] (max_tokens bilan cheklanadi)
+    error_rate      — so'rov xato bilan tugash ehtimoli
+    errors          — xato turlari: "rate_limit", "server", "timeout"
+    stream_error_rate — oqim o'rtasida uzilish ehtimoli
+    time_scale      — barcha kutishlar ko'paytuvchisi (0 — kutmaslik)
+    seed            — takrorlanuvchanlik uchun (null — tasodifiy)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Any, Iterator, Optional
+
+MOCK_ENV = "JARVIS_MOCK_PROVIDER"
+MOCK_URL_SCHEME = "mock://"
+
+_DEFAULT_SETTINGS: dict = {
+    "latency_ms": {"distribution": "lognormal", "median": 400, "p95": 1200},
+    "tokens_per_s": 60,
+    "reply_tokens": [40, 160],
+    "error_rate": 0.0,
+    "errors": ["rate_limit", "server", "timeout"],
+    "stream_error_rate": 0.0,
+    "time_scale": 1.0,
+    "seed": None,
+}
+_ERROR_STATUS = {"rate_limit": 429, "server": 500, "timeout": 504}
+_Z_95 = 1.6449  # Normal taqsimotning 95-persentili
+_CHARS_PER_TOKEN = 4
+_FILLER = (
+    "reja vazifa vaqt natija keyingi qadam muhim fokus tahlil xulosa "
+    "plan task time result next step focus summary review progress"
+).split()
+
+
+class MockProviderError(RuntimeError):
+    """Soxta provayder qaytargan (in'ektsiya qilingan) xato."""
+
+    def __init__(self, kind: str, message: str) -> None:
+        super().__init__(message)
+        self.kind = kind
+        self.status_code = _ERROR_STATUS.get(kind, 500)
+
+
+def _estimate_tokens(text: str) -> int:
+    return (len(text) + _CHARS_PER_TOKEN - 1) // _CHARS_PER_TOKEN
+
+
+class MockBehavior:
+    """Kechikish, javob uzunligi va xatolarni sozlamalar bo'yicha tanlash."""
+
+    def __init__(self, settings: Optional[dict] = None) -> None:
+        self.settings = {**_DEFAULT_SETTINGS, **(settings or {})}
+        self._rng = random.Random(self.settings.get("seed"))
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+    def _random(self) -> float:
+        with self._lock:
+            return self._rng.random()
+
+    def first_token_delay(self) -> float:
+        """Birinchi tokengacha kutish (sekund, time_scale hisobga olingan)."""
+        spec = self.settings["latency_ms"]
+        if isinstance(spec, (int, float)):
+            spec = {"distribution": "fixed", "median": spec}
+        kind = spec.get("distribution", "fixed")
+        median = float(spec.get("median", 0))
+        with self._lock:
+            if kind == "uniform":
+                value = self._rng.uniform(float(spec.get("min", 0)), float(spec.get("max", median)))
+            elif kind == "lognormal" and median > 0:
+                p95 = float(spec.get("p95", median))
+                sigma = math.log(max(p95, median) / median) / _Z_95
+                value = self._rng.lognormvariate(math.log(median), sigma)
+            else:
+                value = median
+        return max(0.0, value) / 1000 * self.settings["time_scale"]
+
+    def token_delay(self) -> float:
+        rate = self.settings["tokens_per_s"]
+        return self.settings["time_scale"] / rate if rate else 0.0
+
+    def reply_length(self, max_tokens: Optional[int]) -> int:
+        low, high = self.settings["reply_tokens"]
+        with self._lock:
+            length = self._rng.randint(int(low), int(high))
+        return max(1, min(length, max_tokens or length))
+
+    def maybe_fail(self) -> None:
+        """``error_rate`` ehtimoli bilan MockProviderError ko'tarish."""
+        with self._lock:
+            self.requests += 1
+            failed = self._rng.random() < self.settings["error_rate"]
+            kind = self._rng.choice(self.settings["errors"] or ["server"]) if failed else ""
+            if failed:
+                self.errors += 1
+        if kind == "timeout":
+            time.sleep(self.first_token_delay() * 3)
+        if failed:
+            raise MockProviderError(kind, f"mock: {kind} ({_ERROR_STATUS.get(kind, 500)})")
+
+    def stream_break_at(self, length: int) -> int:
+        """Oqim uziladigan token raqami (-1 — uzilmaydi)."""
+        if length < 2 or self._random() >= self.settings["stream_error_rate"]:
+            return -1
+        with self._lock:
+            return self._rng.randrange(1, length)
+
+    def reply_tokens(self, messages: list[dict], length: int) -> list[str]:
+        """Javob tokenlari: oxirgi foydalanuvchi so'zlari + to'ldiruvchi so'zlar."""
+        last_user = next(
+            (m.get("content") or "" for m in reversed(messages) if m.get("role") == "user"), ""
+        )
+        words = last_user.split()[:8] + _FILLER
+        with self._lock:
+            offset = self._rng.randrange(len(words))
+        return [(" " if i else "") + words[(offset + i) % len(words)] for i in range(length)]
+
+
+class _Completions:
+    def __init__(self, behavior: MockBehavior) -> None:
+        self._behavior = behavior
+
+    def create(
+        self,
+        model: str,
+        messages: list[dict],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        stream: bool = False,
+        **_: Any,
+    ) -> Any:
+        behavior = self._behavior
+        behavior.maybe_fail()
+        time.sleep(behavior.first_token_delay())
+        tokens = behavior.reply_tokens(messages, behavior.reply_length(max_tokens))
+        if stream:
+            return self._stream(model, tokens)
+        time.sleep(behavior.token_delay() * len(tokens))
+        prompt_tokens = sum(_estimate_tokens(m.get("content") or "") for m in messages)
+        return SimpleNamespace(
+            id=f"mock-{time.monotonic_ns()}",
+            model=model,
+            choices=[
+                SimpleNamespace(
+                    index=0,
+                    message=SimpleNamespace(role="assistant", content="".join(tokens)),
+                    finish_reason="stop",
+                )
+            ],
+            usage=SimpleNamespace(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=len(tokens),
+                total_tokens=prompt_tokens + len(tokens),
+            ),
+        )
+
+    def _stream(self, model: str, tokens: list[str]) -> Iterator[Any]:
+        behavior = self._behavior
+        break_at = behavior.stream_break_at(len(tokens))
+        delay = behavior.token_delay()
+        for i, token in enumerate(tokens):
+            if i == break_at:
+                raise MockProviderError("stream", "mock: oqim uzildi")
+            if i and delay:
+                time.sleep(delay)
+            yield SimpleNamespace(
+                model=model,
+                choices=[SimpleNamespace(index=0, delta=SimpleNamespace(content=token), finish_reason=None)],
+            )
+
+
+class MockOpenAIClient:
+    """``openai.OpenAI`` o'rnini bosuvchi jarayon ichidagi client."""
+
+    def __init__(self, settings: Optional[dict] = None) -> None:
+        self.behavior = MockBehavior(settings)
+        self.chat = SimpleNamespace(completions=_Completions(self.behavior))
+
+    def get_stats(self) -> dict:
+        return {"requests": self.behavior.requests, "errors": self.behavior.errors}
+
+
+class MockProviderServer:
+    """``/v1/chat/completions`` va ``/v1/models`` ga javob beruvchi localhost server."""
+
+    def __init__(
+        self,
+        settings: Optional[dict] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        models: Optional[list[str]] = None,
+    ) -> None:
+        """
+        Args:
+            settings: Mock sozlamalari (yuqoridagi ro'yxat)
+            host: Tinglash manzili
+            port: Port (0 — bo'sh port avtomatik tanlanadi)
+            models: ``/v1/models`` da ko'rsatiladigan modellar
+        """
+        self.client = MockOpenAIClient(settings)
+        self.models = models or ["mock-fast", "mock-code", "mock-pro"]
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "MockProviderServer":
+        """Serverni fon oqimida ishga tushirish."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _handler_class(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+                pass
+
+            def _send_json(self, status: int, payload: dict) -> None:
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self) -> None:  # noqa: N802
+                if self.path.rstrip("/") != "/v1/models":
+                    self._send_json(404, {"error": {"message": "not found"}})
+                    return
+                data = [{"id": m, "object": "model", "owned_by": "mock"} for m in server.models]
+                self._send_json(200, {"object": "list", "data": data})
+
+            def do_POST(self) -> None:  # noqa: N802
+                if self.path.rstrip("/") != "/v1/chat/completions":
+                    self._send_json(404, {"error": {"message": "not found"}})
+                    return
+                try:
+                    length = int(self.headers.get("Content-Length") or 0)
+                    request = json.loads(self.rfile.read(length) or b"{}")
+                    result = server.client.chat.completions.create(
+                        model=request.get("model", "mock"),
+                        messages=request.get("messages", []),
+                        max_tokens=request.get("max_tokens"),
+                        stream=bool(request.get("stream")),
+                    )
+                except MockProviderError as exc:
+                    self._send_json(exc.status_code, {"error": {"message": str(exc), "type": exc.kind}})
+                    return
+                except (ValueError, TypeError) as exc:
+                    self._send_json(400, {"error": {"message": str(exc)}})
+                    return
+                if request.get("stream"):
+                    self._stream(result)
+                    return
+                self._send_json(200, {
+                    "id": result.id,
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": result.model,
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": result.choices[0].message.content},
+                        "finish_reason": "stop",
+                    }],
+                    "usage": vars(result.usage),
+                })
+
+            def _stream(self, chunks: Iterator[Any]) -> None:
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+                created = int(time.time())
+                try:
+                    for chunk in chunks:
+                        event = {
+                            "id": "mock",
+                            "object": "chat.completion.chunk",
+                            "created": created,
+                            "model": chunk.model,
+                            "choices": [{
+                                "index": 0,
+                                "delta": {"content": chunk.choices[0].delta.content},
+                                "finish_reason": None,
+                            }],
+                        }
+                        self.wfile.write(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+                        self.wfile.flush()
+                    self.wfile.write(b"data: [DONE]\n\n")
+                except MockProviderError:
+                    # Oqim uzilishi — ulanish yakunlanmagan holda yopiladi
+                    pass
+
+        return Handler
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Soxta OpenAI-compatible provayder serveri")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency-ms", type=float, help="median kechikish (lognormal)")
+    ap.add_argument("--tokens-per-s", type=float)
+    ap.add_argument("--error-rate", type=float)
+    ap.add_argument("--seed", type=int)
+    args = ap.parse_args()
+
+    settings: dict = {}
+    if args.latency_ms is not None:
+        settings["latency_ms"] = {"distribution": "lognormal", "median": args.latency_ms, "p95": args.latency_ms * 3}
+    if args.tokens_per_s is not None:
+        settings["tokens_per_s"] = args.tokens_per_s
+    if args.error_rate is not None:
+        settings["error_rate"] = args.error_rate
+    if args.seed is not None:
+        settings["seed"] = args.seed
+    server = MockProviderServer(settings, host=args.host, port=args.port)
+    print(f"Mock provayder: {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,14 +6,27 @@ Lokal hujjatlarni indekslash va ulardan ma'lumot qidirish.
 from __future__ import annotations
 
 import os
+import time
 from pathlib import Path
 from typing import Any, Optional
 
+from .metrics import get_registry
+from .vector_store import build_where, get_vector_store_manager, match_where
 
 _SUPPORTED_EXTENSIONS = {".txt", ".py", ".md", ".json", ".csv", ".pdf"}
 _CHUNK_SIZE = 500
 _CHUNK_OVERLAP = 50
 
+_METRICS = get_registry()
+_RAG_CHUNKS = _METRICS.counter("jarvis_rag_chunks_ingested_total", "Indekslangan bo'laklar")
+_RAG_QUERY_SECONDS = _METRICS.histogram("jarvis_rag_query_seconds", "RAG qidiruv vaqti")
+_RAG_RESULTS = _METRICS.counter("jarvis_rag_queries_total", "RAG so'rovlari natija bo'yicha", ["result"])
+_VECTOR_FALLBACKS = _METRICS.counter(
+    "jarvis_vector_store_fallbacks_total",
+    "Vektor ombori xatosi sababli in-memory zaxiraga o'tishlar",
+    ["component", "op"],
+)
+
 
 def _chunk_text(text: str, chunk_size: int = _CHUNK_SIZE, overlap: int = _CHUNK_OVERLAP) -> list[str]:
     """Matnni bo'laklarga ajratish."""
@@ -38,26 +51,19 @@ class RAGEngine:
     ) -> None:
         self._collection_name = collection_name
         self._persist_dir = persist_dir
-        self._collection: Any = None
-        self._use_chroma = False
+        self._vector_store: Any = None
+        self._use_vector_store = False
         self._fallback_store: list[dict] = []
         self._init_storage()
 
     def _init_storage(self) -> None:
-        """ChromaDB ni ishga tushirish."""
+        """Umumiy vektor omboridan kolleksiyani olish."""
         try:
-            import chromadb  # type: ignore
-
-            client = chromadb.PersistentClient(path=self._persist_dir)
-            self._collection = client.get_or_create_collection(
-                name=self._collection_name,
-                metadata={"hnsw:space": "cosine"},
-            )
-            self._use_chroma = True
-        except ImportError:
-            self._use_chroma = False
+            manager = get_vector_store_manager(self._persist_dir)
+            self._use_vector_store = manager.collection(self._collection_name) is not None
+            self._vector_store = manager
         except Exception:
-            self._use_chroma = False
+            self._use_vector_store = False
 
     def ingest_file(self, path: str) -> int:
         """Faylni indekslash.
@@ -123,62 +129,77 @@ class RAGEngine:
         if not chunks:
             return
 
-        if self._use_chroma and self._collection is not None:
+        _RAG_CHUNKS.inc(len(chunks))
+        ingested = int(time.time())
+        metadatas = [
+            {"source": source, "chunk_index": i, "ts": ingested} for i in range(len(chunks))
+        ]
+        if self._use_vector_store:
             try:
                 import uuid
 
                 ids = [str(uuid.uuid4()) for _ in chunks]
-                metadatas = [{"source": source, "chunk_index": i} for i in range(len(chunks))]
-                self._collection.add(documents=chunks, metadatas=metadatas, ids=ids)
+                self._vector_store.add(self._collection_name, chunks, metadatas, ids)
                 return
             except Exception:
-                pass
+                _VECTOR_FALLBACKS.labels("rag", "add").inc()
 
         # Fallback
-        for i, chunk in enumerate(chunks):
-            self._fallback_store.append(
-                {"content": chunk, "metadata": {"source": source, "chunk_index": i}}
-            )
+        for chunk, metadata in zip(chunks, metadatas):
+            self._fallback_store.append({"content": chunk, "metadata": metadata})
 
-    def query(self, question: str, k: int = 5) -> list[dict]:
+    def query(
+        self,
+        question: str,
+        k: int = 5,
+        where: Optional[dict] = None,
+        since: Any = None,
+        until: Any = None,
+    ) -> list[dict]:
         """Savolga mos bo'laklarni qidirish.
 
+        Args:
+            question: Savol matni
+            k: Natijalar soni
+            where: Metadata filtri, masalan ``{"source": "notes/fizika.md"}``
+                yoki ``{"source": {"$in": [...]}}``
+            since: Shu vaqtdan keyin indekslangan bo'laklar (datetime, ISO satr, epoch)
+            until: Shu vaqtgacha indekslangan bo'laklar
+
         Returns:
             [{"content": str, "source": str, "score": float}]
         """
         if not question.strip():
             return []
 
-        if self._use_chroma and self._collection is not None:
+        with _RAG_QUERY_SECONDS.time():
+            results = self._query(question, k, build_where(where, since, until))
+        _RAG_RESULTS.labels("hit" if results else "empty").inc()
+        return results
+
+    def _query(self, question: str, k: int, where: Optional[dict]) -> list[dict]:
+        """Vektor omboridan (bo'lmasa kalit so'z bo'yicha) qidirish."""
+        if self._use_vector_store:
             try:
-                count = self._collection.count()
-                if count == 0:
-                    return []
-                results = self._collection.query(
-                    query_texts=[question],
-                    n_results=min(k, count),
-                )
-                if not results or not results.get("documents"):
-                    return []
-                docs = results["documents"][0]
-                metas = results.get("metadatas", [[]])[0]
-                distances = results.get("distances", [[]])[0]
+                hits = self._vector_store.query(
+                    self._collection_name, [question], k=k, where=where
+                )[0]
                 return [
                     {
-                        "content": d,
-                        "source": m.get("source", ""),
-                        "score": 1 - dist,
+                        "content": h["content"],
+                        "source": h["metadata"].get("source", ""),
+                        "score": 1 - h["distance"],
                     }
-                    for d, m, dist in zip(docs, metas, distances)
+                    for h in hits
                 ]
             except Exception:
-                pass
+                _VECTOR_FALLBACKS.labels("rag", "query").inc()
 
         # Fallback: keyword search
         q_lower = question.lower()
         results = []
         for item in self._fallback_store:
-            if q_lower in item["content"].lower():
+            if q_lower in item["content"].lower() and match_where(where, item["metadata"]):
                 results.append(
                     {
                         "content": item["content"],
@@ -190,10 +211,14 @@ class RAGEngine:
 
     def get_stats(self) -> dict:
         """RAG statistikasi."""
-        if self._use_chroma and self._collection is not None:
+        if self._use_vector_store:
             try:
-                count = self._collection.count()
-                return {"chunks": count, "backend": "chromadb"}
+                count = self._vector_store.count(self._collection_name)
+                return {
+                    "chunks": count,
+                    "backend": self._vector_store.backend,
+                    "vector_store": self._vector_store.stats(),
+                }
             except Exception:
                 pass
         return {"chunks": len(self._fallback_store), "backend": "in-memory"}
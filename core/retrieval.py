@@ -0,0 +1,230 @@
+"""
+Qidiruv natijalarini qayta ishlash — promptga faqat foydali kontekst.
+
+Jarvis.process RAG va uzoq muddatli xotiradan nomzodlarni oladi va ularni
+shu bosqichlardan o'tkazadi:
+
+1. Ball chegarasi — o'xshashligi past bo'laklar tashlanadi
+2. Qayta tartiblash — yuqori N ta nomzod lokal cross-encoder
+   (sentence-transformers, ixtiyoriy) yoki leksik moslik (IDF vaznli) bilan
+3. MMR — bir-birini takrorlaydigan bo'laklar o'rniga xilma-xil kontekst;
+   deyarli bir xil bo'laklar tashlanadi
+4. Erta to'xtash — ball eng yaxshisidan ancha past bo'lsa, bo'laklar soni
+   yoki token byudjeti tugasa qolganlari qo'shilmaydi
+
+Har bir so'rov uchun avvalgi usulga (xom top-3 hujjat + top-3 xotira)
+nisbatan tejalgan tokenlar hisoblanadi.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import threading
+from typing import Any, Optional
+
+_MIN_SCORE = 0.3  # Vektor o'xshashligi (1 - kosinus masofa) shundan past bo'lsa tashlanadi
+_RERANK_TOP_N = 10
+_LEXICAL_WEIGHT = 0.35  # Yakuniy ball = (1 - w) * vektor + w * leksik
+_CROSS_ENCODER_WEIGHT = 0.7
+_CROSS_ENCODER_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+_MMR_LAMBDA = 0.7  # 1.0 — faqat moslik, 0.0 — faqat xilma-xillik
+_RELATIVE_CUTOFF = 0.6  # Eng yaxshi balldan shu ulushdan past nomzodlarda to'xtash
+_DUPLICATE_JACCARD = 0.8  # Tanlanganlarga shunchalik o'xshash bo'lak takror hisoblanadi
+_MAX_ITEMS = 4
+_CONTEXT_TOKEN_BUDGET = 400
+_MIN_TRUNCATED_TOKENS = 40  # Bundan kam joy qolsa bo'lak kesib qo'shilmaydi
+_CHARS_PER_TOKEN = 4
+_WORD_RE = re.compile(r"\w{2,}", re.UNICODE)
+
+
+def estimate_tokens(text: str) -> int:
+    """Taxminiy token soni (~4 belgi = 1 token)."""
+    return (len(text) + _CHARS_PER_TOKEN - 1) // _CHARS_PER_TOKEN
+
+
+def _terms(text: str) -> set[str]:
+    return set(_WORD_RE.findall(text.lower()))
+
+
+class RetrievalPostProcessor:
+    """Nomzodlarni filtrlash, qayta tartiblash va token byudjetiga sig'dirish.
+
+    Nomzod — ``{"content": str, "score": float, ...}`` (``score`` 0..1, kattasi
+    yaqinroq); qolgan kalitlar (``kind``, ``source``) o'zgarishsiz qaytariladi.
+    """
+
+    def __init__(
+        self,
+        min_score: float = _MIN_SCORE,
+        top_n: int = _RERANK_TOP_N,
+        reranker: str = "lexical",
+        mmr_lambda: float = _MMR_LAMBDA,
+        token_budget: int = _CONTEXT_TOKEN_BUDGET,
+        max_items: int = _MAX_ITEMS,
+        relative_cutoff: float = _RELATIVE_CUTOFF,
+    ) -> None:
+        """
+        Args:
+            min_score: Vektor o'xshashligi chegarasi
+            top_n: Qayta tartiblanadigan nomzodlar soni
+            reranker: ``"lexical"``, ``"cross-encoder"`` (sentence-transformers
+                bo'lmasa leksikka qaytadi) yoki ``"none"``
+            mmr_lambda: MMR moslik/xilma-xillik muvozanati
+            token_budget: Promptga qo'shiladigan kontekst uchun maksimal token
+            max_items: Maksimal bo'laklar soni
+            relative_cutoff: Eng yaxshi ballning shu ulushidan pastlari tashlanadi
+        """
+        self.min_score = min_score
+        self.top_n = top_n
+        self.reranker = reranker
+        self.mmr_lambda = mmr_lambda
+        self.token_budget = token_budget
+        self.max_items = max_items
+        self.relative_cutoff = relative_cutoff
+        self._cross_encoder: Any = None
+        self._cross_encoder_failed = False
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._tokens_before = 0
+        self._tokens_after = 0
+        self._dropped = 0
+        self.last: dict = {}
+
+    # === Qayta tartiblash ===
+
+    def _load_cross_encoder(self) -> Any:
+        if self._cross_encoder is None and not self._cross_encoder_failed:
+            try:
+                from sentence_transformers import CrossEncoder  # type: ignore
+
+                self._cross_encoder = CrossEncoder(_CROSS_ENCODER_MODEL)
+            except Exception:
+                self._cross_encoder_failed = True
+        return self._cross_encoder
+
+    def _lexical_scores(self, query: str, docs: list[set[str]]) -> list[float]:
+        """So'rov so'zlarining hujjatdagi ulushi (nomzodlar bo'yicha IDF vaznli)."""
+        query_terms = _terms(query)
+        if not query_terms:
+            return [0.0] * len(docs)
+        n = len(docs)
+        idf = {t: math.log(1 + n / (1 + sum(t in d for d in docs))) + 1e-6 for t in query_terms}
+        total = sum(idf.values())
+        return [sum(idf[t] for t in query_terms & d) / total for d in docs]
+
+    def _rerank(self, query: str, items: list[dict], terms: list[set[str]]) -> list[float]:
+        vector = [item["score"] for item in items]
+        if self.reranker == "none":
+            return vector
+        if self.reranker == "cross-encoder":
+            model = self._load_cross_encoder()
+            if model is not None:
+                logits = model.predict([(query, item["content"]) for item in items])
+                return [
+                    (1 - _CROSS_ENCODER_WEIGHT) * v + _CROSS_ENCODER_WEIGHT / (1 + math.exp(-float(x)))
+                    for v, x in zip(vector, logits)
+                ]
+        lexical = self._lexical_scores(query, terms)
+        return [(1 - _LEXICAL_WEIGHT) * v + _LEXICAL_WEIGHT * x for v, x in zip(vector, lexical)]
+
+    def _mmr(self, relevance: list[float], terms: list[set[str]]) -> list[int]:
+        """Maximal Marginal Relevance tartibi (o'xshashlik — so'zlar Jaccard indeksi).
+
+        Tanlanganlarga deyarli teng bo'laklar va eng yaxshi balldan
+        ``relative_cutoff`` ulushidan pastlari natijaga kirmaydi.
+        """
+        floor = max(relevance) * self.relative_cutoff
+        remaining = [i for i in range(len(relevance)) if relevance[i] >= floor]
+        order: list[int] = []
+        while remaining and len(order) < self.max_items:
+            best, best_value = -1, -math.inf
+            for i in list(remaining):
+                redundancy = max(
+                    (len(terms[i] & terms[j]) / (len(terms[i] | terms[j]) or 1) for j in order),
+                    default=0.0,
+                )
+                if redundancy >= _DUPLICATE_JACCARD:
+                    remaining.remove(i)
+                    continue
+                value = self.mmr_lambda * relevance[i] - (1 - self.mmr_lambda) * redundancy
+                if value > best_value:
+                    best, best_value = i, value
+            if best < 0:
+                break
+            order.append(best)
+            remaining.remove(best)
+        return order
+
+    # === Asosiy ===
+
+    def select(
+        self,
+        query: str,
+        candidates: list[dict],
+        baseline_tokens: Optional[int] = None,
+    ) -> list[dict]:
+        """Promptga qo'shiladigan kontekstni tanlash.
+
+        Args:
+            query: Foydalanuvchi so'rovi
+            candidates: Nomzodlar (``content``, ``score`` va ixtiyoriy kalitlar)
+            baseline_tokens: Filtrsiz usulda qo'shilgan bo'lardi token soni
+                (tejamni hisoblash uchun; berilmasa barcha nomzodlar)
+
+        Returns:
+            Tanlangan nomzodlar (``rerank_score`` qo'shilgan), muhimlik tartibida
+        """
+        if baseline_tokens is None:
+            baseline_tokens = sum(estimate_tokens(c["content"]) for c in candidates)
+        kept = [c for c in candidates if c.get("score", 0.0) >= self.min_score]
+        kept.sort(key=lambda c: -c["score"])
+        kept = kept[: self.top_n]
+
+        selected: list[dict] = []
+        if kept:
+            terms = [_terms(c["content"]) for c in kept]
+            relevance = self._rerank(query, kept, terms)
+            budget = self.token_budget
+            for i in self._mmr(relevance, terms):
+                item = dict(kept[i], rerank_score=round(relevance[i], 4))
+                tokens = estimate_tokens(item["content"])
+                if tokens > budget:
+                    if budget < _MIN_TRUNCATED_TOKENS:
+                        break
+                    item["content"] = item["content"][: budget * _CHARS_PER_TOKEN].rstrip() + "…"
+                    tokens = budget
+                selected.append(item)
+                budget -= tokens
+                if budget <= 0:
+                    break
+
+        used = sum(estimate_tokens(item["content"]) for item in selected)
+        self.last = {
+            "candidates": len(candidates),
+            "dropped_by_threshold": len(candidates) - len(kept),
+            "selected": len(selected),
+            "tokens_before": baseline_tokens,
+            "tokens_after": used,
+            "tokens_saved": baseline_tokens - used,
+        }
+        with self._lock:
+            self._requests += 1
+            self._tokens_before += baseline_tokens
+            self._tokens_after += used
+            self._dropped += self.last["dropped_by_threshold"]
+        return selected
+
+    def stats(self) -> dict:
+        """Jamlangan statistika: so'rovlar va tejalgan tokenlar."""
+        with self._lock:
+            requests = self._requests or 1
+            return {
+                "requests": self._requests,
+                "reranker": self.reranker,
+                "avg_tokens_before": round(self._tokens_before / requests, 1),
+                "avg_tokens_after": round(self._tokens_after / requests, 1),
+                "avg_tokens_saved": round((self._tokens_before - self._tokens_after) / requests, 1),
+                "total_tokens_saved": self._tokens_before - self._tokens_after,
+                "dropped_by_threshold": self._dropped,
+            }
@@ -0,0 +1,581 @@
+"""
+JARVIS HTTP API server — asyncio asosidagi lokal server.
+
+Endpointlar:
+    POST /chat        — {"message": str, "session_id": str, "stream": bool}
+                        stream=true (yoki Accept: text/event-stream) bo'lsa
+                        javob server-sent events (SSE) bilan oqim qilinadi;
+                        Jarvis ichida sessiya ``http-<session_id>`` nomi bilan
+                        yuritiladi (standart va Telegram sessiyalariga kirib bo'lmaydi)
+    GET  /status      — tizim holati (?session_id=...)
+    GET  /schedule    — dars jadvali (?day=monday)
+    GET  /homework    — bajarilmagan uy vazifalari
+    POST /homework    — {"subject", "description", "deadline", "priority"}
+    GET  /tasks       — barcha bajarilmagan vazifalar
+    POST /tasks       — {"title", "description", "deadline", "priority", "category"}
+    GET  /reminders   — joriy eslatmalar
+    GET  /metrics     — metrikalar (Prometheus matn formati)
+
+Bloklovchi chaqiruvlar (AI provayderlar, JSON fayllar) cheklangan worker
+pool'da bajariladi. Navbat to'lsa 429, vaqt tugasa 504 qaytariladi.
+Tashqi kutubxona talab qilinmaydi — faqat standart kutubxona.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from .metrics import get_registry
+
+_DEFAULT_HOST = "127.0.0.1"
+_DEFAULT_PORT = 8080
+_DEFAULT_WORKERS = 4
+_DEFAULT_QUEUE_SIZE = 16  # worker'lar band bo'lganda kutishi mumkin bo'lgan so'rovlar
+_DEFAULT_TIMEOUT = 60.0  # sekund, bitta so'rov uchun
+_MAX_BODY_SIZE = 1024 * 1024  # 1 MB
+_MAX_HEADER_LINES = 100
+_KEEPALIVE_TIMEOUT = 15.0
+_METRICS_PATH = "/metrics"
+_SESSION_PREFIX = "http-"
+_ANONYMOUS_SESSION = "anonymous"
+_PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_METRICS = get_registry()
+_HTTP_REQUESTS = _METRICS.counter(
+    "jarvis_http_requests_total", "HTTP so'rovlar", ["method", "path", "status"]
+)
+_HTTP_SECONDS = _METRICS.histogram("jarvis_http_request_seconds", "HTTP so'rov vaqti", ["path"])
+_HTTP_INFLIGHT = _METRICS.gauge("jarvis_http_inflight_requests", "Bajarilayotgan HTTP so'rovlar")
+
+_STATUS_TEXT = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+    504: "Gateway Timeout",
+}
+
+
+class HTTPError(Exception):
+    """HTTP xato javobi sifatida qaytariladigan istisno."""
+
+    def __init__(self, status: int, message: str, headers: Optional[dict] = None) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+
+
+class _Request:
+    """Tahlil qilingan HTTP so'rov."""
+
+    def __init__(self, method: str, target: str, version: str, headers: dict, body: bytes) -> None:
+        self.method = method
+        self.version = version
+        self.headers = headers
+        self.body = body
+        parsed = urlsplit(target)
+        self.path = parsed.path.rstrip("/") or "/"
+        self.query = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+
+    def json(self) -> dict:
+        """So'rov tanasini JSON obyekt sifatida qaytarish."""
+        if not self.body:
+            return {}
+        try:
+            data = json.loads(self.body)
+        except ValueError as exc:
+            raise HTTPError(400, f"Noto'g'ri JSON: {exc}") from exc
+        if not isinstance(data, dict):
+            raise HTTPError(400, "JSON obyekt kutilgan")
+        return data
+
+    @property
+    def keep_alive(self) -> bool:
+        conn = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return conn == "keep-alive"
+        return conn != "close"
+
+
+class JarvisServer:
+    """Jarvis.process va Life API ni HTTP orqali taqdim etuvchi server."""
+
+    def __init__(
+        self,
+        jarvis: Any,
+        host: str = _DEFAULT_HOST,
+        port: int = _DEFAULT_PORT,
+        workers: int = _DEFAULT_WORKERS,
+        queue_size: int = _DEFAULT_QUEUE_SIZE,
+        request_timeout: float = _DEFAULT_TIMEOUT,
+        life_factory: Optional[Callable[[], dict]] = None,
+    ) -> None:
+        """
+        Args:
+            jarvis: ``process(text, session_id, on_token)`` va ``get_status(session_id)``
+                metodlariga ega obyekt (odatda Jarvis).
+            host: Tinglanadigan manzil.
+            port: Port (0 — tasodifiy bo'sh port).
+            workers: Bloklovchi chaqiruvlar uchun oqimlar soni.
+            queue_size: Barcha worker'lar band bo'lganda navbatda turishi mumkin
+                bo'lgan so'rovlar soni; undan oshsa 429 qaytariladi.
+            request_timeout: Bitta so'rov uchun maksimal vaqt (sekund).
+            life_factory: Life modullarini yaratuvchi funksiya (testlar uchun).
+        """
+        self.jarvis = jarvis
+        self.host = host
+        self.port = port
+        self._workers = max(1, workers)
+        self._capacity = self._workers + max(0, queue_size)
+        self._timeout = request_timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._workers, thread_name_prefix="jarvis-worker"
+        )
+        self._inflight = 0
+        self._rejected = 0
+        self._served = 0
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._life_factory = life_factory or _default_life_factory
+        self._life: Optional[dict] = None
+        self._life_lock = threading.Lock()
+        _HTTP_INFLIGHT.set_function(lambda: self._inflight)
+
+    # === Ishga tushirish ===
+
+    async def start(self) -> None:
+        """Serverni ishga tushirish (port=0 bo'lsa haqiqiy port self.port ga yoziladi)."""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        sockets = self._server.sockets or []
+        if sockets:
+            self.port = sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        """Serverni to'xtatilguncha ishlatish."""
+        if self._server is None:
+            await self.start()
+        assert self._server is not None
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self) -> None:
+        """Serverni to'xtatish va worker pool'ni yopish."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # === Worker pool ===
+
+    def _admit(self) -> None:
+        """So'rovni qabul qilish yoki navbat to'la bo'lsa 429 qaytarish."""
+        if self._inflight >= self._capacity:
+            self._rejected += 1
+            raise HTTPError(429, "Server band, keyinroq urinib ko'ring", {"Retry-After": "1"})
+        self._inflight += 1
+
+    def _release(self) -> None:
+        self._inflight -= 1
+        self._served += 1
+
+    async def _run_blocking(self, func: Callable, *args: Any) -> Any:
+        """Bloklovchi funksiyani worker pool'da timeout bilan bajarish."""
+        loop = asyncio.get_running_loop()
+        work = self._executor.submit(func, *args)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(work, loop=loop), self._timeout)
+        except asyncio.TimeoutError as exc:
+            raise HTTPError(504, f"So'rov {self._timeout:.0f} sekundda bajarilmadi") from exc
+        finally:
+            if not work.done():
+                # Worker hali band (timeout yoki mijoz uzildi) — so'rov slotini
+                # bo'shatsak ham, worker band ekanini qabul qilishda hisoblash kerak
+                self._hold_until_done(loop, work)
+
+    def _hold_until_done(self, loop: asyncio.AbstractEventLoop, work: Future) -> None:
+        """Tugamagan ish uchun slotni band qilish; ish tugaganda bo'shatiladi."""
+        self._inflight += 1
+
+        def done(_: Future) -> None:
+            try:
+                loop.call_soon_threadsafe(self._unhold)
+            except RuntimeError:
+                pass  # Event loop yopilgan — hisoblagich endi kerak emas
+
+        work.add_done_callback(done)
+
+    def _unhold(self) -> None:
+        self._inflight -= 1
+
+    # === Ulanishlar ===
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(
+                        self._read_request(reader), _KEEPALIVE_TIMEOUT
+                    )
+                except HTTPError as exc:
+                    await self._send_json(writer, exc.status, {"error": exc.message}, False)
+                    break
+                if request is None:
+                    break
+                keep_alive = await self._dispatch(request, writer)
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[_Request]:
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, version = line.decode("latin-1").strip().split(" ", 2)
+        except ValueError as exc:
+            raise HTTPError(400, "Noto'g'ri so'rov qatori") from exc
+
+        headers: dict[str, str] = {}
+        for _ in range(_MAX_HEADER_LINES):
+            raw = await reader.readline()
+            if raw in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = raw.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise HTTPError(400, "Sarlavhalar juda ko'p")
+
+        try:
+            length = int(headers.get("content-length", "0") or 0)
+        except ValueError as exc:
+            raise HTTPError(400, "Noto'g'ri Content-Length") from exc
+        if length > _MAX_BODY_SIZE:
+            raise HTTPError(413, "So'rov tanasi juda katta")
+        body = await reader.readexactly(length) if length else b""
+        return _Request(method.upper(), target, version, headers, body)
+
+    async def _dispatch(self, request: _Request, writer: asyncio.StreamWriter) -> bool:
+        """So'rovni marshrutlash. Ulanishni saqlash kerak bo'lsa True qaytaradi."""
+        keep_alive = request.keep_alive
+        routes: dict[tuple[str, str], Callable] = {
+            ("POST", "/chat"): self._chat,
+            ("GET", "/status"): self._status,
+            ("GET", "/schedule"): self._schedule,
+            ("GET", "/homework"): self._homework_list,
+            ("POST", "/homework"): self._homework_add,
+            ("GET", "/tasks"): self._tasks_list,
+            ("POST", "/tasks"): self._tasks_add,
+            ("GET", "/reminders"): self._reminders,
+        }
+        if request.method == "GET" and request.path == _METRICS_PATH:
+            # Worker pool va navbatdan tashqarida — server band bo'lsa ham o'qiladi
+            body = _METRICS.render_prometheus().encode("utf-8")
+            await self._send_body(writer, 200, body, _PROMETHEUS_CONTENT_TYPE, keep_alive)
+            return keep_alive
+
+        handler = routes.get((request.method, request.path))
+        metric_path = request.path if handler is not None else "other"
+        started = time.perf_counter()
+        status = 200
+        try:
+            if handler is None:
+                if any(path == request.path for _, path in routes):
+                    raise HTTPError(405, f"{request.method} ruxsat etilmagan")
+                raise HTTPError(404, f"Topilmadi: {request.path}")
+            self._admit()
+            try:
+                result = await handler(request, writer)
+            finally:
+                self._release()
+        except HTTPError as exc:
+            status = exc.status
+            await self._send_json(writer, exc.status, {"error": exc.message}, keep_alive, exc.headers)
+            return keep_alive
+        except Exception as exc:
+            status = 500
+            await self._send_json(writer, 500, {"error": str(exc)}, keep_alive)
+            return keep_alive
+        finally:
+            _HTTP_REQUESTS.labels(request.method, metric_path, status).inc()
+            _HTTP_SECONDS.labels(metric_path).observe(time.perf_counter() - started)
+
+        if result is None:
+            # Handler javobni o'zi yozgan (SSE) — ulanish yopiladi
+            return False
+        status, payload = result
+        await self._send_json(writer, status, payload, keep_alive)
+        return keep_alive
+
+    # === Javob yozish ===
+
+    @staticmethod
+    async def _send_json(
+        writer: asyncio.StreamWriter,
+        status: int,
+        payload: Any,
+        keep_alive: bool,
+        extra_headers: Optional[dict] = None,
+    ) -> None:
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        await JarvisServer._send_body(
+            writer, status, body, "application/json; charset=utf-8", keep_alive, extra_headers
+        )
+
+    @staticmethod
+    async def _send_body(
+        writer: asyncio.StreamWriter,
+        status: int,
+        body: bytes,
+        content_type: str,
+        keep_alive: bool,
+        extra_headers: Optional[dict] = None,
+    ) -> None:
+        headers = {
+            "Content-Type": content_type,
+            "Content-Length": str(len(body)),
+            "Connection": "keep-alive" if keep_alive else "close",
+        }
+        headers.update(extra_headers or {})
+        head = f"HTTP/1.1 {status} {_STATUS_TEXT.get(status, '')}\r\n" + "".join(
+            f"{k}: {v}\r\n" for k, v in headers.items()
+        )
+        writer.write(head.encode("latin-1") + b"\r\n" + body)
+        await writer.drain()
+
+    @staticmethod
+    def _sse(event: str, data: Any) -> bytes:
+        payload = json.dumps(data, ensure_ascii=False)
+        return f"event: {event}\ndata: {payload}\n\n".encode("utf-8")
+
+    # === Handlerlar ===
+
+    async def _chat(self, request: _Request, writer: asyncio.StreamWriter) -> Optional[tuple]:
+        data = request.json()
+        message = str(data.get("message", "")).strip()
+        if not message:
+            raise HTTPError(400, "'message' maydoni bo'sh")
+        client_session = str(data.get("session_id") or _ANONYMOUS_SESSION)
+        session_id = _SESSION_PREFIX + client_session
+        stream = bool(data.get("stream")) or "text/event-stream" in request.headers.get(
+            "accept", ""
+        )
+        if not stream:
+            response = await self._run_blocking(self.jarvis.process, message, session_id)
+            return 200, {"session_id": client_session, "response": response}
+        await self._chat_stream(writer, message, session_id, client_session)
+        return None
+
+    async def _chat_stream(
+        self, writer: asyncio.StreamWriter, message: str, session_id: str, client_session: str
+    ) -> None:
+        """Javobni SSE orqali bo'laklab yuborish."""
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        streamed = [False]
+
+        def on_token(delta: str) -> None:
+            streamed[0] = True
+            loop.call_soon_threadsafe(queue.put_nowait, ("token", delta))
+
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream; charset=utf-8\r\n"
+            b"Cache-Control: no-cache\r\n"
+            b"Connection: close\r\n\r\n"
+        )
+        await writer.drain()
+
+        task = asyncio.ensure_future(
+            self._run_blocking(self.jarvis.process, message, session_id, on_token)
+        )
+        task.add_done_callback(lambda _: queue.put_nowait(("done", None)))
+        while True:
+            kind, delta = await queue.get()
+            if kind == "done":
+                break
+            writer.write(self._sse("token", {"delta": delta}))
+            await writer.drain()
+
+        try:
+            response = task.result()
+        except HTTPError as exc:
+            writer.write(self._sse("error", {"status": exc.status, "error": exc.message}))
+        except Exception as exc:
+            writer.write(self._sse("error", {"status": 500, "error": str(exc)}))
+        else:
+            if not streamed[0] and response:
+                # Buyruq javoblari (AI siz) bitta bo'lak sifatida yuboriladi
+                writer.write(self._sse("token", {"delta": response}))
+            writer.write(self._sse("done", {"session_id": client_session, "response": response}))
+        await writer.drain()
+
+    async def _status(self, request: _Request, writer: asyncio.StreamWriter) -> tuple:
+        session_id = _SESSION_PREFIX + (request.query.get("session_id") or _ANONYMOUS_SESSION)
+        status = await self._run_blocking(self.jarvis.get_status, session_id)
+        status["server"] = self.get_stats()
+        return 200, status
+
+    def get_stats(self) -> dict:
+        """Server statistikasi."""
+        return {
+            "workers": self._workers,
+            "capacity": self._capacity,
+            "inflight": self._inflight,
+            "served": self._served,
+            "rejected": self._rejected,
+        }
+
+    # === Life endpointlari ===
+
+    def _life_modules(self) -> dict:
+        if self._life is None:
+            self._life = self._life_factory()
+        return self._life
+
+    def _life_call(self, func: Callable[[dict], Any]) -> Callable[[], Any]:
+        """Life modullariga murojaatni bitta qulf ostida bajarish (JSON fayllar umumiy).
+
+        Jarvis (chat, lokal intentlar) xuddi shu fayllarga o'z managerlari
+        orqali yozadi — har bir so'rovdan oldin o'zgargan fayllar qayta
+        yuklanadi, aks holda keyingi saqlash eski ro'yxat bilan ustidan yozardi.
+        """
+
+        def run() -> Any:
+            with self._life_lock:
+                life = self._life_modules()
+                for module in life.values():
+                    reload = getattr(module, "reload_if_changed", None)
+                    if reload is not None:
+                        reload()
+                return func(life)
+
+        return run
+
+    async def _schedule(self, request: _Request, writer: asyncio.StreamWriter) -> tuple:
+        day = request.query.get("day")
+        classes = await self._run_blocking(
+            self._life_call(lambda life: life["scheduler"].get_schedule(day))
+        )
+        return 200, {"day": day or "today", "classes": [c.model_dump() for c in classes]}
+
+    async def _homework_list(self, request: _Request, writer: asyncio.StreamWriter) -> tuple:
+        items = await self._run_blocking(
+            self._life_call(lambda life: life["homework"].get_pending_homework())
+        )
+        return 200, {"homework": [h.model_dump() for h in items]}
+
+    async def _homework_add(self, request: _Request, writer: asyncio.StreamWriter) -> tuple:
+        data = request.json()
+        subject = str(data.get("subject", "")).strip()
+        description = str(data.get("description", "")).strip()
+        if not subject or not description:
+            raise HTTPError(400, "'subject' va 'description' maydonlari kerak")
+
+        def add(life: dict) -> Any:
+            return life["homework"].add_homework(
+                subject,
+                description,
+                str(data.get("deadline", "")),
+                str(data.get("priority", "medium")),
+            )
+
+        try:
+            hw = await self._run_blocking(self._life_call(add))
+        except ValueError as exc:
+            raise HTTPError(400, str(exc)) from exc
+        return 201, hw.model_dump()
+
+    async def _tasks_list(self, request: _Request, writer: asyncio.StreamWriter) -> tuple:
+        pending = await self._run_blocking(
+            self._life_call(lambda life: life["homework"].get_all_pending())
+        )
+        return 200, {
+            "tasks": [
+                {"type": e["type"], "priority_score": e["priority_score"], **e["item"].model_dump()}
+                for e in pending
+            ]
+        }
+
+    async def _tasks_add(self, request: _Request, writer: asyncio.StreamWriter) -> tuple:
+        data = request.json()
+        title = str(data.get("title", "")).strip()
+        if not title:
+            raise HTTPError(400, "'title' maydoni kerak")
+
+        def add(life: dict) -> Any:
+            return life["homework"].add_task(
+                title,
+                str(data.get("description", "")),
+                str(data.get("deadline", "")),
+                str(data.get("priority", "medium")),
+                str(data.get("category", "general")),
+            )
+
+        try:
+            task = await self._run_blocking(self._life_call(add))
+        except ValueError as exc:
+            raise HTTPError(400, str(exc)) from exc
+        return 201, task.model_dump()
+
+    async def _reminders(self, request: _Request, writer: asyncio.StreamWriter) -> tuple:
+        reminders = await self._run_blocking(
+            self._life_call(lambda life: life["reminders"].check_all())
+        )
+        return 200, {"reminders": reminders}
+
+
+def _default_life_factory() -> dict:
+    """Life modullarini yaratish (birinchi murojaatda)."""
+    from life import ReminderEngine
+
+    # ReminderEngine o'z jadval/vazifa managerlariga ega — ularni qayta ishlatamiz
+    reminders = ReminderEngine()
+    return {
+        "scheduler": reminders.scheduler,
+        "homework": reminders.homework_mgr,
+        "reminders": reminders,
+    }
+
+
+def run_server(
+    jarvis: Any,
+    host: str = _DEFAULT_HOST,
+    port: int = _DEFAULT_PORT,
+    workers: int = _DEFAULT_WORKERS,
+) -> None:
+    """Serverni ishga tushirish va Ctrl+C gacha ishlatish."""
+    server = JarvisServer(jarvis, host=host, port=port, workers=workers)
+
+    async def main() -> None:
+        await server.start()
+        print(f"JARVIS API: http://{server.host}:{server.port}")
+        try:
+            await server.serve_forever()
+        finally:
+            await server.stop()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
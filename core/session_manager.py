@@ -0,0 +1,151 @@
+"""
+Sessiya boshqaruvchisi — bir jarayonda ko'p foydalanuvchiga xizmat ko'rsatish.
+
+Har bir foydalanuvchining holati (qisqa muddatli xotira, rejim, til,
+tanlangan provayder/model, focus taymerlari) sessiya ID si bo'yicha alohida
+saqlanadi. Og'ir obyektlar (AIRouter, RAG indeksi, uzoq muddatli xotira
+kolleksiyasi) barcha sessiyalar uchun umumiy. Bo'sh turgan sessiyalar LRU
+tartibida xotiradan chiqariladi — suhbat tarixi SessionStore da qoladi.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from .language import LanguageDetector
+from .lazy import LazyProxy
+from .modes import ModeManager
+
+_MAX_SESSIONS = 1000
+_IDLE_TTL = 3600.0  # sekund
+
+
+class UserSession:
+    """Bitta foydalanuvchining izolyatsiya qilingan holati."""
+
+    def __init__(self, session_id: str, memory: Any, default_mode: str = "pro") -> None:
+        self.session_id = session_id
+        self.memory = memory
+        self.mode_manager = ModeManager(default_mode=default_mode)
+        self.language = LanguageDetector()
+        # Faqat /focus, /study kabi buyruqlarda kerak — birinchi murojaatda yaratiladi
+        self.education = LazyProxy("core.education:SmartEducation")
+        self.time_engine = LazyProxy("core.intelligence:TimePerceptionEngine")
+        self.forced_provider: Optional[str] = None
+        self.forced_model: Optional[str] = None
+        self.last_active = time.monotonic()
+        # Bitta foydalanuvchining so'rovlari ketma-ket bajariladi
+        self.lock = threading.RLock()
+
+    def touch(self) -> None:
+        """Oxirgi faollik vaqtini yangilash."""
+        self.last_active = time.monotonic()
+
+    def is_busy(self) -> bool:
+        """Sessiyada hozir so'rov bajarilayotganini tekshirish."""
+        if self.lock.acquire(blocking=False):
+            self.lock.release()
+            return False
+        return True
+
+
+class SessionManager:
+    """Sessiyalarni ID bo'yicha yaratish, qaytarish va LRU bo'yicha chiqarish."""
+
+    def __init__(
+        self,
+        memory: Any,
+        default_mode: str = "pro",
+        max_sessions: int = _MAX_SESSIONS,
+        idle_ttl: float = _IDLE_TTL,
+    ) -> None:
+        """
+        Args:
+            memory: Umumiy MemoryManager — har bir sessiya uchun
+                ``memory.for_session(id)`` orqali alohida nusxa olinadi.
+            default_mode: Yangi sessiyalar uchun boshlang'ich rejim.
+            max_sessions: Xotirada saqlanadigan maksimal sessiyalar soni.
+            idle_ttl: Shuncha sekund faol bo'lmagan sessiya chiqariladi.
+        """
+        self._memory = memory
+        self._default_mode = default_mode
+        self._max_sessions = max(1, max_sessions)
+        self._idle_ttl = idle_ttl
+        self._sessions: OrderedDict[str, UserSession] = OrderedDict()
+        self._lock = threading.Lock()
+        self._evicted = 0
+
+    def get(self, session_id: str) -> UserSession:
+        """Sessiyani qaytarish (bo'lmasa yaratish)."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                self._sessions.move_to_end(session_id)
+                session.touch()
+                return session
+            if self._memory.get_session_id() == session_id:
+                memory = self._memory
+            else:
+                memory = self._memory.for_session(session_id)
+            session = UserSession(session_id, memory, self._default_mode)
+            self._sessions[session_id] = session
+            self._evict_locked()
+            return session
+
+    def peek(self, session_id: str) -> Optional[UserSession]:
+        """Sessiyani LRU tartibini o'zgartirmasdan qaytarish."""
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def evict_idle(self) -> int:
+        """Muddati o'tgan bo'sh sessiyalarni chiqarish.
+
+        Returns:
+            Chiqarilgan sessiyalar soni.
+        """
+        with self._lock:
+            return self._evict_locked()
+
+    def _evict_locked(self) -> int:
+        now = time.monotonic()
+        removed = 0
+        for session_id in list(self._sessions):
+            session = self._sessions[session_id]
+            over_capacity = len(self._sessions) > self._max_sessions
+            idle = now - session.last_active > self._idle_ttl
+            if not (over_capacity or idle):
+                # OrderedDict LRU tartibida — qolganlari yangiroq
+                break
+            if session.is_busy():
+                continue
+            del self._sessions[session_id]
+            session.memory.flush()
+            removed += 1
+        self._evicted += removed
+        return removed
+
+    def writer_of(self, transcript_id: str) -> Optional[UserSession]:
+        """Transkriptga hozir yozayotgan (xotiradagi) sessiya, bo'lmasa None."""
+        with self._lock:
+            for session in self._sessions.values():
+                if session.memory.get_session_id() == transcript_id:
+                    return session
+            return None
+
+    def list_active(self) -> list[str]:
+        """Xotiradagi sessiya ID lari (eng eskisidan yangisiga)."""
+        with self._lock:
+            return list(self._sessions)
+
+    def get_stats(self) -> dict:
+        """Sessiyalar statistikasi."""
+        with self._lock:
+            return {
+                "active_sessions": len(self._sessions),
+                "max_sessions": self._max_sessions,
+                "idle_ttl_seconds": self._idle_ttl,
+                "evicted_total": self._evicted,
+            }
@@ -0,0 +1,265 @@
+"""
+Sessiya saqlash tizimi — qisqa muddatli suhbatni diskda saqlash.
+
+Har bir sessiya ``data/sessions/<id>.jsonl`` faylida append-only tarzda
+saqlanadi. Yozuvlar buferlanadi va fon taymeri yoki bufer to'lganda diskka
+tushiriladi, shuning uchun REPL hech qachon disk yozuvini kutmaydi.
+Ishga tushganda faqat oxirgi oyna (tail) o'qiladi.
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import os
+import re
+import threading
+import weakref
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+_DEFAULT_SESSION = "default"
+_FLUSH_EVERY = 8  # Bufferda shuncha yozuv yig'ilsa darhol yoziladi
+_FLUSH_INTERVAL = 2.0  # sekund — aks holda shu vaqtdan keyin yoziladi
+_TAIL_BLOCK_SIZE = 8192
+_CLEAR_MARKER = "clear"
+_UNSAFE_CHARS_RE = re.compile(r"[^A-Za-z0-9_.-]")
+_MAX_NAME_LENGTH = 64
+# O'zgartirilgan nomlarga xom ID xeshi qo'shiladi; "~" xavfsiz belgilar
+# qatorida yo'q, shuning uchun o'zgarmagan nom hech qachon xeshli nomga teng emas
+_HASH_SEP = "~"
+_HASH_LENGTH = 10
+
+
+# Ochiq store'lar — jarayon tugaganda bitta atexit hook hammasini yozadi;
+# WeakSet store'ni jarayon oxirigacha ushlab turmaydi
+_LIVE_STORES: "weakref.WeakSet[SessionStore]" = weakref.WeakSet()
+
+
+def _flush_all() -> None:
+    for store in list(_LIVE_STORES):
+        store.flush()
+
+
+atexit.register(_flush_all)
+
+
+def _safe_name(session_id: str) -> str:
+    """Sessiya ID sini xavfsiz fayl nomiga aylantirish.
+
+    Xavfsiz ID o'zgarmaydi. Belgilari almashtirilgan yoki qisqartirilgan
+    ID ga xom ID xeshi qo'shiladi — "a/b" va "a_b" bitta faylga tushmaydi.
+    """
+    raw = session_id.strip()
+    name = _UNSAFE_CHARS_RE.sub("_", raw).strip(".")
+    if name == raw and 0 < len(name) <= _MAX_NAME_LENGTH:
+        return name
+    if not raw:
+        return _DEFAULT_SESSION
+    digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()[:_HASH_LENGTH]
+    return f"{name[:_MAX_NAME_LENGTH]}{_HASH_SEP}{digest}"
+
+
+class SessionStore:
+    """Append-only, buferlangan sessiya transkriptlari."""
+
+    def __init__(
+        self,
+        sessions_dir: str = "./data/sessions",
+        flush_every: int = _FLUSH_EVERY,
+        flush_interval: float = _FLUSH_INTERVAL,
+    ) -> None:
+        # Hozirgi katalogga nisbatan bir marta aniqlanadi — keyin chdir qilinsa
+        # ham (masalan atexit paytida) yozuvlar shu katalogga tushadi
+        self._dir = Path(sessions_dir).resolve()
+        self._flush_every = max(1, flush_every)
+        self._flush_interval = flush_interval
+        self._buffers: dict[str, list[dict]] = {}
+        self._next_seq: dict[str, int] = {}
+        self._lock = threading.Lock()
+        # Sessiya bo'yicha yozish qulfi — buferni olish va faylga yozish bitta
+        # qulf ostida, aks holda parallel flush'lar yozuvlar tartibini almashtiradi
+        self._write_locks: dict[str, threading.Lock] = {}
+        self._timer: Optional[threading.Timer] = None
+        _LIVE_STORES.add(self)
+
+    # === Yo'llar ===
+
+    def transcript_path(self, session_id: str) -> Path:
+        """Sessiya transkripti fayl yo'li."""
+        return self._dir / f"{_safe_name(session_id)}.jsonl"
+
+    def summary_path(self, session_id: str) -> Path:
+        """Sessiyaning yig'ma xulosa fayli yo'li."""
+        return self._dir / f"{_safe_name(session_id)}.summary.json"
+
+    # === Yozish ===
+
+    def append(self, session_id: str, role: str, content: str) -> int:
+        """Xabarni buferga qo'shish (diskka keyinroq yoziladi).
+
+        Returns:
+            Xabarning sessiya ichidagi tartib raqami (seq).
+        """
+        seq = self._allocate_seq(session_id)
+        record = {
+            "seq": seq,
+            "role": role,
+            "content": content,
+            "ts": datetime.now().isoformat(timespec="seconds"),
+        }
+        self._buffer(session_id, record)
+        return seq
+
+    def _allocate_seq(self, session_id: str) -> int:
+        with self._lock:
+            known = session_id in self._next_seq
+        if not known:
+            last = self._read_tail_records(session_id, 1)
+            start = int(last[-1].get("seq", 0)) + 1 if last else 1
+            with self._lock:
+                self._next_seq.setdefault(session_id, start)
+        with self._lock:
+            seq = self._next_seq[session_id]
+            self._next_seq[session_id] = seq + 1
+            return seq
+
+    def mark_cleared(self, session_id: str) -> None:
+        """Tarix tozalanganini belgilash — yuklashda undan oldingilar o'qilmaydi."""
+        self._buffer(session_id, {"type": _CLEAR_MARKER, "seq": self._allocate_seq(session_id)})
+        self.flush(session_id)
+
+    def _buffer(self, session_id: str, record: dict) -> None:
+        with self._lock:
+            buf = self._buffers.setdefault(session_id, [])
+            buf.append(record)
+            full = len(buf) >= self._flush_every
+            if not full and self._timer is None:
+                self._timer = threading.Timer(self._flush_interval, self._on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush(session_id)
+
+    def _on_timer(self) -> None:
+        with self._lock:
+            self._timer = None
+        self.flush()
+
+    def flush(self, session_id: Optional[str] = None) -> None:
+        """Buferlangan yozuvlarni diskka yozish."""
+        with self._lock:
+            session_ids = list(self._buffers) if session_id is None else [session_id]
+        for sid in session_ids:
+            with self._lock:
+                write_lock = self._write_locks.setdefault(sid, threading.Lock())
+            with write_lock:
+                with self._lock:
+                    records = self._buffers.pop(sid, None)
+                if not records:
+                    continue
+                try:
+                    path = self.transcript_path(sid)
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    with open(path, "a", encoding="utf-8") as f:
+                        f.write(
+                            "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+                        )
+                except OSError:
+                    continue
+
+    # === O'qish ===
+
+    def load_tail(
+        self, session_id: str, limit: int, after_seq: int = 0
+    ) -> list[tuple[int, dict]]:
+        """Sessiyaning oxirgi ``limit`` ta xabarini qaytarish.
+
+        Fayl oxiridan bloklab o'qiladi — butun transkript xotiraga yuklanmaydi.
+        Oxirgi "clear" belgisidan oldingi va ``after_seq`` dan kichik yoki teng
+        tartib raqamli (allaqachon xulosaga siqilgan) xabarlar o'tkazib yuboriladi.
+
+        Returns:
+            [(seq, {"role": str, "content": str})]
+        """
+        messages: list[tuple[int, dict]] = []
+        for record in reversed(self._read_tail_records(session_id, limit)):
+            if record.get("type") == _CLEAR_MARKER:
+                break
+            seq = int(record.get("seq", 0))
+            if seq and seq <= after_seq:
+                break
+            if "role" in record and "content" in record:
+                messages.append((seq, {"role": record["role"], "content": record["content"]}))
+                if len(messages) >= limit:
+                    break
+        messages.reverse()
+        return messages
+
+    def _read_tail_records(self, session_id: str, limit: int) -> list[dict]:
+        """Fayl oxiridan kamida ``limit`` ta JSON yozuvni o'qish."""
+        self.flush(session_id)
+        path = self.transcript_path(session_id)
+        if limit <= 0 or not path.exists():
+            return []
+
+        lines: list[bytes] = []
+        try:
+            with open(path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                pos = f.tell()
+                tail = b""
+                while pos > 0 and len(lines) <= limit:
+                    step = min(_TAIL_BLOCK_SIZE, pos)
+                    pos -= step
+                    f.seek(pos)
+                    tail = f.read(step) + tail
+                    parts = tail.split(b"\n")
+                    # Birinchi bo'lak to'liq bo'lmasligi mumkin (pos > 0 bo'lsa)
+                    lines = parts[1:] if pos > 0 else parts
+        except OSError:
+            return []
+
+        records: list[dict] = []
+        for raw in lines:
+            if not raw.strip():
+                continue
+            try:
+                record = json.loads(raw)
+            except ValueError:
+                continue
+            if isinstance(record, dict):
+                records.append(record)
+        return records
+
+    def list_sessions(self) -> list[dict]:
+        """Mavjud sessiyalar ro'yxati (oxirgi o'zgarish bo'yicha tartiblangan).
+
+        Returns:
+            [{"id": str, "size_bytes": int, "updated_at": str}]
+        """
+        self.flush()
+        if not self._dir.is_dir():
+            return []
+        sessions = []
+        for path in self._dir.glob("*.jsonl"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            sessions.append(
+                {
+                    "id": path.stem,
+                    "size_bytes": stat.st_size,
+                    "updated_at": datetime.fromtimestamp(stat.st_mtime).strftime(
+                        "%Y-%m-%d %H:%M"
+                    ),
+                    "_mtime": stat.st_mtime,
+                }
+            )
+        sessions.sort(key=lambda s: s["_mtime"], reverse=True)
+        for s in sessions:
+            del s["_mtime"]
+        return sessions
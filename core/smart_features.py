@@ -8,6 +8,8 @@ from __future__ import annotations
 from datetime import datetime, timedelta
 from typing import Any
 
+from .date_parser import parse_deadline, today_tashkent
+
 
 def _parse_time(time_str: str) -> datetime | None:
     """HH:MM formatdagi vaqtni datetime ga o'girish."""
@@ -147,12 +149,13 @@ class SmartFeatures:
 
         Args:
             tasks: Har bir yozuv ``{"deadline": str, "completed": bool, "title": str}``
-                shaklida bo'lishi kerak.  ``deadline`` — ``"YYYY-MM-DD"`` yoki ``"YYYY-MM-DD HH:MM"``.
+                shaklida bo'lishi kerak.  ``deadline`` — ``"YYYY-MM-DD"``, ``"YYYY-MM-DD HH:MM"`` yoki
+                tabiiy til ifodasi ("ertaga soat 5").
 
         Returns:
             Bajarilmagan va muddati o'tgan vazifalar ro'yxati.
         """
-        today = datetime.now().date()
+        today = today_tashkent()
         missed: list[dict[str, Any]] = []
 
         for task in tasks:
@@ -163,16 +166,9 @@ class SmartFeatures:
             if not deadline_raw:
                 continue
 
-            # deadline ni parse qilish
-            deadline_date = None
-            for fmt in ("%Y-%m-%d %H:%M", "%Y-%m-%d"):
-                try:
-                    deadline_date = datetime.strptime(deadline_raw, fmt).date()
-                    break
-                except ValueError:
-                    continue
-
-            if deadline_date is not None and deadline_date < today:
+            # deadline ni parse qilish (bir xil satrlar keshdan olinadi)
+            deadline = parse_deadline(deadline_raw)
+            if deadline is not None and deadline.date() < today:
                 missed.append(task)
 
         return missed
@@ -1,12 +1,42 @@
 """
 TelegramNotifier — Telegram orqali bildirishnomalar yuborish.
+TelegramBot — Telegram orqali kiruvchi xabarlarni qabul qilish (long polling).
 Bot token va chat ID .env faylidan o'qiladi.
 """
 
 from __future__ import annotations
 
+import asyncio
+import json
 import os
-from typing import Any
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Optional
+
+_API_BASE = "https://api.telegram.org"
+_POLL_TIMEOUT = 25  # sekund — getUpdates long polling
+_MAX_MESSAGE_LEN = 4096  # Telegram xabar uzunligi chegarasi
+_DEFAULT_WORKERS = 4
+_RATE_LIMIT = 5  # bitta chatdan oynada qabul qilinadigan xabarlar soni
+_RATE_WINDOW = 10.0  # sekund
+_RETRY_DELAY = 3.0  # tarmoq xatosidan keyin kutish (sekund)
+_OFFSET_FILE = "./data/telegram_offset.json"
+# Telegram'ning o'z buyruqlari — Jarvis.process da yo'q, bot o'zi javob beradi
+_HELP_COMMANDS = ("/start", "/help")
+_HELP_TEXT = (
+    "🤖 JARVIS — shaxsiy yordamchi. Oddiy yozing yoki buyruqlar:\n"
+    "/today — bugungi sharh\n"
+    "/schedule [monday] — dars jadvali\n"
+    "/homework — uy vazifalari\n"
+    "/tasks — bajarilmagan vazifalar\n"
+    "/plan — kunlik reja\n"
+    "/reminders — eslatmalar\n"
+    "/focus [daqiqa] | /focus stop — fokus rejimi\n"
+    "/modes, /mode <nom> — rejimlar\n"
+    "/status — holat"
+)
 
 
 class TelegramNotifier:
@@ -72,3 +102,233 @@ class TelegramNotifier:
         """
         text = f"📊 Kunlik Xulosa\n\n{summary}"
         return await self.send_message(text)
+
+
+class TelegramBot:
+    """Kiruvchi Telegram xabarlarini Jarvis orqali qayta ishlovchi bot.
+
+    ``getUpdates`` bitta doimiy HTTP sessiya orqali long polling qilinadi.
+    Har bir chat o'z navbatiga ega — bitta chat xabarlari ketma-ket, turli
+    chatlar esa umumiy worker pool'da parallel qayta ishlanadi.
+    """
+
+    def __init__(
+        self,
+        jarvis: Any,
+        token: Optional[str] = None,
+        api_base: str = _API_BASE,
+        workers: int = _DEFAULT_WORKERS,
+        offset_path: str = _OFFSET_FILE,
+        rate_limit: int = _RATE_LIMIT,
+        rate_window: float = _RATE_WINDOW,
+        poll_timeout: int = _POLL_TIMEOUT,
+    ) -> None:
+        """
+        Args:
+            jarvis: ``process(text, session_id)`` metodiga ega obyekt (odatda Jarvis).
+            token: Bot tokeni (None — ``TELEGRAM_BOT_TOKEN`` dan o'qiladi).
+            api_base: Telegram Bot API manzili (test uchun stub server berilishi mumkin).
+            workers: Bloklovchi Jarvis chaqiruvlari uchun oqimlar soni.
+            offset_path: Oxirgi qayta ishlangan update ID saqlanadigan fayl.
+            rate_limit: Bitta chatdan ``rate_window`` ichida qabul qilinadigan xabarlar.
+            rate_window: Rate limit oynasi (sekund).
+            poll_timeout: getUpdates long polling vaqti (sekund).
+        """
+        self.jarvis = jarvis
+        self.bot_token: str | None = token or os.getenv("TELEGRAM_BOT_TOKEN")
+        self.enabled: bool = bool(self.bot_token)
+        self._api_base = api_base.rstrip("/")
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, workers), thread_name_prefix="telegram-worker"
+        )
+        self._offset_path = Path(offset_path)
+        self._offset = self._load_offset()
+        self._rate_limit = max(1, rate_limit)
+        self._rate_window = rate_window
+        self._poll_timeout = poll_timeout
+        self._queues: dict[int, asyncio.Queue] = {}
+        self._consumers: dict[int, asyncio.Task] = {}
+        self._history: dict[int, deque] = {}
+        self._session: Any = None
+        self._running = False
+        self._stats = {"received": 0, "handled": 0, "rate_limited": 0, "errors": 0}
+
+    # === Offset ===
+
+    def _load_offset(self) -> int:
+        """Saqlangan offset ni o'qish (bo'lmasa 0)."""
+        try:
+            with open(self._offset_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return int(data.get("offset", 0)) if isinstance(data, dict) else 0
+        except (OSError, ValueError, TypeError):
+            return 0
+
+    def _save_offset(self) -> None:
+        """Offset ni diskka atomar yozish."""
+        try:
+            self._offset_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._offset_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"offset": self._offset}, f)
+            tmp_path.replace(self._offset_path)
+        except OSError:
+            pass
+
+    # === Bot API ===
+
+    async def _call(self, method: str, payload: dict, timeout: float = 10) -> Any:
+        """Bot API metodini chaqirish va ``result`` ni qaytarish."""
+        import aiohttp
+
+        url = f"{self._api_base}/bot{self.bot_token}/{method}"
+        async with self._session.post(
+            url, json=payload, timeout=aiohttp.ClientTimeout(total=timeout)
+        ) as resp:
+            data = await resp.json(content_type=None)
+        if not isinstance(data, dict) or not data.get("ok"):
+            raise RuntimeError(f"Telegram {method} xatosi: {data}")
+        return data.get("result")
+
+    async def send_message(self, chat_id: int, text: str) -> bool:
+        """Chatga xabar yuborish (uzun matn bo'laklarga bo'linadi).
+
+        Returns:
+            ``True`` — muvaffaqiyatli, ``False`` — xato.
+        """
+        text = text or "..."
+        try:
+            for start in range(0, len(text), _MAX_MESSAGE_LEN):
+                await self._call(
+                    "sendMessage",
+                    {"chat_id": chat_id, "text": text[start:start + _MAX_MESSAGE_LEN]},
+                )
+            return True
+        except Exception:
+            return False
+
+    # === Asosiy sikl ===
+
+    async def run(self) -> None:
+        """Long polling siklini ``stop()`` chaqirilguncha ishlatish."""
+        if not self.enabled:
+            raise RuntimeError("TELEGRAM_BOT_TOKEN sozlanmagan")
+        import aiohttp
+
+        self._running = True
+        async with aiohttp.ClientSession() as session:
+            self._session = session
+            while self._running:
+                try:
+                    updates = await self._call(
+                        "getUpdates",
+                        {
+                            "offset": self._offset,
+                            "timeout": self._poll_timeout,
+                            "allowed_updates": ["message"],
+                        },
+                        timeout=self._poll_timeout + 10,
+                    )
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    self._stats["errors"] += 1
+                    await asyncio.sleep(_RETRY_DELAY)
+                    continue
+                for update in updates or []:
+                    self._dispatch(update)
+                if updates:
+                    self._offset = int(updates[-1]["update_id"]) + 1
+                    self._save_offset()
+            await self._drain()
+            self._session = None
+
+    def stop(self) -> None:
+        """Pollingni to'xtatish (joriy getUpdates tugagach)."""
+        self._running = False
+
+    async def _drain(self) -> None:
+        """Navbatdagi barcha xabarlar qayta ishlanishini kutish."""
+        consumers = list(self._consumers.values())
+        if consumers:
+            await asyncio.gather(*consumers, return_exceptions=True)
+        self._executor.shutdown(wait=False)
+
+    # === Xabarlarni taqsimlash ===
+
+    def _dispatch(self, update: dict) -> None:
+        """Update ni tegishli chat navbatiga qo'yish."""
+        message = update.get("message") or {}
+        text = message.get("text")
+        chat_id = (message.get("chat") or {}).get("id")
+        if not text or chat_id is None:
+            return
+        self._stats["received"] += 1
+
+        if not self._allow(chat_id):
+            self._stats["rate_limited"] += 1
+            return
+
+        queue = self._queues.get(chat_id)
+        if queue is None:
+            queue = self._queues[chat_id] = asyncio.Queue()
+        queue.put_nowait(text)
+        if chat_id not in self._consumers:
+            self._consumers[chat_id] = asyncio.ensure_future(self._consume(chat_id))
+
+    def _allow(self, chat_id: int) -> bool:
+        """Chat uchun sliding-window rate limit tekshiruvi."""
+        now = time.monotonic()
+        history = self._history.setdefault(chat_id, deque())
+        while history and now - history[0] > self._rate_window:
+            history.popleft()
+        if len(history) >= self._rate_limit:
+            return False
+        history.append(now)
+        return True
+
+    async def _consume(self, chat_id: int) -> None:
+        """Bitta chat xabarlarini tartib bilan qayta ishlash."""
+        queue = self._queues[chat_id]
+        loop = asyncio.get_running_loop()
+        try:
+            while not queue.empty():
+                text = queue.get_nowait()
+                try:
+                    reply = await loop.run_in_executor(
+                        self._executor, self._handle_text, chat_id, text
+                    )
+                    self._stats["handled"] += 1
+                except Exception as exc:
+                    self._stats["errors"] += 1
+                    reply = f"Xato yuz berdi: {exc}"
+                await self.send_message(chat_id, reply)
+        finally:
+            # Navbat bo'sh — chat holatini tozalash (keyingi xabar yangi consumer ochadi)
+            del self._consumers[chat_id]
+            del self._queues[chat_id]
+
+    def _handle_text(self, chat_id: int, text: str) -> str:
+        """Xabarni Jarvis orqali qayta ishlash (worker oqimida).
+
+        Matn o'zgarishsiz yuboriladi: slash buyruqlarni ham, lokal intentlarni
+        ham (klassifikator) ``Jarvis.process`` o'zi aniqlaydi. Faqat
+        ``/start`` va ``/help`` bot tomonidan javoblanadi.
+        """
+        session_id = f"tg-{chat_id}"
+        if text.startswith("/"):
+            command, _, rest = text.partition(" ")
+            # Guruhlarda buyruq "/tasks@BotNomi" ko'rinishida keladi
+            command = command.split("@", 1)[0].lower()
+            if command in _HELP_COMMANDS:
+                return _HELP_TEXT
+            text = f"{command} {rest}".rstrip()
+        return self.jarvis.process(text, session_id)
+
+    def get_stats(self) -> dict:
+        """Bot statistikasi."""
+        return {
+            **self._stats,
+            "offset": self._offset,
+            "active_chats": len(self._consumers),
+        }
@@ -0,0 +1,238 @@
+"""
+TextFeatures — kiritilgan matnni bir marta tahlil qiluvchi umumiy qatlam.
+
+IntentParser (intent va kun), AutoModeSwitcher (rejim) va LanguageDetector
+(til) bir xil matnni alohida-alohida skanerlash o'rniga shu yerdagi
+``analyze()`` natijasidan foydalanadi. Barcha kalit so'zlar (intent, kun,
+rejim) bitta Aho-Corasick avtomati bilan bitta o'tishda topiladi, til esa
+faqat so'ralganda trigramma modeli (``lang_model``) bilan aniqlanadi. Natija matn bo'yicha
+keshlanadi, shuning uchun bitta xabar uchun uchala qaror ham bir xil
+xususiyatlardan olinadi.
+"""
+
+from __future__ import annotations
+
+import re
+import string
+import threading
+from functools import lru_cache
+from typing import Optional
+
+from .keyword_matcher import KeywordMatcher
+from .lang_model import get_language_model
+from .metrics import get_registry, lru_cache_collector
+
+_CACHE_SIZE = 512
+_MIN_LANGUAGE_CONFIDENCE = 0.6  # bundan past bo'lsa joriy til saqlanadi
+_WORD_RE = re.compile(r"\b\w+\b")
+_MODE_ORDER = ("code", "study", "pro")
+# ASCII lotin harflarini o'chiruvchi jadval — uzunlik farqi harflar soni
+_DELETE_LATIN = str.maketrans("", "", string.ascii_letters)
+
+
+class _Vocabulary:
+    """Barcha modullarning kalit so'zlari birlashtirilgan avtomat.
+
+    Indekslar diapazonlarga bo'lingan: intent kalit so'zlari, kun nomlari,
+    keyin rejim kalit so'zlari (code, study, pro). Har bir diapazon ichida
+    kichik indeks — yuqori ustuvorlik.
+    """
+
+    def __init__(self) -> None:
+        from .auto_mode import AutoModeSwitcher
+        from .intent_parser import _DAY_MAP, _INTENT_PATTERNS
+        from .language import _RU_CHARS, _UZ_CHARS, _UZ_WORDS
+
+        keywords: list[str] = []
+        self.intent_names: list[str] = []
+        for intent, kws in _INTENT_PATTERNS:
+            keywords.extend(kws)
+            self.intent_names.extend([intent] * len(kws))
+        self.day_start = len(keywords)
+        keywords.extend(_DAY_MAP)
+        self.day_values: list[str] = list(_DAY_MAP.values())
+        self.mode_start = len(keywords)
+        self.mode_names: list[str] = []
+        for mode, kws in zip(
+            _MODE_ORDER,
+            (
+                AutoModeSwitcher._CODE_KEYWORDS,
+                AutoModeSwitcher._STUDY_KEYWORDS,
+                AutoModeSwitcher._PRO_KEYWORDS,
+            ),
+        ):
+            keywords.extend(kws)
+            self.mode_names.extend([mode] * len(kws))
+        self.matcher = KeywordMatcher(keywords)
+
+        self.uz_words = _UZ_WORDS
+        self.uz_chars = tuple(_UZ_CHARS)
+        self.delete_ru = str.maketrans("", "", "".join(_RU_CHARS))
+
+
+_vocab: Optional[_Vocabulary] = None
+_vocab_lock = threading.Lock()
+
+
+def _get_vocabulary() -> _Vocabulary:
+    """Avtomatni birinchi murojaatda qurish (modullar o'zaro import qilinmasligi uchun)."""
+    global _vocab
+    if _vocab is None:
+        with _vocab_lock:
+            if _vocab is None:
+                _vocab = _Vocabulary()
+    return _vocab
+
+
+class TextFeatures:
+    """Bitta matndan olingan xususiyatlar (o'zgarmas deb hisoblanadi).
+
+    Faqat ``text`` va ``lower`` darhol hisoblanadi. Kalit so'z skaneri
+    (intent, kun, rejim) va til qarori birinchi murojaatda ishlaydi, shuning
+    uchun slash buyruq kabi tezkor yo'llar ularni umuman ishga tushirmaydi.
+    """
+
+    __slots__ = (
+        "text",
+        "lower",
+        "_hits",
+        "_keywords",
+        "_words",
+        "_language",
+    )
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.lower = text.lower().strip()
+        self._hits: Optional[tuple[int, ...]] = None
+        self._keywords: Optional[tuple[Optional[str], Optional[str], str]] = None
+        self._words: Optional[tuple[str, ...]] = None
+        # Til qarori qimmat (trigramma modeli) — faqat birinchi murojaatda hisoblanadi
+        self._language: Optional[tuple[Optional[str], float, str]] = None
+
+    @property
+    def hits(self) -> tuple[int, ...]:
+        """Umumiy avtomatdagi kalit so'z indekslari (birinchi murojaatda skanerlanadi)."""
+        if self._hits is None:
+            self._hits = tuple(_get_vocabulary().matcher.scan(self.lower))
+        return self._hits
+
+    @property
+    def intent(self) -> Optional[str]:
+        """Birinchi mos intent (_INTENT_PATTERNS tartibida) yoki None."""
+        return self._keyword_decision()[0]
+
+    @property
+    def day(self) -> Optional[str]:
+        """Birinchi mos kun (_DAY_MAP tartibida) yoki None."""
+        return self._keyword_decision()[1]
+
+    @property
+    def mode(self) -> str:
+        """Kalit so'zlar bo'yicha rejim ("fast" — mos kelmasa)."""
+        return self._keyword_decision()[2]
+
+    def _keyword_decision(self) -> tuple[Optional[str], Optional[str], str]:
+        """Kalit so'z mosliklarini diapazonlar bo'yicha ajratish: (intent, kun, rejim)."""
+        if self._keywords is None:
+            vocab = _get_vocabulary()
+            intent_idx = day_idx = mode_idx = None
+            for i in self.hits:
+                if i < vocab.day_start:
+                    if intent_idx is None or i < intent_idx:
+                        intent_idx = i
+                elif i < vocab.mode_start:
+                    if day_idx is None or i < day_idx:
+                        day_idx = i
+                elif mode_idx is None or i < mode_idx:
+                    mode_idx = i
+            self._keywords = (
+                vocab.intent_names[intent_idx] if intent_idx is not None else None,
+                vocab.day_values[day_idx - vocab.day_start] if day_idx is not None else None,
+                vocab.mode_names[mode_idx - vocab.mode_start] if mode_idx is not None else "fast",
+            )
+        return self._keywords
+
+    @property
+    def words(self) -> tuple[str, ...]:
+        """Kichik harfli so'z tokenlari (birinchi murojaatda ajratiladi)."""
+        if self._words is None:
+            self._words = tuple(_WORD_RE.findall(self.lower))
+        return self._words
+
+    @property
+    def language(self) -> Optional[str]:
+        """Til qarori (aniqlanmasa None — chaqiruvchi joriy tilni saqlaydi)."""
+        return self._language_decision()[0]
+
+    @property
+    def language_confidence(self) -> float:
+        """Til qaroriga ishonch (0..1; evristikada 0)."""
+        return self._language_decision()[1]
+
+    @property
+    def script(self) -> str:
+        """Yozuv: "latn" yoki "cyrl"."""
+        return self._language_decision()[2]
+
+    def _language_decision(self) -> tuple[Optional[str], float, str]:
+        """(til, ishonch, yozuv) — birinchi murojaatda hisoblanib saqlanadi."""
+        if self._language is None:
+            self._language = self._classify_language(_get_vocabulary())
+        return self._language
+
+    def _classify_language(self, vocab: _Vocabulary) -> tuple[Optional[str], float, str]:
+        """Til qarori: (til yoki None, ishonch, yozuv).
+
+        Asosiy usul — trigramma modeli (lang_model). Model yuklanmasa
+        evristikaga qaytiladi.
+        """
+        if not self.lower:
+            return None, 0.0, "latn"
+        model = get_language_model()
+        if model is None:
+            return self._heuristic_language(vocab)
+
+        # Yozuvlar bo'yicha ehtimolliklarni til bo'yicha jamlash (uz = lotin + kirill)
+        by_language: dict[str, float] = {}
+        best_label, best_prob = "", -1.0
+        for label, prob in model.probabilities(self.text).items():
+            lang = label.split("_")[0]
+            by_language[lang] = by_language.get(lang, 0.0) + prob
+            if prob > best_prob:
+                best_label, best_prob = label, prob
+        if not by_language:
+            return None, 0.0, "latn"
+        lang = max(by_language, key=by_language.__getitem__)
+        confidence = by_language[lang]
+        script = "cyrl" if best_label.endswith("cyrl") or lang == "ru" else "latn"
+        return (lang if confidence >= _MIN_LANGUAGE_CONFIDENCE else None), confidence, script
+
+    def _heuristic_language(self, vocab: _Vocabulary) -> tuple[Optional[str], float, str]:
+        """Model bo'lmaganda: rus harflari ulushi > 30%, o'zbek harf yoki
+        so'zlari, lotin harflari ulushi > 50%."""
+        text = self.text
+        length = len(text)
+        ascii_only = text.isascii()
+        if not ascii_only:
+            ru_chars = length - len(text.translate(vocab.delete_ru))
+            if ru_chars > length * 0.3:
+                return "ru", 0.0, "cyrl"
+            if any(ch in text for ch in vocab.uz_chars):
+                return "uz", 0.0, "latn"
+        uz_words = vocab.uz_words
+        if any(w in uz_words for w in self.words):
+            return "uz", 0.0, "latn"
+        latin_chars = length - len(text.translate(_DELETE_LATIN))
+        if latin_chars > length * 0.5:
+            return "en", 0.0, "latn"
+        return None, 0.0, "latn"
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def analyze(text: str) -> TextFeatures:
+    """Matn xususiyatlarini qaytarish (matn bo'yicha keshlangan)."""
+    return TextFeatures(text)
+
+
+get_registry().register_collector(lru_cache_collector("text_features", analyze))
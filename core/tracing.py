@@ -0,0 +1,331 @@
+"""
+Yengil tracing — Jarvis.process bosqichlari va provayder urinishlarining vaqti.
+
+Har bir so'rov — bitta ``Trace``; uning ichidagi bosqichlar (til aniqlash,
+RAG, xotira, prompt, provayder urinishlari, xotiraga yozish) — ``Span``.
+Vaqt ``time.perf_counter`` (monoton) bilan o'lchanadi. Tugagan tracelar
+xotiradagi halqa buferga (oxirgi N ta) tushadi, ``/trace`` buyrug'i ularni
+ko'rsatadi; ``JARVIS_TRACE_FILE`` berilsa har biri JSONL qatori sifatida
+faylga ham yoziladi. ``JARVIS_TRACE=0`` tracingni o'chiradi.
+
+Joriy trace oqim (thread) bo'yicha saqlanadi — ``span()`` ni istalgan
+modul (masalan AIRouter) chaqirishi mumkin; trace yo'q bo'lsa (fon oqimi,
+tracing o'chirilgan) hech narsa qilmaydigan obyekt qaytadi.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Optional
+
+_TRACE_ENV = "JARVIS_TRACE"
+_TRACE_FILE_ENV = "JARVIS_TRACE_FILE"
+_BUFFER_SIZE = 200
+_PREVIEW_CHARS = 60
+
+
+class Span:
+    """Bitta bosqich: nomi, boshlanish/tugash vaqti, atributlar va xato."""
+
+    __slots__ = ("name", "start", "end", "depth", "attrs", "error")
+
+    def __init__(self, name: str, start: float, depth: int, attrs: dict) -> None:
+        self.name = name
+        self.start = start
+        self.end = 0.0
+        self.depth = depth
+        self.attrs = attrs
+        self.error = ""
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end - self.start) * 1000 if self.end else 0.0
+
+    def set(self, **attrs: Any) -> None:
+        """Atribut qo'shish (masalan tanlangan model)."""
+        self.attrs.update(attrs)
+
+    def record_error(self, exc: BaseException) -> None:
+        """Ushlangan (yutib yuborilgan) xatoni qayd etish."""
+        self.error = f"{type(exc).__name__}: {exc}"
+
+
+class Trace:
+    """Bitta so'rovning barcha spanlari."""
+
+    __slots__ = ("trace_id", "name", "session_id", "wall_start", "root", "spans", "_stack")
+
+    def __init__(self, trace_id: int, name: str, session_id: str, attrs: dict) -> None:
+        self.trace_id = trace_id
+        self.name = name
+        self.session_id = session_id
+        self.wall_start = time.time()
+        self.root = Span(name, time.perf_counter(), 0, attrs)
+        self.spans: list[Span] = []
+        self._stack: list[Span] = [self.root]
+
+    @property
+    def duration_ms(self) -> float:
+        return self.root.duration_ms
+
+    @property
+    def attrs(self) -> dict:
+        return self.root.attrs
+
+    def to_dict(self) -> dict:
+        """JSON ga yoziladigan ko'rinish (span vaqtlari trace boshidan ms)."""
+        origin = self.root.start
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "session_id": self.session_id,
+            "start": datetime.fromtimestamp(self.wall_start).isoformat(timespec="milliseconds"),
+            "duration_ms": round(self.duration_ms, 3),
+            "attrs": self.root.attrs,
+            "error": self.root.error,
+            "spans": [
+                {
+                    "name": s.name,
+                    "offset_ms": round((s.start - origin) * 1000, 3),
+                    "duration_ms": round(s.duration_ms, 3),
+                    "depth": s.depth,
+                    "attrs": s.attrs,
+                    "error": s.error,
+                }
+                for s in self.spans
+            ],
+        }
+
+
+class _NullSpan:
+    """Trace yo'q bo'lganda qaytariladigan, hech narsa qilmaydigan span."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+    def record_error(self, exc: BaseException) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _SpanContext:
+    __slots__ = ("_trace", "_span")
+
+    def __init__(self, trace: Trace, span: Span) -> None:
+        self._trace = trace
+        self._span = span
+
+    def __enter__(self) -> Span:
+        return self._span
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        span = self._span
+        span.end = time.perf_counter()
+        if exc is not None and not span.error:
+            span.record_error(exc)
+        stack = self._trace._stack
+        if stack and stack[-1] is span:
+            stack.pop()
+
+
+class _TraceContext:
+    __slots__ = ("_tracer", "_trace")
+
+    def __init__(self, tracer: "Tracer", trace: Trace) -> None:
+        self._tracer = tracer
+        self._trace = trace
+
+    def __enter__(self) -> Trace:
+        return self._trace
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        root = self._trace.root
+        root.end = time.perf_counter()
+        if exc is not None:
+            root.record_error(exc)
+        self._tracer._finish(self._trace)
+
+
+class JsonlExporter:
+    """Tugagan tracelarni JSONL faylga qo'shib borish."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._file: Any = None
+
+    def export(self, trace: Trace) -> None:
+        line = json.dumps(trace.to_dict(), ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            if self._file is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class Tracer:
+    """Tracelarni yaratish, joriy oqimdagi spanlar va halqa bufer."""
+
+    def __init__(
+        self,
+        capacity: int = _BUFFER_SIZE,
+        enabled: bool = True,
+        exporter: Optional[JsonlExporter] = None,
+    ) -> None:
+        """
+        Args:
+            capacity: Xotirada saqlanadigan oxirgi tracelar soni
+            enabled: False bo'lsa barcha chaqiruvlar bo'sh (deyarli bepul)
+            exporter: Har bir tugagan trace uchun ``export(trace)`` (ixtiyoriy)
+        """
+        self.enabled = enabled
+        self.exporter = exporter
+        self._buffer: deque[Trace] = deque(maxlen=max(1, capacity))
+        self._local = threading.local()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._finished = 0
+        self._export_errors = 0
+
+    def _current(self) -> Optional[Trace]:
+        return getattr(self._local, "trace", None)
+
+    def trace(self, name: str, session_id: str = "", **attrs: Any) -> Any:
+        """Yangi trace (context manager). Oqimda trace bor bo'lsa — span sifatida."""
+        if not self.enabled:
+            return _NULL_SPAN
+        if self._current() is not None:
+            return self.span(name, **attrs)
+        trace = Trace(next(self._ids), name, session_id, attrs)
+        self._local.trace = trace
+        return _TraceContext(self, trace)
+
+    def span(self, name: str, **attrs: Any) -> Any:
+        """Joriy trace ichida bosqich (context manager, ``Span`` qaytaradi)."""
+        trace = self._current()
+        if trace is None:
+            return _NULL_SPAN
+        span = Span(name, time.perf_counter(), len(trace._stack), attrs)
+        trace.spans.append(span)
+        trace._stack.append(span)
+        return _SpanContext(trace, span)
+
+    def current_span(self) -> Any:
+        """Joriy ochiq span (yoki trace ildizi); trace yo'q bo'lsa bo'sh span."""
+        trace = self._current()
+        return trace._stack[-1] if trace is not None else _NULL_SPAN
+
+    def annotate(self, **attrs: Any) -> None:
+        """Joriy trace ildiziga atribut qo'shish (masalan javob bergan provayder)."""
+        trace = self._current()
+        if trace is not None:
+            trace.root.attrs.update(attrs)
+
+    def discard(self) -> None:
+        """Joriy traceni buferga yozmaslik (masalan ``/trace`` buyrug'ining o'zi)."""
+        trace = self._current()
+        if trace is not None:
+            trace.root.attrs["_discard"] = True
+
+    def _finish(self, trace: Trace) -> None:
+        self._local.trace = None
+        if trace.root.attrs.pop("_discard", False):
+            return
+        with self._lock:
+            self._buffer.append(trace)
+            self._finished += 1
+        if self.exporter is not None:
+            try:
+                self.exporter.export(trace)
+            except Exception:
+                self._export_errors += 1
+
+    def recent(self, n: int = 10, session_id: Optional[str] = None) -> list[Trace]:
+        """Oxirgi ``n`` ta trace (eskisidan yangisiga), ixtiyoriy sessiya bo'yicha."""
+        with self._lock:
+            traces = list(self._buffer)
+        if session_id is not None:
+            traces = [t for t in traces if t.session_id == session_id]
+        return traces[-n:] if n > 0 else []
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buffer.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "buffered": len(self._buffer),
+                "capacity": self._buffer.maxlen,
+                "finished": self._finished,
+                "exporter": self.exporter.path if self.exporter else None,
+                "export_errors": self._export_errors,
+            }
+
+
+def format_trace(trace: Trace) -> str:
+    """Traceni ``/trace`` uchun matnga aylantirish."""
+    attrs = dict(trace.attrs)
+    preview = attrs.pop("input", "")
+    started = datetime.fromtimestamp(trace.wall_start).strftime("%H:%M:%S")
+    extras = " ".join(f"{k}={v}" for k, v in attrs.items())
+    lines = [f"#{trace.trace_id} {started} {trace.duration_ms:.1f}ms {extras}".rstrip()]
+    if preview:
+        lines.append(f"  «{preview}»")
+    if trace.root.error:
+        lines.append(f"  ❌ {trace.root.error}")
+    for span in trace.spans:
+        details = " ".join(f"{k}={v}" for k, v in span.attrs.items())
+        line = f"{'  ' * span.depth}• {span.name} {span.duration_ms:.1f}ms {details}".rstrip()
+        if span.error:
+            line += f" ❌ {span.error}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def preview(text: str) -> str:
+    """Trace atributi uchun qisqartirilgan matn."""
+    text = " ".join(text.split())
+    return text if len(text) <= _PREVIEW_CHARS else text[: _PREVIEW_CHARS - 1] + "…"
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """Jarayon bo'yicha yagona tracer (muhit o'zgaruvchilaridan sozlanadi)."""
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                enabled = os.getenv(_TRACE_ENV, "1").lower() not in ("0", "false", "no")
+                path = os.getenv(_TRACE_FILE_ENV)
+                _tracer = Tracer(enabled=enabled, exporter=JsonlExporter(path) if path else None)
+    return _tracer
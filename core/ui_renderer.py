@@ -1,26 +1,115 @@
 """
 JARVIS Terminal UI Renderer — Professional, clean, persistent UI.
+
+Ekran kadri — header (sarlavha, soat, rejim) va oxirgi savol-javob. Butun
+sessiya davomida bitta Rich ``Console`` ishlatiladi, ekran ANSI ketma-ketligi
+bilan tozalanadi (``clear`` jarayoni ishga tushirilmaydi), javobning
+render qilingan markdown'i keshlanadi. Kadr o'zgarmagan va undan keyin faqat
+kiritish satri chiqarilgan bo'lsa, faqat soat va rejim satrlari joyida
+qayta yoziladi.
 """
 from __future__ import annotations
 
-import os
-import platform
+import sys
 from datetime import datetime, timezone, timedelta
+from typing import Any, Optional
 
 TASHKENT_TZ = timezone(timedelta(hours=5))
 
+_CLEAR_SCREEN = "\x1b[H\x1b[2J"  # kursorni boshiga qo'yish + ekranni tozalash
+_ERASE_LINE = "\x1b[2K"
+_ERASE_BELOW = "\x1b[J"
+_CLOCK_LINE = 3  # header ichidagi satr indekslari (0 dan)
+_MODE_LINE = 4
+
+
+def _move_to(row: int) -> str:
+    """Kursorni ``row`` satr boshiga o'tkazish (1 dan)."""
+    return f"\x1b[{row};1H"
+
+
+class _TrackedOutput:
+    """Konsol oqimi o'rami: konsol orqali yozilgan yangi satrlarni sanaydi.
+
+    Kadrdan keyin hech narsa chiqarilmaganini (faqat kiritish taklifi)
+    bilish uchun kerak — aks holda ekran siljigan bo'lishi mumkin va
+    satrlarni joyida yangilab bo'lmaydi.
+    """
+
+    def __init__(self, stream: Any) -> None:
+        self._stream = stream
+        self.newlines = 0
+
+    def write(self, text: str) -> int:
+        self.newlines += text.count("\n")
+        return self._stream.write(text)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stream, name)
+
+
+class _Frame:
+    """Ekrandagi oxirgi kadr."""
+
+    __slots__ = ("mode", "ai_status", "body_key", "rows", "newlines")
+
+    def __init__(
+        self, mode: str, ai_status: bool, body_key: tuple, rows: int, newlines: int
+    ) -> None:
+        self.mode = mode
+        self.ai_status = ai_status
+        self.body_key = body_key
+        self.rows = rows
+        self.newlines = newlines
+
 
 class UIRenderer:
     """Terminal UI rendering engine."""
 
-    def __init__(self) -> None:
+    def __init__(self, console: Any = None) -> None:
+        """
+        Args:
+            console: Chaqiruvchining Rich ``Console`` obyekti (ixtiyoriy) —
+                berilmasa birinchi kerak bo'lganda bittasi yaratiladi.
+        """
         self._last_query: str = ""
         self._last_response: str = ""
         self._width: int = 60
+        self._console: Any = console
+        self._rich_missing = False
+        self._output: Optional[_TrackedOutput] = None
+        self._frame: Optional[_Frame] = None
+        self._body_key: Optional[tuple] = None
+        self._body_text: str = ""
+
+    @property
+    def console(self) -> Any:
+        """Yagona Rich Console (rich o'rnatilmagan bo'lsa None)."""
+        if self._console is None and not self._rich_missing:
+            try:
+                from rich.console import Console
+
+                self._console = Console()
+            except ImportError:
+                self._rich_missing = True
+        if self._console is not None and self._output is None:
+            self._output = _TrackedOutput(self._console.file)
+            self._console.file = self._output
+        return self._console
+
+    def invalidate(self) -> None:
+        """Keyingi chizishda ekranni to'liq qayta chizish."""
+        self._frame = None
 
     def clear_screen(self) -> None:
-        """Terminal ekranini tozalash."""
-        os.system("cls" if platform.system() == "Windows" else "clear")
+        """Terminal ekranini tozalash (alohida jarayonsiz)."""
+        console = self.console
+        if console is not None:
+            console.clear()
+        elif sys.stdout.isatty():
+            sys.stdout.write(_CLEAR_SCREEN)
+            sys.stdout.flush()
+        self._frame = None
 
     def get_tashkent_time(self) -> str:
         """Toshkent vaqtini olish."""
@@ -37,9 +126,13 @@ class UIRenderer:
         Returns:
             Formatlangan header matni (Rich markup bilan).
         """
+        return "\n".join(self._header_lines(mode, ai_status))
+
+    def _header_lines(self, mode: str, ai_status: bool) -> list[str]:
+        """Header satrlari (soat — ``_CLOCK_LINE``, rejim — ``_MODE_LINE``)."""
         ai_icon = "🟢 Tayyor" if ai_status else "🔴 Tayyor emas"
         sep = "═" * self._width
-        lines = [
+        return [
             f"[bold cyan]{sep}[/bold cyan]",
             f"[bold cyan]{'JARVIS • AI AGENT':^{self._width}}[/bold cyan]",
             f"[bold cyan]{sep}[/bold cyan]",
@@ -47,7 +140,6 @@ class UIRenderer:
             f"  [dim]🧭 Rejim: {mode.upper()} | {ai_icon}[/dim]",
             f"[bold cyan]{sep}[/bold cyan]",
         ]
-        return "\n".join(lines)
 
     def render_startup(
         self, mode: str, ai_status: bool, providers: list[str]
@@ -113,7 +205,12 @@ class UIRenderer:
         query: str = "",
         response: str = "",
     ) -> None:
-        """To'liq ekranni qayta chizish.
+        """Ekranni qayta chizish — faqat o'zgargan qismlarni.
+
+        Savol-javob va rejim avvalgi kadr bilan bir xil bo'lsa va kadrdan
+        keyin konsolga hech narsa chiqarilmagan bo'lsa, faqat soat (va
+        rejim) satri yangilanadi. Aks holda ekran bitta yozuvda to'liq
+        qayta chiziladi; javobning render qilingan ko'rinishi keshdan olinadi.
 
         Args:
             mode: Joriy rejim nomi.
@@ -121,21 +218,84 @@ class UIRenderer:
             query: Oxirgi foydalanuvchi so'rovi (ixtiyoriy).
             response: Oxirgi JARVIS javobi (ixtiyoriy).
         """
-        try:
-            from rich.console import Console
-
-            console = Console()
-            self.clear_screen()
+        console = self.console
+        if console is None:
+            self._plain_redraw(mode, query, response)
+            return
+        body = self._render_body(query, response)
+        if not console.is_terminal or console.legacy_windows:
+            # Kursor boshqaruvi yo'q — oddiy chiqarish
+            console.clear()
             console.print(self.render_header(mode, ai_status))
-            if query or response:
-                console.print(self.render_response(query, response))
-        except ImportError:
-            self.clear_screen()
-            print(f"JARVIS • {mode.upper()}")
+            self._output.write(body)
+            return
+
+        output = self._output
+        frame = self._frame
+        if (
+            frame is not None
+            and frame.body_key == self._body_key
+            and frame.newlines == output.newlines
+            and frame.rows + 2 < console.height  # taklif + kiritish satri siljitmagan
+            and console.width > self._width  # header satrlari o'ralmagan
+        ):
+            self._repaint_status(frame, mode, ai_status)
+            return
+
+        header = self._capture(self.render_header(mode, ai_status))
+        output.write(_CLEAR_SCREEN + header + body)
+        output.flush()
+        self._frame = _Frame(
+            mode, ai_status, self._body_key,
+            rows=header.count("\n") + body.count("\n"),
+            newlines=output.newlines,
+        )
+
+    def _repaint_status(self, frame: _Frame, mode: str, ai_status: bool) -> None:
+        """Soat (va o'zgargan bo'lsa rejim) satrini joyida yangilash, kadrdan pastini tozalash."""
+        lines = self._header_lines(mode, ai_status)
+        parts = [_move_to(_CLOCK_LINE + 1), _ERASE_LINE, self._capture(lines[_CLOCK_LINE]).rstrip("\n")]
+        if (mode, ai_status) != (frame.mode, frame.ai_status):
+            parts += [_move_to(_MODE_LINE + 1), _ERASE_LINE, self._capture(lines[_MODE_LINE]).rstrip("\n")]
+            frame.mode, frame.ai_status = mode, ai_status
+        parts += [_move_to(frame.rows + 1), _ERASE_BELOW]
+        self._output.write("".join(parts))
+        self._output.flush()
+
+    def _render_body(self, query: str, response: str) -> str:
+        """Savol-javobni ANSI matnga render qilish (oxirgi natija keshlanadi)."""
+        key = (query, response, self.console.width)
+        if key == self._body_key:
+            return self._body_text
+        from rich.markdown import Markdown
+        from rich.markup import escape
+
+        console = self.console
+        with console.capture() as capture:
             if query:
-                print(f"🧑 Siz: {query}")
+                console.print(f"\n[bold cyan]🧑 Siz:[/bold cyan] {escape(query)}\n")
             if response:
-                print(f"🤖 JARVIS: {response}")
+                console.print("[bold green]🤖 JARVIS:[/bold green]")
+                console.print(Markdown(response))
+        self._body_key, self._body_text = key, capture.get()
+        self._last_query, self._last_response = query, response
+        return self._body_text
+
+    def _capture(self, markup: str) -> str:
+        """Rich markup'ni ANSI matnga render qilish (chiqarmasdan)."""
+        console = self.console
+        with console.capture() as capture:
+            console.print(markup)
+        return capture.get()
+
+    def _plain_redraw(self, mode: str, query: str, response: str) -> None:
+        """Rich o'rnatilmagan holat uchun oddiy chiqarish."""
+        self.clear_screen()
+        print(f"JARVIS • {mode.upper()}")
+        if query:
+            print(f"🧑 Siz: {query}")
+        if response:
+            print(f"🤖 JARVIS: {response}")
 
     def full_redraw(
         self,
@@ -167,13 +327,10 @@ class UIRenderer:
             ai_status: AI tayyor holati.
             providers: Mavjud provayder nomlari ro'yxati.
         """
-        try:
-            from rich.console import Console
-
-            console = Console()
-            self.clear_screen()
+        console = self.console
+        self.clear_screen()
+        if console is not None:
             console.print(self.render_startup(mode, ai_status, providers or []))
-        except ImportError:
-            self.clear_screen()
+        else:
             providers_str = ", ".join(providers) if providers else "yo'q"
             print(f"JARVIS • {mode.upper()} | Provayderlar: {providers_str}")
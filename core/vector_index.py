@@ -0,0 +1,540 @@
+"""
+O'rnatilgan vektor ombori — NumPy, IVF indeksi va memory-mapped fayllar.
+
+ChromaDB siz deploylar uchun ``VectorStore`` backendi. Kolleksiya katalogi:
+
+* ``vectors.f32``   — L2-normallangan vektorlar (memmap, sig'im ikki baravar o'sadi)
+* ``assign.i32``    — har bir qatorning IVF klasteri (memmap, -1 = hali yo'q)
+* ``centroids.npy`` — IVF markazlari (sferik k-means)
+* ``records.jsonl`` — append-only jurnal: qo'shish (ID, matn, metadata) va o'chirish
+* ``meta.json``     — o'lcham va o'qitish holati
+
+Vektorlar soni ``_IVF_MIN_VECTORS`` dan kam bo'lsa aniq (brute-force) qidiruv,
+ko'p bo'lsa so'rovga eng yaqin ``nprobe`` ta klaster skanerlanadi. Yangi
+qo'shilgan qatorlar ro'yxatlar qayta qurilguncha alohida (pending) skanerlanadi,
+o'chirish — tombstone. ``snapshot`` faqat tirik qatorlarni ixcham nusxalaydi.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+from .vector_store import VectorStore, _RANGE_OPERATORS
+
+_VECTORS_FILE = "vectors.f32"
+_ASSIGN_FILE = "assign.i32"
+_CENTROIDS_FILE = "centroids.npy"
+_RECORDS_FILE = "records.jsonl"
+_META_FILE = "meta.json"
+_INITIAL_CAPACITY = 1024
+_IVF_MIN_VECTORS = 4096  # Bundan kam vektorda aniq qidiruv
+_IVF_RETRAIN_GROWTH = 4  # Vektorlar shuncha marta ko'payganda markazlar qayta o'qitiladi
+_IVF_TRAIN_PER_LIST = 40  # O'qitish namunasi: har bir klasterga shuncha vektor
+_IVF_TRAIN_ITERATIONS = 8
+_IVF_NPROBE = 8
+_PENDING_REBUILD = 2048  # Ro'yxatlarga kiritilmagan qatorlar shundan oshsa qayta quriladi
+_EXACT_FILTER_LIMIT = 4096  # Filtrdan o'tgan qatorlar shundan kam bo'lsa aniq qidiruv
+_ASSIGN_CHUNK = 8192
+_SEED = 1337
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _nearest_centroids(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Har bir vektorga eng yaqin markaz (bo'laklab, xotirani tejash uchun)."""
+    out = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), _ASSIGN_CHUNK):
+        block = vectors[start:start + _ASSIGN_CHUNK]
+        out[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return out
+
+
+def _kmeans(sample: np.ndarray, nlist: int, rng: np.random.Generator) -> np.ndarray:
+    """Sferik k-means (kosinus o'xshashlik bo'yicha)."""
+    centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+    for _ in range(_IVF_TRAIN_ITERATIONS):
+        labels = _nearest_centroids(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, sample)
+        sizes = np.bincount(labels, minlength=nlist)
+        empty = np.flatnonzero(sizes == 0)
+        if len(empty):
+            sums[empty] = sample[rng.choice(len(sample), len(empty), replace=False)]
+        centroids = _normalize(sums)
+    return centroids.astype(np.float32)
+
+
+class NumpyVectorStore(VectorStore):
+    """IVF indeksli, diskda memory-mapped vektor ombori (bitta kolleksiya)."""
+
+    backend = "numpy"
+
+    def __init__(self, directory: Path, embed: Optional[Callable[[list[str]], Any]] = None) -> None:
+        """
+        Args:
+            directory: Kolleksiya fayllari katalogi
+            embed: ``embeddings`` berilmaganda matnlarni vektorlash funksiyasi
+        """
+        self._dir = Path(directory)
+        self._embed = embed
+        self._lock = threading.RLock()
+        self._load()
+
+    # === Yuklash va saqlash ===
+
+    def _reset(self) -> None:
+        self._dim = 0
+        self._size = 0
+        self._capacity = 0
+        self._vectors: Optional[np.memmap] = None
+        self._assign: Optional[np.memmap] = None
+        self._alive = np.zeros(0, dtype=bool)
+        self._ids: list[Optional[str]] = []
+        self._documents: list[Optional[str]] = []
+        self._metadatas: list[Optional[dict]] = []
+        self._row_of: dict[str, int] = {}
+        self._meta_index: dict[str, dict[Any, set[int]]] = {}
+        self._postings: dict[tuple[str, Any], np.ndarray] = {}
+        self._numeric: dict[str, np.ndarray] = {}
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: list[np.ndarray] = []
+        self._pending: list[int] = []
+        self._trained_size = 0
+        self._records_file: Any = None
+
+    def _load(self) -> None:
+        self._reset()
+        self._dir.mkdir(parents=True, exist_ok=True)
+        meta_path = self._dir / _META_FILE
+        if meta_path.exists():
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            self._dim = int(meta.get("dim", 0))
+            self._trained_size = int(meta.get("trained_size", 0))
+        records_path = self._dir / _RECORDS_FILE
+        rows = 0
+        if records_path.exists():
+            with open(records_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        break  # Uzilgan oxirgi qator
+                    if record.get("op") == "delete":
+                        self._remove_row(record["id"])
+                        continue
+                    self._remove_row(record["id"])
+                    self._ids.append(record["id"])
+                    self._documents.append(record.get("document", ""))
+                    self._metadatas.append(record.get("metadata") or {})
+                    self._row_of[record["id"]] = rows
+                    self._index_metadata(rows, self._metadatas[rows])
+                    rows += 1
+        if not self._dim or not rows:
+            self._ids, self._documents, self._metadatas = [], [], []
+            self._row_of, self._meta_index, self._numeric = {}, {}, {}
+            return
+        vectors_path = self._dir / _VECTORS_FILE
+        capacity = vectors_path.stat().st_size // (self._dim * 4) if vectors_path.exists() else 0
+        # Vektor yozilgan, lekin jurnalga tushmagan qatorlar tashlab yuboriladi
+        rows = min(rows, capacity)
+        self._size = rows
+        del self._ids[rows:], self._documents[rows:], self._metadatas[rows:]
+        self._row_of = {doc_id: row for doc_id, row in self._row_of.items() if row < rows}
+        self._open_files(capacity)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._alive[list(self._row_of.values())] = True
+        centroids_path = self._dir / _CENTROIDS_FILE
+        if centroids_path.exists():
+            self._centroids = np.load(centroids_path)
+            self._rebuild_lists()
+
+    def _open_files(self, capacity: int) -> None:
+        """Memmap fayllarini ``capacity`` qatorga kengaytirib ochish."""
+        assigned = 0
+        for name, width in ((_VECTORS_FILE, self._dim * 4), (_ASSIGN_FILE, 4)):
+            path = self._dir / name
+            with open(path, "ab") as f:
+                if name == _ASSIGN_FILE:
+                    assigned = min(f.tell() // width, capacity)
+                if f.tell() < capacity * width:
+                    f.truncate(capacity * width)
+        self._vectors = np.memmap(
+            self._dir / _VECTORS_FILE, dtype=np.float32, mode="r+", shape=(capacity, self._dim)
+        )
+        self._assign = np.memmap(self._dir / _ASSIGN_FILE, dtype=np.int32, mode="r+", shape=(capacity,))
+        # Yangi (nol bilan to'ldirilgan) qatorlar hali hech qaysi klasterda emas
+        self._assign[assigned:] = -1
+        self._capacity = capacity
+
+    def _reserve(self, needed: int) -> None:
+        if needed <= self._capacity:
+            return
+        capacity = max(needed, self._capacity * 2, _INITIAL_CAPACITY)
+        self._open_files(capacity)
+        alive = np.zeros(capacity, dtype=bool)
+        alive[: len(self._alive)] = self._alive
+        self._alive = alive
+
+    def _append_records(self, records: list[dict]) -> None:
+        if self._records_file is None:
+            self._records_file = open(self._dir / _RECORDS_FILE, "a", encoding="utf-8")
+        self._records_file.write(
+            "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+        )
+        self._records_file.flush()
+
+    def _write_meta(self) -> None:
+        tmp = self._dir / f"{_META_FILE}.tmp"
+        tmp.write_text(
+            json.dumps({"dim": self._dim, "trained_size": self._trained_size}),
+            encoding="utf-8",
+        )
+        tmp.replace(self._dir / _META_FILE)
+
+    def flush(self) -> None:
+        """Memmap va jurnalni diskka tushirish."""
+        with self._lock:
+            if self._vectors is not None:
+                self._vectors.flush()
+                self._assign.flush()
+            if self._records_file is not None:
+                self._records_file.flush()
+                os.fsync(self._records_file.fileno())
+
+    def close(self) -> None:
+        with self._lock:
+            self.flush()
+            if self._records_file is not None:
+                self._records_file.close()
+            self._vectors = None
+            self._assign = None
+            self._records_file = None
+
+    # === Metadata indeksi ===
+
+    def _index_metadata(self, row: int, metadata: dict) -> None:
+        for key, value in metadata.items():
+            if isinstance(value, (str, int, float, bool)):
+                self._meta_index.setdefault(key, {}).setdefault(value, set()).add(row)
+                self._postings.pop((key, value), None)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                column = self._numeric.get(key)
+                if column is None or row >= len(column):
+                    grown = np.full(max(row + 1, 2 * len(column) if column is not None else 0,
+                                        _INITIAL_CAPACITY), np.nan)
+                    if column is not None:
+                        grown[: len(column)] = column
+                    column = self._numeric[key] = grown
+                column[row] = value
+
+    def _unindex_metadata(self, row: int, metadata: dict) -> None:
+        for key, value in metadata.items():
+            if not isinstance(value, (str, int, float, bool)):
+                continue
+            rows = self._meta_index.get(key, {}).get(value)
+            if rows is not None:
+                rows.discard(row)
+                self._postings.pop((key, value), None)
+            column = self._numeric.get(key)
+            if column is not None and row < len(column):
+                column[row] = np.nan
+
+    def _posting(self, key: str, value: Any) -> np.ndarray:
+        """``key == value`` bo'lgan qatorlar massivi (keshlangan)."""
+        rows = self._postings.get((key, value))
+        if rows is None:
+            rows = np.fromiter(self._meta_index.get(key, {}).get(value, ()), dtype=np.int64)
+            self._postings[(key, value)] = rows
+        return rows
+
+    def _remove_row(self, doc_id: str) -> bool:
+        row = self._row_of.pop(doc_id, None)
+        if row is None:
+            return False
+        self._unindex_metadata(row, self._metadatas[row] or {})
+        self._documents[row] = None
+        self._metadatas[row] = None
+        self._ids[row] = None
+        if row < len(self._alive):
+            self._alive[row] = False
+        return True
+
+    def _rows_mask(self, rows: np.ndarray) -> np.ndarray:
+        mask = np.zeros(self._size, dtype=bool)
+        mask[rows[rows < self._size]] = True
+        return mask
+
+    def _column(self, key: str) -> np.ndarray:
+        """Sonli metadata ustuni (qiymati yo'q qatorlarda NaN), uzunligi ``_size``."""
+        column = self._numeric.get(key)
+        if column is None:
+            return np.full(self._size, np.nan)
+        if len(column) < self._size:
+            column = np.concatenate([column, np.full(self._size - len(column), np.nan)])
+        return column[: self._size]
+
+    def _condition_mask(self, key: str, op: str, operand: Any) -> np.ndarray:
+        if op == "$eq":
+            return self._rows_mask(self._posting(key, operand))
+        if op == "$ne":
+            return ~self._rows_mask(self._posting(key, operand))
+        if op in ("$in", "$nin"):
+            mask = np.zeros(self._size, dtype=bool)
+            for value in operand:
+                mask |= self._rows_mask(self._posting(key, value))
+            return mask if op == "$in" else ~mask
+        if op not in _RANGE_OPERATORS:
+            raise ValueError(f"Noma'lum filtr operatori: {op}")
+        if isinstance(operand, bool) or not isinstance(operand, (int, float)):
+            raise ValueError(f"{op} faqat sonli qiymat bilan ishlaydi: {operand!r}")
+        # NaN bilan taqqoslash False — qiymati yo'q qatorlar chiqib ketadi
+        with np.errstate(invalid="ignore"):
+            return _RANGE_OPERATORS[op](self._column(key), operand)
+
+    def _where_mask(self, where: dict) -> np.ndarray:
+        mask = np.ones(self._size, dtype=bool)
+        for key, condition in where.items():
+            if key == "$and":
+                for sub in condition:
+                    mask &= self._where_mask(sub)
+            elif key == "$or":
+                union = np.zeros(self._size, dtype=bool)
+                for sub in condition:
+                    union |= self._where_mask(sub)
+                mask &= union
+            else:
+                operators = condition if isinstance(condition, dict) else {"$eq": condition}
+                for op, operand in operators.items():
+                    mask &= self._condition_mask(key, op, operand)
+        return mask
+
+    def _filter_mask(self, where: dict) -> np.ndarray:
+        """``where`` ga mos tirik qatorlar maskasi — metadata indeksi va sonli
+        ustunlardan, qatorlarni o'qimasdan (vektorlar skanerlanishidan oldin)."""
+        return self._alive[: self._size] & self._where_mask(where)
+
+    # === IVF ===
+
+    def _train(self) -> None:
+        alive_rows = np.flatnonzero(self._alive[: self._size])
+        nlist = max(16, int(math.sqrt(len(alive_rows))))
+        rng = np.random.default_rng(_SEED)
+        sample_size = min(len(alive_rows), nlist * _IVF_TRAIN_PER_LIST)
+        sample = np.asarray(self._vectors[np.sort(rng.choice(alive_rows, sample_size, replace=False))])
+        self._centroids = _kmeans(sample, nlist, rng)
+        self._assign[: self._size] = _nearest_centroids(np.asarray(self._vectors[: self._size]), self._centroids)
+        self._trained_size = self._size
+        np.save(self._dir / _CENTROIDS_FILE, self._centroids)
+        self._write_meta()
+        self._rebuild_lists()
+
+    def _rebuild_lists(self) -> None:
+        assign = np.asarray(self._assign[: self._size])
+        order = np.argsort(assign, kind="stable")
+        bounds = np.searchsorted(assign[order], np.arange(len(self._centroids) + 1))
+        self._lists = [order[bounds[i]:bounds[i + 1]] for i in range(len(self._centroids))]
+        self._pending = [int(r) for r in np.flatnonzero(assign < 0)]
+
+    def _maybe_train(self) -> None:
+        alive = int(self._alive[: self._size].sum())
+        if self._centroids is None:
+            if alive >= _IVF_MIN_VECTORS:
+                self._train()
+        elif self._size >= self._trained_size * _IVF_RETRAIN_GROWTH:
+            self._train()
+        elif len(self._pending) > _PENDING_REBUILD:
+            self._rebuild_lists()
+
+    # === VectorStore ===
+
+    def add(self, documents, metadatas, ids, embeddings=None) -> None:
+        if not documents:
+            return
+        last = {doc_id: i for i, doc_id in enumerate(ids)}
+        if len(last) != len(ids):
+            # Bir partiyada takroriy ID — oxirgisi qoladi (aks holda oldingi
+            # qator tirik qolib, _row_of unga ishora qilmaydi)
+            keep = sorted(last.values())
+            ids = [ids[i] for i in keep]
+            documents = [documents[i] for i in keep]
+            metadatas = [metadatas[i] for i in keep]
+            if embeddings is not None:
+                embeddings = [embeddings[i] for i in keep]
+        if embeddings is None:
+            if self._embed is None:
+                raise ValueError("embeddings yoki embed funksiyasi kerak")
+            embeddings = self._embed(documents)
+        vectors = _normalize(np.asarray(embeddings, dtype=np.float32))
+        with self._lock:
+            if not self._dim:
+                self._dim = vectors.shape[1]
+                self._write_meta()
+            elif vectors.shape[1] != self._dim:
+                raise ValueError(f"Vektor o'lchami {vectors.shape[1]}, kutilgan {self._dim}")
+            for doc_id in ids:
+                self._remove_row(doc_id)
+            start = self._size
+            end = start + len(documents)
+            self._reserve(end)
+            self._vectors[start:end] = vectors
+            if self._centroids is not None:
+                self._assign[start:end] = _nearest_centroids(vectors, self._centroids)
+            else:
+                self._assign[start:end] = -1
+            self._vectors.flush()
+            self._assign.flush()
+            records = []
+            for offset, (doc_id, document, metadata) in enumerate(zip(ids, documents, metadatas)):
+                row = start + offset
+                metadata = metadata or {}
+                self._ids.append(doc_id)
+                self._documents.append(document)
+                self._metadatas.append(metadata)
+                self._row_of[doc_id] = row
+                self._index_metadata(row, metadata)
+                records.append({"op": "add", "id": doc_id, "document": document, "metadata": metadata})
+            self._alive[start:end] = True
+            self._append_records(records)
+            self._size = end
+            if self._centroids is not None:
+                self._pending.extend(range(start, end))
+            self._maybe_train()
+
+    def delete(self, ids: list[str]) -> None:
+        with self._lock:
+            removed = [doc_id for doc_id in ids if self._remove_row(doc_id)]
+            if removed:
+                self._append_records([{"op": "delete", "id": doc_id} for doc_id in removed])
+
+    def count(self) -> int:
+        return len(self._row_of)
+
+    def query(self, query_texts, k=5, query_embeddings=None, where=None) -> list[list[dict]]:
+        if not query_texts:
+            return []
+        with self._lock:
+            if not self._row_of or k <= 0:
+                return [[] for _ in query_texts]
+            if query_embeddings is None:
+                if self._embed is None:
+                    raise ValueError("query_embeddings yoki embed funksiyasi kerak")
+                query_embeddings = self._embed(query_texts)
+            queries = _normalize(np.asarray(query_embeddings, dtype=np.float32))
+            mask = self._alive[: self._size]
+            if where:
+                mask = self._filter_mask(where)
+            allowed = int(mask.sum())
+            if not allowed:
+                return [[] for _ in query_texts]
+            return [self._search(q, k, mask, allowed) for q in queries]
+
+    def _search(self, query: np.ndarray, k: int, mask: np.ndarray, allowed: int) -> list[dict]:
+        if self._centroids is None or allowed <= _EXACT_FILTER_LIMIT:
+            candidates = np.flatnonzero(mask)
+        else:
+            centroid_scores = self._centroids @ query
+            nlist = len(self._centroids)
+            nprobe = min(_IVF_NPROBE, nlist)
+            while True:
+                probe = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+                candidates = np.concatenate(
+                    [self._lists[p] for p in probe] + [np.asarray(self._pending, dtype=np.int64)]
+                )
+                candidates = candidates[mask[candidates]]
+                # Filtr qattiq bo'lsa natija yetmasligi mumkin — ko'proq klaster
+                if len(candidates) >= k or nprobe >= nlist:
+                    break
+                nprobe = min(nprobe * 4, nlist)
+        if not len(candidates):
+            return []
+        scores = np.asarray(self._vectors[candidates]) @ query
+        top = min(k, len(scores))
+        best = np.argpartition(-scores, top - 1)[:top]
+        best = best[np.argsort(-scores[best])]
+        return [
+            {
+                "id": self._ids[row],
+                "content": self._documents[row],
+                "metadata": self._metadatas[row],
+                "distance": float(1.0 - scores[i]),
+            }
+            for i, row in ((i, int(candidates[i])) for i in best)
+        ]
+
+    # === Snapshot ===
+
+    def snapshot(self, path: str) -> None:
+        """Faqat tirik qatorlarni ixcham nusxalash (markazlar saqlanadi)."""
+        target = Path(path)
+        with self._lock:
+            self.flush()
+            tmp = target.with_name(target.name + ".tmp")
+            shutil.rmtree(tmp, ignore_errors=True)
+            tmp.mkdir(parents=True)
+            rows = np.flatnonzero(self._alive[: self._size])
+            if len(rows):
+                np.asarray(self._vectors[rows], dtype=np.float32).tofile(tmp / _VECTORS_FILE)
+                np.asarray(self._assign[rows], dtype=np.int32).tofile(tmp / _ASSIGN_FILE)
+            with open(tmp / _RECORDS_FILE, "w", encoding="utf-8") as f:
+                for row in rows:
+                    record = {
+                        "op": "add",
+                        "id": self._ids[row],
+                        "document": self._documents[row],
+                        "metadata": self._metadatas[row],
+                    }
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            if self._centroids is not None:
+                np.save(tmp / _CENTROIDS_FILE, self._centroids)
+            (tmp / _META_FILE).write_text(
+                json.dumps({"dim": self._dim, "trained_size": self._trained_size}),
+                encoding="utf-8",
+            )
+            shutil.rmtree(target, ignore_errors=True)
+            tmp.replace(target)
+
+    def restore(self, path: str) -> None:
+        source = Path(path)
+        if not (source / _RECORDS_FILE).exists():
+            raise FileNotFoundError(f"Snapshot topilmadi: {path}")
+        with self._lock:
+            self.close()
+            tmp = self._dir.with_name(self._dir.name + ".restore")
+            shutil.rmtree(tmp, ignore_errors=True)
+            shutil.copytree(source, tmp)
+            shutil.rmtree(self._dir, ignore_errors=True)
+            tmp.replace(self._dir)
+            self._load()
+
+    def compact(self) -> None:
+        """O'chirilgan qatorlarni fayllardan tozalash."""
+        with self._lock:
+            staging = self._dir.with_name(self._dir.name + ".compact")
+            self.snapshot(str(staging))
+            self.restore(str(staging))
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "vectors": len(self._row_of),
+                "rows": self._size,
+                "deleted": self._size - len(self._row_of),
+                "dimension": self._dim,
+                "approx_vector_bytes": self._capacity * self._dim * 4,
+                "nlist": 0 if self._centroids is None else len(self._centroids),
+                "pending": len(self._pending),
+                "index": "exact" if self._centroids is None else "ivf",
+            }
@@ -0,0 +1,580 @@
+"""
+Vektor ombori — ``VectorStore`` interfeysi va jarayon bo'yicha yagona boshqaruvchi.
+
+MemoryManager va RAGEngine semantik qidiruvni ``VectorStoreManager`` orqali
+bajaradi; kolleksiyalar nom bo'yicha beriladi va tanlangan backendga bog'liq:
+
+* ``chroma`` — ChromaDB (katalog bo'yicha bitta ``PersistentClient``)
+* ``numpy``  — o'rnatilgan IVF indeksi, memory-mapped fayllarda
+  (``core.vector_index``), ChromaDB siz deploylar uchun
+
+Backend ``JARVIS_VECTOR_BACKEND`` (``auto`` | ``chroma`` | ``numpy``) bilan
+tanlanadi; ``auto`` avval ChromaDB ni, keyin NumPy ni sinaydi. Ikkalasi ham
+bo'lmasa ``available`` False va chaqiruvchilar in-memory fallback ga o'tadi.
+Embedding funksiyasi bitta va umumiy; bir nechta kolleksiyaga bitta so'rov
+bilan qidirishda so'rov matni faqat bir marta vektorlanadi.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Optional
+
+_LATENCY_WINDOW = 256  # Har bir kolleksiya uchun saqlanadigan oxirgi o'lchovlar
+_COLLECTION_METADATA = {"hnsw:space": "cosine"}
+_FLOAT_BYTES = 4
+_BACKEND_ENV = "JARVIS_VECTOR_BACKEND"
+_VECTORS_SUBDIR = "vectors"
+_TIMESTAMP_KEY = "ts"  # Yozuv vaqti (epoch sekund) — sana oralig'i filtri uchun
+
+_managers: dict[tuple[str, str], "VectorStoreManager"] = {}
+_managers_lock = threading.Lock()
+
+
+def get_vector_store_manager(
+    persist_dir: str = "./data/memory",
+    backend: Optional[str] = None,
+    embedding_function: Any = None,
+) -> "VectorStoreManager":
+    """Katalog uchun yagona (process-wide) boshqaruvchini qaytarish.
+
+    ``embedding_function`` faqat boshqaruvchi birinchi marta yaratilganda
+    hisobga olinadi (masalan, benchmarklarda oflayn ``HashingEmbedder``).
+    """
+    backend = (backend or os.getenv(_BACKEND_ENV) or "auto").lower()
+    key = (str(Path(persist_dir).resolve()), backend)
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = VectorStoreManager(
+                persist_dir, backend=backend, embedding_function=embedding_function
+            )
+            _managers[key] = manager
+        return manager
+
+
+_RANGE_OPERATORS = {
+    "$gt": lambda a, b: a > b,
+    "$gte": lambda a, b: a >= b,
+    "$lt": lambda a, b: a < b,
+    "$lte": lambda a, b: a <= b,
+}
+
+
+def _compare(op: str, value: Any, operand: Any) -> bool:
+    if op == "$eq":
+        return value == operand
+    if op == "$ne":
+        return value != operand
+    if op == "$in":
+        return value in operand
+    if op == "$nin":
+        return value not in operand
+    if op not in _RANGE_OPERATORS:
+        raise ValueError(f"Noma'lum filtr operatori: {op}")
+    if value is None or isinstance(value, bool):
+        return False
+    try:
+        return _RANGE_OPERATORS[op](value, operand)
+    except TypeError:
+        return False
+
+
+def match_where(where: Optional[dict], metadata: dict) -> bool:
+    """Chroma uslubidagi ``where`` filtrini metadata ga qo'llash.
+
+    Qo'llab-quvvatlanadi: ``{"kalit": qiymat}``, ``{"kalit": {"$eq" | "$ne" |
+    "$gt" | "$gte" | "$lt" | "$lte" | "$in" | "$nin": ...}}``, ``$and``, ``$or``.
+    """
+    if not where:
+        return True
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(match_where(sub, metadata) for sub in condition):
+                return False
+        elif key == "$or":
+            if not any(match_where(sub, metadata) for sub in condition):
+                return False
+        else:
+            operators = condition if isinstance(condition, dict) else {"$eq": condition}
+            value = metadata.get(key)
+            if not all(_compare(op, value, operand) for op, operand in operators.items()):
+                return False
+    return True
+
+
+def to_timestamp(value: Any) -> float:
+    """datetime/date, ISO satr yoki son (epoch sekund) → epoch sekund."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day).timestamp()
+    raise TypeError(f"Sana sifatida qabul qilinmaydi: {value!r}")
+
+
+def build_where(
+    where: Optional[dict] = None,
+    since: Any = None,
+    until: Any = None,
+) -> Optional[dict]:
+    """Filtr va sana oralig'ini bitta Chroma-mos ``where`` ga birlashtirish.
+
+    Bir nechta kalitli lug'at ``$and`` ga yoyiladi (Chroma yuqori darajada
+    bitta kalit kutadi); sana oralig'i ``ts`` (epoch sekund) maydoniga qo'llanadi.
+
+    Args:
+        where: ``{"lang": "uz", "mode": {"$in": ["pro", "code"]}}`` kabi filtr
+        since: Shu vaqtdan keyingi yozuvlar (datetime, date, ISO satr yoki epoch)
+        until: Shu vaqtgacha bo'lgan yozuvlar
+
+    Returns:
+        Birlashtirilgan filtr yoki filtr yo'q bo'lsa None
+    """
+    terms = [{key: value} for key, value in (where or {}).items() if value is not None]
+    if since is not None:
+        terms.append({_TIMESTAMP_KEY: {"$gte": to_timestamp(since)}})
+    if until is not None:
+        terms.append({_TIMESTAMP_KEY: {"$lte": to_timestamp(until)}})
+    if not terms:
+        return None
+    return terms[0] if len(terms) == 1 else {"$and": terms}
+
+
+class VectorStore:
+    """Bitta kolleksiya uchun vektor ombori interfeysi.
+
+    Qidiruv natijasi: har bir so'rov uchun
+    ``[{"id", "content", "metadata", "distance"}]`` (kosinus masofa, kichigi yaqin).
+    """
+
+    backend = "base"
+
+    def add(
+        self,
+        documents: list[str],
+        metadatas: list[dict],
+        ids: list[str],
+        embeddings: Optional[list[list[float]]] = None,
+    ) -> None:
+        """Hujjatlarni qo'shish (mavjud ID lar almashtiriladi)."""
+        raise NotImplementedError
+
+    def query(
+        self,
+        query_texts: list[str],
+        k: int = 5,
+        query_embeddings: Optional[list[list[float]]] = None,
+        where: Optional[dict] = None,
+    ) -> list[list[dict]]:
+        """Eng yaqin ``k`` ta hujjatni qidirish (``where`` — metadata filtri)."""
+        raise NotImplementedError
+
+    def delete(self, ids: list[str]) -> None:
+        """ID bo'yicha o'chirish."""
+        raise NotImplementedError
+
+    def count(self) -> int:
+        raise NotImplementedError
+
+    def snapshot(self, path: str) -> None:
+        """Kolleksiya holatini ``path`` katalogiga saqlash."""
+        raise NotImplementedError
+
+    def restore(self, path: str) -> None:
+        """``snapshot`` bilan saqlangan holatni tiklash (joriy holat almashtiriladi)."""
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        return {"vectors": self.count()}
+
+
+class ChromaVectorStore(VectorStore):
+    """ChromaDB kolleksiyasi ustidagi ``VectorStore``."""
+
+    backend = "chromadb"
+    _SNAPSHOT_FILE = "records.jsonl"
+
+    def __init__(self, collection: Any) -> None:
+        self._collection = collection
+        self._dimension = 0
+
+    def add(self, documents, metadatas, ids, embeddings=None) -> None:
+        kwargs: dict[str, Any] = {"documents": documents, "metadatas": metadatas, "ids": ids}
+        if embeddings is not None:
+            kwargs["embeddings"] = embeddings
+            if embeddings:
+                self._dimension = len(embeddings[0])
+        self._collection.upsert(**kwargs)
+
+    def query(self, query_texts, k=5, query_embeddings=None, where=None) -> list[list[dict]]:
+        count = self._collection.count()
+        if count == 0 or not query_texts:
+            return [[] for _ in query_texts]
+        kwargs: dict[str, Any] = {"n_results": min(k, count)}
+        if query_embeddings is not None:
+            kwargs["query_embeddings"] = query_embeddings
+        else:
+            kwargs["query_texts"] = query_texts
+        if where:
+            # Chroma yuqori darajada bitta kalit kutadi
+            kwargs["where"] = build_where(where)
+        results = self._collection.query(**kwargs)
+        if not results or not results.get("documents"):
+            return [[] for _ in query_texts]
+        empty = [[] for _ in query_texts]
+        return [
+            [
+                {"id": doc_id, "content": doc, "metadata": meta or {}, "distance": dist}
+                for doc_id, doc, meta, dist in zip(ids, docs, metas, distances)
+            ]
+            for ids, docs, metas, distances in zip(
+                results.get("ids") or empty,
+                results["documents"],
+                results.get("metadatas") or empty,
+                results.get("distances") or empty,
+            )
+        ]
+
+    def delete(self, ids: list[str]) -> None:
+        if ids:
+            self._collection.delete(ids=ids)
+
+    def count(self) -> int:
+        return self._collection.count()
+
+    def snapshot(self, path: str) -> None:
+        """Barcha yozuvlarni (embedding bilan) JSONL ga eksport qilish."""
+        data = self._collection.get(include=["documents", "metadatas", "embeddings"])
+        target = Path(path)
+        target.mkdir(parents=True, exist_ok=True)
+        tmp = target / f"{self._SNAPSHOT_FILE}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for doc_id, doc, meta, vector in zip(
+                data["ids"], data["documents"], data["metadatas"], data["embeddings"]
+            ):
+                record = {"id": doc_id, "document": doc, "metadata": meta or {},
+                          "embedding": [float(x) for x in vector]}
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        tmp.replace(target / self._SNAPSHOT_FILE)
+
+    def restore(self, path: str) -> None:
+        source = Path(path) / self._SNAPSHOT_FILE
+        records = [json.loads(line) for line in source.read_text(encoding="utf-8").splitlines() if line]
+        existing = self._collection.get(include=[])["ids"]
+        if existing:
+            self._collection.delete(ids=existing)
+        if records:
+            self.add(
+                [r["document"] for r in records],
+                [r["metadata"] for r in records],
+                [r["id"] for r in records],
+                embeddings=[r["embedding"] for r in records],
+            )
+
+    def stats(self) -> dict:
+        return {"vectors": self.count(), "dimension": self._dimension}
+
+
+class _CollectionStats:
+    """Kolleksiya bo'yicha chaqiruvlar soni va kechikishlar."""
+
+    __slots__ = ("adds", "queries", "add_ms", "query_ms")
+
+    def __init__(self) -> None:
+        self.adds = 0
+        self.queries = 0
+        self.add_ms: deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self.query_ms: deque[float] = deque(maxlen=_LATENCY_WINDOW)
+
+
+def _latency_summary(samples: deque) -> dict:
+    if not samples:
+        return {"avg_ms": 0.0, "p95_ms": 0.0}
+    ordered = sorted(samples)
+    return {
+        "avg_ms": round(sum(ordered) / len(ordered), 2),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+    }
+
+
+class VectorStoreManager:
+    """Bitta backend, bitta embedding funksiyasi, nomlangan kolleksiyalar."""
+
+    def __init__(
+        self,
+        persist_dir: str = "./data/memory",
+        backend: str = "auto",
+        embedding_function: Any = None,
+    ) -> None:
+        """
+        Args:
+            persist_dir: Ma'lumotlar katalogi
+            backend: ``"auto"``, ``"chroma"`` yoki ``"numpy"``
+            embedding_function: Standart modelning o'rniga ishlatiladigan
+                ``f(texts) -> vectors`` (berilmasa avtomatik tanlanadi)
+        """
+        self._persist_dir = persist_dir
+        self._requested_backend = backend
+        self._backend = ""
+        self._client: Any = None
+        self._custom_embedding = embedding_function is not None
+        self._embedding_fn: Any = embedding_function
+        self._embedding_name = type(embedding_function).__name__ if embedding_function else ""
+        self._collections: dict[str, VectorStore] = {}
+        self._stats: dict[str, _CollectionStats] = {}
+        self._lock = threading.RLock()
+        self._initialized = False
+
+    # === Ishga tushirish ===
+
+    def _init_chroma(self) -> bool:
+        try:
+            import chromadb  # type: ignore
+
+            self._client = chromadb.PersistentClient(path=self._persist_dir)
+        except ImportError:
+            return False
+        except Exception:
+            return False
+        if not self._custom_embedding:
+            try:
+                from chromadb.utils import embedding_functions  # type: ignore
+
+                self._embedding_fn = embedding_functions.DefaultEmbeddingFunction()
+                self._embedding_name = "chroma-default"
+            except Exception:
+                self._embedding_fn = None
+        self._backend = "chromadb"
+        return True
+
+    def _init_numpy(self) -> bool:
+        try:
+            from . import vector_index  # noqa: F401 — NumPy shu yerda import qilinadi
+            from .embeddings import default_embedding_function
+        except ImportError:
+            return False
+        if not self._custom_embedding:
+            self._embedding_name, self._embedding_fn = default_embedding_function()
+        self._backend = "numpy"
+        return True
+
+    def _ensure_backend(self) -> bool:
+        """Backend va embedding funksiyasini birinchi murojaatda tanlash."""
+        if self._initialized:
+            return bool(self._backend)
+        with self._lock:
+            if not self._initialized:
+                requested = self._requested_backend
+                if requested in ("auto", "chroma", "chromadb"):
+                    self._init_chroma()
+                if not self._backend and requested in ("auto", "numpy"):
+                    self._init_numpy()
+                self._initialized = True
+        return bool(self._backend)
+
+    @property
+    def available(self) -> bool:
+        """Semantik qidiruv backendi mavjudmi."""
+        return self._ensure_backend()
+
+    @property
+    def backend(self) -> str:
+        """``"chromadb"``, ``"numpy"`` yoki bo'sh satr (mavjud emas)."""
+        self._ensure_backend()
+        return self._backend
+
+    @property
+    def persist_dir(self) -> str:
+        return self._persist_dir
+
+    def collection(self, name: str) -> Optional[VectorStore]:
+        """Nom bo'yicha kolleksiya (bir marta ochiladi, keyin keshdan).
+
+        Returns:
+            ``VectorStore`` yoki backend bo'lmasa None
+        """
+        store = self._collections.get(name)
+        if store is not None:
+            return store
+        if not self._ensure_backend():
+            return None
+        with self._lock:
+            store = self._collections.get(name)
+            if store is None:
+                if self._backend == "chromadb":
+                    kwargs: dict[str, Any] = {"name": name, "metadata": _COLLECTION_METADATA}
+                    if self._embedding_fn is not None:
+                        kwargs["embedding_function"] = self._embedding_fn
+                    store = ChromaVectorStore(self._client.get_or_create_collection(**kwargs))
+                else:
+                    from .vector_index import NumpyVectorStore
+
+                    store = NumpyVectorStore(
+                        Path(self._persist_dir) / _VECTORS_SUBDIR / name,
+                        embed=self._embedding_fn,
+                    )
+                self._collections[name] = store
+                self._stats.setdefault(name, _CollectionStats())
+        return store
+
+    def _require(self, name: str) -> VectorStore:
+        store = self.collection(name)
+        if store is None:
+            raise RuntimeError("Vektor ombori mavjud emas (ChromaDB yoki NumPy o'rnating)")
+        return store
+
+    # === Embedding ===
+
+    def embed(self, texts: list[str]) -> Optional[list[list[float]]]:
+        """Matnlarni umumiy embedding funksiyasi bilan vektorlash."""
+        if not texts or not self._ensure_backend() or self._embedding_fn is None:
+            return None
+        return [list(vector) for vector in self._embedding_fn(texts)]
+
+    # === Qo'shish va o'chirish ===
+
+    def add(
+        self,
+        name: str,
+        documents: list[str],
+        metadatas: list[dict],
+        ids: list[str],
+        embeddings: Optional[list[list[float]]] = None,
+    ) -> None:
+        """Kolleksiyaga hujjatlar qo'shish.
+
+        Raises:
+            RuntimeError: Vektor ombori mavjud bo'lmasa
+        """
+        store = self._require(name)
+        if embeddings is None:
+            embeddings = self.embed(documents)
+        started = time.perf_counter()
+        store.add(documents, metadatas, ids, embeddings=embeddings)
+        stats = self._stats[name]
+        stats.adds += len(documents)
+        stats.add_ms.append((time.perf_counter() - started) * 1000)
+
+    def add_many(self, batches: dict[str, tuple[list[str], list[dict], list[str]]]) -> None:
+        """Bir nechta kolleksiyaga qo'shish; barcha matnlar bitta embedding chaqiruvida.
+
+        Args:
+            batches: {kolleksiya: (documents, metadatas, ids)}
+        """
+        batches = {name: batch for name, batch in batches.items() if batch[0]}
+        if not batches:
+            return
+        all_documents = [doc for documents, _, _ in batches.values() for doc in documents]
+        vectors = self.embed(all_documents)
+        offset = 0
+        for name, (documents, metadatas, ids) in batches.items():
+            chunk = None
+            if vectors is not None:
+                chunk = vectors[offset:offset + len(documents)]
+            offset += len(documents)
+            self.add(name, documents, metadatas, ids, embeddings=chunk)
+
+    def delete(self, name: str, ids: list[str]) -> None:
+        self._require(name).delete(ids)
+
+    # === Qidirish ===
+
+    def query(
+        self,
+        name: str,
+        query_texts: list[str],
+        k: int = 5,
+        query_embeddings: Optional[list[list[float]]] = None,
+        where: Optional[dict] = None,
+    ) -> list[list[dict]]:
+        """Kolleksiyadan eng yaqin hujjatlarni qidirish.
+
+        Returns:
+            Har bir so'rov uchun [{"id", "content", "metadata", "distance"}]
+        """
+        store = self._require(name)
+        if not query_texts:
+            return []
+        if query_embeddings is None:
+            query_embeddings = self.embed(query_texts)
+        started = time.perf_counter()
+        results = store.query(query_texts, k=k, query_embeddings=query_embeddings, where=where)
+        stats = self._stats[name]
+        stats.queries += len(query_texts)
+        stats.query_ms.append((time.perf_counter() - started) * 1000)
+        return results
+
+    def query_many(self, names: list[str], query_text: str, k: int = 5) -> dict[str, list[dict]]:
+        """Bitta so'rovni bir nechta kolleksiyada qidirish (embedding bir marta).
+
+        Returns:
+            {kolleksiya: [{"id", "content", "metadata", "distance"}]}
+        """
+        vectors = self.embed([query_text])
+        return {
+            name: self.query(name, [query_text], k=k, query_embeddings=vectors)[0]
+            for name in names
+        }
+
+    def count(self, name: str) -> int:
+        store = self.collection(name)
+        return store.count() if store is not None else 0
+
+    # === Snapshot ===
+
+    def snapshot(self, name: str, path: str) -> None:
+        self._require(name).snapshot(path)
+
+    def restore(self, name: str, path: str) -> None:
+        self._require(name).restore(path)
+
+    # === Statistika ===
+
+    def stats(self) -> dict:
+        """Kolleksiyalar bo'yicha hajm, taxminiy xotira va kechikish.
+
+        Returns:
+            {"backend", "embedding", "persist_dir", "disk_bytes", "collections": {nom: {...}}}
+        """
+        collections = {}
+        for name, store in list(self._collections.items()):
+            stats = self._stats[name]
+            try:
+                info = store.stats()
+            except Exception:
+                info = {"vectors": 0}
+            info.setdefault("dimension", 0)
+            info.setdefault("approx_vector_bytes", info["vectors"] * info["dimension"] * _FLOAT_BYTES)
+            info.update(
+                {
+                    "added": stats.adds,
+                    "queries": stats.queries,
+                    "add": _latency_summary(stats.add_ms),
+                    "query": _latency_summary(stats.query_ms),
+                }
+            )
+            collections[name] = info
+        return {
+            "backend": self._backend or "unavailable",
+            "embedding": self._embedding_name,
+            "persist_dir": self._persist_dir,
+            "disk_bytes": _dir_size(Path(self._persist_dir)),
+            "collections": collections,
+        }
+
+
+def _dir_size(path: Path) -> int:
+    try:
+        return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+    except OSError:
+        return 0
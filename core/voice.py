@@ -5,6 +5,7 @@ Bog'liqliklar yo'q bo'lsa, graceful fallback.
 
 from __future__ import annotations
 
+from importlib.util import find_spec
 from typing import Optional
 
 
@@ -15,8 +16,18 @@ class VoiceEngine:
         self._enabled = enabled
         self._whisper_model: Optional[object] = None
         self._tts_engine: Optional[str] = None
-        if enabled:
+        # Whisper modeli va TTS dasturi birinchi ishlatilganda yuklanadi
+        self._stt_loaded = False
+        self._tts_checked = False
+
+    def _ensure_stt(self) -> None:
+        if not self._stt_loaded:
+            self._stt_loaded = True
             self._init_stt()
+
+    def _ensure_tts(self) -> None:
+        if not self._tts_checked:
+            self._tts_checked = True
             self._init_tts()
 
     def _init_stt(self) -> None:
@@ -76,6 +87,7 @@ class VoiceEngine:
         if not self._enabled:
             return ""
 
+        self._ensure_stt()
         if self._whisper_model is None:
             return ""
 
@@ -104,7 +116,10 @@ class VoiceEngine:
 
     def speak(self, text: str) -> None:
         """Matnni ovozga aylantirish va o'qish."""
-        if not self._enabled or not self._tts_engine or not text.strip():
+        if not self._enabled or not text.strip():
+            return
+        self._ensure_tts()
+        if not self._tts_engine:
             return
 
         try:
@@ -128,9 +143,16 @@ class VoiceEngine:
     @property
     def is_available(self) -> bool:
         """Ovoz tizimi ishga tayyor ekanligini tekshirish."""
-        return self._enabled and self._tts_engine is not None
+        if not self._enabled:
+            return False
+        self._ensure_tts()
+        return self._tts_engine is not None
 
     @property
     def stt_available(self) -> bool:
-        """STT mavjudligini tekshirish."""
-        return self._enabled and self._whisper_model is not None
+        """STT mavjudligini tekshirish (modelni yuklamasdan)."""
+        if not self._enabled:
+            return False
+        if self._stt_loaded:
+            return self._whisper_model is not None
+        return find_spec("whisper") is not None
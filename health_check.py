@@ -72,6 +72,7 @@ def check_dependencies() -> list[tuple[str, bool, str]]:
         ("python-dotenv", "dotenv"),
         ("httpx", "httpx"),
         ("chromadb", "chromadb"),
+        ("numpy", "numpy"),
         ("duckduckgo-search", "duckduckgo_search"),
         ("openai", "openai"),
         ("google-generativeai", "google.generativeai"),
@@ -18,8 +18,9 @@ except ImportError:
     print("Rich kutubxonasi topilmadi. O'rnating: pip install rich")
     sys.exit(1)
 
-from life import SmartScheduler, HomeworkManager, DailyPlanner, ReminderEngine
+from life import AmbiguousPrefixError, SmartScheduler, HomeworkManager, DailyPlanner, ReminderEngine
 from core.intelligence import CognitiveLoadBalancer, TimePerceptionEngine, LifeNarrativeEngine
+from core.energy_tracker import EnergyTracker
 
 console = Console()
 
@@ -92,7 +93,9 @@ def show_schedule(scheduler: SmartScheduler, day: str | None = None) -> None:
     table.add_column("O'qituvchi")
     table.add_column("ID", style="dim", no_wrap=True)
     for c in classes:
-        table.add_row(c.start_time, c.end_time, c.name, c.location, c.teacher, c.id[:8])
+        table.add_row(
+            c.start_time, c.end_time, c.name, c.location, c.teacher, scheduler.short_class_id(c.id)
+        )
     console.print(table)
 
 
@@ -135,7 +138,13 @@ def show_homework(homework_mgr: HomeworkManager) -> None:
     table.add_column("Ustuvorlik", style="magenta")
     table.add_column("ID", style="dim", no_wrap=True)
     for hw in pending:
-        table.add_row(hw.subject, hw.description, hw.deadline or "-", hw.priority.value, hw.id[:8])
+        table.add_row(
+            hw.subject,
+            hw.description,
+            hw.deadline or "-",
+            hw.priority.value,
+            homework_mgr.short_homework_id(hw.id),
+        )
     console.print(table)
 
 
@@ -156,10 +165,12 @@ def show_tasks(homework_mgr: HomeworkManager) -> None:
         if entry["type"] == "homework":
             title_col = item.subject
             desc_col = item.description
+            short_id = homework_mgr.short_homework_id(item.id)
         else:
             title_col = item.title
             desc_col = item.description
-        table.add_row(entry["type"], title_col, desc_col, item.priority.value, item.id[:8])
+            short_id = homework_mgr.short_task_id(item.id)
+        table.add_row(entry["type"], title_col, desc_col, item.priority.value, short_id)
     console.print(table)
 
 
@@ -320,7 +331,7 @@ def main() -> None:
     time_engine = TimePerceptionEngine()
     narrative = LifeNarrativeEngine()
 
-    ui = UIRenderer()
+    ui = UIRenderer(console)
 
     # Startup ekrani
     ui.startup()
@@ -393,7 +404,7 @@ def main() -> None:
                 teacher = parts[6] if len(parts) > 6 else ""
                 try:
                     cls = scheduler.add_class(name, day, start, end_, location, teacher)
-                    output = f"✅ Dars qo'shildi: {cls.name} ({cls.id[:8]})"
+                    output = f"✅ Dars qo'shildi: {cls.name} ({scheduler.short_class_id(cls.id)})"
                     console.print(f"[green]{output}[/green]")
                 except Exception as e:
                     output = f"Xato: {e}"
@@ -404,12 +415,18 @@ def main() -> None:
                 console.print("[red]Foydalanish: /remove_class <id>[/red]")
                 output = "Noto'g'ri format."
             else:
-                found = scheduler.find_class_by_prefix(parts[1])
+                try:
+                    found, ambiguous = scheduler.find_class_by_prefix(parts[1]), ""
+                except AmbiguousPrefixError as e:
+                    found, ambiguous = None, str(e)
                 if found:
                     result = scheduler.remove_class(found.id)
                     output = "✅ Dars o'chirildi." if result else "Dars topilmadi."
                     color = "green" if result else "red"
                     console.print(f"[{color}]{output}[/{color}]")
+                elif ambiguous:
+                    output = ambiguous
+                    console.print(f"[yellow]{output}[/yellow]")
                 else:
                     output = "Dars topilmadi."
                     console.print(f"[red]{output}[/red]")
@@ -429,7 +446,7 @@ def main() -> None:
                 priority = parts[4] if len(parts) > 4 else "medium"
                 try:
                     hw = homework_mgr.add_homework(subject, description, deadline, priority)
-                    output = f"✅ Uy vazifasi qo'shildi: {hw.subject} ({hw.id[:8]})"
+                    output = f"✅ Uy vazifasi qo'shildi: {hw.subject} ({homework_mgr.short_homework_id(hw.id)})"
                     console.print(f"[green]{output}[/green]")
                 except Exception as e:
                     output = f"Xato: {e}"
@@ -440,12 +457,18 @@ def main() -> None:
                 console.print("[red]Foydalanish: /done_hw <id>[/red]")
                 output = "Noto'g'ri format."
             else:
-                found = homework_mgr.find_homework_by_prefix(parts[1])
+                try:
+                    found, ambiguous = homework_mgr.find_homework_by_prefix(parts[1]), ""
+                except AmbiguousPrefixError as e:
+                    found, ambiguous = None, str(e)
                 if found:
                     result = homework_mgr.complete_homework(found.id)
                     output = "✅ Bajarilgan deb belgilandi!" if result else "Topilmadi."
                     color = "green" if result else "red"
                     console.print(f"[{color}]{output}[/{color}]")
+                elif ambiguous:
+                    output = ambiguous
+                    console.print(f"[yellow]{output}[/yellow]")
                 else:
                     output = "Vazifa topilmadi."
                     console.print(f"[red]{output}[/red]")
@@ -466,7 +489,7 @@ def main() -> None:
                 category = parts[5] if len(parts) > 5 else "general"
                 try:
                     task = homework_mgr.add_task(title, description, deadline, priority, category)
-                    output = f"✅ Vazifa qo'shildi: {task.title} ({task.id[:8]})"
+                    output = f"✅ Vazifa qo'shildi: {task.title} ({homework_mgr.short_task_id(task.id)})"
                     console.print(f"[green]{output}[/green]")
                 except Exception as e:
                     output = f"Xato: {e}"
@@ -477,18 +500,27 @@ def main() -> None:
                 console.print("[red]Foydalanish: /done_task <id>[/red]")
                 output = "Noto'g'ri format."
             else:
-                found = homework_mgr.find_task_by_prefix(parts[1])
+                try:
+                    found, ambiguous = homework_mgr.find_task_by_prefix(parts[1]), ""
+                except AmbiguousPrefixError as e:
+                    found, ambiguous = None, str(e)
                 if found:
                     result = homework_mgr.complete_task(found.id)
                     output = "✅ Bajarilgan deb belgilandi!" if result else "Topilmadi."
                     color = "green" if result else "red"
                     console.print(f"[{color}]{output}[/{color}]")
+                elif ambiguous:
+                    output = ambiguous
+                    console.print(f"[yellow]{output}[/yellow]")
                 else:
                     output = "Vazifa topilmadi."
                     console.print(f"[red]{output}[/red]")
 
         elif cmd == "/plan":
-            plan = planner.generate_daily_plan()
+            today_energy = EnergyTracker().get_today_energy()
+            plan = planner.generate_daily_plan(
+                energy_level=today_energy.get("level") if today_energy else None
+            )
             lines = [f"📅 Sana: {plan.date}", f"⏰ Uyg'onish: {plan.wake_up_time}", ""]
             if plan.classes:
                 lines.append(f"🏫 Darslar ({len(plan.classes)} ta):")
@@ -502,6 +534,12 @@ def main() -> None:
                 lines.append(f"\n📝 Bugungi vazifalar ({len(plan.tasks)} ta):")
                 for t in plan.tasks:
                     lines.append(f"  - {t.get('subject', t.get('title', ''))}")
+            if plan.breaks:
+                lines.append(f"\n☕ Dam olish ({len(plan.breaks)} ta):")
+                for b in plan.breaks:
+                    lines.append(f"  {b['start']}-{b['end']}")
+            if plan.notes:
+                lines.append(f"\n⚠️  {plan.notes}")
             console.print(Panel("\n".join(lines), title="📋 Bugungi Reja"))
             output = "Reja ko'rsatildi."
 
@@ -1,14 +1,39 @@
-from life.models import ClassSchedule, Homework, Task, DailyPlan
-from life.scheduler import SmartScheduler
-from life.homework import HomeworkManager
-from life.daily_planner import DailyPlanner
-from life.reminders import ReminderEngine
+# Submodullar birinchi murojaatda import qilinadi (PEP 562): ``life.dates``
+# kabi yengil modullar pydantic va boshqa menejerlarni yuklamaydi.
+from importlib import import_module
+
+_EXPORTS = {
+    "ClassSchedule": "life.models",
+    "Homework": "life.models",
+    "Task": "life.models",
+    "DailyPlan": "life.models",
+    "AmbiguousPrefixError": "life.indexes",
+    "SmartScheduler": "life.scheduler",
+    "HomeworkManager": "life.homework",
+    "DailyPlanner": "life.daily_planner",
+    "ReminderEngine": "life.reminders",
+}
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
 
 __all__ = [
     "ClassSchedule",
     "Homework",
     "Task",
     "DailyPlan",
+    "AmbiguousPrefixError",
     "SmartScheduler",
     "HomeworkManager",
     "DailyPlanner",
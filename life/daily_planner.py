@@ -1,12 +1,14 @@
-from datetime import datetime, timedelta
+from datetime import datetime
+from typing import Optional
 
-from life.models import DailyPlan
+from life.models import DailyPlan, clock_minutes, today_epoch_day
+from life.plan_solver import PlanItem, SolvedPlan, free_windows, solve_plan
 from life.scheduler import SmartScheduler
 from life.homework import HomeworkManager
 from life.storage import LifeStorage
 
 _END_OF_DAY_TIME = "22:00"  # Kun oxiri vaqti (dam olish hisobi uchun)
-_DAILY_PLAN_MAX_TASKS = 5   # Kundalik rejaga kiritilgan maksimal vazifalar soni
+_END_OF_DAY_MINUTES = clock_minutes(_END_OF_DAY_TIME) or 0
 
 
 class DailyPlanner:
@@ -17,72 +19,58 @@ class DailyPlanner:
         self.homework_mgr = HomeworkManager()
         self.storage = LifeStorage()
 
-    def generate_daily_plan(self, wake_up: str = "07:00") -> DailyPlan:
+    def reload_if_changed(self) -> bool:
+        """Jadval va vazifalar fayllari o'zgargan bo'lsa qayta yuklash."""
+        scheduler_changed = self.scheduler.reload_if_changed()
+        return self.homework_mgr.reload_if_changed() or scheduler_changed
+
+    def generate_daily_plan(
+        self, wake_up: str = "07:00", energy_level: Optional[int] = None
+    ) -> DailyPlan:
         """Bugungi kun uchun optimal reja yaratish.
 
         Logika:
         1. Bugungi darslarni olish
-        2. Bajarilmagan homework/tasks olish
-        3. Darslar orasidagi bo'sh vaqtlarni aniqlash
-        4. Study blocks yaratish (bo'sh vaqtlarda)
-        5. Dam olish vaqtlarini qo'shish (har 90 daqiqada 15 daqiqa)
+        2. Bo'sh oynalarni aniqlash (uyg'onish/hozirdan kun oxirigacha,
+           joy o'zgarganda yo'l vaqti ayiriladi)
+        3. Bajarilmagan homework/tasks ni davomiylik, muddat, ustuvorlik va
+           kuch bo'yicha baholash
+        4. Eng qimmatli to'plamni oynalarga joylashtirish (plan_solver)
+        5. Dam olish vaqtlarini faqat o'qish bloklari orasiga qo'yish
         6. Kundalik rejani qaytarish
+
+        Args:
+            wake_up: Uyg'onish vaqti.
+            energy_level: Bugungi energiya (1-5); berilsa og'ir vazifalar
+                umumiy hajmi cheklanadi.
         """
         today = datetime.now().strftime("%Y-%m-%d")
-        today_classes = self.scheduler.get_today_classes()
-        pending = self.homework_mgr.get_all_pending()
+        today_classes, solved = self._solve_today(wake_up, energy_level)
 
         classes_data = [c.model_dump() for c in today_classes]
-        # Top _DAILY_PLAN_MAX_TASKS pending items are included to keep the daily plan concise
         tasks_data = [
-            {"type": item["type"], **item["item"].model_dump()}
-            for item in pending[:_DAILY_PLAN_MAX_TASKS]
+            {"type": item.kind, **item.record.to_storage()} for _, _, item in solved.blocks
         ]
-
-        free_slots = self._find_free_slots(
-            [{"start": c.start_time, "end": c.end_time} for c in today_classes]
-        )
-
-        study_blocks: list[dict] = []
-        pending_copy = list(pending)
-        for slot_start, slot_end in free_slots:
-            suggestion = ""
-            if pending_copy:
-                top = pending_copy.pop(0)
-                item = top["item"]
-                if top["type"] == "homework":
-                    suggestion = f"{item.subject} uy vazifasi"
-                else:
-                    suggestion = item.title
-            study_blocks.append(
-                {"start": slot_start, "end": slot_end, "suggestion": suggestion}
-            )
-
-        breaks: list[dict] = []
-        start_min = self._time_str_to_minutes(wake_up)
-        last_break = start_min
-        interval = 90
-        break_dur = 15
-        end_of_day = self._time_str_to_minutes(_END_OF_DAY_TIME)
-        while last_break + interval < end_of_day:
-            break_start_min = last_break + interval
-            break_end_min = break_start_min + break_dur
-            breaks.append(
-                {
-                    "start": self._minutes_to_time_str(break_start_min),
-                    "end": self._minutes_to_time_str(break_end_min),
-                    "type": "dam olish",
-                }
-            )
-            last_break = break_end_min
+        breaks = [
+            {
+                "start": self._minutes_to_time_str(start),
+                "end": self._minutes_to_time_str(end),
+                "type": "dam olish",
+            }
+            for start, end in solved.breaks
+        ]
+        notes = ""
+        if solved.skipped:
+            notes = f"{len(solved.skipped)} ta vazifa bugungi bo'sh vaqtga sig'madi."
 
         plan = DailyPlan(
             date=today,
             wake_up_time=wake_up,
             classes=classes_data,
-            study_blocks=study_blocks,
+            study_blocks=self._study_blocks(solved),
             tasks=tasks_data,
             breaks=breaks,
+            notes=notes,
         )
         self.storage.save_daily_plan(plan.model_dump())
         return plan
@@ -117,7 +105,7 @@ class DailyPlanner:
             lines.append("")
             suggestion_text = first["suggestion"] or "o'qishni"
             lines.append(
-                f"💡 Tavsiya: Darslar orasida {first['start']}-{first['end']} da "
+                f"💡 Tavsiya: {first['start']}-{first['end']} da "
                 f"{suggestion_text} bajaring."
             )
 
@@ -148,55 +136,42 @@ class DailyPlanner:
         """Darslar orasidagi bo'sh vaqtlarda o'qish bloklarini taklif qilish.
 
         Returns:
-            [{"start": "10:30", "end": "11:00", "suggestion": "Matematika uy vazifasi"}]
+            [{"start": "10:30", "end": "11:15", "suggestion": "Matematika uy vazifasi",
+              "type": "homework", "id": "..."}]
         """
+        _, solved = self._solve_today()
+        return self._study_blocks(solved)
+
+    def _solve_today(
+        self, wake_up: str = "07:00", energy_level: Optional[int] = None
+    ) -> tuple[list, SolvedPlan]:
+        """Bugungi darslar va bajarilmagan ishlar bo'yicha rejani hisoblash."""
+        now = datetime.now()
+        now_minutes = now.hour * 60 + now.minute
         today_classes = self.scheduler.get_today_classes()
-        slots = self._find_free_slots(
-            [{"start": c.start_time, "end": c.end_time} for c in today_classes]
+        windows = free_windows(
+            [(c.start_minutes, c.end_minutes, c.location) for c in today_classes],
+            day_start=max(clock_minutes(wake_up) or 0, now_minutes),
+            day_end=_END_OF_DAY_MINUTES,
         )
-        pending = self.homework_mgr.get_all_pending()
-        result = []
-        for i, (slot_start, slot_end) in enumerate(slots):
-            suggestion = ""
-            if i < len(pending):
-                item = pending[i]["item"]
-                if pending[i]["type"] == "homework":
-                    suggestion = f"{item.subject} uy vazifasi"
-                else:
-                    suggestion = item.title
-            result.append({"start": slot_start, "end": slot_end, "suggestion": suggestion})
-        return result
-
-    def _find_free_slots(
-        self, classes: list[dict], min_duration: int = 30
-    ) -> list[tuple[str, str]]:
-        """Darslar orasidagi bo'sh vaqtlarni topish (min 30 daqiqa)."""
-        if not classes:
-            return []
-
-        sorted_classes = sorted(classes, key=lambda c: self._time_str_to_minutes(c["start"]))
-        slots: list[tuple[str, str]] = []
-
-        for i in range(len(sorted_classes) - 1):
-            end_prev = self._time_str_to_minutes(sorted_classes[i]["end"])
-            start_next = self._time_str_to_minutes(sorted_classes[i + 1]["start"])
-            gap = start_next - end_prev
-            if gap >= min_duration:
-                slots.append(
-                    (
-                        self._minutes_to_time_str(end_prev),
-                        self._minutes_to_time_str(start_next),
-                    )
-                )
-        return slots
-
-    def _time_str_to_minutes(self, time_str: str) -> int:
-        """'09:30' -> 570."""
-        try:
-            hours, minutes = map(int, time_str.split(":"))
-            return hours * 60 + minutes
-        except (ValueError, AttributeError):
-            return 0
+        today = today_epoch_day()
+        items = [
+            PlanItem.from_pending(entry, today, now_minutes)
+            for entry in self.homework_mgr.get_all_pending()
+        ]
+        return today_classes, solve_plan(items, windows, energy_level)
+
+    def _study_blocks(self, solved: SolvedPlan) -> list[dict]:
+        return [
+            {
+                "start": self._minutes_to_time_str(start),
+                "end": self._minutes_to_time_str(end),
+                "suggestion": item.label,
+                "type": item.kind,
+                "id": item.key,
+            }
+            for start, end, item in solved.blocks
+        ]
 
     def _minutes_to_time_str(self, minutes: int) -> str:
         """570 -> '09:30'."""
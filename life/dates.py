@@ -0,0 +1,56 @@
+from datetime import date
+from typing import Optional
+
+# Sana/vaqt yordamchilari pydantic'siz alohida modulda — core trackerlari
+# ularni life.models (va pydantic) ni yuklamasdan ishlatadi.
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def epoch_day(value: str) -> Optional[int]:
+    """'2026-03-02' yoki '2026-03-02 14:00' -> 1970-01-01 dan beri kunlar soni.
+
+    Sana bo'lmasa yoki noto'g'ri bo'lsa None.
+    """
+    if not value or len(value) < 10:
+        return None
+    try:
+        return date.fromisoformat(value[:10]).toordinal() - _EPOCH_ORDINAL
+    except ValueError:
+        return None
+
+
+def date_to_epoch_day(value: date) -> int:
+    """date -> 1970-01-01 dan beri kunlar soni."""
+    return value.toordinal() - _EPOCH_ORDINAL
+
+
+def today_epoch_day() -> int:
+    """Bugungi kun (epoch kun)."""
+    return date.today().toordinal() - _EPOCH_ORDINAL
+
+
+def clock_minutes(value: str) -> Optional[int]:
+    """'09:30' -> 570 (yarim tundan beri daqiqalar). Noto'g'ri bo'lsa None."""
+    hours, sep, minutes = value.partition(":") if value else ("", "", "")
+    if not sep:
+        return None
+    try:
+        h, m = int(hours), int(minutes)
+    except ValueError:
+        return None
+    if not (0 <= h <= 24 and 0 <= m < 60):
+        return None
+    return h * 60 + m
+
+
+def deadline_minutes(value: str) -> Optional[int]:
+    """'2026-03-02 14:00' -> 840; vaqt ko'rsatilmagan bo'lsa None."""
+    if not value or len(value) <= 11:
+        return None
+    if len(value) == 16 and value[13] == ":":
+        try:
+            return int(value[11:13]) * 60 + int(value[14:16])
+        except ValueError:
+            return None
+    return clock_minutes(value[11:].strip())
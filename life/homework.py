@@ -1,7 +1,8 @@
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Optional
 
-from life.models import Homework, Task, TaskPriority, TaskStatus
+from life.indexes import RecordIndex
+from life.models import Homework, Task, TaskPriority, TaskStatus, today_epoch_day
 from life.storage import LifeStorage
 
 _PRIORITY_SCORE = {
@@ -19,27 +20,55 @@ class HomeworkManager:
         self.storage = LifeStorage()
         self._homework: list[Homework] = []
         self._tasks: list[Task] = []
+        self._hw_index = RecordIndex(subject_attr="subject")
+        self._task_index = RecordIndex()
+        self._stamps: dict[str, Optional[tuple[int, int]]] = {}
         self._load_data()
 
     # === Ichki yordamchilar ===
 
     def _load_data(self) -> None:
         """Ma'lumotlarni saqlashdan yuklash."""
-        self._homework = [Homework(**item) for item in self.storage.load_homework()]
-        self._tasks = [Task(**item) for item in self.storage.load_tasks()]
+        # Versiya o'qishdan oldin olinadi — o'qish paytidagi yozuv keyin qayta yuklanadi
+        self._stamps = {
+            "homework": self.storage.stamp(self.storage.homework_file),
+            "tasks": self.storage.stamp(self.storage.tasks_file),
+        }
+        # Diskdagi yozuvlar ishonchli — validatsiyasiz tezkor yo'l
+        self._homework = [Homework.from_storage(item) for item in self.storage.load_homework()]
+        self._tasks = [Task.from_storage(item) for item in self.storage.load_tasks()]
+        # Ikkilamchi indekslar bir marta quriladi va har bir o'zgarishda yangilanadi
+        self._hw_index = RecordIndex(self._homework, subject_attr="subject")
+        self._task_index = RecordIndex(self._tasks)
 
     def _save_homework(self) -> None:
-        self.storage.save_homework([h.model_dump() for h in self._homework])
+        self.storage.save_homework([h.to_storage() for h in self._homework])
+        self._stamps["homework"] = self.storage.stamp(self.storage.homework_file)
 
     def _save_tasks(self) -> None:
-        self.storage.save_tasks([t.model_dump() for t in self._tasks])
+        self.storage.save_tasks([t.to_storage() for t in self._tasks])
+        self._stamps["tasks"] = self.storage.stamp(self.storage.tasks_file)
+
+    def reload_if_changed(self) -> bool:
+        """Fayllar boshqa manager tomonidan o'zgartirilgan bo'lsa qayta yuklash.
+
+        Uzoq yashaydigan nusxalar (server) eski ro'yxatni saqlab, chat orqali
+        qo'shilgan yozuvlarni ustidan yozib yubormasligi uchun.
+
+        Returns:
+            Qayta yuklandimi.
+        """
+        if (
+            self.storage.stamp(self.storage.homework_file) == self._stamps.get("homework")
+            and self.storage.stamp(self.storage.tasks_file) == self._stamps.get("tasks")
+        ):
+            return False
+        self._load_data()
+        return True
 
     def _today_str(self) -> str:
         return datetime.now().strftime("%Y-%m-%d")
 
-    def _tomorrow_str(self) -> str:
-        return (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
-
     # === Homework ===
 
     def add_homework(
@@ -48,6 +77,7 @@ class HomeworkManager:
         description: str,
         deadline: str = "",
         priority: str = "medium",
+        estimated_minutes: int = 0,
     ) -> Homework:
         """Yangi uy vazifasini qo'shish."""
         hw = Homework(
@@ -56,56 +86,43 @@ class HomeworkManager:
             assigned_date=self._today_str(),
             deadline=deadline,
             priority=TaskPriority(priority.lower()),
+            estimated_minutes=estimated_minutes,
         )
         self._homework.append(hw)
+        self._hw_index.add(hw)
         self._save_homework()
         return hw
 
     def complete_homework(self, homework_id: str) -> bool:
         """Uy vazifasini bajarilgan deb belgilash."""
-        for hw in self._homework:
-            if hw.id == homework_id:
-                hw.status = TaskStatus.COMPLETED
-                self._save_homework()
-                return True
-        return False
+        hw = self._hw_index.by_id.get(homework_id)
+        if hw is None:
+            return False
+        self._hw_index.set_status(hw, TaskStatus.COMPLETED)
+        self._save_homework()
+        return True
 
     def get_pending_homework(self) -> list[Homework]:
         """Bajarilmagan uy vazifalari ro'yxati."""
-        return [
-            hw for hw in self._homework if hw.status != TaskStatus.COMPLETED
-        ]
+        return self._hw_index.pending()
 
     def get_homework_by_subject(self, subject: str) -> list[Homework]:
         """Ma'lum fan bo'yicha uy vazifalari."""
-        return [hw for hw in self._homework if hw.subject.lower() == subject.lower()]
+        return self._hw_index.with_subject(subject)
 
     def get_overdue_homework(self) -> list[Homework]:
         """Muddati o'tgan uy vazifalari."""
-        today = self._today_str()
-        return [
-            hw
-            for hw in self._homework
-            if hw.deadline and hw.deadline < today and hw.status != TaskStatus.COMPLETED
-        ]
+        return self._hw_index.due_before(today_epoch_day())
 
     def get_due_today(self) -> list[Homework]:
         """Bugun muddati tugaydigan vazifalar."""
-        today = self._today_str()
-        return [
-            hw
-            for hw in self._homework
-            if hw.deadline == today and hw.status != TaskStatus.COMPLETED
-        ]
+        today = today_epoch_day()
+        return self._hw_index.due_between(today, today + 1)
 
     def get_due_tomorrow(self) -> list[Homework]:
         """Ertaga muddati tugaydigan vazifalar."""
-        tomorrow = self._tomorrow_str()
-        return [
-            hw
-            for hw in self._homework
-            if hw.deadline == tomorrow and hw.status != TaskStatus.COMPLETED
-        ]
+        tomorrow = today_epoch_day() + 1
+        return self._hw_index.due_between(tomorrow, tomorrow + 1)
 
     # === General Tasks ===
 
@@ -116,6 +133,7 @@ class HomeworkManager:
         deadline: str = "",
         priority: str = "medium",
         category: str = "general",
+        estimated_minutes: int = 0,
     ) -> Task:
         """Yangi vazifa qo'shish."""
         task = Task(
@@ -124,23 +142,25 @@ class HomeworkManager:
             deadline=deadline,
             priority=TaskPriority(priority.lower()),
             category=category,
+            estimated_minutes=estimated_minutes,
         )
         self._tasks.append(task)
+        self._task_index.add(task)
         self._save_tasks()
         return task
 
     def complete_task(self, task_id: str) -> bool:
         """Vazifani bajarilgan deb belgilash."""
-        for task in self._tasks:
-            if task.id == task_id:
-                task.status = TaskStatus.COMPLETED
-                self._save_tasks()
-                return True
-        return False
+        task = self._task_index.by_id.get(task_id)
+        if task is None:
+            return False
+        self._task_index.set_status(task, TaskStatus.COMPLETED)
+        self._save_tasks()
+        return True
 
     def get_pending_tasks(self) -> list[Task]:
         """Bajarilmagan vazifalar."""
-        return [t for t in self._tasks if t.status != TaskStatus.COMPLETED]
+        return self._task_index.pending()
 
     def get_all_pending(self) -> list[dict]:
         """Barcha bajarilmagan homework + tasks, priority bo'yicha tartiblangan.
@@ -148,51 +168,53 @@ class HomeworkManager:
         Returns:
             [{"type": "homework"|"task", "item": ..., "priority_score": int}]
         """
+        # Ustuvorlik bo'yicha indekslangan — saralash kerak emas (bir xil
+        # ustuvorlikda avval homework, keyin task, qo'shilish tartibida)
+        hw_buckets = dict(self._hw_index.pending_by_priority())
+        task_buckets = dict(self._task_index.pending_by_priority())
         combined: list[dict] = []
-        for hw in self.get_pending_homework():
-            combined.append(
-                {
-                    "type": "homework",
-                    "item": hw,
-                    "priority_score": _PRIORITY_SCORE.get(hw.priority, 2),
-                }
-            )
-        for task in self.get_pending_tasks():
-            combined.append(
-                {
-                    "type": "task",
-                    "item": task,
-                    "priority_score": _PRIORITY_SCORE.get(task.priority, 2),
-                }
-            )
-        combined.sort(key=lambda x: x["priority_score"], reverse=True)
+        for priority, score in _PRIORITY_SCORE.items():
+            for hw in hw_buckets.get(priority, ()):
+                combined.append({"type": "homework", "item": hw, "priority_score": score})
+            for task in task_buckets.get(priority, ()):
+                combined.append({"type": "task", "item": task, "priority_score": score})
         return combined
 
     def find_homework_by_prefix(self, id_prefix: str) -> Optional[Homework]:
-        """ID prefiksi bo'yicha uy vazifasini topish."""
-        for hw in self._homework:
-            if hw.id.startswith(id_prefix):
-                return hw
-        return None
+        """ID prefiksi bo'yicha uy vazifasini topish.
+
+        Raises:
+            AmbiguousPrefixError: Prefiks bir nechta uy vazifasiga mos kelsa.
+        """
+        return self._hw_index.find_by_prefix(id_prefix)
 
     def find_task_by_prefix(self, id_prefix: str) -> Optional[Task]:
-        """ID prefiksi bo'yicha vazifani topish."""
-        for task in self._tasks:
-            if task.id.startswith(id_prefix):
-                return task
-        return None
+        """ID prefiksi bo'yicha vazifani topish.
+
+        Raises:
+            AmbiguousPrefixError: Prefiks bir nechta vazifaga mos kelsa.
+        """
+        return self._task_index.find_by_prefix(id_prefix)
+
+    def short_homework_id(self, homework_id: str) -> str:
+        """Jadvallar uchun uy vazifasi ID sining eng qisqa yagona prefiksi."""
+        return self._hw_index.ids.short_id(homework_id)
+
+    def short_task_id(self, task_id: str) -> str:
+        """Jadvallar uchun vazifa ID sining eng qisqa yagona prefiksi."""
+        return self._task_index.ids.short_id(task_id)
 
     # === Statistika ===
 
     def get_stats(self) -> dict:
         """Statistika ma'lumotlarini qaytarish."""
-        total_hw = len(self._homework)
-        completed_hw = sum(1 for h in self._homework if h.status == TaskStatus.COMPLETED)
+        total_hw = len(self._hw_index)
+        completed_hw = self._hw_index.completed_count
         pending_hw = total_hw - completed_hw
-        overdue_hw = len(self.get_overdue_homework())
+        overdue_hw = self._hw_index.count_due_before(today_epoch_day())
 
-        total_tasks = len(self._tasks)
-        completed_tasks = sum(1 for t in self._tasks if t.status == TaskStatus.COMPLETED)
+        total_tasks = len(self._task_index)
+        completed_tasks = self._task_index.completed_count
 
         total = total_hw + total_tasks
         completed_total = completed_hw + completed_tasks
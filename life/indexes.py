@@ -0,0 +1,222 @@
+from bisect import bisect_left, insort
+from os.path import commonprefix
+from typing import Iterable, Iterator, Optional
+
+from life.models import TaskPriority, TaskStatus
+
+# Ustuvorlik tartibi: yuqoridan pastga
+_PRIORITY_ORDER = (
+    TaskPriority.URGENT,
+    TaskPriority.HIGH,
+    TaskPriority.MEDIUM,
+    TaskPriority.LOW,
+)
+
+
+_SHORT_ID_MIN_LENGTH = 4  # jadvallarda ko'rsatiladigan eng qisqa ID uzunligi
+_AMBIGUOUS_SHOW = 5  # xato xabarida ko'rsatiladigan nomzodlar soni
+
+
+class AmbiguousPrefixError(LookupError):
+    """ID prefiksi bir nechta yozuvga mos keladi."""
+
+    def __init__(self, prefix: str, matches: list[str]):
+        self.prefix = prefix
+        self.matches = matches
+        shown = ", ".join(m[: len(prefix) + 4] for m in matches[:_AMBIGUOUS_SHOW])
+        more = "..." if len(matches) > _AMBIGUOUS_SHOW else ""
+        super().__init__(
+            f"'{prefix}' prefiksi bir nechta yozuvga mos keladi ({shown}{more}). "
+            f"Uzunroq ID kiriting."
+        )
+
+
+class PrefixIndex:
+    """Tartiblangan ID massivi ustidagi prefiks qidiruvi (bisect, O(log n))."""
+
+    def __init__(self, ids: Iterable[str] = ()):
+        self._ids: list[str] = sorted(set(ids))
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, item_id: str) -> None:
+        i = bisect_left(self._ids, item_id)
+        if i == len(self._ids) or self._ids[i] != item_id:
+            self._ids.insert(i, item_id)
+
+    def remove(self, item_id: str) -> None:
+        i = bisect_left(self._ids, item_id)
+        if i < len(self._ids) and self._ids[i] == item_id:
+            del self._ids[i]
+
+    def matches(self, prefix: str, limit: Optional[int] = None) -> list[str]:
+        """Prefiksga mos ID lar (tartiblangan, ko'pi bilan ``limit`` ta)."""
+        ids = self._ids
+        i = bisect_left(ids, prefix)
+        result: list[str] = []
+        while i < len(ids) and ids[i].startswith(prefix):
+            result.append(ids[i])
+            if limit is not None and len(result) >= limit:
+                break
+            i += 1
+        return result
+
+    def find(self, prefix: str) -> Optional[str]:
+        """Prefiksga yagona mos ID.
+
+        Returns:
+            ID yoki None (mos kelmasa).
+
+        Raises:
+            AmbiguousPrefixError: Prefiks bir nechta ID ga mos kelsa.
+        """
+        found = self.matches(prefix, limit=2)
+        if not found:
+            return None
+        if len(found) == 1 or found[0] == prefix:
+            return found[0]
+        raise AmbiguousPrefixError(prefix, self.matches(prefix, limit=_AMBIGUOUS_SHOW + 1))
+
+    def short_id(self, item_id: str, min_length: int = _SHORT_ID_MIN_LENGTH) -> str:
+        """ID ning eng qisqa yagona prefiksi (kamida ``min_length`` belgi)."""
+        ids = self._ids
+        i = bisect_left(ids, item_id)
+        common = 0
+        # Tartiblangan massivda eng uzun umumiy prefiks faqat qo'shnilar bilan bo'ladi
+        for j in (i - 1, i + 1 if i < len(ids) and ids[i] == item_id else i):
+            if 0 <= j < len(ids) and ids[j] != item_id:
+                common = max(common, len(commonprefix([ids[j], item_id])))
+        return item_id[: max(min_length, common + 1)]
+
+
+class RecordIndex:
+    """Homework yoki Task ro'yxati uchun ikkilamchi indekslar.
+
+    - ``id`` → yozuv
+    - status → yozuvlar (qo'shilish tartibida)
+    - bajarilmagan yozuvlar: umumiy va ustuvorlik bo'yicha (qo'shilish tartibida)
+    - bajarilmagan yozuvlarning muddat bo'yicha tartiblangan ro'yxati
+    - fan → yozuvlar (``subject_attr`` berilsa)
+    - ID prefikslari (``PrefixIndex``)
+    - statistika hisoblagichlari
+
+    Ustuvorlik darajalari to'rtta bo'lgani uchun "uyum" o'rniga har bir daraja
+    uchun tartiblangan lug'at ishlatiladi: eng yuqori k ta yozuv O(k) da,
+    o'chirish O(1) da. Har bir o'zgarish O(log n) (muddat ro'yxatida bisect).
+    """
+
+    def __init__(self, items: Iterable = (), subject_attr: Optional[str] = None):
+        self.subject_attr = subject_attr
+        self.by_id: dict = {}
+        self.ids = PrefixIndex()
+        self.by_status: dict[TaskStatus, dict] = {status: {} for status in TaskStatus}
+        self.by_subject: dict[str, dict] = {}
+        self._pending: dict = {}
+        self._pending_by_priority: dict[TaskPriority, dict] = {p: {} for p in _PRIORITY_ORDER}
+        self._deadlines: list[tuple[int, int, str]] = []  # (epoch kun, tartib, id)
+        self._seq: dict[str, int] = {}
+        self._next_seq = 0
+        self.completed_count = 0
+        # Ommaviy yuklash: tartiblangan ro'yxatlar oxirida bir marta saralanadi
+        for item in items:
+            self.add(item, _bulk=True)
+        self.ids = PrefixIndex(self.by_id)
+        self._deadlines.sort()
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    # === O'zgarishlar ===
+
+    def add(self, item, _bulk: bool = False) -> None:
+        """Yangi yozuvni barcha indekslarga qo'shish."""
+        self.by_id[item.id] = item
+        if not _bulk:
+            self.ids.add(item.id)
+        self._seq[item.id] = self._next_seq
+        self._next_seq += 1
+        self.by_status[item.status][item.id] = item
+        if self.subject_attr:
+            key = getattr(item, self.subject_attr).lower()
+            self.by_subject.setdefault(key, {})[item.id] = item
+        if item.status == TaskStatus.COMPLETED:
+            self.completed_count += 1
+        else:
+            self._add_pending(item, _bulk)
+
+    def set_status(self, item, status: TaskStatus) -> None:
+        """Yozuv statusini o'zgartirish va indekslarni yangilash."""
+        old = item.status
+        item.status = status
+        if old == status:
+            return
+        del self.by_status[old][item.id]
+        self.by_status[status][item.id] = item
+        if old == TaskStatus.COMPLETED:
+            self.completed_count -= 1
+            self._add_pending(item)
+        elif status == TaskStatus.COMPLETED:
+            self.completed_count += 1
+            self._remove_pending(item)
+
+    def _add_pending(self, item, _bulk: bool = False) -> None:
+        self._pending[item.id] = item
+        self._pending_by_priority[item.priority][item.id] = item
+        day = getattr(item, "deadline_day", None)
+        if day is not None:
+            key = (day, self._seq[item.id], item.id)
+            if _bulk:
+                self._deadlines.append(key)
+            else:
+                insort(self._deadlines, key)
+
+    def _remove_pending(self, item) -> None:
+        del self._pending[item.id]
+        del self._pending_by_priority[item.priority][item.id]
+        day = getattr(item, "deadline_day", None)
+        if day is not None:
+            key = (day, self._seq[item.id], item.id)
+            i = bisect_left(self._deadlines, key)
+            if i < len(self._deadlines) and self._deadlines[i] == key:
+                del self._deadlines[i]
+
+    # === So'rovlar ===
+
+    def pending(self) -> list:
+        """Bajarilmagan yozuvlar (qo'shilish tartibida)."""
+        return list(self._pending.values())
+
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def pending_by_priority(self) -> Iterator[tuple[TaskPriority, list]]:
+        """(ustuvorlik, yozuvlar) — yuqori ustuvorlikdan boshlab."""
+        for priority in _PRIORITY_ORDER:
+            bucket = self._pending_by_priority[priority]
+            if bucket:
+                yield priority, list(bucket.values())
+
+    def due_between(self, start_day: int, end_day: int) -> list:
+        """Muddati [start_day, end_day) oralig'idagi bajarilmagan yozuvlar (muddat tartibida)."""
+        lo = bisect_left(self._deadlines, (start_day,))
+        hi = bisect_left(self._deadlines, (end_day,), lo)
+        return [self.by_id[item_id] for _, _, item_id in self._deadlines[lo:hi]]
+
+    def due_before(self, day: int) -> list:
+        """Muddati ``day`` dan oldin bo'lgan bajarilmagan yozuvlar (muddat tartibida)."""
+        hi = bisect_left(self._deadlines, (day,))
+        return [self.by_id[item_id] for _, _, item_id in self._deadlines[:hi]]
+
+    def count_due_before(self, day: int) -> int:
+        """Muddati ``day`` dan oldin bo'lgan bajarilmagan yozuvlar soni (O(log n))."""
+        return bisect_left(self._deadlines, (day,))
+
+    def find_by_prefix(self, prefix: str):
+        """ID prefiksi bo'yicha yozuv (yo'q bo'lsa None; noaniq bo'lsa AmbiguousPrefixError)."""
+        item_id = self.ids.find(prefix)
+        return self.by_id[item_id] if item_id is not None else None
+
+    def with_subject(self, subject: str) -> list:
+        """Fan bo'yicha barcha yozuvlar (qo'shilish tartibida)."""
+        return list(self.by_subject.get(subject.lower(), {}).values())
@@ -1,7 +1,68 @@
-from pydantic import BaseModel, Field
 from enum import Enum
+from typing import Any, Callable, ClassVar, Optional
 from uuid import uuid4
 
+from pydantic import BaseModel, Field, PrivateAttr
+
+from life.dates import (  # noqa: F401 — avvalgi import yo'llari uchun
+    clock_minutes,
+    date_to_epoch_day,
+    deadline_minutes,
+    epoch_day,
+    today_epoch_day,
+)
+
+
+class _IndexedModel(BaseModel):
+    """Satr maydonlaridan hisoblangan butun sonli maydonlar va tezkor yuklash.
+
+    ``_DERIVED`` — {satr maydoni: ((xususiy atribut, funksiya), ...)}.
+    Qiymatlar yuklashda bir marta hisoblanadi va maydon o'zgarganda qayta
+    hisoblanadi; saqlash (model_dump) uchun satr ko'rinishi o'zgarmaydi.
+
+    Diskdagi yozuvlar ``from_storage`` orqali quriladi, ``to_storage`` esa
+    model_dump o'rniga yengil nusxa qaytaradi.
+    """
+
+    _DERIVED: ClassVar[dict[str, tuple[tuple[str, Callable[[str], Any]], ...]]] = {}
+
+    def model_post_init(self, __context: Any) -> None:
+        private = self.__pydantic_private__
+        values = self.__dict__
+        for field, targets in type(self)._DERIVED.items():
+            value = values[field]
+            for attr, func in targets:
+                private[attr] = func(value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        targets = self._DERIVED.get(name)
+        if targets:
+            for attr, func in targets:
+                super().__setattr__(attr, func(value))
+
+    def model_copy(self, *, update: Optional[dict[str, Any]] = None, deep: bool = False):
+        copy = super().model_copy(update=update, deep=deep)
+        if update:
+            copy.model_post_init(None)
+        return copy
+
+    @classmethod
+    def from_storage(cls, data: dict):
+        """Diskdan o'qilgan yozuvdan model qurish.
+
+        Yozuv to'liq validatsiyadan o'tadi (``model_validate``, pydantic-core).
+        Validatsiyasiz yo'llar — ``model_construct`` va ``model_copy(update=...)``
+        — Python da ishlaydi va bu yerda sekinroq chiqdi (yozuv boshiga ~12 va
+        ~10 µs, ``model_validate`` ~8 µs). Hisoblangan maydonlarni
+        ``model_post_init`` to'ldiradi.
+        """
+        return cls.model_validate(data)
+
+    def to_storage(self) -> dict:
+        """Saqlash uchun lug'at (enum'lar str bo'lgani uchun JSON ga to'g'ridan-to'g'ri yoziladi)."""
+        return dict(self.__dict__)
+
 
 class DayOfWeek(str, Enum):
     MONDAY = "monday"
@@ -34,9 +95,19 @@ class TaskStatus(str, Enum):
     OVERDUE = "overdue"
 
 
-class ClassSchedule(BaseModel):
+def _minutes_or_zero(value: str) -> int:
+    minutes = clock_minutes(value)
+    return minutes if minutes is not None else 0
+
+
+class ClassSchedule(_IndexedModel):
     """Dars jadvali modeli."""
 
+    _DERIVED: ClassVar[dict[str, tuple[tuple[str, Callable[[str], Any]], ...]]] = {
+        "start_time": (("_start_minutes", _minutes_or_zero),),
+        "end_time": (("_end_minutes", _minutes_or_zero),),
+    }
+
     id: str = Field(default_factory=lambda: str(uuid4()))
     name: str  # Fan nomi: "Matematika", "Fizika"
     day: DayOfWeek  # Hafta kuni
@@ -47,10 +118,27 @@ class ClassSchedule(BaseModel):
     notes: str = ""  # Qo'shimcha
     status: ClassStatus = ClassStatus.UPCOMING
 
+    _start_minutes: int = PrivateAttr(default=0)
+    _end_minutes: int = PrivateAttr(default=0)
+
+    @property
+    def start_minutes(self) -> int:
+        """Boshlanish vaqti, yarim tundan beri daqiqalar (noto'g'ri bo'lsa 0)."""
+        return self._start_minutes
+
+    @property
+    def end_minutes(self) -> int:
+        """Tugash vaqti, yarim tundan beri daqiqalar (noto'g'ri bo'lsa 0)."""
+        return self._end_minutes
 
-class Homework(BaseModel):
+
+class Homework(_IndexedModel):
     """Uy vazifasi modeli."""
 
+    _DERIVED: ClassVar[dict[str, tuple[tuple[str, Callable[[str], Any]], ...]]] = {
+        "deadline": (("_deadline_day", epoch_day), ("_deadline_minutes", deadline_minutes)),
+    }
+
     id: str = Field(default_factory=lambda: str(uuid4()))
     subject: str  # Fan nomi
     description: str  # Vazifa tavsifi
@@ -59,11 +147,29 @@ class Homework(BaseModel):
     priority: TaskPriority = TaskPriority.MEDIUM
     status: TaskStatus = TaskStatus.PENDING
     notes: str = ""
+    estimated_minutes: int = 0  # Taxminiy davomiylik (0 — avtomatik baho)
+
+    _deadline_day: Optional[int] = PrivateAttr(default=None)
+    _deadline_minutes: Optional[int] = PrivateAttr(default=None)
 
+    @property
+    def deadline_day(self) -> Optional[int]:
+        """Muddat kuni (epoch kun); muddat yo'q bo'lsa None."""
+        return self._deadline_day
 
-class Task(BaseModel):
+    @property
+    def deadline_minutes(self) -> Optional[int]:
+        """Muddat vaqti (yarim tundan beri daqiqalar); vaqt yo'q bo'lsa None."""
+        return self._deadline_minutes
+
+
+class Task(_IndexedModel):
     """Vazifa modeli."""
 
+    _DERIVED: ClassVar[dict[str, tuple[tuple[str, Callable[[str], Any]], ...]]] = {
+        "deadline": (("_deadline_day", epoch_day), ("_deadline_minutes", deadline_minutes)),
+    }
+
     id: str = Field(default_factory=lambda: str(uuid4()))
     title: str
     description: str = ""
@@ -71,6 +177,20 @@ class Task(BaseModel):
     priority: TaskPriority = TaskPriority.MEDIUM
     status: TaskStatus = TaskStatus.PENDING
     category: str = "general"  # "study", "personal", "project"
+    estimated_minutes: int = 0  # Taxminiy davomiylik (0 — avtomatik baho)
+
+    _deadline_day: Optional[int] = PrivateAttr(default=None)
+    _deadline_minutes: Optional[int] = PrivateAttr(default=None)
+
+    @property
+    def deadline_day(self) -> Optional[int]:
+        """Muddat kuni (epoch kun); muddat yo'q bo'lsa None."""
+        return self._deadline_day
+
+    @property
+    def deadline_minutes(self) -> Optional[int]:
+        """Muddat vaqti (yarim tundan beri daqiqalar); vaqt yo'q bo'lsa None."""
+        return self._deadline_minutes
 
 
 class DailyPlan(BaseModel):
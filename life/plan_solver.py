@@ -0,0 +1,513 @@
+from bisect import bisect_right
+from time import perf_counter
+from typing import Optional
+
+_STEP = 5  # daqiqa: davomiyliklar va oynalar shu qadamga yaxlitlanadi
+_BREAK_EVERY = 90  # shuncha daqiqa uzluksiz ishdan keyin tanaffus
+_BREAK_MINUTES = 15
+_TRAVEL_MINUTES = 10  # boshqa xona/binoga o'tish vaqti
+_MIN_WINDOW = 15  # bundan qisqa bo'sh vaqt rejaga kirmaydi
+_TIME_BUDGET_MS = 30.0  # qidiruv vaqti chegarasi (tozalash va joylash bilan < 50 ms)
+_MAX_SEARCH_ITEMS = 400  # qidiruv chuqurligi (rekursiya) chegarasi
+
+# Davomiylik va kuch bahosi (yozuvda estimated_minutes berilmagan bo'lsa)
+_HOMEWORK_MINUTES = 45
+_HOMEWORK_EFFORT = 2
+_TASK_MINUTES = {"study": 45, "project": 60}
+_TASK_EFFORT = {"study": 2, "project": 3}
+_DEFAULT_TASK_MINUTES = 30
+_DEFAULT_EFFORT = 1
+_ENERGY_PER_LEVEL = 120  # energiya darajasining bir birligi — "kuch-daqiqa"
+
+# Shoshilinchlik koeffitsienti (x10): (qolgan kunlar <=, koeffitsient)
+_URGENCY = ((0, 25), (1, 20), (3, 15))
+_OVERDUE_URGENCY = 30
+_NO_DEADLINE_URGENCY = 10
+
+
+def _round_up(minutes: int) -> int:
+    return -(-minutes // _STEP) * _STEP
+
+
+def _breaks_needed(work: int) -> int:
+    """``work`` daqiqa ish orasida kerak bo'ladigan tanaffuslar soni."""
+    return (work - 1) // _BREAK_EVERY if work > 0 else 0
+
+
+def work_capacity(length: int) -> int:
+    """Uzunligi ``length`` bo'lgan oynaga sig'adigan ish daqiqalari.
+
+    Tanaffuslar ishlar orasiga qo'yiladi: har bir tanaffusdan oldin kamida
+    ``_BREAK_EVERY`` daqiqa ish bo'ladi, demak W daqiqa ish uchun
+    (W - 1) // _BREAK_EVERY ta tanaffus yetarli.
+    """
+    work = length - length % _STEP
+    while work > 0 and work + _BREAK_MINUTES * _breaks_needed(work) > length:
+        work -= _STEP
+    return max(work, 0)
+
+
+class Window:
+    """Darslar orasidagi bo'sh vaqt oynasi (yarim tundan beri daqiqalar)."""
+
+    __slots__ = ("start", "end", "capacity")
+
+    def __init__(self, start: int, end: int):
+        self.start = start
+        self.end = end
+        self.capacity = work_capacity(end - start)
+
+    def __repr__(self) -> str:
+        return f"Window({self.start}, {self.end}, capacity={self.capacity})"
+
+
+def free_windows(
+    classes: list[tuple[int, int, str]],
+    day_start: int,
+    day_end: int,
+    travel: int = _TRAVEL_MINUTES,
+) -> list[Window]:
+    """Kun davomidagi bo'sh oynalar.
+
+    Args:
+        classes: [(boshlanish, tugash, joy)] — daqiqalar va xona/bino.
+        day_start: Rejalash boshlanadigan vaqt (uyg'onish yoki hozir).
+        day_end: Kun oxiri.
+        travel: Joy o'zgarganda yo'lga ketadigan vaqt — dars oldidan
+            (boshqa joyga o'tish) va oxirgi darsdan keyin (uyga qaytish)
+            oynadan ayiriladi.
+
+    Returns:
+        Tanaffuslarni hisobga olgan holda kamida bitta ish qadami sig'adigan
+        oynalar, vaqt tartibida.
+    """
+    windows: list[Window] = []
+    cursor, place = day_start, ""  # "" — uy yoki joy noma'lum
+
+    def add(start: int, end: int) -> None:
+        start, end = _round_up(start), min(end, day_end)
+        if end - start >= _MIN_WINDOW:
+            window = Window(start, end)
+            if window.capacity >= _STEP:
+                windows.append(window)
+
+    for start, end, location in sorted(classes):
+        if end <= cursor:
+            continue
+        leave = travel if location and location != place else 0
+        add(cursor, start - leave)
+        cursor = max(cursor, end)
+        if location:
+            place = location
+    add(cursor + (travel if place else 0), day_end)
+    return windows
+
+
+class PlanItem:
+    """Rejaga kiritiladigan uy vazifasi yoki vazifa.
+
+    ``value`` — ustuvorlik x shoshilinchlik, ``energy`` — davomiylik x kuch
+    (1-3), ``deadline`` — bugun shu daqiqagacha tugashi kerak (yoki None).
+    """
+
+    __slots__ = ("key", "kind", "label", "minutes", "value", "effort", "energy",
+                 "deadline", "record", "windows")
+
+    def __init__(
+        self,
+        key: str,
+        kind: str,
+        label: str,
+        minutes: int,
+        value: int,
+        effort: int = _DEFAULT_EFFORT,
+        deadline: Optional[int] = None,
+        record=None,
+    ):
+        self.key = key
+        self.kind = kind
+        self.label = label
+        self.minutes = _round_up(max(minutes, _STEP))
+        self.value = value
+        self.effort = effort
+        self.energy = self.minutes * effort
+        self.deadline = deadline
+        self.record = record
+        self.windows: tuple[int, ...] = ()
+
+    def __repr__(self) -> str:
+        return f"PlanItem({self.label!r}, {self.minutes}m, value={self.value})"
+
+    @classmethod
+    def from_pending(cls, entry: dict, today: int, now: int) -> "PlanItem":
+        """``HomeworkManager.get_all_pending()`` elementidan.
+
+        Args:
+            entry: {"type", "item", "priority_score"}.
+            today: Bugungi epoch kun.
+            now: Hozirgi vaqt (daqiqalar) — bugungi muddati o'tganlar
+                kechikkan hisoblanadi.
+        """
+        record = entry["item"]
+        if entry["type"] == "homework":
+            label = f"{record.subject} uy vazifasi"
+            minutes, effort = _HOMEWORK_MINUTES, _HOMEWORK_EFFORT
+        else:
+            label = record.title
+            minutes = _TASK_MINUTES.get(record.category, _DEFAULT_TASK_MINUTES)
+            effort = _TASK_EFFORT.get(record.category, _DEFAULT_EFFORT)
+        if record.estimated_minutes > 0:
+            minutes = record.estimated_minutes
+
+        deadline = None
+        day = record.deadline_day
+        if day is None:
+            urgency = _NO_DEADLINE_URGENCY
+        elif day < today:
+            urgency = _OVERDUE_URGENCY
+        else:
+            left = day - today
+            urgency = next((u for limit, u in _URGENCY if left <= limit), _NO_DEADLINE_URGENCY)
+            if left == 0 and record.deadline_minutes is not None:
+                if record.deadline_minutes > now:
+                    deadline = record.deadline_minutes
+                else:
+                    urgency = _OVERDUE_URGENCY
+        return cls(
+            key=record.id,
+            kind=entry["type"],
+            label=label,
+            minutes=minutes,
+            value=entry["priority_score"] * urgency,
+            effort=effort,
+            deadline=deadline,
+            record=record,
+        )
+
+
+class SolvedPlan:
+    """Rejalashtiruvchi natijasi."""
+
+    __slots__ = ("blocks", "breaks", "skipped", "value", "optimal", "elapsed_ms")
+
+    def __init__(self, blocks, breaks, skipped, value, optimal, elapsed_ms):
+        self.blocks: list[tuple[int, int, PlanItem]] = blocks
+        self.breaks: list[tuple[int, int]] = breaks
+        self.skipped: list[PlanItem] = skipped
+        self.value: int = value
+        self.optimal: bool = optimal
+        self.elapsed_ms: float = elapsed_ms
+
+
+def _fits(window: Window, used: int, deadline: Optional[int]) -> bool:
+    """Oynada ``used`` daqiqa ish bo'lganda element muddatga ulguradimi.
+
+    Eng yomon holat: element oynadagi barcha ishlar va tanaffuslardan keyin.
+    Joylashtirishda muddatli elementlar muddat tartibida birinchi turadi,
+    shuning uchun bu baho xavfsiz.
+    """
+    if deadline is None:
+        return True
+    return window.start + used + _BREAK_MINUTES * _breaks_needed(used) <= deadline
+
+
+def _prune_dominated(items: list[PlanItem], windows: list[Window]) -> list[PlanItem]:
+    """Bir-birining o'rnini bosa oladigan elementlardan faqat sig'adiganlarini qoldirish.
+
+    Davomiyligi, kuchi, muddati va mos oynalari bir xil elementlar faqat
+    qiymati bilan farq qiladi — optimal yechim ulardan eng qimmatlarini oladi,
+    va oynalarga jami ``sum(capacity // minutes)`` tadan ortig'i sig'maydi.
+    """
+    groups: dict[tuple, list[PlanItem]] = {}
+    for item in items:
+        key = (item.minutes, item.effort, item.deadline, item.windows)
+        groups.setdefault(key, []).append(item)
+    kept: list[PlanItem] = []
+    for (minutes, _, _, eligible), group in groups.items():
+        room = sum(windows[w].capacity // minutes for w in eligible)
+        if len(group) > room:
+            group = sorted(group, key=lambda it: -it.value)[:room]
+        kept.extend(group)
+    return kept
+
+
+def _knapsack(pool: list[PlanItem], capacity: int) -> list[int]:
+    """0/1 rukzak (DP, ``_STEP`` birliklarida): tanlangan ``pool`` indekslari."""
+    cap = capacity // _STEP
+    # Bir xil davomiylikdagilardan ko'pi bilan cap // units tasi sig'adi
+    by_units: dict[int, list[int]] = {}
+    for i, item in enumerate(pool):
+        by_units.setdefault(item.minutes // _STEP, []).append(i)
+    candidates: list[int] = []
+    for units, indexes in by_units.items():
+        indexes.sort(key=lambda i: -pool[i].value)
+        candidates.extend(indexes[: cap // units])
+
+    best = [0] * (cap + 1)
+    keep: list[bytearray] = []
+    for i in candidates:
+        units, value = pool[i].minutes // _STEP, pool[i].value
+        row = bytearray(cap + 1)
+        for c in range(cap, units - 1, -1):
+            option = best[c - units] + value
+            if option > best[c]:
+                best[c] = option
+                row[c] = 1
+        keep.append(row)
+
+    chosen: list[int] = []
+    c = cap
+    for k in range(len(candidates) - 1, -1, -1):
+        if keep[k][c]:
+            i = candidates[k]
+            chosen.append(i)
+            c -= pool[i].minutes // _STEP
+    return chosen
+
+
+def _initial_assignment(
+    items: list[PlanItem], windows: list[Window], energy: Optional[int]
+) -> list[int]:
+    """Boshlang'ich yechim: har bir oyna uchun alohida rukzak DP.
+
+    Oynalar vaqt tartibida to'ldiriladi; muddatli element faqat muddatigacha
+    to'liq tugaydigan oynaga kiradi. Energiya chegarasidan oshsa eng kam
+    samarali elementlar olib tashlanadi va bo'shagan joy qolganlar bilan
+    to'ldiriladi.
+    """
+    assign = [-1] * len(items)
+    for w, window in enumerate(windows):
+        pool = [
+            i for i, item in enumerate(items)
+            if assign[i] < 0 and w in item.windows
+            and (item.deadline is None or window.end <= item.deadline)
+        ]
+        for k in _knapsack([items[i] for i in pool], window.capacity):
+            assign[pool[k]] = w
+
+    if energy is not None:
+        chosen = sorted(
+            (i for i in range(len(items)) if assign[i] >= 0),
+            key=lambda i: items[i].value / items[i].energy,
+        )
+        spent = sum(items[i].energy for i in chosen)
+        for i in chosen:
+            if spent <= energy:
+                break
+            assign[i] = -1
+            spent -= items[i].energy
+        used = [0] * len(windows)
+        for i, w in enumerate(assign):
+            if w >= 0:
+                used[w] += items[i].minutes
+        for i, item in enumerate(items):
+            if assign[i] >= 0 or spent + item.energy > energy:
+                continue
+            for w in item.windows:
+                after = used[w] + item.minutes
+                if after <= windows[w].capacity and _fits(windows[w], after, item.deadline):
+                    assign[i] = w
+                    used[w] = after
+                    spent += item.energy
+                    break
+    return assign
+
+
+def _surrogate_weight(
+    items: list[PlanItem], windows: list[Window], energy: Optional[int]
+) -> float:
+    """Vaqt va energiya cheklovlarini bitta surrogat cheklovga birlashtirish koeffitsienti.
+
+    Har qanday weight >= 0 uchun "daqiqa + weight * energiya" bo'yicha kasr
+    rukzak haqiqiy yuqori chegara beradi. Energiya yetarli bo'lsa 0 (faqat
+    vaqt), aks holda ikkala resurs bir xil o'lchamga keltiriladi.
+    """
+    if energy is None or sum(item.energy for item in items) <= energy:
+        return 0.0
+    return sum(w.capacity for w in windows) / energy
+
+
+def _branch_and_bound(
+    items: list[PlanItem],
+    windows: list[Window],
+    energy: Optional[int],
+    weight: float,
+    incumbent: list[int],
+    stop: float,
+) -> tuple[list[int], bool]:
+    """Tarmoqlanish va chegaralar: har bir element — mos oynalardan biri yoki tashlab ketish.
+
+    Elementlar surrogat zichlik (qiymat / (daqiqa + weight * energiya)) bo'yicha
+    tartiblangan bo'lishi kerak: yuqori chegara — qolgan umumiy joyga kasr
+    rukzak (prefiks yig'indi va bisect bilan O(log n)). Vaqt chegarasi tugasa
+    topilgan eng yaxshi yechim qaytariladi.
+
+    Returns:
+        (oyna indekslari, optimal isbotlandimi).
+    """
+    n = len(items)
+    caps = [w.capacity for w in windows]
+    left = caps[:]
+    # Chegara uchun surrogat og'irlik: daqiqa + weight * energiya
+    sizes = [item.minutes + weight * item.energy for item in items]
+    prefix_size = [0.0]
+    prefix_value = [0]
+    for size, item in zip(sizes, items):
+        prefix_size.append(prefix_size[-1] + size)
+        prefix_value.append(prefix_value[-1] + item.value)
+
+    best = incumbent[:]
+    best_value = sum(items[i].value for i in range(n) if incumbent[i] >= 0)
+    assign = [-1] * n
+    nodes = 0
+    timed_out = False
+    # Energiya cheklovi yo'q bo'lsa — hech qachon tugamaydigan chekli zaxira
+    energy_start = energy if energy is not None else sum(item.energy for item in items)
+    # Holat kaliti bitta butun son: [oynalardagi bo'sh joy | energiya | indeks]
+    # bit maydonlari. Kortej kalitlar har tugunda GC kuzatadigan obyekt yaratib,
+    # to'liq yig'ishlar vaqt chegarasidan 20-30 ms oshirib yuborardi
+    index_bits = n.bit_length()
+    energy_bits = energy_start.bit_length()
+    cap_bits = max(caps, default=0).bit_length()
+    shifts = [index_bits + energy_bits + w * cap_bits for w in range(len(windows))]
+    seen: dict[int, int] = {}
+
+    def bound(i: int, value: int, room: int, energy_left: int) -> float:
+        target = prefix_size[i] + room + (weight * energy_left if weight else 0.0)
+        k = bisect_right(prefix_size, target) - 1
+        total = value + prefix_value[k] - prefix_value[i]
+        if k < n:
+            total += items[k].value * (target - prefix_size[k]) / sizes[k]
+        return total
+
+    def search(i: int, value: int, room: int, energy_left: int, packed: int) -> None:
+        nonlocal best, best_value, nodes, timed_out
+        if value > best_value:
+            best, best_value = assign[:], value
+        if i == n or room <= 0:
+            return
+        nodes += 1
+        if not nodes & 255 and perf_counter() > stop:
+            timed_out = True
+        # Qiymatlar butun son: kasr chegaraning butun qismi ham chegara
+        if timed_out or int(bound(i, value, room, energy_left)) <= best_value:
+            return
+        # Bir xil holatga (i, oynalardagi bo'sh joy, energiya) kamroq qiymat
+        # bilan qaytish foydasiz — oynalar almashinuvi simmetriyasini kesadi
+        state = packed | energy_left << index_bits | i
+        if seen.get(state, -1) >= value:
+            return
+        seen[state] = value
+        item = items[i]
+        if item.energy <= energy_left:
+            for w in item.windows:
+                free = left[w]
+                if free < item.minutes:
+                    continue
+                if not _fits(windows[w], caps[w] - free + item.minutes, item.deadline):
+                    continue
+                left[w] = free - item.minutes
+                assign[i] = w
+                search(
+                    i + 1,
+                    value + item.value,
+                    room - item.minutes,
+                    energy_left - item.energy,
+                    packed - (item.minutes << shifts[w]),
+                )
+                left[w] = free
+                assign[i] = -1
+                if timed_out:
+                    return
+        search(i + 1, value, room, energy_left, packed)
+
+    packed = sum(cap << shift for cap, shift in zip(caps, shifts))
+    search(0, 0, sum(caps), energy_start, packed)
+    return best, not timed_out
+
+
+def _layout(
+    items: list[PlanItem], windows: list[Window], assign: list[int]
+) -> tuple[list[tuple[int, int, PlanItem]], list[tuple[int, int]]]:
+    """Oyna ichida vaqt belgilash: avval muddatlilar (muddat tartibida), keyin og'irlari.
+
+    Har ``_BREAK_EVERY`` daqiqa uzluksiz ishdan keyin keyingi element oldidan
+    tanaffus qo'yiladi — tanaffus hech qachon darsga tushmaydi.
+    """
+    placed: list[list[PlanItem]] = [[] for _ in windows]
+    for i, w in enumerate(assign):
+        if w >= 0:
+            placed[w].append(items[i])
+    blocks: list[tuple[int, int, PlanItem]] = []
+    breaks: list[tuple[int, int]] = []
+    for window, group in zip(windows, placed):
+        group.sort(key=lambda it: (it.deadline is None, it.deadline or 0, -it.effort, -it.value))
+        t, streak = window.start, 0
+        for item in group:
+            if streak >= _BREAK_EVERY:
+                breaks.append((t, t + _BREAK_MINUTES))
+                t += _BREAK_MINUTES
+                streak = 0
+            blocks.append((t, t + item.minutes, item))
+            t += item.minutes
+            streak += item.minutes
+    return blocks, breaks
+
+
+def solve_plan(
+    items: list[PlanItem],
+    windows: list[Window],
+    energy_level: Optional[int] = None,
+    time_budget_ms: float = _TIME_BUDGET_MS,
+) -> SolvedPlan:
+    """Bo'sh oynalarga eng qimmatli elementlar to'plamini joylashtirish.
+
+    Masala — muddat va energiya cheklovli bir nechta rukzak: maqsad
+    joylashtirilgan elementlar qiymatining yig'indisi. Har bir oyna uchun DP
+    boshlang'ich yechim beradi, tarmoqlanish va chegaralar usuli uni vaqt
+    chegarasi ichida yaxshilaydi (kichik masalalarda optimal isbotlanadi).
+
+    Args:
+        items: Rejaga nomzod elementlar.
+        windows: ``free_windows`` natijasi.
+        energy_level: Bugungi energiya (1-5); None — cheklovsiz.
+        time_budget_ms: Umumiy vaqt chegarasi.
+
+    Returns:
+        SolvedPlan — vaqt bloklari, tanaffuslar va sig'magan elementlar.
+    """
+    started = perf_counter()
+    energy = None
+    if energy_level is not None:
+        energy = max(1, min(5, int(energy_level))) * _ENERGY_PER_LEVEL
+
+    for item in items:
+        item.windows = tuple(
+            w for w, window in enumerate(windows)
+            if item.minutes <= window.capacity
+            and (item.deadline is None or window.start + item.minutes <= item.deadline)
+        )
+    candidates = _prune_dominated([it for it in items if it.windows], windows)
+    weight = _surrogate_weight(candidates, windows, energy)
+    candidates.sort(key=lambda it: (-it.value / (it.minutes + weight * it.energy), it.minutes))
+    truncated = len(candidates) > _MAX_SEARCH_ITEMS
+    candidates = candidates[:_MAX_SEARCH_ITEMS]
+
+    assign = _initial_assignment(candidates, windows, energy)
+    assign, proven = _branch_and_bound(
+        candidates, windows, energy, weight, assign, started + time_budget_ms / 1000
+    )
+    blocks, breaks = _layout(candidates, windows, assign)
+
+    scheduled = {id(item) for _, _, item in blocks}
+    skipped = sorted(
+        (it for it in items if id(it) not in scheduled), key=lambda it: -it.value
+    )
+    return SolvedPlan(
+        blocks=blocks,
+        breaks=breaks,
+        skipped=skipped,
+        value=sum(item.value for _, _, item in blocks),
+        optimal=proven and not truncated,
+        elapsed_ms=(perf_counter() - started) * 1000,
+    )
@@ -3,6 +3,15 @@ from datetime import datetime, timedelta
 from life.scheduler import SmartScheduler
 from life.homework import HomeworkManager
 from life.daily_planner import DailyPlanner
+from core.metrics import get_registry
+
+_METRICS = get_registry()
+_REMINDERS_FIRED = _METRICS.counter(
+    "jarvis_reminders_fired_total", "Chiqarilgan eslatmalar", ["type", "priority"]
+)
+_REMINDER_CHECK_SECONDS = _METRICS.histogram(
+    "jarvis_reminder_check_seconds", "Barcha eslatmalarni tekshirish vaqti"
+)
 
 
 class ReminderEngine:
@@ -13,6 +22,12 @@ class ReminderEngine:
         self.homework_mgr = HomeworkManager()
         self.planner = DailyPlanner()
 
+    def reload_if_changed(self) -> bool:
+        """Ichki managerlar fayllari o'zgargan bo'lsa qayta yuklash."""
+        changed = self.scheduler.reload_if_changed()
+        changed = self.homework_mgr.reload_if_changed() or changed
+        return self.planner.reload_if_changed() or changed
+
     def check_all(self) -> list[dict]:
         """Barcha eslatmalarni tekshirish va ro'yxatini qaytarish.
 
@@ -28,11 +43,14 @@ class ReminderEngine:
             }
         """
         reminders: list[dict] = []
-        reminders.extend(self.check_pre_class_alerts())
-        reminders.extend(self.check_post_class_prompts())
-        reminders.extend(self.check_homework_deadlines())
-        reminders.extend(self.check_overdue_tasks())
-        reminders.extend(self.check_study_reminders())
+        with _REMINDER_CHECK_SECONDS.time():
+            reminders.extend(self.check_pre_class_alerts())
+            reminders.extend(self.check_post_class_prompts())
+            reminders.extend(self.check_homework_deadlines())
+            reminders.extend(self.check_overdue_tasks())
+            reminders.extend(self.check_study_reminders())
+        for reminder in reminders:
+            _REMINDERS_FIRED.labels(reminder["type"], reminder["priority"]).inc()
         return reminders
 
     def check_pre_class_alerts(self) -> list[dict]:
@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
+from life.indexes import PrefixIndex
 from life.models import ClassSchedule, DayOfWeek, ClassStatus
 from life.storage import LifeStorage
 
@@ -11,18 +12,31 @@ class SmartScheduler:
     def __init__(self):
         self.storage = LifeStorage()
         self._schedule: list[ClassSchedule] = []
+        self._ids = PrefixIndex()
+        self._stamp: Optional[tuple[int, int]] = None
         self._load_schedule()
 
     # === Jadval Boshqaruvi ===
 
     def _load_schedule(self) -> None:
         """Jadvallarni saqlashdan yuklash."""
+        self._stamp = self.storage.stamp(self.storage.schedule_file)
         data = self.storage.load_schedule()
-        self._schedule = [ClassSchedule(**item) for item in data]
+        # Diskdagi yozuvlar ishonchli — validatsiyasiz tezkor yo'l
+        self._schedule = [ClassSchedule.from_storage(item) for item in data]
+        self._ids = PrefixIndex(c.id for c in self._schedule)
 
     def _save_schedule(self) -> None:
         """Jadvallarni saqlash."""
-        self.storage.save_schedule([item.model_dump() for item in self._schedule])
+        self.storage.save_schedule([item.to_storage() for item in self._schedule])
+        self._stamp = self.storage.stamp(self.storage.schedule_file)
+
+    def reload_if_changed(self) -> bool:
+        """Jadval fayli boshqa joyda o'zgargan bo'lsa qayta yuklash."""
+        if self.storage.stamp(self.storage.schedule_file) == self._stamp:
+            return False
+        self._load_schedule()
+        return True
 
     def add_class(
         self,
@@ -43,6 +57,7 @@ class SmartScheduler:
             teacher=teacher,
         )
         self._schedule.append(cls)
+        self._ids.add(cls.id)
         self._save_schedule()
         return cls
 
@@ -51,6 +66,7 @@ class SmartScheduler:
         before = len(self._schedule)
         self._schedule = [c for c in self._schedule if c.id != class_id]
         if len(self._schedule) < before:
+            self._ids.remove(class_id)
             self._save_schedule()
             return True
         return False
@@ -59,9 +75,8 @@ class SmartScheduler:
         """Darsni yangilash."""
         for i, cls in enumerate(self._schedule):
             if cls.id == class_id:
-                data = cls.model_dump()
-                data.update(kwargs)
-                updated = ClassSchedule(**data)
+                # Foydalanuvchi kiritgan qiymatlar — API chegarasida validatsiya
+                updated = ClassSchedule(**{**cls.to_storage(), **kwargs})
                 self._schedule[i] = updated
                 self._save_schedule()
                 return updated
@@ -72,7 +87,7 @@ class SmartScheduler:
         target_day = day.lower() if day else self._get_today_day_name()
         return sorted(
             [c for c in self._schedule if c.day.value == target_day],
-            key=lambda c: self._time_str_to_minutes(c.start_time),
+            key=lambda c: c.start_minutes,
         )
 
     def get_weekly_schedule(self) -> dict[str, list[ClassSchedule]]:
@@ -81,7 +96,7 @@ class SmartScheduler:
         for day in DayOfWeek:
             result[day.value] = sorted(
                 [c for c in self._schedule if c.day == day],
-                key=lambda c: self._time_str_to_minutes(c.start_time),
+                key=lambda c: c.start_minutes,
             )
         return result
 
@@ -95,9 +110,7 @@ class SmartScheduler:
         """Hozir davom etayotgan dars (agar bor bo'lsa)."""
         now = self._current_minutes()
         for cls in self.get_today_classes():
-            start = self._time_str_to_minutes(cls.start_time)
-            end = self._time_str_to_minutes(cls.end_time)
-            if start <= now < end:
+            if cls.start_minutes <= now < cls.end_minutes:
                 return cls
         return None
 
@@ -109,7 +122,7 @@ class SmartScheduler:
         """
         now = self._current_minutes()
         for cls in self.get_today_classes():
-            start = self._time_str_to_minutes(cls.start_time)
+            start = cls.start_minutes
             if start > now:
                 return cls, start - now
         return None, -1
@@ -119,8 +132,7 @@ class SmartScheduler:
         now = self._current_minutes()
         result = []
         for cls in self.get_today_classes():
-            start = self._time_str_to_minutes(cls.start_time)
-            if 0 < start - now <= minutes_before:
+            if 0 < cls.start_minutes - now <= minutes_before:
                 result.append(cls)
         return result
 
@@ -129,8 +141,7 @@ class SmartScheduler:
         now = self._current_minutes()
         result = []
         for cls in self.get_today_classes():
-            end = self._time_str_to_minutes(cls.end_time)
-            if 0 < now - end <= minutes_ago:
+            if 0 < now - cls.end_minutes <= minutes_ago:
                 result.append(cls)
         return result
 
@@ -139,12 +150,12 @@ class SmartScheduler:
         today = self.get_today_classes()
         now = self._current_minutes()
         completed = [
-            c for c in today if self._time_str_to_minutes(c.end_time) < now
+            c for c in today if c.end_minutes < now
         ]
         current = self.get_current_class()
         next_cls, next_in = self.get_next_class()
         remaining = [
-            c for c in today if self._time_str_to_minutes(c.start_time) > now
+            c for c in today if c.start_minutes > now
         ]
         return {
             "today_total": len(today),
@@ -158,24 +169,24 @@ class SmartScheduler:
     # === Yordamchi ===
 
     def find_class_by_prefix(self, id_prefix: str) -> Optional[ClassSchedule]:
-        """ID prefiksi bo'yicha darsni topish."""
-        for cls in self._schedule:
-            if cls.id.startswith(id_prefix):
-                return cls
-        return None
+        """ID prefiksi bo'yicha darsni topish.
+
+        Raises:
+            AmbiguousPrefixError: Prefiks bir nechta darsga mos kelsa.
+        """
+        class_id = self._ids.find(id_prefix)
+        if class_id is None:
+            return None
+        return next((c for c in self._schedule if c.id == class_id), None)
+
+    def short_class_id(self, class_id: str) -> str:
+        """Jadvallar uchun dars ID sining eng qisqa yagona prefiksi."""
+        return self._ids.short_id(class_id)
 
     def _get_today_day_name(self) -> str:
         """Bugungi hafta kunini qaytarish: 'monday', 'tuesday', ..."""
         return datetime.now().strftime("%A").lower()
 
-    def _time_str_to_minutes(self, time_str: str) -> int:
-        """'09:30' -> 570 daqiqa."""
-        try:
-            hours, minutes = map(int, time_str.split(":"))
-            return hours * 60 + minutes
-        except (ValueError, AttributeError):
-            return 0
-
     def _current_minutes(self) -> int:
         """Hozirgi vaqtni daqiqalarda qaytarish."""
         now = datetime.now()
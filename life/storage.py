@@ -2,6 +2,16 @@ import json
 from pathlib import Path
 from typing import Optional
 
+from core.metrics import get_registry
+
+_METRICS = get_registry()
+_STORAGE_SECONDS = _METRICS.histogram(
+    "jarvis_storage_seconds", "LifeStorage fayl amallari vaqti", ["op", "file"]
+)
+_STORAGE_ERRORS = _METRICS.counter(
+    "jarvis_storage_errors_total", "O'qib bo'lmagan (buzilgan) fayllar", ["file"]
+)
+
 
 class LifeStorage:
     """JSON fayl asosidagi doimiy saqlash."""
@@ -15,37 +25,51 @@ class LifeStorage:
         self.tasks_file = self.data_dir / "tasks.json"
         self.plans_file = self.data_dir / "daily_plans.json"
 
+    def stamp(self, path: Path) -> Optional[tuple[int, int]]:
+        """Fayl versiyasi (mtime_ns, hajm) — boshqa joyda o'zgarganini aniqlash uchun."""
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
     def _read_file(self, path: Path) -> list[dict]:
         """JSON fayldan ro'yxat o'qish."""
         if not path.exists():
             return []
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            with _STORAGE_SECONDS.labels("read", path.name).time():
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
             return data if isinstance(data, list) else []
         except (json.JSONDecodeError, OSError):
+            _STORAGE_ERRORS.labels(path.name).inc()
             return []
 
     def _write_file(self, path: Path, data: list[dict]) -> None:
         """JSON faylga ro'yxat yozish."""
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        with _STORAGE_SECONDS.labels("write", path.name).time():
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
 
     def _read_dict_file(self, path: Path) -> dict:
         """JSON fayldan lug'at o'qish."""
         if not path.exists():
             return {}
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            with _STORAGE_SECONDS.labels("read", path.name).time():
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
             return data if isinstance(data, dict) else {}
         except (json.JSONDecodeError, OSError):
+            _STORAGE_ERRORS.labels(path.name).inc()
             return {}
 
     def _write_dict_file(self, path: Path, data: dict) -> None:
         """JSON faylga lug'at yozish."""
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        with _STORAGE_SECONDS.labels("write", path.name).time():
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
 
     def load_schedule(self) -> list[dict]:
         """Dars jadvalini yuklash."""
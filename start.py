@@ -50,6 +50,9 @@ _COMMANDS_HELP = """
   [bold cyan]Slash buyruqlar:[/bold cyan]
     /fast /code /pro   — rejim o'zgartirish
     /status            — tizim holati
+    /trace [N]         — so'rovlar bosqichlari vaqti
+    /metrics [raw]     — metrikalar (raw — Prometheus formati)
+    /session /sessions — suhbat sessiyalari
     /today             — bugungi to'liq sharh
     /cognitive         — kognitiv yuk
     /reflect           — haftalik tahlil
@@ -156,6 +159,40 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="RAG uchun hujjatlar katalogi",
     )
+    parser.add_argument(
+        "--session",
+        default="default",
+        help="Suhbat sessiyasi nomi (default: default)",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        default=False,
+        help="HTTP API server rejimida ishga tushirish",
+    )
+    parser.add_argument(
+        "--telegram",
+        action="store_true",
+        default=False,
+        help="Telegram bot rejimida ishga tushirish (TELEGRAM_BOT_TOKEN kerak)",
+    )
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Server manzili (default: 127.0.0.1)",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8080,
+        help="Server porti (default: 8080)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Bloklovchi so'rovlar uchun worker oqimlar soni (default: 4)",
+    )
     parser.add_argument(
         "--setup",
         action="store_true",
@@ -190,6 +227,68 @@ def run_life_assistant() -> None:
     subprocess.run([sys.executable, str(life_script)])
 
 
+def run_server(args: argparse.Namespace) -> None:
+    """JARVIS-X ni HTTP API server sifatida ishga tushirish."""
+    try:
+        from core.jarvis import Jarvis
+        from core.server import run_server as serve
+    except ImportError as exc:
+        print(
+            f"Modul yuklanmadi: {exc}\n"
+            "  Bog'liqliklarni o'rnatish uchun: python setup.py"
+        )
+        sys.exit(1)
+
+    try:
+        jarvis = Jarvis(
+            default_mode=args.mode,
+            voice_enabled=False,
+            rag_dir=args.rag_dir,
+            session_id=args.session,
+        )
+    except Exception as exc:
+        print(f"JARVIS ishga tushirishda xato: {exc}")
+        sys.exit(1)
+
+    serve(jarvis, host=args.host, port=args.port, workers=args.workers)
+
+
+def run_telegram(args: argparse.Namespace) -> None:
+    """JARVIS-X ni Telegram bot sifatida ishga tushirish."""
+    import asyncio
+
+    try:
+        from core.jarvis import Jarvis
+        from core.telegram_bot import TelegramBot
+    except ImportError as exc:
+        print(
+            f"Modul yuklanmadi: {exc}\n"
+            "  Bog'liqliklarni o'rnatish uchun: python setup.py"
+        )
+        sys.exit(1)
+
+    try:
+        jarvis = Jarvis(
+            default_mode=args.mode,
+            voice_enabled=False,
+            rag_dir=args.rag_dir,
+            session_id=args.session,
+        )
+    except Exception as exc:
+        print(f"JARVIS ishga tushirishda xato: {exc}")
+        sys.exit(1)
+
+    bot = TelegramBot(jarvis, workers=args.workers)
+    if not bot.enabled:
+        print("Xato: .env faylida TELEGRAM_BOT_TOKEN sozlanmagan.")
+        sys.exit(1)
+    print("JARVIS Telegram bot ishga tushdi (to'xtatish: Ctrl+C)")
+    try:
+        asyncio.run(bot.run())
+    except KeyboardInterrupt:
+        pass
+
+
 def run_jarvis(args: argparse.Namespace) -> None:
     """To'liq JARVIS-X agentini ishga tushirish."""
     try:
@@ -213,7 +312,7 @@ def run_jarvis(args: argparse.Namespace) -> None:
         sys.exit(1)
 
     console = Console()
-    ui = UIRenderer()
+    ui = UIRenderer(console)
 
     # Jarvis ni ishga tushirish
     try:
@@ -223,6 +322,8 @@ def run_jarvis(args: argparse.Namespace) -> None:
             default_mode=args.mode,
             voice_enabled=args.voice,
             rag_dir=args.rag_dir,
+            session_id=args.session,
+            local_cli=True,
         )
     except Exception as exc:
         console.print(f"[red]JARVIS ishga tushirishda xato: {exc}[/red]")
@@ -253,7 +354,7 @@ def run_jarvis(args: argparse.Namespace) -> None:
             pass
 
     # Startup ekrani
-    status = jarvis.get_status()
+    status = jarvis.get_brief_status()
     ui.startup(
         mode=status["mode"],
         ai_status=status["ai_available"],
@@ -266,7 +367,7 @@ def run_jarvis(args: argparse.Namespace) -> None:
 
     # Asosiy tsikl
     while True:
-        current_status = jarvis.get_status()
+        current_status = jarvis.get_brief_status()
         ui.full_redraw(
             mode=current_status["mode"],
             ai_status=current_status["ai_available"],
@@ -349,7 +450,7 @@ def run_jarvis(args: argparse.Namespace) -> None:
         print("\a", end="", flush=True)
 
         # Suhbat logini saqlash
-        current_mode = jarvis.get_status().get("mode", "unknown")
+        current_mode = jarvis.get_brief_status().get("mode", "unknown")
         _log_interaction(log_file, user_input, response, current_mode)
 
         # Keyingi render uchun saqlash
@@ -375,6 +476,10 @@ def main() -> None:
 
     if args.life_only:
         run_life_assistant()
+    elif args.serve:
+        run_server(args)
+    elif args.telegram:
+        run_telegram(args)
     else:
         run_jarvis(args)
 
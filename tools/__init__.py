@@ -1,7 +1,27 @@
-from .web_search import WebSearchTool
-from .file_manager import FileManagerTool
-from .code_executor import CodeExecutorTool
-from .terminal import TerminalTool
+# Vositalar birinchi murojaatda import qilinadi (PEP 562): Jarvis ishga
+# tushganda ``tools.*`` modullari faqat mavjudligi tekshiriladi.
+from importlib import import_module
+
+_EXPORTS = {
+    "WebSearchTool": ".web_search",
+    "FileManagerTool": ".file_manager",
+    "CodeExecutorTool": ".code_executor",
+    "TerminalTool": ".terminal",
+}
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
 
 __all__ = [
     "WebSearchTool",